@@ -228,6 +228,12 @@ mode:
     parser.add_argument("--title", default="SMA_2H_week", help="mass simulation title")
     parser.add_argument("--file", default=None, help="generated config file name")
     parser.add_argument("--offset", type=int, default=120, help="mass simulation period offset (minutes)")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip the periods already in the mass simulation result journal")
+    parser.add_argument("--analyze", action="store_true",
+                        help="write the mass simulation result from the journal without simulating")
+    parser.add_argument("--lean", action="store_true",
+                        help="compute mass simulation metrics only, without report files and graphs")
 
     # 그래프 옵션
     parser.add_argument("--bb", type=int, default=1, help="볼린저밴드 표시(1/0)")
@@ -294,7 +300,10 @@ mode:
             parser.print_help()
             sys.exit(1)
         mass = MassSimulator()
-        mass.run(args.config, args.process)
+        if args.analyze:
+            mass.analyze_journal(args.config)
+        else:
+            mass.run(args.config, args.process, resume=args.resume, lean=args.lean)
 
     elif args.mode == 5:
         result = MassSimulator.make_config_json(
@@ -7,11 +7,16 @@ Combines separated components while maintaining the existing interface.
 """
 
 from typing import List, Dict, Any, Optional, Callable, Tuple
+import numpy as np
+from ..config import Config
 from ..log_manager import LogManager
 from .data_repository import DataRepository
+from .columnar_data_repository import ColumnarDataRepository
+from .lean_data_repository import LeanDataRepository
 from .data_analyzer import DataAnalyzer
 from .graph_generator import GraphGenerator
-from .report_generator import ReportGenerator
+from .report_generator import ReportGenerator, TradingTable
+from .performance_metrics import compute_metrics
 
 
 class Analyzer:
@@ -23,19 +28,27 @@ class Analyzer:
     단일 책임 원칙을 적용하여 분할된 컴포넌트들을 조합합니다.
     """
 
-    def __init__(self, sma_info: Tuple[int, int, int] = (10, 40, 120)):
+    def __init__(self, sma_info: Tuple[int, int, int] = (10, 40, 120), lean: bool = False):
         """
         Initialize Analyzer
         Analyzer 초기화
 
         Args:
             sma_info: SMA (Simple Moving Average) configuration tuple / SMA 설정 튜플
+            lean: Record only equity curve and trades without report file and graph /
+                자산 곡선과 거래 결과만 기록하고 보고서 파일과 그래프를 만들지 않음
         """
         self.logger = LogManager.get_logger("Analyzer")
+        self.lean = lean
 
         # Initialize components
         # 컴포넌트 초기화
-        self.data_repository = DataRepository()
+        if lean:
+            self.data_repository = LeanDataRepository()
+        elif Config.analyzer_data_backend == "column":
+            self.data_repository = ColumnarDataRepository()
+        else:
+            self.data_repository = DataRepository()
         self.data_analyzer = DataAnalyzer()
         self.graph_generator = GraphGenerator(sma_info)
         self.report_generator = ReportGenerator()
@@ -57,6 +70,12 @@ class Analyzer:
         self.start_asset_info = self.data_repository.start_asset_info
         self.is_simulation = self.data_repository.is_simulation
         self.sma_info = sma_info
+        # Performance metrics of the last report
+        # 마지막 보고서의 성과 지표
+        self.metrics: Dict[str, Any] = {}
+        # Whether market_candle of other markets was received (portfolio simulation)
+        # 다른 마켓의 market_candle을 받았는지 여부 (포트폴리오 시뮬레이션)
+        self.has_market_candle = False
         
         # Additional attributes for backward compatibility
         # 추가 하위 호환성 속성들
@@ -109,6 +128,8 @@ class Analyzer:
         Args:
             info: List of trading information / 거래 정보 리스트
         """
+        if not self.has_market_candle:
+            self.has_market_candle = any(item.get("type") == "market_candle" for item in info)
         self.data_repository.add_trading_info(info)
         self.make_periodic_record()
 
@@ -224,7 +245,7 @@ class Analyzer:
 
         # Generate graph
         # 그래프 생성
-        if graph_filename is not None:
+        if graph_filename is not None and not self.lean:
             graph = self.graph_generator.draw_graph(
                 info_list,
                 result_list,
@@ -251,6 +272,110 @@ class Analyzer:
 
         return summary
 
+    def get_performance_metrics(self, info_list: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Get performance metrics
+        자산 곡선과 거래 결과로 성과 지표를 계산합니다.
+
+        Args:
+            info_list: Trading information of the period, whole period if None /
+                구간의 거래 정보, None이면 전체 구간
+
+        Returns:
+            Metrics dictionary, empty if there is no data / 성과 지표 딕셔너리, 데이터가 없으면 빈 딕셔너리
+        """
+        try:
+            curve = self._make_equity_curve()
+            if curve is None:
+                return {}
+            epochs, equity, position, trades = curve
+            close = trades.pop("close", None)
+
+            if info_list is not None and len(info_list) > 0:
+                start, end = self._to_epochs([info_list[0]["date_time"], info_list[-1]["date_time"]])
+                mask = (epochs >= start) & (epochs <= end)
+                first = int(np.argmax(mask))
+                trade_mask = (trades["epoch"] >= start) & (trades["epoch"] <= end)
+                # 구간 시작 전부터 보유한 수량은 구간 시작 가격으로 매입한 것으로 본다
+                if first > 0:
+                    trades["start_amount"] = float(position[first - 1])
+                    if close is not None:
+                        trades["start_price"] = float(close[first])
+                for key in ("epoch", "side", "price", "amount"):
+                    trades[key] = trades[key][trade_mask]
+                epochs, equity, position = epochs[mask], equity[mask], position[mask]
+
+            interval = int(np.median(np.diff(epochs))) if len(epochs) > 1 else Config.candle_interval
+            return compute_metrics(
+                equity, epochs=epochs, position=position, trades=trades, candle_interval=max(interval, 1)
+            )
+        except (KeyError, IndexError, TypeError, ValueError) as err:
+            self.logger.warning(f"failed to compute performance metrics: {err}")
+            return {}
+
+    def _make_equity_curve(self) -> Optional[Tuple]:
+        """
+        Make equity curve
+        캔들별 자산 곡선을 만듭니다.
+
+        단일 마켓 시뮬레이션은 체결 결과의 잔고와 수량으로 캔들마다 자산 가치를 다시 계산하고,
+        그 외에는 저장된 자산 정보 기록을 자산 곡선으로 사용합니다.
+        market_candle을 받았거나 다른 마켓의 체결 결과가 있으면 포트폴리오 시뮬레이션으로 봅니다.
+
+        Returns:
+            (epochs, equity, position, trades) or None / 자산 곡선 튜플 또는 None
+        """
+        repo = self.data_repository
+        start = repo.start_asset_info
+        if start is None or len(repo.asset_info_list) == 0:
+            return None
+
+        results = [r for r in repo.result_list if r.get("type") in ("buy", "sell")]
+        trades = {
+            "epoch": self._to_epochs([r["date_time"] for r in results]),
+            "side": np.array([1 if r["type"] == "buy" else -1 for r in results], dtype=np.int8),
+            "price": np.array([r["price"] for r in results], dtype=np.float64),
+            "amount": np.array([r["amount"] for r in results], dtype=np.float64),
+        }
+        order = np.argsort(trades["epoch"], kind="stable")
+        trades = {key: value[order] for key, value in trades.items()}
+
+        info_list = repo.info_list
+        market = info_list[-1].get("market") if len(info_list) > 0 else None
+        start_item = start["asset"].get(market, (0.0, 0.0)) if market is not None else (0.0, 0.0)
+        trades["start_amount"] = float(start_item[1])
+        trades["start_price"] = float(start_item[0])
+        per_candle = (
+            not self.lean
+            and market is not None
+            and len(info_list) > 1
+            and not self.has_market_candle
+            and set(start["asset"].keys()) <= {market}
+            and all("balance" in r and r.get("market", market) == market for r in results)
+        )
+
+        if per_candle:
+            epochs = self._to_epochs([info["date_time"] for info in info_list])
+            close = np.array([info["closing_price"] for info in info_list], dtype=np.float64)
+            balance = np.array([results[i]["balance"] for i in order], dtype=np.float64)
+            last = np.searchsorted(trades["epoch"], epochs, side="right")
+            signed = np.concatenate(([0.0], np.cumsum(trades["side"] * trades["amount"])))
+            position = trades["start_amount"] + signed[last]
+            cash = np.concatenate(([float(start["balance"])], balance))[last]
+            trades["close"] = close
+            return epochs, cash + position * close, position, trades
+
+        assets = repo.asset_info_list
+        epochs = self._to_epochs([asset["date_time"] for asset in assets])
+        equity = np.array([DataAnalyzer._get_property_total_value(asset) for asset in assets], dtype=np.float64)
+        position = np.array([sum(float(item[1]) for item in asset["asset"].values()) for asset in assets])
+        return epochs, equity, position, trades
+
+    @staticmethod
+    def _to_epochs(date_time_list: List[str]) -> np.ndarray:
+        """ISO 형식 시간 문자열 리스트를 epoch 초 배열로 변환"""
+        return np.array(date_time_list, dtype="datetime64[s]").astype(np.int64)
+
     def get_trading_results(self) -> List[Dict[str, Any]]:
         """
         Get trading results
@@ -278,16 +403,30 @@ class Analyzer:
                 self.logger.error("invalid return report")
                 return None
 
-            trading_table = self.report_generator.create_trading_table(
+            # Performance metrics of the whole period, only for the final report
+            # 전체 구간의 성과 지표, 구간 수익률 조회마다 계산하지 않도록 보고서를 만들 때만 계산
+            self.metrics = self.get_performance_metrics()
+            self.report_generator.format_metrics_log(self.metrics)
+
+            # Lean mode returns summary only
+            # lean 모드는 보고서 파일과 그래프 없이 요약만 반환
+            if self.lean:
+                return {"summary": summary, "trading_table": [], "metrics": self.metrics}
+
+            trading_lists = (
                 self.data_repository.request_list,
                 self.data_repository.info_list,
                 self.data_repository.score_list,
                 self.data_repository.result_list,
             )
 
-            # Create report file
-            # 보고서 파일 생성
-            self.report_generator.create_report_file(tag, summary, trading_table)
+            # Create report file, rows are merged and written one by one
+            # 보고서 파일 생성, 거래 테이블 리스트를 만들지 않고 병합하면서 기록
+            self.report_generator.create_report_file(
+                tag, summary, self.report_generator.iter_trading_table(*trading_lists), metrics=self.metrics
+            )
+            # 반환하는 거래 테이블은 처음 읽을 때 만든다
+            trading_table = TradingTable(self.report_generator, *trading_lists)
 
             # Generate graph
             # 그래프 생성
@@ -300,7 +439,7 @@ class Analyzer:
                 line_graph_list=self.data_repository.line_graph_list,
             )
 
-            return {"summary": summary, "trading_table": trading_table}
+            return {"summary": summary, "trading_table": trading_table, "metrics": self.metrics}
 
         except (IndexError, AttributeError):
             self.logger.error("create report FAIL")
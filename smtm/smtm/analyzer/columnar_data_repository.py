@@ -0,0 +1,332 @@
+"""
+Columnar Data Repository Class
+컬럼형 데이터 저장소 클래스
+
+Stores candles, requests, results, asset samples and score records in growable typed NumPy columns
+instead of lists of deep-copied dicts. date_time is kept as epoch seconds, read as UTC like ColumnStore.
+The list attributes of DataRepository remain available as lazy read-only views that build dicts on access,
+and whole columns are available as pandas DataFrames.
+딥카피한 dict 리스트 대신 캔들, 요청, 결과, 자산 샘플, 수익률 기록을 늘어나는 타입 지정 NumPy 컬럼에 저장합니다.
+date_time은 ColumnStore와 같이 UTC로 읽은 epoch 초로 보관합니다.
+DataRepository의 리스트 속성은 접근할 때 dict를 만드는 읽기 전용 뷰로 제공하고, 컬럼 전체는 DataFrame으로 제공합니다.
+"""
+
+import calendar
+import time
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_repository import DataRepository
+
+
+_MISSING = object()
+
+
+class RecordColumns:
+    """
+    레코드 한 종류를 저장하는 늘어나는 컬럼 묶음
+    Growable set of typed columns for one kind of record
+
+    float_fields는 float64, object_fields는 object 배열이며 레코드에 없는 필드는 NaN, _MISSING으로 표시한다
+    float_fields에 int로 들어온 값은 is_int에 표시해서 dict로 만들 때 int로 되돌린다
+    스키마에 없는 필드는 extra 컬럼에 dict로 보관한다
+    kind가 None이면 만든 dict에 kind 필드를 넣지 않는다
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, kind: Optional[int], float_fields: Tuple[str, ...], object_fields: Tuple[str, ...]):
+        self.kind = kind
+        self.float_fields = float_fields
+        self.object_fields = object_fields
+        self.fields = frozenset(("date_time", "kind") + float_fields + object_fields)
+        self.count = 0
+        # 모든 레코드가 epoch로 변환되었고 시간 순이면 True
+        self.is_sorted = True
+        self._allocate(self.INITIAL_CAPACITY)
+
+    def _allocate(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.epoch = np.full(capacity, -1, dtype=np.int64)
+        self.floats = {field: np.full(capacity, np.nan, dtype=np.float64) for field in self.float_fields}
+        self.is_int = {field: np.zeros(capacity, dtype=np.bool_) for field in self.float_fields}
+        self.objects = {
+            field: np.full(capacity, None, dtype=object) for field in self.object_fields + ("date_time", "extra")
+        }
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        self.count = 0
+        self.is_sorted = True
+        self._allocate(self.INITIAL_CAPACITY)
+
+    def _grow(self) -> None:
+        count = self.count
+        epoch, floats, is_int, objects = self.epoch, self.floats, self.is_int, self.objects
+        self._allocate(self.capacity * 2)
+        self.epoch[:count] = epoch[:count]
+        for field, column in floats.items():
+            self.floats[field][:count] = column[:count]
+            self.is_int[field][:count] = is_int[field][:count]
+        for field, column in objects.items():
+            self.objects[field][:count] = column[:count]
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """레코드 dict를 컬럼에 추가, 값은 복사하지 않으므로 호출하는 쪽에서 필요한 만큼 복사한다"""
+        if self.count == self.capacity:
+            self._grow()
+        idx = self.count
+
+        date_time = record.get("date_time")
+        epoch = to_epoch(date_time)
+        self.epoch[idx] = epoch
+        if epoch < 0 or (idx > 0 and epoch < self.epoch[idx - 1]):
+            self.is_sorted = False
+        # 형식이 다른 시간 문자열은 그대로 보관해서 원래 값으로 복원
+        self.objects["date_time"][idx] = date_time if epoch < 0 else None
+
+        for field in self.float_fields:
+            value = record.get(field, _MISSING)
+            self.floats[field][idx] = np.nan if value is _MISSING else value
+            self.is_int[field][idx] = isinstance(value, int)
+        for field in self.object_fields:
+            self.objects[field][idx] = record.get(field, _MISSING)
+
+        extra = None
+        if len(record.keys() - self.fields) > 0:
+            extra = {key: value for key, value in record.items() if key not in self.fields}
+        self.objects["extra"][idx] = extra
+        self.count = idx + 1
+
+    def get_record(self, index: int) -> Dict[str, Any]:
+        """index 번째 레코드를 dict로 만들어 반환"""
+        record = {}
+        for field in self.float_fields:
+            value = self.floats[field][index]
+            if value == value:
+                record[field] = int(value) if self.is_int[field][index] else float(value)
+        for field in self.object_fields:
+            value = self.objects[field][index]
+            if value is not _MISSING:
+                record[field] = value
+        text = self.objects["date_time"][index]
+        record["date_time"] = text if text is not None else to_date_time(int(self.epoch[index]))
+        extra = self.objects["extra"][index]
+        if extra is not None:
+            record.update(extra)
+        if self.kind is not None:
+            record["kind"] = self.kind
+        return record
+
+    def get_dataframe(self) -> pd.DataFrame:
+        """컬럼 전체를 DataFrame으로 반환, date_time은 datetime64, 추가 필드는 제외"""
+        count = self.count
+        epoch = self.epoch[:count]
+        frame = {"date_time": pd.to_datetime(np.where(epoch < 0, np.nan, epoch), unit="s")}
+        for field in self.float_fields:
+            frame[field] = self.floats[field][:count].copy()
+        for field in self.object_fields:
+            column = self.objects[field][:count]
+            frame[field] = [None if value is _MISSING else value for value in column]
+        return pd.DataFrame(frame)
+
+
+class RecordView(Sequence):
+    """
+    RecordColumns를 dict 리스트처럼 읽는 뷰
+    Read-only list-like view building dicts from RecordColumns on access
+
+    인덱스, 슬라이스, 반복, len, 리스트와의 + 연산과 비교를 지원한다
+    반환된 dict를 수정해도 저장소에는 반영되지 않는다
+    """
+
+    def __init__(self, columns: RecordColumns):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.columns.get_record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("record index out of range")
+        return self.columns.get_record(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.columns.get_record(index)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, RecordView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RecordView(kind={self.columns.kind}, count={len(self)})"
+
+
+def to_epoch(date_time: Optional[str]) -> int:
+    """'YYYY-MM-DDTHH:MM:SS' 문자열을 UTC로 읽은 epoch 초로 변환, 다른 형식이면 -1"""
+    if not isinstance(date_time, str) or len(date_time) != 19 or date_time[10] != "T":
+        return -1
+    try:
+        return calendar.timegm(datetime.fromisoformat(date_time).timetuple())
+    except ValueError:
+        return -1
+
+
+def to_date_time(epoch: int) -> str:
+    """epoch 초를 'YYYY-MM-DDTHH:MM:SS' 문자열로 변환"""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(epoch))
+
+
+class ColumnarDataRepository(DataRepository):
+    """
+    Columnar Data Repository Class
+    컬럼형 거래 데이터 저장소
+
+    DataRepository와 같은 인터페이스로 거래 정보, 요청, 결과, 자산 정보, 수익률 기록을 컬럼으로 저장한다.
+    info_list, request_list, result_list, asset_info_list, score_list는 RecordView를 반환하며
+    리스트를 대입하면 그 내용으로 컬럼을 다시 만든다 (load_dump, set_start_point 호환)
+    """
+
+    PRICE_FIELDS = ("opening_price", "high_price", "low_price", "closing_price", "acc_price", "acc_volume")
+
+    def __init__(self):
+        self.columns = {
+            "info": RecordColumns(0, self.PRICE_FIELDS, ("type", "market")),
+            "request": RecordColumns(1, ("price", "amount"), ("id", "type")),
+            "result": RecordColumns(2, ("price", "amount", "balance"), ("request", "type", "msg", "state")),
+            "asset_info": RecordColumns(None, ("balance",), ("asset", "quote")),
+            "score": RecordColumns(3, ("balance", "cumulative_return"), ("price_change_ratio", "asset")),
+        }
+        self.views = {name: RecordView(columns) for name, columns in self.columns.items()}
+        super().__init__()
+
+    def _set_records(self, name: str, records: List[Dict[str, Any]]) -> None:
+        columns = self.columns[name]
+        columns.clear()
+        for record in records:
+            columns.append(record)
+
+    info_list = property(lambda self: self.views["info"], lambda self, v: self._set_records("info", v))
+    request_list = property(lambda self: self.views["request"], lambda self, v: self._set_records("request", v))
+    result_list = property(lambda self: self.views["result"], lambda self, v: self._set_records("result", v))
+    asset_info_list = property(
+        lambda self: self.views["asset_info"], lambda self, v: self._set_records("asset_info", v)
+    )
+    score_list = property(lambda self: self.views["score"], lambda self, v: self._set_records("score", v))
+
+    def add_trading_info(self, info: List[Dict[str, Any]]) -> None:
+        """
+        Store trading information
+        거래 정보를 저장합니다. 캔들 값은 컬럼에 복사되므로 dict를 복사하지 않습니다.
+        """
+        for item in info:
+            if item["type"] == "primary_candle":
+                self.columns["info"].append(item)
+                return
+
+    def add_requests(self, requests: List[Dict[str, Any]]) -> None:
+        """
+        Store trading request information
+        거래 요청 정보를 저장합니다.
+        """
+        columns = self.columns["request"]
+        for request in requests:
+            if request["type"] == "cancel":
+                columns.append(dict(request, price=0, amount=0))
+                continue
+            if float(request["price"]) <= 0 or float(request["amount"]) <= 0:
+                continue
+            columns.append(dict(request, price=float(request["price"]), amount=float(request["amount"])))
+
+    def add_result(self, result: Dict[str, Any]) -> None:
+        """
+        Store trading result information
+        거래 결과 정보를 저장합니다.
+        """
+        try:
+            if float(result["price"]) <= 0 or float(result["amount"]) <= 0:
+                return
+        except KeyError as err:
+            self.logger.warning(f"Invalid result: {err}")
+            return
+
+        new = dict(result, price=float(result["price"]), amount=float(result["amount"]))
+        if isinstance(new.get("request"), dict):
+            new["request"] = dict(new["request"])
+        self.columns["result"].append(new)
+
+    def add_asset_info(self, asset_info: Dict[str, Any]) -> None:
+        """
+        Store asset information
+        자산 정보를 저장합니다. asset, quote는 값이 불변이므로 얕은 복사로 보관합니다.
+        """
+        new = dict(asset_info, balance=float(asset_info["balance"]))
+        for key in ("asset", "quote"):
+            if isinstance(new.get(key), dict):
+                new[key] = dict(new[key])
+
+        columns = self.columns["asset_info"]
+        if self.start_asset_info is None and len(columns) == 0:
+            self.start_asset_info = new
+        columns.append(new)
+
+    def add_score_record(self, score_record: Dict[str, Any]) -> None:
+        """
+        Store return rate record
+        수익률 기록을 저장합니다.
+        """
+        score_record["kind"] = 3
+        self.columns["score"].append(score_record)
+
+    def get_dataframe(self, name: str) -> pd.DataFrame:
+        """
+        저장된 레코드를 DataFrame으로 반환
+
+        name: info, request, result, asset_info, score
+        """
+        if name not in self.columns:
+            raise UserWarning(f"unknown record name: {name}")
+        return self.columns[name].get_dataframe()
+
+    def _get_epochs(self, name: str) -> Tuple[Sequence[int], bool]:
+        """
+        Get epoch index of record list
+        컬럼에 저장된 epoch를 그대로 색인으로 사용합니다. 정렬되지 않았거나 변환하지 못한 시간이 있으면 기본 색인을 사용합니다.
+        """
+        columns = self.columns.get(name[: -len("_list")])
+        if columns is None or not columns.is_sorted:
+            return super()._get_epochs(name)
+        return columns.epoch[: columns.count], True
+
+    def should_make_periodic_record(self) -> bool:
+        """
+        Check if periodic record should be created
+        주기적 기록을 생성해야 하는지 확인합니다. 저장된 epoch로 비교해서 dict를 만들지 않습니다.
+        """
+        assets = self.columns["asset_info"]
+        if len(assets) == 0:
+            return True
+
+        infos = self.columns["info"]
+        last = assets.epoch[assets.count - 1]
+        if self.is_simulation and len(infos) > 0 and last >= 0 and infos.epoch[infos.count - 1] >= 0:
+            return int(infos.epoch[infos.count - 1] - last) > self.RECORD_INTERVAL
+        return super().should_make_periodic_record()
@@ -6,13 +6,70 @@ Handles storage, retrieval, and management of trading data.
 거래 데이터의 저장, 조회, 관리를 담당합니다.
 """
 
+import calendar
 import copy
 import os
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Sequence, Tuple
 from ..log_manager import LogManager
 
 
+class EpochIndex:
+    """
+    Epoch Index
+    레코드 리스트의 date_time을 epoch 초로 보관하는 색인
+
+    Records are appended in time order, so only the records added after the last update are parsed
+    and interval queries become a pair of bisect calls.
+    레코드는 시간 순으로 추가되므로 마지막 갱신 이후 추가된 레코드만 변환하고 구간 조회는 bisect 두 번으로 처리합니다.
+    리스트가 바뀌었거나 줄어들었으면 처음부터 다시 색인합니다.
+    """
+
+    def __init__(self):
+        self.source: Optional[Sequence[Dict[str, Any]]] = None
+        self.last: Optional[Dict[str, Any]] = None
+        self.epochs: List[int] = []
+        self.is_sorted = True
+
+    def update(self, source: Sequence[Dict[str, Any]]) -> None:
+        """
+        Index records added to source
+        source에 추가된 레코드를 색인합니다.
+
+        Args:
+            source: Record list / 레코드 리스트
+        """
+        count = len(self.epochs)
+        if (
+            source is not self.source
+            or len(source) < count
+            or (count > 0 and source[count - 1] is not self.last)
+        ):
+            self.source = source
+            self.epochs = []
+            self.is_sorted = True
+            count = 0
+
+        epochs = self.epochs
+        for idx in range(count, len(source)):
+            epoch = to_epoch(source[idx]["date_time"])
+            if epochs and epoch < epochs[-1]:
+                self.is_sorted = False
+            epochs.append(epoch)
+        self.last = source[-1] if len(source) > 0 else None
+
+
+def to_epoch(date_time: str) -> int:
+    """
+    Convert ISO date time string to epoch seconds
+    ISO 형식 시간 문자열을 epoch 초로 변환합니다. 시간대 없이 UTC로 읽습니다.
+    """
+    return calendar.timegm(
+        datetime.strptime(date_time, DataRepository.ISO_DATEFORMAT).timetuple()
+    )
+
+
 class DataRepository:
     """
     Data Repository Class
@@ -47,6 +104,10 @@ class DataRepository:
         self.start_asset_info: Optional[Dict[str, Any]] = None
         self.is_simulation = False
 
+        # Epoch index by record list name for interval queries
+        # 구간 조회를 위한 레코드 리스트별 epoch 색인
+        self.epoch_index: Dict[str, EpochIndex] = {}
+
     def add_trading_info(self, info: List[Dict[str, Any]]) -> None:
         """
         Store trading information
@@ -236,21 +297,13 @@ class DataRepository:
         if start_dt == end_dt:
             end_dt = end_dt + timedelta(minutes=2)
 
-        score_list = []
-        asset_info_list = []
-        result_list = []
-        spot_list = []
-        line_graph_list = []
-
-        self._make_filtered_list(start_dt, end_dt, score_list, self.score_list)
-        self._make_filtered_list(
-            start_dt, end_dt, asset_info_list, self.asset_info_list
-        )
-        self._make_filtered_list(start_dt, end_dt, result_list, self.result_list)
-        self._make_filtered_list(start_dt, end_dt, spot_list, self.spot_list)
-        self._make_filtered_list(
-            start_dt, end_dt, line_graph_list, self.line_graph_list
-        )
+        start = calendar.timegm(start_dt.timetuple())
+        end = calendar.timegm(end_dt.timetuple())
+        score_list = self._get_records_between("score_list", start, end)
+        asset_info_list = self._get_records_between("asset_info_list", start, end)
+        result_list = self._get_records_between("result_list", start, end)
+        spot_list = self._get_records_between("spot_list", start, end)
+        line_graph_list = self._get_records_between("line_graph_list", start, end)
 
         return (
             asset_info_list,
@@ -261,6 +314,43 @@ class DataRepository:
             line_graph_list,
         )
 
+    def _get_epochs(self, name: str) -> Tuple[Sequence[int], bool]:
+        """
+        Get epoch index of record list
+        레코드 리스트의 epoch 색인과 정렬 여부를 반환합니다.
+
+        Args:
+            name: Record list attribute name / 레코드 리스트 속성 이름
+
+        Returns:
+            Tuple of epochs and sorted flag / epoch 리스트와 정렬 여부 튜플
+        """
+        index = self.epoch_index.get(name)
+        if index is None:
+            index = EpochIndex()
+            self.epoch_index[name] = index
+        index.update(getattr(self, name))
+        return index.epochs, index.is_sorted
+
+    def _get_records_between(self, name: str, start: int, end: int) -> List[Dict[str, Any]]:
+        """
+        Get records within time range
+        epoch 색인으로 시간 범위에 맞는 레코드를 반환합니다.
+
+        Args:
+            name: Record list attribute name / 레코드 리스트 속성 이름
+            start: Start epoch / 시작 epoch
+            end: End epoch / 종료 epoch
+
+        Returns:
+            List of records between start and end / 시작과 종료 사이의 레코드 리스트
+        """
+        source = getattr(self, name)
+        epochs, is_sorted = self._get_epochs(name)
+        if is_sorted:
+            return list(source[bisect_left(epochs, start) : bisect_right(epochs, end)])
+        return [source[idx] for idx, epoch in enumerate(epochs) if start <= epoch <= end]
+
     @staticmethod
     def _make_filtered_list(
         start_dt: datetime, end_dt: datetime, dest: List, source: List
@@ -0,0 +1,63 @@
+"""
+Lean Data Repository Class
+요약 지표용 데이터 저장소 클래스
+
+Keeps only what the return summary needs: the first and last candle, trading results,
+asset samples and score records. Requests, spots and line graph values are not stored.
+수익률 요약에 필요한 첫 캔들과 마지막 캔들, 거래 결과, 자산 정보, 수익률 기록만 보관합니다.
+거래 요청, 스팟, 선 그래프 값은 저장하지 않습니다.
+"""
+
+from typing import List, Dict, Any
+from .data_repository import DataRepository
+
+
+class LeanDataRepository(DataRepository):
+    """
+    Lean Data Repository Class
+    대량 시뮬레이션, 스윕에서 요약 지표만 계산하기 위한 거래 데이터 저장소
+
+    info_list는 첫 캔들과 마지막 캔들만 가지므로 구간 데이터는 조회할 수 없습니다.
+    """
+
+    def add_trading_info(self, info: List[Dict[str, Any]]) -> None:
+        """
+        Store first and last trading information
+        첫 거래 정보와 마지막 거래 정보만 저장합니다.
+
+        Args:
+            info: List of trading information / 거래 정보 리스트
+        """
+        for item in info:
+            if item["type"] == "primary_candle":
+                new = dict(item, kind=0)
+                if len(self.info_list) < 2:
+                    self.info_list.append(new)
+                else:
+                    self.info_list[-1] = new
+                return
+
+    def add_requests(self, requests: List[Dict[str, Any]]) -> None:
+        """
+        Ignore trading requests
+        거래 요청은 저장하지 않습니다.
+        """
+
+    def add_spot(self, date_time: str, value: float) -> None:
+        """
+        Ignore graph spot
+        그래프 스팟은 저장하지 않습니다.
+        """
+
+    def add_line_graph_value(self, date_time: str, value: float) -> None:
+        """
+        Ignore line graph value
+        선 그래프 값은 저장하지 않습니다.
+        """
+
+    def get_interval_data(self, index_info: tuple) -> tuple:
+        """
+        Interval data is not available in lean mode
+        구간 데이터는 저장하지 않으므로 조회할 수 없습니다.
+        """
+        raise UserWarning("interval data is not recorded by lean analyzer")
@@ -0,0 +1,174 @@
+"""
+Performance Metrics
+성과 지표 계산 모듈
+
+Computes drawdown, risk adjusted returns, exposure, turnover and trade statistics
+from an equity curve and a trade list given as NumPy arrays.
+NumPy 배열로 전달된 자산 곡선과 거래 리스트로 낙폭, 위험 조정 수익률, 보유 비율, 회전율, 거래 통계를 계산합니다.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+YEAR_SECONDS = 365 * 24 * 60 * 60
+
+
+def drawdown_series(equity: np.ndarray) -> np.ndarray:
+    """
+    Drawdown from running peak in percent
+    직전 최고점 대비 낙폭(%) 배열을 반환합니다. 값은 0 이하입니다.
+
+    Args:
+        equity: Equity curve / 자산 곡선
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.size == 0:
+        return equity
+    peak = np.maximum.accumulate(equity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(peak > 0, equity / peak - 1.0, 0.0) * 100
+    return drawdown
+
+
+def max_drawdown(equity: np.ndarray) -> Tuple[float, int]:
+    """
+    Max drawdown and longest underwater duration
+    최대 낙폭(%, 양수)과 최고점을 회복하지 못한 가장 긴 기간(캔들 수)을 반환합니다.
+
+    Args:
+        equity: Equity curve / 자산 곡선
+    """
+    drawdown = drawdown_series(equity)
+    if drawdown.size == 0:
+        return 0.0, 0
+    position = np.arange(drawdown.size)
+    last_peak = np.maximum.accumulate(np.where(drawdown >= 0, position, 0))
+    # 낙폭은 0 이하이므로 abs로 양수로 바꾼다, -0.0 대신 0.0
+    return abs(float(drawdown.min())), int((position - last_peak).max())
+
+
+def candle_returns(equity: np.ndarray) -> np.ndarray:
+    """
+    Return of each candle
+    캔들별 수익률 배열을 반환합니다.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.size < 2:
+        return np.zeros(0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(equity[:-1] > 0, equity[1:] / equity[:-1] - 1.0, 0.0)
+    return returns
+
+
+def trade_statistics(
+    side: np.ndarray, price: np.ndarray, amount: np.ndarray, start_amount: float = 0.0, start_price: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Trade statistics by average cost
+    평균 매입가 기준으로 매도 거래의 손익을 계산해서 거래 통계를 반환합니다.
+
+    Args:
+        side: 1 for buy, -1 for sell / 매수 1, 매도 -1
+        price: Fill price / 체결 가격
+        amount: Fill amount / 체결 수량
+        start_amount: Holding amount at start / 시작 보유 수량
+        start_price: Average price of starting holding / 시작 보유 평균 가격
+    """
+    side = np.asarray(side, dtype=np.int8)
+    price = np.asarray(price, dtype=np.float64)
+    amount = np.asarray(amount, dtype=np.float64)
+
+    # 매도 시점의 평균 매입가는 직전까지의 거래에 의존하므로 거래 수만큼 순서대로 계산
+    cost = np.zeros(side.size)
+    holding = start_amount
+    average = start_price
+    for idx in range(side.size):
+        if side[idx] > 0:
+            total = holding + amount[idx]
+            average = (average * holding + price[idx] * amount[idx]) / total if total > 0 else 0.0
+            holding = total
+        else:
+            cost[idx] = average
+            holding = max(holding - amount[idx], 0.0)
+
+    sells = side < 0
+    pnl = ((price - cost) * amount)[sells]
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
+    loss_sum = -losses.sum()
+    return {
+        "trade_count": int(side.size),
+        "sell_count": int(sells.sum()),
+        "win_rate": float(wins.size / pnl.size * 100) if pnl.size > 0 else 0.0,
+        "avg_trade_pnl": float(pnl.mean()) if pnl.size > 0 else 0.0,
+        "profit_factor": float(wins.sum() / loss_sum) if loss_sum > 0 else (float("inf") if wins.size > 0 else 0.0),
+    }
+
+
+def compute_metrics(
+    equity: np.ndarray,
+    epochs: Optional[np.ndarray] = None,
+    position: Optional[np.ndarray] = None,
+    trades: Optional[Dict[str, np.ndarray]] = None,
+    candle_interval: int = 60,
+) -> Dict[str, Any]:
+    """
+    Compute performance metrics
+    자산 곡선과 거래 리스트로 성과 지표를 계산합니다.
+
+    Args:
+        equity: Equity value of each candle / 캔들별 자산 가치
+        epochs: Epoch seconds of each candle / 캔들별 epoch 초
+        position: Holding amount of each candle / 캔들별 보유 수량
+        trades: {"side", "price", "amount", "start_amount", "start_price"} arrays / 거래 배열
+        candle_interval: Seconds between equity samples / 자산 곡선 간격(초)
+
+    Returns:
+        Metrics dictionary, returns and drawdowns are percent / 지표 딕셔너리, 수익률과 낙폭은 %
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.size == 0:
+        return {}
+
+    returns = candle_returns(equity)
+    periods_per_year = YEAR_SECONDS / candle_interval
+    mean = returns.mean() if returns.size > 0 else 0.0
+    std = returns.std() if returns.size > 0 else 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2)) if returns.size > 0 else 0.0
+    mdd, mdd_duration = max_drawdown(equity)
+
+    total_return = float(equity[-1] / equity[0] - 1.0) * 100 if equity[0] > 0 else 0.0
+    cagr = 0.0
+    if epochs is not None and len(epochs) > 0 and equity[0] > 0 and equity[-1] > 0:
+        years = (float(epochs[-1]) - float(epochs[0]) + candle_interval) / YEAR_SECONDS
+        with np.errstate(over="ignore"):
+            cagr = float(np.power(equity[-1] / equity[0], 1.0 / years) - 1.0) * 100
+
+    metrics = {
+        "candles": int(equity.size),
+        "total_return": total_return,
+        "cagr": cagr,
+        "max_drawdown": mdd,
+        "max_drawdown_duration": mdd_duration,
+        "volatility": float(std * np.sqrt(periods_per_year) * 100),
+        "sharpe": float(mean / std * np.sqrt(periods_per_year)) if std > 0 else 0.0,
+        "sortino": float(mean / downside * np.sqrt(periods_per_year)) if downside > 0 else 0.0,
+        "exposure": float(np.mean(np.asarray(position) > 0) * 100) if position is not None else 0.0,
+        "turnover": 0.0,
+    }
+
+    if trades is not None:
+        notional = np.asarray(trades["price"], dtype=np.float64) * np.asarray(trades["amount"], dtype=np.float64)
+        metrics["turnover"] = float(notional.sum() / equity.mean()) if equity.mean() > 0 else 0.0
+        metrics.update(
+            trade_statistics(
+                trades["side"],
+                trades["price"],
+                trades["amount"],
+                trades.get("start_amount", 0.0),
+                trades.get("start_price", 0.0),
+            )
+        )
+
+    return {key: round(value, 3) if isinstance(value, float) else value for key, value in metrics.items()}
@@ -6,12 +6,17 @@ Handles trading report generation and file output.
 거래 보고서 생성과 파일 출력을 담당합니다.
 """
 
+import heapq
 import os
 import psutil
+from collections.abc import Sequence
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from operator import itemgetter
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from ..log_manager import LogManager
 
+_EPOCH = datetime(1970, 1, 1)
+
 
 class ReportGenerator:
     """
@@ -36,7 +41,11 @@ class ReportGenerator:
             os.mkdir(self.OUTPUT_FOLDER)
 
     def create_report_file(
-        self, filepath: str, summary: Tuple, trading_table: List[Dict[str, Any]]
+        self,
+        filepath: str,
+        summary: Tuple,
+        trading_table: Iterable[Dict[str, Any]],
+        metrics: Optional[Dict[str, Any]] = None,
     ) -> None:
         """
         Output report to file
@@ -45,7 +54,8 @@ class ReportGenerator:
         Args:
             filepath: Report file path / 보고서 파일 경로
             summary: Summary tuple / 요약 튜플
-            trading_table: Trading table data / 거래 테이블 데이터
+            trading_table: Trading table list or iterator / 거래 테이블 리스트 또는 iterator
+            metrics: Optional performance metrics / 선택적 성과 지표
         """
         # Ensure filepath is a string
         # 파일 경로가 문자열인지 확인
@@ -53,12 +63,15 @@ class ReportGenerator:
         final_path = self.OUTPUT_FOLDER + filepath + ".txt"
 
         with open(final_path, "w", encoding="utf-8") as report_file:
-            if len(trading_table) > 0:
-                report_file.write(
-                    "### TRADING TABLE =================================\n"
-                )
-
+            # iterator도 받을 수 있도록 첫 항목을 쓸 때 제목을 출력
+            is_first = True
             for item in trading_table:
+                if is_first:
+                    report_file.write(
+                        "### TRADING TABLE =================================\n"
+                    )
+                    is_first = False
+
                 if item["kind"] == 0:
                     report_file.write(
                         f"{item['date_time']}, {item['opening_price']}, {item['high_price']}, {item['low_price']}, {item['closing_price']}, {item['acc_price']}, {item['acc_volume']}\n"
@@ -88,6 +101,11 @@ class ReportGenerator:
             )
             report_file.write(f"Price_change_ratio {summary[3]}\n")
 
+            if metrics:
+                report_file.write("### METRICS =======================================\n")
+                for key, value in metrics.items():
+                    report_file.write(f"{key:<25}{value:>15}\n")
+
             if self.DEBUG_MODE:
                 self._write_debug_info(report_file)
 
@@ -147,15 +165,100 @@ class ReportGenerator:
         Returns:
             Sorted trading table / 정렬된 거래 테이블
         """
-        list_sum = request_list + info_list + score_list + result_list
-        trading_table = sorted(
-            list_sum,
-            key=lambda x: (
-                datetime.strptime(x["date_time"], "%Y-%m-%dT%H:%M:%S"),
-                x["kind"],
-            ),
+        return list(self.iter_trading_table(request_list, info_list, score_list, result_list))
+
+    def iter_trading_table(
+        self,
+        request_list: List[Dict[str, Any]],
+        info_list: List[Dict[str, Any]],
+        score_list: List[Dict[str, Any]],
+        result_list: List[Dict[str, Any]],
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate trading table in time order
+        시간, 종류 순서로 거래 테이블 항목을 하나씩 반환합니다.
+
+        Each list is already time ordered, so they are merged lazily with heapq.merge on
+        (epoch, kind) keys instead of sorting the concatenated list. Result is identical to
+        the stable sort of request_list + info_list + score_list + result_list.
+        각 리스트는 이미 시간 순서이므로 합쳐서 정렬하지 않고 하나씩 병합합니다.
+        정렬되지 않은 리스트는 해당 리스트만 정렬한 뒤 병합합니다.
+
+        Args:
+            request_list: Trading request list / 거래 요청 리스트
+            info_list: Trading information list / 거래 정보 리스트
+            score_list: Score list / 점수 리스트
+            result_list: Trading result list / 거래 결과 리스트
+        """
+        sources = []
+        for records in (request_list, info_list, score_list, result_list):
+            if not self._is_time_ordered(records):
+                records = sorted(records, key=lambda x: (self._to_epoch(x["date_time"]), x["kind"]))
+            sources.append(self._iter_keyed(records))
+
+        # heapq.merge는 키가 같으면 앞선 리스트의 항목을 먼저 반환하므로 안정 정렬과 같은 순서
+        for _, item in heapq.merge(*sources, key=itemgetter(0)):
+            yield item
+
+    @staticmethod
+    def _to_epoch(date_time: str) -> int:
+        """
+        'YYYY-MM-DDTHH:MM:SS' 문자열을 epoch 초로 변환, 형식이 다르면 strptime과 같이 ValueError
+        """
+        if len(date_time) == 19 and date_time[10] == "T":
+            when = datetime.fromisoformat(date_time)
+        else:
+            when = datetime.strptime(date_time, "%Y-%m-%dT%H:%M:%S")
+        return int((when - _EPOCH).total_seconds())
+
+    @classmethod
+    def _iter_keyed(cls, records: Iterable[Dict[str, Any]]) -> Iterator[Tuple]:
+        """각 항목을 ((epoch, kind), item)으로 반환, 연속된 같은 시간은 다시 변환하지 않는다"""
+        last_date_time = None
+        epoch = 0
+        for item in records:
+            date_time = item["date_time"]
+            if date_time != last_date_time:
+                epoch = cls._to_epoch(date_time)
+                last_date_time = date_time
+            yield (epoch, item["kind"]), item
+
+    @staticmethod
+    def _is_time_ordered(records: Iterable[Dict[str, Any]]) -> bool:
+        """
+        (시간, 종류) 순서로 정렬되어 있는지 여부
+        고정 길이 ISO 형식 문자열은 사전 순서가 시간 순서와 같으므로 변환하지 않고 비교하며,
+        다른 형식이 있으면 정렬해서 확인하도록 False를 반환한다
+        """
+        last = None
+        for item in records:
+            date_time = item["date_time"]
+            if len(date_time) != 19 or date_time[10] != "T":
+                return False
+            key = (date_time, item["kind"])
+            if last is not None and key < last:
+                return False
+            last = key
+        return True
+
+    def format_metrics_log(self, metrics: Dict[str, Any]) -> None:
+        """
+        Format and output performance metrics to log
+        성과 지표를 로그로 출력합니다.
+
+        Args:
+            metrics: Performance metrics dictionary / 성과 지표 딕셔너리
+        """
+        if not metrics:
+            return
+        self.logger.info(
+            f"MDD {metrics['max_drawdown']} % ({metrics['max_drawdown_duration']} candles), "
+            f"Sharpe {metrics['sharpe']}, Sortino {metrics['sortino']}, CAGR {metrics['cagr']} %"
+        )
+        self.logger.info(
+            f"Exposure {metrics['exposure']} %, Turnover {metrics['turnover']}, "
+            f"Trades {metrics.get('trade_count', 0)}, Win rate {metrics.get('win_rate', 0.0)} %"
         )
-        return trading_table
 
     def format_summary_log(self, summary: Tuple) -> None:
         """
@@ -236,3 +339,44 @@ class ReportGenerator:
             self.logger.error("get return report FAIL")
             self.logger.error(err)
             return None
+
+
+class TradingTable(Sequence):
+    """
+    Trading Table
+    처음 읽을 때 만들어지는 거래 테이블
+
+    Keeps the source lists and their lengths at creation, the merged list is built only when
+    a caller reads the table.
+    만들 때의 각 리스트 길이를 기억하고 있다가 테이블을 처음 읽을 때 병합한 리스트를 만듭니다.
+    """
+
+    def __init__(self, report_generator: "ReportGenerator", *lists: Sequence[Dict[str, Any]]):
+        self.report_generator = report_generator
+        self.lists = lists
+        self.lengths = [len(records) for records in lists]
+        self.rows: Optional[List[Dict[str, Any]]] = None
+
+    def _get_rows(self) -> List[Dict[str, Any]]:
+        if self.rows is None:
+            self.rows = self.report_generator.create_trading_table(
+                *(records[:length] for records, length in zip(self.lists, self.lengths))
+            )
+        return self.rows
+
+    def __getitem__(self, index):
+        return self._get_rows()[index]
+
+    def __len__(self) -> int:
+        return sum(self.lengths)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._get_rows())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return self._get_rows() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._get_rows())
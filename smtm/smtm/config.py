@@ -15,6 +15,29 @@ class Config:
     # SimulationDualDataProvider의 데이터를 사용할지 여부: normal, dual
     simulation_data_provider_type = "normal"
     candle_interval = 60
+    # 시뮬레이션 캔들 캐시(CandleCache)의 메모리 상한(MB)
+    candle_cache_size_mb = 512
+    # 시뮬레이션 캔들 저장소 simulation_data_backend: sqlite, column(ColumnStore memmap)
+    simulation_data_backend = "sqlite"
+    # Analyzer 기록 저장소 analyzer_data_backend: list(dict 리스트), column(ColumnarDataRepository NumPy 컬럼)
+    analyzer_data_backend = "list"
+    # ColumnStore 파일 저장 경로
+    column_store_dir = "column_store"
+    # 1분봉 이외의 간격을 저장된 1분봉으로 만들어서 사용할지 여부 (CandleRollup)
+    candle_rollup = True
+    # 시뮬레이션 전체 구간의 지표를 미리 계산해서 전략이 캔들 인덱스로 읽을지 여부 (IndicatorCache)
+    indicator_precompute = True
+    # 사전 계산 지표(.npy) 저장 경로, 빈 문자열이면 메모리에만 보관
+    # 디스크 저장은 크기 제한 없이 쌓이므로 필요할 때만 경로를 지정 ex) "indicator_cache"
+    indicator_cache_dir = ""
+    # 사전 계산 지표 캐시의 메모리 상한(MB)
+    indicator_cache_size_mb = 256
+    # 시뮬레이션 가상 거래소에서 체결되지 않은 지정가 주문을 대기시킬지 여부 (OrderBook)
+    simulation_order_book = False
+    # 대기 주문 사용 시 캔들 거래량(acc_volume) 대비 체결 가능한 비율, 0이면 제한 없음
+    simulation_participation_rate = 0.0
+    # 대기 주문 사용 시 주문이 유지되는 최대 턴 수, 0이면 만료 없음
+    simulation_order_expire_turn = 0
     """
     스트림 핸들러의 레벨 levels of stream handlers
     CRITICAL  50
@@ -1,9 +1,10 @@
 import copy
 import os
 import json
-import time
+import queue
 import sys
-from multiprocessing import Pool, TimeoutError, current_process
+import time
+from multiprocessing import Pool, Queue, TimeoutError, current_process
 from datetime import datetime
 from datetime import timedelta
 import psutil
@@ -19,16 +20,32 @@ from ..trader.simulation_trader import SimulationTrader
 from ..date_converter import DateConverter
 from ..data.simulation_data_provider import SimulationDataProvider
 from ..data.simulation_dual_data_provider import SimulationDualDataProvider
+from ..data.candle_cache import CandleCache
+from ..data.coverage_map import CoverageMap
+from ..data.shared_candle_store import SharedCandleStore
+from .result_journal import ResultJournal
 
 
 class MassSimulator:
     """
     설정 파일을 사용하여 대량 시뮬레이션 진행하는 시뮬레이터
+
+    전체 구간의 캔들을 부모 프로세스에서 한 번 로딩해서 공유 메모리(SharedCandleStore)에 올리고,
+    워커 프로세스들은 작업 큐에서 구간을 하나씩 가져가서(work stealing) 공유 메모리의 뷰로 시뮬레이션한다.
+
+    Candles of all periods are loaded once in the parent into shared memory (SharedCandleStore),
+    workers pull one period at a time from a work queue and simulate on views of the shared arrays.
+
+    끝난 구간 결과는 바로 저널(ResultJournal)에 기록되며, resume으로 실행하면 저널에 있는 구간은 건너뛴다.
+    Finished periods are written to the journal at once, resume skips the periods already journaled.
     """
 
     RESULT_FILE_OUTPUT = "output/"
     CONFIG_FILE_OUTPUT = "output/generated_config.json"
     MIN_PRINT_STATE_SEC = 3
+    # 워커 프로세스에서 Pool initializer가 설정하는 작업 큐, 결과 큐
+    work_queue = None
+    result_queue = None
 
     def __init__(self):
         self.logger = LogManager.get_logger("MassSimulator")
@@ -37,6 +54,9 @@ class MassSimulator:
         self.last_print = 0
         self.config = {}
         self.analyzed_result = None
+        self.worker_stats = []
+        self.elapsed_sec = 0
+        self.journal = None
         LogManager.change_log_file("mass-simulation.log")
 
         if os.path.isdir("output") is False:
@@ -102,14 +122,14 @@ class MassSimulator:
             )
 
     @staticmethod
-    def run_single(operator):
+    def run_single(operator, stop_condition=None):
         """
         시뮬레이션 1회 실행
         Execute a single simulation
+
+        stop_condition: SimulationOperator.run_to_completion의 조기 종료 조건
         """
-        operator.start()
-        while operator.state == "running":
-            time.sleep(0.1)
+        operator.run_to_completion(stop_condition=stop_condition)
 
         last_report = (None, None, None, None)
 
@@ -123,12 +143,14 @@ class MassSimulator:
 
     @staticmethod
     def get_initialized_operator(
-        budget, strategy_code, interval, currency, start, end, tag
+        budget, strategy_code, interval, currency, start, end, tag, strategy_params=None, lean=False
     ):
         """
         주어진 설정 값으로 초기화된 SimulationOperator 반환
         Returns a SimulationOperator initialized with the given setting values.
 
+        strategy_params: 전략 객체에 적용할 파라미터 {속성 이름: 값}
+        lean: True이면 보고서 파일과 그래프 없이 요약 지표만 계산하는 Analyzer 사용
         """
         dt = DateConverter.to_end_min(
             start_iso=start, end_iso=end, interval_min=Config.candle_interval / 60
@@ -147,7 +169,7 @@ class MassSimulator:
             )
         data_provider.initialize_simulation(end=end, count=count)
 
-        strategy = StrategyFactory.create(strategy_code)
+        strategy = StrategyFactory.create(strategy_code, params=strategy_params)
         if strategy is None:
             raise UserWarning(f"Invalid Strategy! {strategy_code}")
 
@@ -155,7 +177,7 @@ class MassSimulator:
         trader = SimulationTrader(currency=currency, interval=Config.candle_interval)
         trader.initialize_simulation(end=end, count=count, budget=budget)
 
-        analyzer = Analyzer()
+        analyzer = Analyzer(lean=lean)
         analyzer.is_simulation = True
 
         operator = SimulationOperator(periodic_record_enable=False)
@@ -170,23 +192,45 @@ class MassSimulator:
         operator.set_interval(interval)
         return operator
 
-    def run(self, config_file, process=-1):
-        self.config = self._load_config(config_file)
-        process_num = process
-        if process_num < 1:
-            process_num = os.cpu_count()
+    @classmethod
+    def get_journal_path(cls, title):
+        """결과 저널 파일 경로를 반환 Return the result journal file path"""
+        return f"{cls.RESULT_FILE_OUTPUT}{title}.journal.jsonl"
+
+    def run(self, config_file, process=-1, resume=False, lean=False):
+        """
+        설정 파일의 모든 구간을 시뮬레이션
+        Simulate all periods of the config file
 
-        if process_num > len(self.config["period_list"]):
-            process_num = len(self.config["period_list"])
+        resume: True이면 결과 저널에 이미 있는 구간은 다시 시뮬레이션하지 않는다
+        lean: True이면 구간마다 보고서 파일과 그래프를 만들지 않고 요약 지표만 계산한다,
+            설정 파일의 "lean" 값으로도 지정할 수 있다
+        """
+        self.config = self._load_config(config_file)
+        lean = lean or self.config.get("lean", False)
+        self.result = [None for x in range(len(self.config["period_list"]))]
+        self.journal = ResultJournal(self.get_journal_path(self.config["title"]))
+        if resume:
+            for idx, result in self.journal.load(self.config["period_list"]).items():
+                self.result[idx] = result
 
-        # 시뮬레이션 준비
+        # 시뮬레이션 준비, 구간은 정적으로 나누지 않고 작업 큐로 전달한다
         config_list = []
         period_object_list = []
         for i in range(len(self.config["period_list"])):
+            if self.result[i] is not None:
+                continue
             period_object_list.append(
                 {"idx": i, "period": self.config["period_list"][i]}
             )
-        separated_periods = self.make_chunk(period_object_list, process_num)
+
+        process_num = process
+        if process_num < 1:
+            process_num = os.cpu_count()
+
+        if process_num > len(period_object_list):
+            process_num = len(period_object_list)
+
         for i in range(process_num):
             config_list.append(
                 {
@@ -196,22 +240,124 @@ class MassSimulator:
                     "interval": self.config["interval"],
                     "currency": self.config["currency"],
                     "partial_idx": i,
-                    "partial_period_list": separated_periods[i],
+                    "lean": lean,
                 }
             )
 
-        self.result = [None for x in range(len(self.config["period_list"]))]
         self.print_state(is_start=True)
-        self._execute_simulation(config_list, process_num)
+        if resume:
+            print(f"resume: {len(self.result) - len(period_object_list)} period(s) from journal")
+
+        if len(period_object_list) > 0:
+            store = self.load_shared_store(
+                self.config["currency"], [p["period"] for p in period_object_list]
+            )
+            self.journal.open(resume=resume)
+            try:
+                self._execute_simulation(config_list, process_num, period_object_list, store)
+            finally:
+                self.journal.close()
+                if store is not None:
+                    store.close()
 
         self.analyze_result(self.result, self.config)
         self.print_state(is_end=True)
+        self.print_worker_stats()
+
+    def analyze_journal(self, config_file):
+        """
+        시뮬레이션 없이 결과 저널에 있는 구간들로 결과 파일을 생성
+        Write the result file from the journaled periods without simulating
+
+        진행 중이거나 중단된 대량 시뮬레이션의 중간 결과를 확인할 때 사용한다
+        Returns: 저널에 있는 구간 수
+        """
+        self.config = self._load_config(config_file)
+        journal = ResultJournal(self.get_journal_path(self.config["title"]))
+        self.result = [None for x in range(len(self.config["period_list"]))]
+        loaded = journal.load(self.config["period_list"])
+        for idx, result in loaded.items():
+            self.result[idx] = result
+
+        if len(loaded) == 0:
+            print(f"no result in journal: {journal.path}")
+            return 0
 
-    def _execute_simulation(self, config_list, process_num):
+        self.analyze_result(self.result, self.config)
+        print(f"{len(loaded)} / {len(self.result)} period(s) analyzed")
+        return len(loaded)
+
+    @staticmethod
+    def get_candle_range(start, end):
+        """
+        구간 시뮬레이션에서 SimulationDataProvider와 VirtualMarket이 로딩하는 캔들 구간을 반환
+        Returns the candle range loaded by SimulationDataProvider and VirtualMarket for a period
+        """
+        interval_min = Config.candle_interval / 60
+        dt = DateConverter.to_end_min(start_iso=start, end_iso=end, interval_min=interval_min)
+        if dt is None:
+            raise UserWarning(f"Invalid Period! {start} ~ {end}")
+        end = dt[0][1]
+        end_dt = datetime.strptime(end, "%Y-%m-%dT%H:%M:%S")
+        start_dt = end_dt - timedelta(minutes=dt[0][2] * interval_min)
+        return (start_dt.strftime("%Y-%m-%dT%H:%M:%S"), end)
+
+    @staticmethod
+    def load_shared_store(currency, period_list):
+        """
+        모든 구간의 캔들을 한 번에 로딩해서 공유 메모리에 올린 SharedCandleStore를 반환
+        Load candles of all periods at once and return them as a SharedCandleStore
+
+        겹치거나 맞닿은 구간은 합쳐서 조회하며, dual 데이터 제공자는 지원하지 않아 None을 반환한다.
+        """
+        if Config.simulation_data_provider_type == "dual":
+            return None
+
+        data_provider = SimulationDataProvider(currency=currency, interval=Config.candle_interval)
+        ranges = CoverageMap(
+            [MassSimulator.get_candle_range(p["start"], p["end"]) for p in period_list]
+        )
+        data = []
+        for start, end in ranges:
+            data += data_provider.repo.get_data(start, end, market=data_provider.market)
+
+        store = SharedCandleStore.create(
+            Config.simulation_source,
+            data_provider.market,
+            Config.candle_interval,
+            data,
+            list(ranges),
+        )
+        print(f"shared candles: {len(store)}, {len(ranges)} range(s)")
+        return store
+
+    @staticmethod
+    def _init_worker(work_queue, result_queue, descriptor):
+        """워커 프로세스 초기화, 작업 큐와 결과 큐를 저장하고 공유 캔들에 연결"""
+        MassSimulator.work_queue = work_queue
+        MassSimulator.result_queue = result_queue
+        if descriptor is not None:
+            CandleCache.get_instance().set_store(SharedCandleStore.attach(descriptor))
+
+    def _execute_simulation(self, config_list, process_num, period_list, store=None):
         is_running = True
         result_list = []
         self.memory_usage()
-        with Pool(processes=process_num) as pool:
+        work_queue = Queue()
+        for period in period_list:
+            work_queue.put(period)
+        # 워커마다 하나씩 종료 표시
+        for _ in range(len(config_list)):
+            work_queue.put(None)
+
+        result_queue = Queue()
+        descriptor = store.get_descriptor() if store is not None else None
+        started = time.perf_counter()
+        with Pool(
+            processes=process_num,
+            initializer=MassSimulator._init_worker,
+            initargs=(work_queue, result_queue, descriptor),
+        ) as pool:
             try:
                 async_result = pool.map_async(
                     MassSimulator._execute_single_process_simulation, config_list
@@ -221,30 +367,86 @@ class MassSimulator:
                         result_list = async_result.get(timeout=0.5)
                         is_running = False
                     except TimeoutError:
+                        self._drain_result_queue(result_queue)
                         self.print_state()
 
+                self.elapsed_sec = time.perf_counter() - started
+                self.worker_stats = []
                 for result in result_list:
-                    self._update_result(result)
+                    self._update_result(result["result_list"])
+                    self.worker_stats.append(result)
             except KeyboardInterrupt:
+                self._drain_result_queue(result_queue)
                 print("Terminating...")
+                if self.journal is not None:
+                    print(f"finished periods are saved in {self.journal.path}, run again with resume")
 
         if is_running is True:
+            if self.journal is not None:
+                self.journal.close()
             sys.exit(0)
 
+    def _drain_result_queue(self, result_queue):
+        """워커가 보낸 구간 결과를 모두 꺼내서 반영 Apply all period results sent by workers"""
+        partial_result = []
+        while True:
+            try:
+                partial_result.append(result_queue.get_nowait())
+            except queue.Empty:
+                break
+        self._update_result(partial_result)
+
     def _update_result(self, partial_result):
         for result in partial_result:
             idx = result["idx"]
+            # 처음 받은 결과만 저널에 기록한다, 리포트가 없는 구간은 재개할 때 다시 실행한다
+            if self.journal is not None and self.result[idx] is None and result["result"] is not None:
+                self.journal.append(idx, self.config["period_list"][idx], result["result"])
             self.result[idx] = result["result"]
 
+    def print_worker_stats(self):
+        """
+        처리량(periods/sec)과 워커별 사용률을 화면에 출력
+        Print throughput (periods/sec) and per-worker utilization
+        """
+        total = sum(stat["count"] for stat in self.worker_stats)
+        elapsed = self.elapsed_sec if self.elapsed_sec > 0 else float("nan")
+        print("Worker Utilization =====================================")
+        print(f"throughput: {total / elapsed:.2f} periods/sec ({total} periods, {self.elapsed_sec:.2f} sec)")
+        for stat in self.worker_stats:
+            print(
+                f"{stat['worker']}: {stat['count']:5} periods, busy {stat['busy_sec']:.2f} sec, "
+                f"{stat['busy_sec'] / elapsed * 100:5.1f} %"
+            )
+        print("========================================================")
+
     @staticmethod
     def _execute_single_process_simulation(config):
+        """
+        작업 큐가 빌 때까지 구간을 가져와서 시뮬레이션 실행, partial_period_list가 있으면 그 구간만 실행
+        Pull periods from the work queue until it's drained, or run partial_period_list if it is given
+
+        Returns:
+        {
+            "partial_idx": 워커 번호
+            "worker": 프로세스 이름
+            "result_list": [{"idx": 구간 번호, "result": 결과}]
+            "count": 실행한 구간 수
+            "busy_sec": 시뮬레이션에 사용한 시간
+        }
+        """
         LogManager.set_stream_level(Config.operation_log_level)
         LogManager.change_log_file(f"mass-simulation-{config['partial_idx']}.log")
-        period_list = config["partial_period_list"]
+        period_list = config.get("partial_period_list")
+        if period_list is None:
+            period_list = iter(MassSimulator.work_queue.get, None)
         result_list = []
+        busy_sec = 0
         MassSimulator.memory_usage()
         print(f"partial simulation start @{current_process().name}")
         for period in period_list:
+            operator = None
+            started = time.perf_counter()
             try:
                 tag = f"MASS-{config['title']}-{period['idx']}"
                 operator = MassSimulator.get_initialized_operator(
@@ -255,16 +457,35 @@ class MassSimulator:
                     period["period"]["start"],
                     period["period"]["end"],
                     tag,
+                    lean=config.get("lean", False),
                 )
                 report = MassSimulator.run_single(operator)
                 result_list.append({"idx": period["idx"], "result": report})
-                print(f"     #{period['idx']} return: {report[2]}")
+                if MassSimulator.result_queue is not None:
+                    MassSimulator.result_queue.put(result_list[-1])
+                if report is None or report[2] is None:
+                    print(f"     #{period['idx']} no report")
+                else:
+                    print(f"     #{period['idx']} return: {report[2]}")
             except KeyboardInterrupt:
                 print(f"Terminating...@{current_process().name}")
                 if operator is not None:
                     operator.stop()
+            busy_sec += time.perf_counter() - started
 
-        return result_list
+        stats = CandleCache.get_instance().get_stats()
+        print(
+            f"candle cache @{current_process().name} "
+            f"hits: {stats['hits']}, misses: {stats['misses']}, "
+            f"evictions: {stats['evictions']}, {stats['bytes'] / 2**20:.1f} MB"
+        )
+        return {
+            "partial_idx": config["partial_idx"],
+            "worker": current_process().name,
+            "result_list": result_list,
+            "count": len(result_list),
+            "busy_sec": busy_sec,
+        }
 
     @staticmethod
     def _round(num):
@@ -282,7 +503,12 @@ class MassSimulator:
         final_return_list = []
         min_return_list = []
         max_return_list = []
-        for result in result_list:
+        index_list = []
+        for idx, result in enumerate(result_list):
+            # 아직 끝나지 않은 구간은 건너뛰고 구간 번호를 인덱스로 유지
+            if result is None:
+                continue
+            index_list.append(idx)
             final_return_list.append(result[2])
             min_return_list.append(result[6])
             max_return_list.append(result[7])
@@ -292,7 +518,8 @@ class MassSimulator:
                 "min_return": min_return_list,
                 "max_return": max_return_list,
                 "final_return": final_return_list,
-            }
+            },
+            index=index_list,
         )
         # 최종수익율
         df_final = dataframe.sort_values(by="final_return", ascending=False)
@@ -0,0 +1,85 @@
+import json
+import os
+from ..log_manager import LogManager
+
+
+class ResultJournal:
+    """
+    대량 시뮬레이션의 구간 결과를 끝나는 대로 한 줄씩 추가하는 JSONL 저널
+    JSONL journal appending each mass simulation period result as soon as it finishes
+
+    한 줄이 하나의 구간 결과이며 기록할 때마다 flush 하므로 중단되어도 완료된 구간은 남는다.
+    비정상 종료로 잘린 마지막 줄과 결과 요약이 없는 줄은 읽을 때 무시한다.
+
+    One line per period, flushed on every write so finished periods survive an interrupt.
+    A truncated last line left by a crash and lines without a result are ignored on load.
+
+    {"idx": 구간 번호, "start": 시작, "end": 종료, "result": 결과 요약}
+    """
+
+    def __init__(self, path):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.path = path
+        self.file = None
+
+    def load(self, period_list=None):
+        """
+        저널의 구간 결과를 {idx: result} 로 반환
+        Return the journaled results as {idx: result}
+
+        period_list가 주어지면 같은 idx의 시작, 종료가 다른 결과는 제외한다
+        """
+        results = {}
+        if not os.path.exists(self.path):
+            return results
+
+        with open(self.path, encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    self.logger.warning(f"skip broken journal line: {line[:80]}")
+                    continue
+
+                # 결과 요약이 없거나 형식이 다른 줄은 건너뛰어 해당 구간을 다시 실행하게 한다
+                try:
+                    idx = record["idx"]
+                    if period_list is not None:
+                        if idx >= len(period_list):
+                            continue
+                        period = period_list[idx]
+                        if (record["start"], record["end"]) != (period["start"], period["end"]):
+                            continue
+                    # JSON은 tuple을 list로 저장하므로 결과 요약의 tuple 형태로 되돌린다
+                    results[idx] = tuple(
+                        tuple(value) if isinstance(value, list) else value
+                        for value in record["result"]
+                    )
+                except (KeyError, TypeError):
+                    self.logger.warning(f"skip invalid journal line: {line[:80]}")
+        return results
+
+    def open(self, resume=False):
+        """저널을 쓰기 위해 연다, resume이 아니면 기존 내용을 지운다 Open, truncating unless resume"""
+        dirname = os.path.dirname(self.path)
+        if dirname != "" and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        self.file = open(self.path, "a" if resume else "w", encoding="utf-8")
+        if resume and self.file.tell() > 0:
+            with open(self.path, "rb") as journal_file:
+                journal_file.seek(-1, os.SEEK_END)
+                is_truncated = journal_file.read(1) != b"\n"
+            # 잘린 마지막 줄에 새 결과가 이어 붙지 않도록 줄을 바꾼다
+            if is_truncated:
+                self.file.write("\n")
+
+    def append(self, idx, period, result):
+        """구간 결과 하나를 기록 Write a single period result"""
+        record = {"idx": idx, "start": period["start"], "end": period["end"], "result": result}
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
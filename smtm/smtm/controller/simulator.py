@@ -23,6 +23,8 @@ class Simulator:
         from_dash_to="201220.170000-201220.180000",
         currency="BTC",
         fast=True,
+        batch=False,
+        lean=False,
     ):
         self.logger = LogManager.get_logger("Simulator")
         LogManager.set_stream_level(Config.operation_log_level)
@@ -36,6 +38,9 @@ class Simulator:
         self.need_init = True
         self.currency = currency
         self.fast = bool(fast)
+        self.batch = bool(batch)
+        # 보고서 파일과 그래프 없이 요약 지표만 계산
+        self.lean = bool(lean)
 
         start_end = from_dash_to.split("-")
         self.start_str = start_end[0]
@@ -97,7 +102,7 @@ class Simulator:
         )
         trader.initialize_simulation(end=end, count=count, budget=self.budget)
 
-        analyzer = Analyzer()
+        analyzer = Analyzer(lean=self.lean)
         analyzer.is_simulation = True
 
         self.operator.initialize(
@@ -148,6 +153,10 @@ class Simulator:
         self._print("Good Bye~")
 
     def run_single(self):
+        if self.batch:
+            self.run_batch()
+            return
+
         self.initialize()
         self.start()
 
@@ -179,6 +188,17 @@ class Simulator:
 
         self.terminate()
 
+    def run_batch(self):
+        """
+        Worker 스레드, 폴링, watchdog 없이 시뮬레이션을 끝까지 수행한다
+        Run the simulation to the end on the calling thread without polling or watchdog
+        """
+        self.initialize()
+        self.logger.info("Simulation start! (batch) ====================")
+        if self.operator.run_to_completion() is None:
+            self._print("Simulation finished without report")
+        self.terminate()
+
     def main(self):
         signal.signal(signal.SIGINT, self.stop)
         signal.signal(signal.SIGTERM, self.stop)
@@ -0,0 +1,421 @@
+"""
+업비트/바이낸스 과거 캔들 동시 다운로더
+Concurrent rate-limited historical candle downloader for Upbit and Binance
+
+사용 예)
+  python -m smtm.data.backfill --market KRW-BTC --market KRW-ETH --start 2024-01-01T00:00:00 --end 2025-01-01T00:00:00
+  python -m smtm.data.backfill --all-krw --start 2024-01-01T00:00:00 --end 2025-01-01T00:00:00 --workers 8
+  python -m smtm.data.backfill --source binance --market BTCUSDT --start 2024-01-01T00:00:00 --end 2024-02-01T00:00:00
+
+구간을 요청 단위(업비트 200개, 바이낸스 1000개)로 나눠 스레드 풀에서 동시에 가져오고,
+결과는 메인 스레드에서 여러 구간씩 한 트랜잭션으로 저장한다.
+완료된 구간은 backfill_ledger 테이블에 기록되어 중단 후 다시 실행하면 남은 구간만 가져온다.
+"""
+
+import argparse
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+import requests
+from ..log_manager import LogManager
+from ..date_converter import DateConverter
+from .database import Database
+from .data_repository import DataRepository
+
+
+class TokenBucket:
+    """
+    토큰 버킷 방식의 요청 속도 제한기
+    Token bucket rate limiter
+
+    rate 초당 충전되는 토큰 수, capacity 최대 토큰 수
+    서버가 알려주는 남은 요청 수로 토큰을 줄일 수 있다
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.paused_until = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        """토큰을 얻을 때까지 대기 Block until the tokens are available"""
+        while True:
+            with self.lock:
+                now = self.clock()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = max(self.paused_until - now, (tokens - self.tokens) / self.rate)
+            self.sleep(wait)
+
+    def limit_remaining(self, remaining):
+        """서버가 알려준 남은 요청 수 이하로 토큰을 맞춘다"""
+        with self.lock:
+            self._refill(self.clock())
+            self.tokens = min(self.tokens, max(remaining, 0))
+
+    def pause(self, seconds):
+        """seconds 동안 토큰 발급을 멈춘다 (429 응답 등)"""
+        with self.lock:
+            now = self.clock()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0
+            self.updated = now
+
+
+class Backfill:
+    """
+    과거 캔들 데이터를 동시에 내려받아 Database에 저장하는 다운로더
+    Downloader that fetches historical candles concurrently and stores them in Database
+
+    source: upbit, binance
+    interval: 캔들 간격(초), DataRepository와 같은 값을 지원
+    workers: 동시에 요청하는 스레드 수
+    batch_chunks: 한 트랜잭션으로 저장할 구간 수
+    base_url: 거래소 API 주소, 테스트용 로컬 서버로 바꿀 수 있음
+    """
+
+    UPBIT_URL = "https://api.upbit.com"
+    BINANCE_URL = "https://api.binance.com"
+    UPBIT_MAX_COUNT = 200
+    BINANCE_MAX_COUNT = 1000
+    # 업비트 시세 캔들 그룹 초당 요청 수
+    UPBIT_REQUEST_PER_SEC = 10
+    # 바이낸스 분당 weight 한도와 klines 요청 weight
+    BINANCE_WEIGHT_PER_MIN = 6000
+    BINANCE_KLINES_WEIGHT = 2
+    KST = timezone(timedelta(hours=9))
+
+    def __init__(
+        self,
+        source="upbit",
+        interval=60,
+        db_file=None,
+        workers=4,
+        batch_chunks=20,
+        base_url=None,
+        max_retry=5,
+        database=None,
+    ):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.database = database if database is not None else Database(db_file)
+        self.repo = DataRepository(interval=interval, source=source, database=self.database)
+        self.source = source
+        self.interval = interval
+        self.interval_min = interval // 60
+        self.workers = workers
+        self.batch_chunks = batch_chunks
+        self.max_retry = max_retry
+        self.session = requests.Session()
+        if source == "upbit":
+            self.url = f"{base_url or self.UPBIT_URL}/v1/candles/minutes/{self.interval_min}"
+            self.max_count = self.UPBIT_MAX_COUNT
+            self.cost = 1
+            self.bucket = TokenBucket(self.UPBIT_REQUEST_PER_SEC, self.UPBIT_REQUEST_PER_SEC)
+        else:
+            self.url = f"{base_url or self.BINANCE_URL}/api/v3/klines"
+            self.max_count = self.BINANCE_MAX_COUNT
+            self.cost = self.BINANCE_KLINES_WEIGHT
+            self.bucket = TokenBucket(
+                self.BINANCE_WEIGHT_PER_MIN / 60, self.BINANCE_WEIGHT_PER_MIN
+            )
+        self.request_count = 0
+        self.retry_count = 0
+        self.count_lock = threading.Lock()
+        self._create_ledger_table()
+
+    def _create_ledger_table(self):
+        """진행 기록 테이블 생성
+        source TEXT upbit, binance
+        market TEXT 거래 시장
+        period INT 캔들의 기간(초)
+        chunk_start INTEGER 구간 시작 epoch 초 (date_time을 UTC로 간주)
+        chunk_end INTEGER 구간 끝 epoch 초
+        count INT 저장한 캔들 수
+        """
+        self.database.conn.execute(
+            "CREATE TABLE IF NOT EXISTS backfill_ledger (source TEXT NOT NULL, market TEXT NOT NULL, period INT NOT NULL, chunk_start INTEGER NOT NULL, chunk_end INTEGER NOT NULL, count INT, PRIMARY KEY (source, market, period, chunk_start)) WITHOUT ROWID"
+        )
+        self.database.conn.commit()
+
+    def get_done_chunks(self, market):
+        """완료된 구간의 시작 epoch 집합을 반환"""
+        cursor = self.database.conn.execute(
+            "SELECT chunk_start FROM backfill_ledger WHERE source = ? AND market = ? AND period = ?",
+            (self.source, market, self.interval),
+        )
+        return {row["chunk_start"] for row in cursor.fetchall()}
+
+    def plan(self, market, start, end):
+        """
+        [start, end) 구간을 요청 단위로 나누고 완료되지 않은 구간만 반환
+        Returns: [(market, chunk_start, chunk_end, count), ...]
+        """
+        done = self.get_done_chunks(market)
+        chunks = DateConverter.to_end_min(
+            start_iso=start, end_iso=end, max_count=self.max_count, interval_min=self.interval_min
+        )
+        return [
+            (market, chunk[0], chunk[1], chunk[2])
+            for chunk in chunks or []
+            if Database.to_epoch(chunk[0]) not in done
+        ]
+
+    def run(self, markets, start, end):
+        """
+        markets의 [start, end) 구간을 내려받아 저장
+        Download and store [start, end) of the markets
+
+        Returns:
+        {
+            "chunks": 요청 대상 구간 수
+            "skipped": 진행 기록으로 건너뛴 구간 수
+            "failed": 실패한 구간 수, 다시 실행하면 재시도
+            "candles": 저장한 캔들 수
+            "requests": 서버 요청 수
+            "retries": 재시도 수
+            "elapsed": 소요 시간(초)
+        }
+        """
+        started = time.perf_counter()
+        start = DateConverter.floor_min(start, self.interval_min)
+        end = DateConverter.floor_min(end, self.interval_min)
+        total = DateConverter.to_end_min(
+            start_iso=start, end_iso=end, max_count=self.max_count, interval_min=self.interval_min
+        )
+        chunks = []
+        for market in markets:
+            chunks += self.plan(market, start, end)
+        skipped = len(total or []) * len(markets) - len(chunks)
+        self.logger.info(f"backfill {len(chunks)} chunks, skipped {skipped}")
+
+        pending = []
+        candle_count = 0
+        failed = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._fetch_chunk, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    pending.append((chunk, future.result()))
+                except UserWarning as err:
+                    self.logger.error(f"fail to fetch {chunk}: {err}")
+                    failed += 1
+                    continue
+
+                if len(pending) >= self.batch_chunks:
+                    candle_count += self._store(pending)
+                    pending = []
+        if len(pending) > 0:
+            candle_count += self._store(pending)
+
+        return {
+            "chunks": len(chunks),
+            "skipped": skipped,
+            "failed": failed,
+            "candles": candle_count,
+            "requests": self.request_count,
+            "retries": self.retry_count,
+            "elapsed": time.perf_counter() - started,
+        }
+
+    def _store(self, results):
+        """
+        여러 구간의 캔들과 진행 기록을 한 트랜잭션으로 저장
+        Database.update가 commit하므로 진행 기록은 그 전에 같은 연결에 추가한다
+        """
+        ledger = []
+        candles = []
+        for (market, start, end, _), data in results:
+            ledger.append(
+                (self.source, market, self.interval, Database.to_epoch(start), Database.to_epoch(end), len(data))
+            )
+            candles += data
+        self.database.conn.executemany(
+            "REPLACE INTO backfill_ledger (source, market, period, chunk_start, chunk_end, count) VALUES(?, ?, ?, ?, ?, ?)",
+            ledger,
+        )
+        DataRepository._convert_to_sqlite_datetime_string(candles)
+        self.database.update(candles, period=self.interval, is_upbit=self.source == "upbit")
+        self.logger.info(f"stored {len(results)} chunks, {len(candles)} candles")
+        return len(candles)
+
+    def _fetch_chunk(self, chunk):
+        """
+        한 구간을 가져와서 빈 캔들을 복구한 뒤 반환
+        거래가 전혀 없는 구간(상장 이전 등)은 빈 리스트를 반환
+        """
+        market, start, end, count = chunk
+        if self.source == "upbit":
+            query_string = {
+                "market": market,
+                "to": DateConverter.from_kst_to_utc_str(end) + "Z",
+                "count": count,
+            }
+            data = self._parse_upbit(self._request(query_string))
+        else:
+            start_ms = int(self._to_kst_dt(start).timestamp() * 1000)
+            end_ms = int(self._to_kst_dt(end).timestamp() * 1000) - 1
+            query_string = {
+                "symbol": market,
+                "startTime": start_ms,
+                "endTime": end_ms,
+                "limit": count,
+                "interval": f"{self.interval_min}m",
+            }
+            data = self._parse_binance(market, self._request(query_string))
+
+        data = [item for item in data if start <= item["date_time"] < end]
+        if len(data) == 0:
+            return []
+        data = self.repo._recovery_head(data[0], start, market) + data
+        return self.repo._recovery_broken_data(data, start, count, market)
+
+    def _request(self, query_string):
+        """
+        속도 제한에 맞춰 요청하고 응답 헤더로 남은 요청 수를 갱신
+        429 응답이나 연결 오류는 max_retry 만큼 재시도
+        """
+        for retry in range(self.max_retry + 1):
+            self.bucket.acquire(self.cost)
+            with self.count_lock:
+                self.request_count += 1
+                if retry > 0:
+                    self.retry_count += 1
+            try:
+                response = self.session.get(self.url, params=query_string, timeout=10)
+            except requests.exceptions.RequestException as error:
+                self.logger.warning(f"request error, retry {retry}: {error}")
+                self.bucket.pause(0.5 * (retry + 1))
+                continue
+
+            self._update_limit(response.headers)
+            if response.status_code == 429:
+                retry_after = float(response.headers.get("Retry-After", 1))
+                self.logger.warning(f"Too Many Requests, wait {retry_after} sec")
+                self.bucket.pause(retry_after)
+                continue
+
+            try:
+                response.raise_for_status()
+                return response.json()
+            except ValueError as error:
+                self.logger.error(f"Invalid data from server: {error}")
+                raise UserWarning("Fail get data from sever") from error
+            except requests.exceptions.HTTPError as error:
+                self.logger.error(error)
+                raise UserWarning(f"{error}") from error
+
+        raise UserWarning(f"Fail get data from sever after {self.max_retry} retries")
+
+    def _update_limit(self, headers):
+        if self.source == "upbit":
+            remaining = self.parse_upbit_remaining_req(headers.get("Remaining-Req"))
+            if remaining is not None:
+                self.bucket.limit_remaining(remaining)
+            return
+
+        used = headers.get("X-MBX-USED-WEIGHT-1M")
+        if used is not None:
+            self.bucket.limit_remaining(self.BINANCE_WEIGHT_PER_MIN - int(used))
+
+    @staticmethod
+    def parse_upbit_remaining_req(header):
+        """
+        업비트 Remaining-Req 헤더에서 현재 초의 남은 요청 수를 반환
+        e.g. "group=candles; min=1799; sec=9" -> 9
+        """
+        if header is None:
+            return None
+        matched = re.search(r"sec=(\d+)", header)
+        return int(matched.group(1)) if matched else None
+
+    def _to_kst_dt(self, date_time):
+        return DataRepository._convert_to_dt(date_time).replace(tzinfo=self.KST)
+
+    @staticmethod
+    def _parse_upbit(data):
+        data.reverse()
+        return [
+            {
+                "market": item["market"],
+                "date_time": item["candle_date_time_kst"],
+                "opening_price": float(item["opening_price"]),
+                "high_price": float(item["high_price"]),
+                "low_price": float(item["low_price"]),
+                "closing_price": float(item["trade_price"]),
+                "acc_price": float(item["candle_acc_trade_price"]),
+                "acc_volume": float(item["candle_acc_trade_volume"]),
+            }
+            for item in data
+        ]
+
+    @staticmethod
+    def _parse_binance(market, data):
+        return [
+            {
+                "market": market,
+                "date_time": DataRepository._get_kst_time_from_unix_time_ms(item[0]),
+                "opening_price": float(item[1]),
+                "high_price": float(item[2]),
+                "low_price": float(item[3]),
+                "closing_price": float(item[4]),
+                "acc_price": float(item[7]),
+                "acc_volume": float(item[5]),
+            }
+            for item in data
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill historical candles into smtm.db")
+    parser.add_argument("--source", default="upbit", choices=("upbit", "binance"))
+    parser.add_argument("--market", action="append", default=[], help="market, repeatable")
+    parser.add_argument("--all-krw", action="store_true", help="all upbit KRW markets")
+    parser.add_argument("--start", required=True, help="start, %%Y-%%m-%%dT%%H:%%M:%%S (KST)")
+    parser.add_argument("--end", default=None, help="end, %%Y-%%m-%%dT%%H:%%M:%%S (KST), default now")
+    parser.add_argument("--interval", type=int, default=60, help="candle interval seconds")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=20, help="chunks per transaction")
+    parser.add_argument("--db", default="smtm.db")
+    args = parser.parse_args()
+
+    markets = list(args.market)
+    if args.all_krw:
+        from .upbit_markets import load_krw_tickers
+
+        markets += [f"KRW-{ticker}" for ticker in load_krw_tickers()]
+    if len(markets) == 0:
+        parser.error("--market or --all-krw is required")
+
+    end = args.end or datetime.now().strftime("%Y-%m-%dT%H:%M:00")
+    backfill = Backfill(
+        source=args.source,
+        interval=args.interval,
+        db_file=args.db,
+        workers=args.workers,
+        batch_chunks=args.batch,
+    )
+    result = backfill.run(markets, args.start, end)
+    print(
+        f"chunks: {result['chunks']}, skipped: {result['skipped']}, failed: {result['failed']}, "
+        f"candles: {result['candles']}, requests: {result['requests']}, retries: {result['retries']}, "
+        f"{result['elapsed']:.1f}s"
+    )
+    return 1 if result["failed"] > 0 else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+from .data_provider import DataProvider
+from ..log_manager import LogManager
+
+
+class BroadcastDataProvider:
+    """
+    하나의 DataProvider 스트림을 여러 소비자에게 나눠 주는 클래스
+
+    Broadcasts one DataProvider stream to several consumers
+
+    create_view()로 만든 뷰마다 같은 순서의 거래 정보를 전달하며 원본 get_info는 턴마다 한 번만 호출한다
+    모든 뷰가 가져간 거래 정보는 버퍼에서 제거한다
+    뷰들은 같은 거래 정보 객체를 공유하므로 소비자는 전달받은 정보를 수정하면 안 된다
+
+    source: 원본 DataProvider, initialize_simulation은 호출하는 쪽에서 먼저 처리한다
+    """
+
+    def __init__(self, source):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.source = source
+        self.views = []
+        self.buffer = []
+        self.base_index = 0
+        self.is_finished = False
+
+    def create_view(self):
+        """원본 스트림을 처음부터 받는 새 뷰를 반환"""
+        if self.base_index > 0:
+            raise UserWarning("broadcast already started")
+        view = BroadcastDataProviderView(self)
+        self.views.append(view)
+        return view
+
+    def get_info_at(self, index):
+        """index 번째 거래 정보, 원본 데이터가 끝났으면 None"""
+        if index < self.base_index:
+            raise UserWarning(f"released info index: {index}")
+
+        while index >= self.base_index + len(self.buffer):
+            if self.is_finished:
+                return None
+            info = self.source.get_info()
+            if info is None:
+                self.is_finished = True
+                return None
+            self.buffer.append(info)
+
+        info = self.buffer[index - self.base_index]
+        self._release()
+        return info
+
+    def _release(self):
+        consumed = min(view.index for view in self.views) if len(self.views) > 0 else 0
+        count = consumed - self.base_index
+        if count > 0:
+            del self.buffer[:count]
+            self.base_index = consumed
+
+
+class BroadcastDataProviderView(DataProvider):
+    """BroadcastDataProvider의 소비자별 뷰, 원본 스트림의 거래 정보를 순서대로 전달한다"""
+
+    NAME = "BROADCAST DP VIEW"
+    CODE = "BCV"
+
+    def __init__(self, broadcast):
+        self.broadcast = broadcast
+        self.index = 0
+        # 원본이 전체 캔들을 제공하면 SimulationOperator의 지표 사전 계산에 그대로 사용
+        get_candles = getattr(broadcast.source, "get_candles", None)
+        if get_candles is not None:
+            self.get_candles = get_candles
+
+    def get_info(self):
+        now = self.index
+        self.index = now + 1
+        info = self.broadcast.get_info_at(now)
+        if info is None:
+            self.index = now
+        return info
@@ -0,0 +1,72 @@
+"""
+Candle Alignment
+마켓별 캔들 시간 정렬
+
+Aligns candle lists of several markets on one timeline so that index i is the same time in every market.
+A market without a trade in a period has no candle, so the gap is filled with a flat candle
+at the previous closing price and zero volume, and reported through the traded mask.
+여러 마켓의 캔들 리스트를 하나의 시간축에 맞춰 i번째 캔들이 모든 마켓에서 같은 시간이 되도록 합니다.
+거래가 없는 구간은 캔들이 없으므로 직전 종가의 거래량 0 캔들로 채우고 traded 마스크로 알려줍니다.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+def make_flat_candle(market: str, date_time: str, price: float) -> Dict[str, Any]:
+    """거래가 없는 구간을 채우는 가격 변동 없는 캔들"""
+    return {
+        "market": market,
+        "date_time": date_time,
+        "opening_price": price,
+        "high_price": price,
+        "low_price": price,
+        "closing_price": price,
+        "acc_price": 0.0,
+        "acc_volume": 0.0,
+    }
+
+
+def align_candles(
+    data: Dict[str, List[Dict[str, Any]]]
+) -> Tuple[List[str], Dict[str, List[Dict[str, Any]]], Dict[str, np.ndarray]]:
+    """
+    Align candle lists of markets on the union of their date_time
+    마켓별 캔들 리스트를 전체 date_time의 합집합에 맞춰 정렬합니다.
+
+    첫 캔들 이전 구간은 첫 캔들의 시가, 이후 빈 구간은 직전 종가로 채웁니다.
+    실제 캔들은 복사하지 않고 그대로 사용하므로 읽기 전용으로 다뤄야 합니다.
+
+    Args:
+        data: {market: date_time 오름차순 캔들 리스트}
+
+    Returns:
+        (date_time 리스트, {market: 정렬된 캔들 리스트}, {market: 실제 거래가 있는 캔들인지 bool 배열})
+    """
+    for market, candles in data.items():
+        if len(candles) == 0:
+            raise UserWarning(f"no candle data: {market}")
+
+    timeline = sorted({candle["date_time"] for candles in data.values() for candle in candles})
+    aligned = {}
+    traded = {}
+    for market, candles in data.items():
+        result = []
+        is_traded = np.zeros(len(timeline), dtype=bool)
+        pos = 0
+        price = candles[0]["opening_price"]
+        for idx, date_time in enumerate(timeline):
+            # 같은 시간의 중복 캔들은 건너뛴다
+            while pos < len(candles) and candles[pos]["date_time"] < date_time:
+                pos += 1
+            if pos < len(candles) and candles[pos]["date_time"] == date_time:
+                result.append(candles[pos])
+                price = candles[pos]["closing_price"]
+                is_traded[idx] = True
+                pos += 1
+            else:
+                result.append(make_flat_candle(market, date_time, price))
+        aligned[market] = result
+        traded[market] = is_traded
+    return timeline, aligned, traded
@@ -0,0 +1,143 @@
+import sys
+import threading
+from collections import OrderedDict
+from ..config import Config
+from ..log_manager import LogManager
+
+
+class CandleCache:
+    """
+    프로세스 단위로 공유되는 캔들 데이터 LRU 캐시
+    Process-level LRU cache of candle data shared by simulation consumers
+
+    (source, db, backend, market, interval, start, end)를 키로 DataRepository.get_data 결과를 보관하며
+    SimulationDataProvider와 VirtualMarket이 같은 구간을 한 번만 로딩하도록 한다.
+    캐시된 리스트와 캔들 dict는 여러 소비자가 공유하므로 읽기 전용으로 다뤄야 한다.
+    set_store로 SharedCandleStore가 지정되면 캐시 미스 때 저장소가 담고 있는 구간은 공유 메모리에서 가져온다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 제거한다.
+
+    Keeps DataRepository.get_data results keyed by (source, db, backend, market, interval, start, end).
+    Cached lists and candle dicts are shared, so consumers must treat them as read-only.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_bytes=None):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        if max_bytes is None:
+            max_bytes = Config.candle_cache_size_mb * 2**20
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.store = None
+        self.lock = threading.RLock()
+
+    @classmethod
+    def get_instance(cls):
+        """프로세스 공용 인스턴스를 반환 Return the process-wide instance"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @staticmethod
+    def make_key(repo, start, end, market):
+        """DataRepository 설정과 조회 구간으로 캐시 키를 만든다"""
+        source = "upbit" if repo.is_upbit else "binance"
+        db_file = getattr(repo.database, "db_file", None)
+        backend = getattr(repo, "backend", "sqlite")
+        return (source, db_file, backend, market, repo.interval, start, end)
+
+    @staticmethod
+    def estimate_size(data):
+        """캔들 리스트의 대략적인 메모리 크기(byte)를 첫 캔들 기준으로 추정"""
+        if not isinstance(data, list) or len(data) == 0:
+            return sys.getsizeof(data)
+
+        first = data[0]
+        item_size = sys.getsizeof(first)
+        if isinstance(first, dict):
+            item_size += sum(
+                sys.getsizeof(key) + sys.getsizeof(value) for key, value in first.items()
+            )
+        return sys.getsizeof(data) + item_size * len(data)
+
+    def get_data(self, repo, start, end, market):
+        """
+        캐시에 있으면 캐시된 데이터를, 없으면 repo.get_data로 로딩 후 저장하여 반환
+
+        Return cached candles, or load them with repo.get_data and keep them
+        """
+        key = self.make_key(repo, start, end, market)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+
+            self.misses += 1
+            store = self.store
+            if store is not None and store.covers(key[0], market, repo.interval, start, end):
+                data = store.get_data(start, end)
+            else:
+                data = repo.get_data(start, end, market=market)
+            self._put(key, data)
+            return data
+
+    def set_store(self, store):
+        """
+        캐시 미스 때 DataRepository 대신 사용할 SharedCandleStore를 지정, None이면 해제
+        Set the SharedCandleStore used on a miss before falling back to DataRepository
+        """
+        with self.lock:
+            self.store = store
+
+    def _put(self, key, data):
+        size = self.estimate_size(data)
+        if size > self.max_bytes:
+            self.logger.info(f"too big to cache: {size} bytes, {key}")
+            return
+
+        self.entries[key] = (data, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            self.evictions += 1
+
+    def get_stats(self):
+        """
+        캐시 통계 정보를 반환 Return cache statistics
+
+        Returns:
+        {
+            "hits": 캐시 적중 횟수
+            "misses": 캐시 미스 횟수 (= 실제 로딩 횟수)
+            "evictions": 용량 초과로 제거된 항목 수
+            "entries": 현재 항목 수
+            "bytes": 현재 추정 메모리 사용량
+            "max_bytes": 메모리 상한
+        }
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        """모든 항목과 통계를 초기화 Clear all entries and statistics"""
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
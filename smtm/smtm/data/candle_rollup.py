@@ -0,0 +1,108 @@
+import numpy as np
+from ..log_manager import LogManager
+
+
+class CandleRollup:
+    """
+    저장된 1분봉으로 상위 간격 캔들을 만들어 저장하는 클래스
+    Builds higher-timeframe candles from stored 1m candles
+
+    시가는 첫 분봉, 종가는 마지막 분봉, 고가/저가는 최대/최소, 거래 금액과 거래량은 합계를 사용한다.
+    분봉이 모두 있는 완전한 구간만 저장하며, 모든 분봉이 복구된 데이터일 때만 recovered=1 이다.
+    4시간봉은 거래소와 같이 UTC 00:00(KST 09:00) 기준으로 나눈다.
+
+    Open from the first minute, close from the last, high/low as max/min, volumes summed.
+    Only complete buckets are stored, recovered=1 only when every minute was recovered.
+    """
+
+    BASE_PERIOD = 60
+    PERIODS = (180, 300, 600, 900, 1800, 3600, 14400)
+    # date_time(KST)을 UTC로 간주한 epoch 기준, 거래소 캔들 경계인 UTC 00:00 = KST 09:00
+    KST_OFFSET = 9 * 3600
+
+    def __init__(self, database):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.database = database
+
+    @classmethod
+    def is_supported(cls, period):
+        return period in cls.PERIODS
+
+    @classmethod
+    def floor_epoch(cls, epoch, period):
+        """epoch를 period 캔들의 시작 시간으로 내림"""
+        offset = cls.KST_OFFSET % period
+        return (epoch - offset) // period * period + offset
+
+    def build(self, market, period, start_epoch, end_epoch, is_upbit=True):
+        """
+        [start_epoch, end_epoch) 구간의 period 캔들을 1분봉으로 만들어 저장
+        Build and store period candles of [start_epoch, end_epoch) from 1m candles
+
+        Returns: 저장한 캔들 수
+        """
+        if not self.is_supported(period):
+            raise UserWarning(f"not supported rollup period: {period}")
+
+        table = "upbit" if is_upbit is True else "binance"
+        cursor = self.database.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            f"SELECT ts_epoch, opening_price, high_price, low_price, closing_price, acc_price, acc_volume, recovered FROM {table} WHERE market = ? AND period = ? AND ts_epoch >= ? AND ts_epoch < ? ORDER BY ts_epoch ASC",
+            (market, self.BASE_PERIOD, start_epoch, end_epoch),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        if len(rows) == 0:
+            return 0
+
+        columns = np.array(rows, dtype=np.float64).T
+        ts_epoch = columns[0].astype(np.int64)
+        bucket = self.floor_epoch(ts_epoch, period)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+        ends = np.concatenate((starts[1:], [len(bucket)]))
+        complete = (ends - starts) == period // self.BASE_PERIOD
+
+        recovered = np.nan_to_num(columns[7], nan=0)
+        rollup = {
+            "ts_epoch": bucket[starts],
+            "opening_price": columns[1][starts],
+            "high_price": np.maximum.reduceat(columns[2], starts),
+            "low_price": np.minimum.reduceat(columns[3], starts),
+            "closing_price": columns[4][ends - 1],
+            "acc_price": np.add.reduceat(columns[5], starts),
+            "acc_volume": np.add.reduceat(columns[6], starts),
+            "recovered": np.minimum.reduceat(recovered, starts).astype(np.int64),
+        }
+        rollup = {key: value[complete].tolist() for key, value in rollup.items()}
+        date_times = (
+            np.array(rollup["ts_epoch"], dtype="datetime64[s]").astype(str).tolist()
+        )
+
+        data = [
+            {
+                "market": market,
+                "date_time": date_time.replace("T", " "),
+                "opening_price": opening_price,
+                "high_price": high_price,
+                "low_price": low_price,
+                "closing_price": closing_price,
+                "acc_price": acc_price,
+                "acc_volume": acc_volume,
+                "recovered": rec,
+            }
+            for date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume, rec in zip(
+                date_times,
+                rollup["opening_price"],
+                rollup["high_price"],
+                rollup["low_price"],
+                rollup["closing_price"],
+                rollup["acc_price"],
+                rollup["acc_volume"],
+                rollup["recovered"],
+            )
+        ]
+        if len(data) > 0:
+            self.database.update(data, period=period, is_upbit=is_upbit)
+        self.logger.info(f"rollup {market} {period}s: {len(data)} candles")
+        return len(data)
@@ -0,0 +1,204 @@
+import os
+import calendar
+from datetime import datetime
+import numpy as np
+from ..log_manager import LogManager
+
+
+class ColumnStore:
+    """
+    numpy.memmap 기반의 컬럼형 캔들 저장소
+    Columnar candle store opened with numpy.memmap
+
+    source/market/interval 마다 파일 하나를 사용하며, 파일은 헤더 뒤에 고정폭 컬럼이 순서대로 저장된다.
+    One file per source/market/interval, a fixed header followed by fixed-width columns.
+
+    | header 32 bytes | epoch int64[n] | opening_price float64[n] | ... | acc_volume float64[n] | recovered int8[n] |
+
+    epoch는 date_time 문자열(KST)을 UTC로 간주한 초 단위 값이며 오름차순으로 저장되어 이진 탐색으로 구간을 자른다.
+    epoch is the date_time string (KST) read as UTC seconds, stored ascending and sliced by binary search.
+    """
+
+    MAGIC = b"SMTMCOL1"
+    HEADER_SIZE = 32
+    PRICE_FIELDS = (
+        "opening_price",
+        "high_price",
+        "low_price",
+        "closing_price",
+        "acc_price",
+        "acc_volume",
+    )
+    COLUMNS = (("epoch", np.int64),) + tuple((name, np.float64) for name in PRICE_FIELDS) + (
+        ("recovered", np.int8),
+    )
+
+    def __init__(self, root_dir="column_store"):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.root_dir = root_dir
+        self.opened = {}
+
+    def get_path(self, source, market, interval):
+        """저장 파일 경로를 반환 Return the file path of the store"""
+        return os.path.join(self.root_dir, source, f"{market}_{interval}.col")
+
+    @staticmethod
+    def to_epoch(date_time):
+        """'YYYY-MM-DDTHH:MM:SS' 또는 'YYYY-MM-DD HH:MM:SS' 문자열을 epoch 초로 변환"""
+        return calendar.timegm(datetime.fromisoformat(date_time).timetuple())
+
+    @staticmethod
+    def to_date_time(epoch):
+        """epoch 배열을 'YYYY-MM-DDTHH:MM:SS' 문자열 배열로 변환"""
+        return np.asarray(epoch, dtype="int64").astype("datetime64[s]").astype(str)
+
+    def open(self, source, market, interval):
+        """
+        컬럼들을 읽기 전용 memmap으로 열어 반환, 파일이 없으면 None
+        Open the columns as read-only memmaps, None if the file does not exist
+
+        Returns: {"epoch": np.memmap, "opening_price": np.memmap, ...}
+        """
+        path = self.get_path(source, market, interval)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        cached = self.opened.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, "rb") as f:
+            header = f.read(self.HEADER_SIZE)
+        if header[:8] != self.MAGIC:
+            raise UserWarning(f"invalid column store file: {path}")
+        count = int(np.frombuffer(header, dtype=np.int64, count=1, offset=8)[0])
+
+        columns = {}
+        offset = self.HEADER_SIZE
+        for name, dtype in self.COLUMNS:
+            if count == 0:
+                columns[name] = np.empty(0, dtype=dtype)
+            else:
+                columns[name] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+            offset += np.dtype(dtype).itemsize * count
+
+        self.opened[path] = (mtime, columns)
+        return columns
+
+    def get_columns(self, source, market, interval, start, end):
+        """
+        [start, end) 구간의 컬럼 뷰를 복사 없이 반환, 저장소가 없으면 None
+        Return zero-copy column views of [start, end), None if there is no store
+        """
+        columns = self.open(source, market, interval)
+        if columns is None:
+            return None
+
+        epoch = columns["epoch"]
+        lo = int(np.searchsorted(epoch, self.to_epoch(start), side="left"))
+        hi = int(np.searchsorted(epoch, self.to_epoch(end), side="left"))
+        return {name: column[lo:hi] for name, column in columns.items()}
+
+    def get_data(self, source, market, interval, start, end):
+        """
+        [start, end) 구간의 캔들을 DataRepository.get_data와 같은 dict 리스트로 반환
+        Return candles of [start, end) as the same list of dict as DataRepository.get_data
+        """
+        columns = self.get_columns(source, market, interval, start, end)
+        if columns is None:
+            return None
+
+        return self.to_candles(columns, market, interval)
+
+    @classmethod
+    def to_candles(cls, columns, market, interval):
+        """
+        컬럼 dict를 DataRepository.get_data와 같은 캔들 dict 리스트로 변환
+        Convert a dict of columns to the candle dict list of DataRepository.get_data
+        """
+        date_times = cls.to_date_time(columns["epoch"]).tolist()
+        prices = [columns[name].tolist() for name in cls.PRICE_FIELDS]
+        recovered = columns["recovered"].tolist()
+        return [
+            {
+                "market": market,
+                "date_time": date_time,
+                "opening_price": opening_price,
+                "high_price": high_price,
+                "low_price": low_price,
+                "closing_price": closing_price,
+                "acc_price": acc_price,
+                "acc_volume": acc_volume,
+                "period": interval,
+                "recovered": rec,
+            }
+            for date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume, rec in zip(
+                date_times, *prices, recovered
+            )
+        ]
+
+    def write(self, source, market, interval, columns):
+        """
+        컬럼 배열을 epoch 순으로 정렬, 중복 제거 후 파일로 저장 (기존 파일은 교체)
+        Sort by epoch, drop duplicates and write the columns, replacing the existing file
+
+        columns: {"epoch": array, "opening_price": array, ..., "recovered": array(optional)}
+        Returns: 저장된 캔들 수
+        """
+        epoch = np.asarray(columns["epoch"], dtype=np.int64)
+        epoch, index = np.unique(epoch, return_index=True)
+        count = len(epoch)
+
+        path = self.get_path(source, market, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            header = self.MAGIC + np.array([count], dtype=np.int64).tobytes()
+            f.write(header.ljust(self.HEADER_SIZE, b"\0"))
+            for name, dtype in self.COLUMNS:
+                if name == "epoch":
+                    values = epoch
+                elif name == "recovered" and name not in columns:
+                    values = np.zeros(count, dtype=dtype)
+                else:
+                    values = np.asarray(columns[name], dtype=dtype)[index]
+                f.write(values.tobytes())
+        os.replace(tmp_path, path)
+        self.opened.pop(path, None)
+        self.logger.info(f"column store written: {path}, {count}")
+        return count
+
+    def import_from_database(self, database, market, interval=60, is_upbit=True):
+        """
+        SQLite upbit/binance 테이블의 market, interval 데이터를 컬럼 저장소로 가져온다
+        Import the market/interval rows of the SQLite upbit/binance table
+
+        Returns: 가져온 캔들 수
+        """
+        table = "upbit" if is_upbit is True else "binance"
+        columns = ("ts_epoch",) + self.PRICE_FIELDS + ("recovered",)
+        # dict_factory를 거치지 않도록 tuple 커서를 사용
+        cursor = database.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            f"SELECT {', '.join(columns)} FROM {table} WHERE market = ? AND period = ? ORDER BY ts_epoch ASC",
+            (market, interval),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+
+        if len(rows) == 0:
+            values = [[] for _ in columns]
+        else:
+            values = list(zip(*rows))
+        data = {
+            "epoch": np.array(values[0], dtype=np.int64),
+            "recovered": np.array([rec or 0 for rec in values[-1]], dtype=np.int8),
+        }
+        for name, column in zip(self.PRICE_FIELDS, values[1:-1]):
+            data[name] = np.array(column, dtype=np.float64)
+
+        source = "upbit" if is_upbit is True else "binance"
+        return self.write(source, market, interval, data)
@@ -0,0 +1,59 @@
+from bisect import bisect_left, bisect_right
+
+
+class CoverageMap:
+    """
+    저장된 캔들 구간을 나타내는 정렬된 반개구간 [start, end) 집합
+    Sorted set of half-open [start, end) ranges of stored candles
+
+    겹치거나 맞닿은 구간은 하나로 합쳐지며, 조회는 이진 탐색으로 O(log n)에 시작 위치를 찾는다.
+    Overlapping or adjacent ranges are merged, lookups start with an O(log n) binary search.
+    """
+
+    def __init__(self, ranges=()):
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(ranges):
+            self.add(start, end)
+
+    def __iter__(self):
+        return iter(zip(self.starts, self.ends))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, start, end):
+        """
+        구간을 추가하고 합쳐진 결과를 반환
+        Add a range and return the merge result
+
+        Returns: (합쳐지면서 없어진 기존 구간의 start 리스트, 합쳐진 (start, end))
+        """
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        removed = self.starts[lo:hi]
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+        return removed, (start, end)
+
+    def missing(self, start, end):
+        """[start, end) 중 저장되지 않은 구간 리스트를 반환 Return the uncovered sub-ranges"""
+        result = []
+        cursor = start
+        idx = bisect_right(self.ends, start)
+        while idx < len(self.starts) and self.starts[idx] < end:
+            if self.starts[idx] > cursor:
+                result.append((cursor, self.starts[idx]))
+            cursor = max(cursor, self.ends[idx])
+            idx += 1
+        if cursor < end:
+            result.append((cursor, end))
+        return result
+
+    def covers(self, start, end):
+        """[start, end)가 모두 저장되어 있는지 여부 Whether the whole range is covered"""
+        idx = bisect_right(self.starts, start) - 1
+        return idx >= 0 and self.ends[idx] >= end
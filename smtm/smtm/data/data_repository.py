@@ -1,10 +1,14 @@
 import copy
 import time
 from datetime import datetime, timedelta, timezone
+import numpy as np
 import requests
 from ..log_manager import LogManager
 from ..date_converter import DateConverter
+from ..config import Config
 from .database import Database
+from .column_store import ColumnStore
+from .candle_rollup import CandleRollup
 
 
 class DataRepository:
@@ -14,9 +18,18 @@ class DataRepository:
 
     DataRepository class to fetch, store, and serve transaction data from the exchange service
     Allows you to select Ubit and Binance data in Config
+
+    backend가 column이면 ColumnStore에서 먼저 조회하고, 구간이 모두 있을 때만 바로 반환한다.
+    If backend is column, read from ColumnStore first and return it when the whole range exists.
+
+    rollup이 켜져 있으면 1분봉 이외의 간격(CandleRollup.PERIODS)은 서버에서 받지 않고
+    저장된 1분봉으로 만들어서 제공한다.
+    With rollup on, intervals other than 1m (CandleRollup.PERIODS) are built from stored 1m candles.
     """
 
-    def __init__(self, db_file=None, interval=60, source="upbit", database=None):
+    def __init__(
+        self, db_file=None, interval=60, source="upbit", database=None, backend=None, rollup=None
+    ):
         self.logger = LogManager.get_logger(__class__.__name__)
         target_db_file = db_file if db_file is not None else "smtm.db"
         if database is not None:
@@ -26,7 +39,17 @@ class DataRepository:
         self.interval = interval
         self.interval_min = interval // 60
         self.is_upbit = True
-        if source == "upbit":
+        use_rollup = rollup if rollup is not None else Config.candle_rollup
+        self.rollup = None
+        self.minute_repo = None
+        if use_rollup and CandleRollup.is_supported(interval):
+            self.rollup = CandleRollup(self.database)
+            self.minute_repo = DataRepository(
+                interval=60, source=source, database=self.database, backend=backend, rollup=False
+            )
+            self.url = self.minute_repo.url
+            self.is_upbit = self.minute_repo.is_upbit
+        elif source == "upbit":
             if interval == 60:
                 self.url = "https://api.upbit.com/v1/candles/minutes/1"
             elif interval == 180:
@@ -45,6 +68,15 @@ class DataRepository:
         else:
             raise UserWarning(f"not supported simulation data: {source}")
 
+        self.source = source
+        self.backend = backend if backend is not None else Config.simulation_data_backend
+        if self.backend == "column":
+            self.column_store = ColumnStore(Config.column_store_dir)
+        elif self.backend == "sqlite":
+            self.column_store = None
+        else:
+            raise UserWarning(f"not supported data backend: {self.backend}")
+
     def get_data(self, start, end, market="KRW-BTC"):
         """
         거래 데이터를 제공
@@ -56,28 +88,85 @@ class DataRepository:
         Retrieve data from the database and return the result
         If there is no data in the database, fetch the data from the server and return it
         Update the database with the data fetched from the server
+
+        데이터베이스의 coverage로 빠진 구간을 계산해서 그 구간만 서버에서 가져온다
+        Only the sub-ranges missing from the database coverage are fetched from the server
         """
         self.logger.info(f"get data from repo: {start} to {end}, {market}")
+        if self.rollup is not None:
+            return self._get_rollup_data(start, end, market)
+
         target_start = DateConverter.floor_min(start, self.interval_min)
         target_end = DateConverter.floor_min(end, self.interval_min)
         count_info = DateConverter.to_end_min(
             start_iso=target_start, end_iso=target_end, interval_min=self.interval_min
         )
         total_count = count_info[0][2]
-        db_data = self._query(target_start, target_end, market)
+        if self.column_store is not None:
+            column_data = self.column_store.get_data(
+                self.source, market, self.interval, target_start, target_end
+            )
+            if column_data is not None and len(column_data) == total_count:
+                self.logger.info(f"from column store: {total_count}")
+                return column_data
 
-        self.logger.info(f"total vs database: {total_count} vs {len(db_data)}")
-        if len(db_data) > total_count:
-            raise UserWarning("Something wrong in DB")
+        missing = self.database.get_missing_ranges(
+            target_start, target_end, market, period=self.interval, is_upbit=self.is_upbit
+        )
+        if len(missing) == 0:
+            db_data = self._query(target_start, target_end, market)
+            self.logger.info(f"total vs database: {total_count} vs {len(db_data)}")
+            if len(db_data) > total_count:
+                raise UserWarning("Something wrong in DB")
 
-        if total_count == len(db_data):
-            self.logger.info(f"from database: {total_count}")
             self._convert_to_iso_datetime_string(db_data)
             return db_data
 
-        server_data = self._fetch_from_server(target_start, target_end, market)
-        self._convert_to_iso_datetime_string(server_data)
-        return server_data
+        # 저장된 구간은 데이터베이스에서, 빠진 구간만 서버에서 가져와서 시간 순서대로 합친다
+        result = []
+        current = target_start
+        for missing_start, missing_end in missing:
+            if current < missing_start:
+                result += self._query(current, missing_start, market)
+            self.logger.info(f"fetch missing range: {missing_start} to {missing_end}")
+            result += self._fetch_from_server(missing_start, missing_end, market)
+            current = missing_end
+        if current < target_end:
+            result += self._query(current, target_end, market)
+
+        self._convert_to_iso_datetime_string(result)
+        return result
+
+    def _get_rollup_data(self, start, end, market):
+        """
+        상위 간격 캔들을 제공, 저장되지 않은 구간만 1분봉을 확보한 뒤 만들어서 저장한다
+        Provide higher-timeframe candles, building only the ranges that are not stored yet
+        """
+        start_epoch = CandleRollup.floor_epoch(Database.to_epoch(start), self.interval)
+        end_epoch = CandleRollup.floor_epoch(Database.to_epoch(end), self.interval)
+        target_start = Database.to_iso_string(start_epoch)
+        target_end = Database.to_iso_string(end_epoch)
+        if start_epoch >= end_epoch:
+            return []
+
+        missing = self.database.get_missing_ranges(
+            target_start, target_end, market, period=self.interval, is_upbit=self.is_upbit
+        )
+        for missing_start, missing_end in missing:
+            self.logger.info(f"rollup missing range: {missing_start} to {missing_end}")
+            # 1분봉도 빠진 구간만 서버에서 가져와서 저장된다
+            self.minute_repo.get_data(missing_start, missing_end, market=market)
+            self.rollup.build(
+                market,
+                self.interval,
+                Database.to_epoch(missing_start),
+                Database.to_epoch(missing_end),
+                is_upbit=self.is_upbit,
+            )
+
+        data = self._query(target_start, target_end, market)
+        self._convert_to_iso_datetime_string(data)
+        return data
 
     @staticmethod
     def _convert_to_iso_datetime_string(data_list):
@@ -187,9 +276,7 @@ class DataRepository:
         Fetch 1000 more and copy it backwards to fill up to the start
         Not a problem with Upbit
         """
-        new_data = []
-        broken_count = 0
-
+        tail = []
         # 데이터가 하나도 없는 경우 앞부분 데이터를 채워줄 1000개 데이터를 추가로 가져옴
         if len(fetch_data) == 0:
             new_start = self._convert_to_string(
@@ -203,31 +290,53 @@ class DataRepository:
             )
             if len(recovery_data) == 0:
                 raise UserWarning(f"critical error in binance data recovery process")
-            new_data.append(copy.deepcopy(recovery_data[0]))
+            anchor = recovery_data[0]
+            tail.append(dict(anchor))
         else:
-            new_data.append(copy.deepcopy(fetch_data[0]))
-
-        # 시작부분까지 데이터를 복사해서 채워줌
-        while True:
-            current_dt = self._convert_to_dt(new_data[0]["date_time"])
-            start_dt = self._convert_to_dt(start)
-            delta = current_dt - start_dt
-            if delta.total_seconds() > 0:
-                recovery_item = copy.deepcopy(new_data[0])
-                current_dt = current_dt - timedelta(seconds=self.interval)
-                current_datetime = self._convert_to_string(current_dt)
-                recovery_item["date_time"] = current_datetime
-                recovery_item["recovered"] = 1
-                new_data.insert(0, recovery_item)
-                self._report_broken_block(current_datetime, market)
-                broken_count += 1
-            else:
-                break
+            anchor = fetch_data[0]
 
-        if broken_count > 0:
-            self.logger.info(f"Recovered broken head data: {broken_count}")
+        head = self._recovery_head(anchor, start, market)
+        if len(head) > 0:
+            self.logger.info(f"Recovered broken head data: {len(head)}")
+
+        return head + tail + fetch_data
+
+    def _recovery_head(self, anchor, start, market):
+        """
+        start부터 anchor 캔들 직전까지 anchor를 복사한 복구 캔들 리스트를 반환
+        Return recovered candles copied from anchor, from start up to just before anchor
+        """
+        start_epoch = self._to_epoch_array([start])[0]
+        anchor_epoch = self._to_epoch_array([anchor["date_time"]])[0]
+        grid = np.arange(start_epoch, anchor_epoch, self.interval, dtype=np.int64)
+        if len(grid) == 0:
+            return []
+
+        self._report_broken_block(self._to_iso_strings(grid[:1])[0], market, len(grid))
+        return [self._make_recovery_item(anchor, date_time) for date_time in self._to_iso_strings(grid)]
+
+    @staticmethod
+    def _to_epoch_array(date_time_list):
+        """'YYYY-MM-DDTHH:MM:SS' 또는 'YYYY-MM-DD HH:MM:SS' 문자열 리스트를 epoch 초 배열로 변환"""
+        return np.array(date_time_list, dtype="datetime64[s]").astype(np.int64)
+
+    @staticmethod
+    def _to_iso_strings(epochs):
+        """epoch 초 배열을 'YYYY-MM-DDTHH:MM:SS' 문자열 리스트로 변환"""
+        return np.asarray(epochs, dtype=np.int64).astype("datetime64[s]").astype(str).tolist()
 
-        return new_data + fetch_data
+    @staticmethod
+    def _make_recovery_item(source, date_time):
+        """
+        거래가 없던 시간의 복구 캔들, 가격은 source를 그대로 쓰고 거래량과 거래 금액은 0
+        Recovered candle for a time without trades, prices from source and zero volume
+        """
+        item = dict(source)
+        item["date_time"] = date_time
+        item["acc_price"] = 0.0
+        item["acc_volume"] = 0.0
+        item["recovered"] = 1
+        return item
 
     @staticmethod
     def _get_kst_time_from_unix_time_ms(unix_time_ms):
@@ -321,55 +430,42 @@ class DataRepository:
     def _recovery_broken_data(self, data, start, count, market):
         """
         서버에서 가져온 데이터가 중간에 거래 데이터가 없는 경우 바로 앞의 데이터를 복사해서 채워준다
+        시작 시간부터 count개의 시간 격자에 한 번에 맞추며, 격자마다 그 시간 이전의 마지막 데이터를 사용한다
+        복구된 캔들은 거래량과 거래 금액이 0이고, 깨진 구간은 연속 구간 단위로 한 번씩 보고한다
 
         If the data fetched from the server does not have transaction data in the middle, copy the previous data and fill it
+        The data is reindexed onto the count-long time grid from start in one pass
+        Recovered candles have zero volume, and broken blocks are reported once per consecutive block
         """
-        new_data = []
-        current_dt = self._convert_to_dt(start)
-        current_datetime = start
-        last_item = None
-        idx = 0
-        broken_count = 0
-        while len(new_data) < count:
-            if len(data) <= idx:
-                # 주어진 데이터에 유효한 데이터가 부족한 경우 마지막 데이터로 채울 수 있게 조정
-                item_dt = self._convert_to_dt("2099-01-01T00:00:00")
-            else:
-                item_dt = self._convert_to_dt(data[idx]["date_time"])
-            delta = current_dt - item_dt
-
-            if delta.total_seconds() > 0:
-                # 기준보다 과거의 데이터 저장, 첫 데이터가 깨진 경우 사용
-                self.logger.debug(f"pass data: {idx}")
-                last_item = copy.deepcopy(data[idx])
-                idx += 1
-                continue
-
-            if delta.total_seconds() == 0:
-                # 일치하는 데이터 복사
-                new_data.append(copy.deepcopy(data[idx]))
-                last_item = copy.deepcopy(data[idx])
-                idx += 1
-            else:
-                # 일치할때까지 저장된 과거의 데이터로 채움
-                if last_item is None:
-                    raise UserWarning("something wrong in recovery data")
-
-                recovery_item = copy.deepcopy(last_item)
-                recovery_item["date_time"] = current_datetime
-                recovery_item["recovered"] = 1
-                new_data.append(recovery_item)
-                self._report_broken_block(current_datetime, market)
-                broken_count += 1
-
-            current_dt = current_dt + timedelta(seconds=self.interval)
-            current_datetime = self._convert_to_string(current_dt)
+        grid = self._to_epoch_array([start])[0] + self.interval * np.arange(count, dtype=np.int64)
+        if len(data) == 0:
+            raise UserWarning("something wrong in recovery data")
+
+        epochs = self._to_epoch_array([item["date_time"] for item in data])
+        source_idx = np.searchsorted(epochs, grid, side="right") - 1
+        if source_idx[0] < 0:
+            raise UserWarning("something wrong in recovery data")
+
+        broken = epochs[source_idx] != grid
+        date_times = self._to_iso_strings(grid)
+        new_data = [
+            self._make_recovery_item(data[idx], date_time) if is_broken else dict(data[idx])
+            for idx, is_broken, date_time in zip(source_idx.tolist(), broken.tolist(), date_times)
+        ]
+
+        broken_count = int(broken.sum())
         if broken_count > 0:
+            # 연속된 깨진 구간의 시작 위치와 길이
+            edges = np.diff(np.concatenate(([0], broken.astype(np.int8), [0])))
+            block_starts = np.flatnonzero(edges == 1)
+            block_ends = np.flatnonzero(edges == -1)
+            for block_start, block_end in zip(block_starts.tolist(), block_ends.tolist()):
+                self._report_broken_block(date_times[block_start], market, block_end - block_start)
             self.logger.info(f"Recovered broken data: {broken_count}")
         return new_data
 
-    def _report_broken_block(self, dt, market):
-        self.logger.error(f"Broken data {dt}, {market}, {self.interval}")
+    def _report_broken_block(self, dt, market, count=1):
+        self.logger.error(f"Broken data {dt}, {market}, {self.interval}, count: {count}")
 
     def _fetch_from_upbit_up_to_200(self, end, count, market):
         result = None
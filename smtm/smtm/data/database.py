@@ -1,15 +1,37 @@
 import sqlite3
+import calendar
+from datetime import datetime, timezone
 from ..log_manager import LogManager
+from .coverage_map import CoverageMap
 
 
 class Database:
     """
     과거 거래 데이터의 데이터 베이스 클래스
     Database class for past trading data
+
+    이전 버전 스키마의 DB 파일은 생성 시 자동으로 현재 버전(SCHEMA_VERSION)으로 마이그레이션된다.
+    A DB file with an older schema is migrated to SCHEMA_VERSION when opened.
     """
 
+    # PRAGMA user_version 으로 관리하는 스키마 버전
+    # 1: TEXT id PRIMARY KEY (60S-YYYY-MM-DD HH:MM:SS)
+    # 2: (market, period, ts_epoch) PRIMARY KEY, WITHOUT ROWID
+    # 3: 저장된 구간을 기록하는 coverage 테이블 추가
+    SCHEMA_VERSION = 3
+    TABLES = ("upbit", "binance")
+    COLUMNS = "market TEXT NOT NULL, period INT NOT NULL, ts_epoch INTEGER NOT NULL, recovered INT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT"
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA mmap_size=268435456",
+    )
+
     def __init__(self, db_file=None):
         db = db_file if db_file is not None else "smtm.db"
+        self.db_file = db
         self.logger = LogManager.get_logger(__class__.__name__)
         self.conn = sqlite3.connect(db, check_same_thread=False, timeout=30.0)
 
@@ -22,21 +44,65 @@ class Database:
         self.conn.row_factory = dict_factory
 
         self.cursor = self.conn.cursor()
+        self.coverage_maps = {}
+        self._apply_pragmas()
         self.create_table()
 
     def __del__(self):
         self.conn.close()
 
+    @staticmethod
+    def to_iso_string(epoch):
+        """epoch 초를 'YYYY-MM-DDTHH:MM:SS' 문자열로 변환, to_epoch의 역변환"""
+        return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+    @staticmethod
+    def to_epoch(date_time):
+        """
+        'YYYY-MM-DD HH:MM:SS' 또는 'YYYY-MM-DDTHH:MM:SS' 문자열을 UTC로 간주한 epoch 초로 변환
+        SQLite의 strftime('%s', date_time)과 같은 값
+        """
+        return calendar.timegm(datetime.fromisoformat(date_time).timetuple())
+
+    def _apply_pragmas(self):
+        for pragma in self.PRAGMAS:
+            self.cursor.execute(pragma)
+
     def create_table(self):
-        self._create_upbit_table()
-        self._create_binance_table()
+        """
+        테이블을 생성하고 이전 버전 스키마는 현재 버전으로 마이그레이션
+        Create tables and migrate an old schema to the current version
+        """
+        version = self._get_schema_version()
+        if version == self.SCHEMA_VERSION:
+            return
+
+        for table in self.TABLES:
+            if version < 2 and self._has_legacy_table(table):
+                self._migrate_to_v2(table)
+            else:
+                self._create_candle_table(table)
+        self._create_coverage_table()
+        if version < 3:
+            self.rebuild_coverage()
+        self.cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def _get_schema_version(self):
+        self.cursor.execute("PRAGMA user_version")
+        return self.cursor.fetchone()["user_version"]
 
-    def _create_upbit_table(self):
+    def _has_legacy_table(self, table):
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        columns = [column["name"] for column in self.cursor.fetchall()]
+        return "id" in columns and "ts_epoch" not in columns
+
+    def _create_candle_table(self, table, name=None):
         """테이블 생성
-        id TEXT 고유 식별자 period(S)-date_time e.g. 60S-YYYY-MM-DD HH:MM:SS
-        period INT 캔들의 기간(초), 분봉 - 60
-        recoverd INT 복구된 데이터인지여부
         market TEXT 거래 시장 종류 BTC
+        period INT 캔들의 기간(초), 분봉 - 60
+        ts_epoch INTEGER date_time을 UTC로 간주한 epoch 초, (market, period, ts_epoch)가 PRIMARY KEY
+        recovered INT 복구된 데이터인지여부
         date_time DATETIME 정보의 기준 시간, 'YYYY-MM-DD HH:MM:SS' 형식의 sql datetime format
         opening_price FLOAT 시작 거래 가격
         high_price FLOAT 최고 거래 가격
@@ -44,51 +110,144 @@ class Database:
         closing_price FLOAT 마지막 거래 가격
         acc_price FLOAT 단위 시간내 누적 거래 금액
         acc_volume FLOAT 단위 시간내 누적 거래 양
+
+        WITHOUT ROWID 테이블이라 PRIMARY KEY 순서로 저장되며, 구간 조회는 PK 범위 스캔으로 처리된다.
+        Stored in primary key order as a WITHOUT ROWID table, so range queries are primary key range scans.
         """
         self.cursor.execute(
-            """CREATE TABLE IF NOT EXISTS upbit (id TEXT PRIMARY KEY, period INT, recovered INT, market TEXT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT)"""
+            f"CREATE TABLE IF NOT EXISTS {name or table} ({self.COLUMNS}, PRIMARY KEY (market, period, ts_epoch)) WITHOUT ROWID"
         )
-        self.conn.commit()
 
-    def _create_binance_table(self):
+    def _create_coverage_table(self):
         """테이블 생성
-        id TEXT 고유 식별자 period(S)-date_time e.g. 60S-YYYY-MM-DD HH:MM:SS
-        period INT 캔들의 기간(초), 분봉 - 60
-        recovered INT 복구된 데이터인지여부
-        market TEXT 거래 시장 종류 BTC
-        date_time DATETIME 정보의 기준 시간, 'YYYY-MM-DD HH:MM:SS' 형식의 sql datetime format
-        opening_price FLOAT 시작 거래 가격
-        high_price FLOAT 최고 거래 가격
-        low_price FLOAT 최저 거래 가격
-        closing_price FLOAT 마지막 거래 가격
-        acc_price FLOAT 단위 시간내 누적 거래 금액
-        acc_volume FLOAT 단위 시간내 누적 거래 양
+        source TEXT 캔들 테이블 이름 upbit, binance
+        market TEXT 거래 시장 종류
+        period INT 캔들의 기간(초)
+        start_epoch INTEGER 저장된 구간의 시작 ts_epoch
+        end_epoch INTEGER 저장된 구간의 끝 ts_epoch (마지막 캔들 + period, 포함하지 않음)
         """
         self.cursor.execute(
-            """CREATE TABLE IF NOT EXISTS binance (id TEXT PRIMARY KEY, period INT, recovered INT, market TEXT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT)"""
+            "CREATE TABLE IF NOT EXISTS coverage (source TEXT NOT NULL, market TEXT NOT NULL, period INT NOT NULL, start_epoch INTEGER NOT NULL, end_epoch INTEGER NOT NULL, PRIMARY KEY (source, market, period, start_epoch)) WITHOUT ROWID"
         )
-        self.conn.commit()
+
+    def rebuild_coverage(self):
+        """
+        캔들 테이블에서 연속된 구간을 다시 계산해서 coverage 테이블을 재생성
+        Rebuild the coverage table from consecutive candles in the candle tables
+        """
+        self.cursor.execute("DELETE FROM coverage")
+        for table in self.TABLES:
+            self.cursor.execute(
+                f"INSERT INTO coverage (source, market, period, start_epoch, end_epoch) SELECT '{table}', market, period, MIN(ts_epoch), MAX(ts_epoch) + period FROM (SELECT market, period, ts_epoch, ts_epoch - period * ROW_NUMBER() OVER (PARTITION BY market, period ORDER BY ts_epoch) AS grp FROM {table}) GROUP BY market, period, grp"
+            )
+        self.coverage_maps = {}
+
+    def _get_coverage_map(self, table, market, period):
+        key = (table, market, period)
+        if key not in self.coverage_maps:
+            return self._load_coverage_map(table, market, period)
+        return self.coverage_maps[key]
+
+    def _load_coverage_map(self, table, market, period):
+        """coverage 테이블에서 구간을 다시 읽어서 캐시를 갱신 Reload ranges from the coverage table"""
+        self.cursor.execute(
+            "SELECT start_epoch, end_epoch FROM coverage WHERE source = ? AND market = ? AND period = ?",
+            (table, market, period),
+        )
+        self.coverage_maps[(table, market, period)] = CoverageMap(
+            (row["start_epoch"], row["end_epoch"]) for row in self.cursor.fetchall()
+        )
+        return self.coverage_maps[(table, market, period)]
+
+    def get_coverage(self, market, period=60, is_upbit=True):
+        """
+        저장된 구간 리스트를 반환 Return the stored ranges
+
+        Returns: [(start, end), ...] 'YYYY-MM-DDTHH:MM:SS' 형식, end는 포함하지 않음
+        """
+        table = "upbit" if is_upbit is True else "binance"
+        return [
+            (self.to_iso_string(start), self.to_iso_string(end))
+            for start, end in self._get_coverage_map(table, market, period)
+        ]
+
+    def get_missing_ranges(self, start, end, market, period=60, is_upbit=True):
+        """
+        [start, end) 중 저장되지 않은 구간 리스트를 반환
+        Return the sub-ranges of [start, end) that are not stored
+
+        Returns: [(start, end), ...] 'YYYY-MM-DDTHH:MM:SS' 형식, end는 포함하지 않음
+        """
+        table = "upbit" if is_upbit is True else "binance"
+        coverage = self._get_coverage_map(table, market, period)
+        return [
+            (self.to_iso_string(missing_start), self.to_iso_string(missing_end))
+            for missing_start, missing_end in coverage.missing(self.to_epoch(start), self.to_epoch(end))
+        ]
+
+    def _update_coverage(self, table, period, epochs):
+        """
+        새로 저장된 캔들의 연속 구간을 coverage에 합친다
+        epochs: {market: [ts_epoch, ...]}
+
+        같은 파일을 여는 다른 Database 객체가 coverage를 바꿨을 수 있으므로 캐시를 쓰지 않고
+        캔들을 저장한 쓰기 트랜잭션 안에서 coverage를 다시 읽는다
+        """
+        for market, market_epochs in epochs.items():
+            coverage = self._load_coverage_map(table, market, period)
+            market_epochs = sorted(set(market_epochs))
+            run_start = market_epochs[0]
+            for prev, current in zip(market_epochs, market_epochs[1:] + [None]):
+                if current == prev + period:
+                    continue
+                removed, merged = coverage.add(run_start, prev + period)
+                for removed_start in removed:
+                    self.cursor.execute(
+                        "DELETE FROM coverage WHERE source = ? AND market = ? AND period = ? AND start_epoch = ?",
+                        (table, market, period, removed_start),
+                    )
+                self.cursor.execute(
+                    "INSERT OR REPLACE INTO coverage (source, market, period, start_epoch, end_epoch) VALUES(?, ?, ?, ?, ?)",
+                    (table, market, period, merged[0], merged[1]),
+                )
+                run_start = current
+
+    def _migrate_to_v2(self, table):
+        """
+        v1 테이블(TEXT id PRIMARY KEY)을 v2 테이블로 옮긴다
+        기존 id는 market을 포함하지 않으므로 같은 시간의 다른 market 데이터는 이미 덮어쓰여진 상태다
+        """
+        self.logger.info(f"migrate {table} table to schema v{self.SCHEMA_VERSION}")
+        self._create_candle_table(table, name=f"{table}_v2")
+        self.cursor.execute(
+            f"INSERT OR REPLACE INTO {table}_v2 (market, period, ts_epoch, recovered, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume) SELECT market, period, CAST(strftime('%s', date_time) AS INTEGER), recovered, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume FROM {table} WHERE date_time IS NOT NULL"
+        )
+        self.cursor.execute(f"DROP TABLE {table}")
+        self.cursor.execute(f"ALTER TABLE {table}_v2 RENAME TO {table}")
 
     def query(self, start, end, market, period=60, is_upbit=True):
         table = "upbit" if is_upbit is True else "binance"
 
         self.cursor.execute(
-            f"SELECT id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume FROM {table} WHERE market = ? AND period = ? AND date_time >= ? AND date_time < ? ORDER BY datetime(date_time) ASC",
-            (market, period, start, end),
+            f"SELECT period || 'S-' || date_time AS id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume FROM {table} WHERE market = ? AND period = ? AND ts_epoch >= ? AND ts_epoch < ? ORDER BY ts_epoch ASC",
+            (market, period, self.to_epoch(start), self.to_epoch(end)),
         )
         return self.cursor.fetchall()
 
     def update(self, data, period=60, is_upbit=True):
         table = "upbit" if is_upbit is True else "binance"
         tuple_list = []
+        epochs = {}
         for item in data:
             recovered = item["recovered"] if "recovered" in item else 0
+            ts_epoch = self.to_epoch(item["date_time"])
+            epochs.setdefault(item["market"], []).append(ts_epoch)
             tuple_list.append(
                 (
-                    f"{period}S-{item['date_time']}",
+                    item["market"],
                     period,
+                    ts_epoch,
                     recovered,
-                    item["market"],
                     item["date_time"],
                     item["opening_price"],
                     item["high_price"],
@@ -100,8 +259,15 @@ class Database:
             )
 
         self.logger.info(f"Updated: {len(tuple_list)}")
-        self.cursor.executemany(
-            f"REPLACE INTO {table} (id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            tuple_list,
-        )
-        self.conn.commit()
+        try:
+            self.cursor.executemany(
+                f"REPLACE INTO {table} (market, period, ts_epoch, recovered, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                tuple_list,
+            )
+            self._update_coverage(table, period, epochs)
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            # 되돌린 coverage와 캐시가 달라지지 않도록 다음 조회 때 다시 읽는다
+            self.coverage_maps = {}
+            raise
@@ -0,0 +1,141 @@
+from multiprocessing import shared_memory
+import numpy as np
+from .column_store import ColumnStore
+from .coverage_map import CoverageMap
+from ..date_converter import DateConverter
+from ..log_manager import LogManager
+
+
+class SharedCandleStore:
+    """
+    multiprocessing.shared_memory에 올린 단일 마켓 캔들 컬럼 저장소
+    Candle columns of a single market placed in multiprocessing.shared_memory
+
+    부모 프로세스가 필요한 구간을 한 번 로딩해서 create로 공유 메모리에 올리고,
+    워커 프로세스는 get_descriptor()의 결과로 attach 해서 복사 없이 구간 뷰를 잘라 쓴다.
+    컬럼 구성은 ColumnStore와 같으며 epoch 오름차순으로 저장된다.
+
+    The parent loads the needed ranges once and places them in shared memory with create,
+    workers attach with the get_descriptor() result and slice zero-copy views.
+    Columns are the same as ColumnStore, stored in ascending epoch order.
+    """
+
+    def __init__(self, descriptor, blocks, owner=False):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.descriptor = descriptor
+        self.blocks = blocks
+        self.owner = owner
+        self.source = descriptor["source"]
+        self.market = descriptor["market"]
+        self.interval = descriptor["interval"]
+        self.coverage = CoverageMap(descriptor["ranges"])
+
+        count = descriptor["count"]
+        self.columns = {
+            name: np.ndarray((count,), dtype=dtype, buffer=blocks[name].buf)
+            for name, dtype in ColumnStore.COLUMNS
+        }
+
+    def __len__(self):
+        return self.descriptor["count"]
+
+    @classmethod
+    def create(cls, source, market, interval, data, ranges):
+        """
+        DataRepository.get_data 결과를 공유 메모리에 올린 저장소를 생성
+        Create a store holding DataRepository.get_data results in shared memory
+
+        data: date_time 오름차순 캔들 dict 리스트
+        ranges: data가 빠짐없이 담고 있는 [start, end) 구간 리스트, "%Y-%m-%dT%H:%M:%S"
+        """
+        count = len(data)
+        values = {
+            "epoch": [ColumnStore.to_epoch(candle["date_time"]) for candle in data],
+            "recovered": [candle.get("recovered") or 0 for candle in data],
+        }
+        for name in ColumnStore.PRICE_FIELDS:
+            values[name] = [candle[name] for candle in data]
+
+        descriptor = {
+            "source": source,
+            "market": market,
+            "interval": interval,
+            "count": count,
+            "ranges": [
+                (ColumnStore.to_epoch(start), ColumnStore.to_epoch(end)) for start, end in ranges
+            ],
+            "blocks": {},
+        }
+        blocks = {}
+        try:
+            for name, dtype in ColumnStore.COLUMNS:
+                # 크기가 0인 공유 메모리는 만들 수 없으므로 최소 1 byte
+                size = max(np.dtype(dtype).itemsize * count, 1)
+                blocks[name] = shared_memory.SharedMemory(create=True, size=size)
+                descriptor["blocks"][name] = blocks[name].name
+                column = np.ndarray((count,), dtype=dtype, buffer=blocks[name].buf)
+                column[:] = np.asarray(values[name], dtype=dtype)
+                del column
+        except Exception:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+
+        store = cls(descriptor, blocks, owner=True)
+        store.logger.info(f"shared candles {market} {interval}s: {count}")
+        return store
+
+    @classmethod
+    def attach(cls, descriptor):
+        """다른 프로세스가 만든 저장소에 연결 Attach to a store created by another process"""
+        blocks = {
+            name: shared_memory.SharedMemory(name=block_name)
+            for name, block_name in descriptor["blocks"].items()
+        }
+        return cls(descriptor, blocks, owner=False)
+
+    def get_descriptor(self):
+        """attach에 사용할 pickle 가능한 정보를 반환 Return the picklable info for attach"""
+        return self.descriptor
+
+    def _to_range(self, start, end):
+        interval_min = self.interval / 60
+        return (
+            ColumnStore.to_epoch(DateConverter.floor_min(start, interval_min)),
+            ColumnStore.to_epoch(DateConverter.floor_min(end, interval_min)),
+        )
+
+    def covers(self, source, market, interval, start, end):
+        """요청한 캔들을 이 저장소에서 모두 제공할 수 있는지 여부 Whether the request is fully served"""
+        if (source, market, interval) != (self.source, self.market, self.interval):
+            return False
+        return self.coverage.covers(*self._to_range(start, end))
+
+    def get_columns(self, start, end):
+        """
+        [start, end) 구간의 컬럼 뷰를 복사 없이 반환
+        Return zero-copy column views of [start, end)
+        """
+        start_epoch, end_epoch = self._to_range(start, end)
+        epoch = self.columns["epoch"]
+        lo = int(np.searchsorted(epoch, start_epoch, side="left"))
+        hi = int(np.searchsorted(epoch, end_epoch, side="left"))
+        return {name: column[lo:hi] for name, column in self.columns.items()}
+
+    def get_data(self, start, end):
+        """
+        [start, end) 구간의 캔들을 DataRepository.get_data와 같은 dict 리스트로 반환
+        Return candles of [start, end) as the same list of dict as DataRepository.get_data
+        """
+        return ColumnStore.to_candles(self.get_columns(start, end), self.market, self.interval)
+
+    def close(self):
+        """공유 메모리 연결을 닫고, 생성한 프로세스라면 삭제 Close, and unlink if this process created it"""
+        # 버퍼를 참조하는 numpy 뷰를 먼저 놓아야 close 할 수 있다
+        self.columns = {}
+        for block in self.blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+        self.blocks = {}
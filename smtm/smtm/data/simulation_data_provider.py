@@ -6,6 +6,7 @@ from ..config import Config
 from .data_provider import DataProvider
 from ..log_manager import LogManager
 from .data_repository import DataRepository
+from .candle_cache import CandleCache
 
 from .upbit_markets import krw_market_map
 
@@ -94,7 +95,13 @@ class SimulationDataProvider(DataProvider):
         end_dt = datetime.strptime(end, "%Y-%m-%dT%H:%M:%S")
         start_dt = end_dt - timedelta(minutes=count * self.interval_min)
         start = start_dt.strftime("%Y-%m-%dT%H:%M:%S")
-        self.data = self.repo.get_data(start, end, market=self.market)
+        self.data = CandleCache.get_instance().get_data(
+            self.repo, start, end, market=self.market
+        )
+
+    def get_candles(self):
+        """시뮬레이션 전체 구간의 캔들 리스트, CandleCache와 공유하므로 읽기 전용"""
+        return self.data
 
     def get_info(self):
         now = self.index
@@ -103,5 +110,7 @@ class SimulationDataProvider(DataProvider):
 
         self.index = now + 1
         self.logger.info(f'[DATA] @ {self.data[now]["date_time"]}')
-        self.data[now]["type"] = "primary_candle"
-        return [self.data[now]]
+        # 캐시된 캔들은 VirtualMarket과 공유하므로 복사본에 type을 추가
+        candle = dict(self.data[now])
+        candle["type"] = "primary_candle"
+        return [candle]
@@ -0,0 +1,59 @@
+from .data_provider import DataProvider
+from ..log_manager import LogManager
+from .simulation_data_provider import SimulationDataProvider
+from .candle_alignment import align_candles
+
+
+class SimulationPortfolioDataProvider(DataProvider):
+    """
+    여러 마켓의 과거 데이터를 같은 시간축으로 정렬해서 순차적으로 제공하는 클래스
+    첫 번째 통화의 캔들을 primary_candle, 나머지 통화의 캔들을 market_candle 타입으로 전달한다
+    거래가 없는 구간은 직전 종가의 거래량 0 캔들로 채운다
+
+    DataProvider providing time-aligned candles of several markets for portfolio simulation
+    """
+
+    NAME = "SIMULATION PORTFOLIO DP"
+    CODE = "SIP"
+
+    def __init__(self, currencies=("BTC",), interval=60):
+        if len(currencies) == 0:
+            raise UserWarning("empty currency list")
+
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.providers = [SimulationDataProvider(currency=c, interval=interval) for c in currencies]
+        self.markets = [provider.market for provider in self.providers]
+        if len(set(self.markets)) != len(self.markets):
+            raise UserWarning(f"duplicated market: {self.markets}")
+        self.date_time_list = []
+        self.data = {}
+        self.index = 0
+
+    def initialize_simulation(self, end=None, count=100):
+        """마켓별 데이터를 CandleCache로 가져와서 시간 정렬한다"""
+        self.index = 0
+        for provider in self.providers:
+            provider.initialize_simulation(end=end, count=count)
+        self.date_time_list, self.data, _ = align_candles(
+            {provider.market: provider.get_candles() for provider in self.providers}
+        )
+
+    def get_info(self):
+        """
+        순차적으로 모든 마켓의 같은 시간 거래 정보를 전달한다
+
+        Returns: 마켓 순서대로 거래 정보 딕셔너리 리스트, 첫 번째는 primary_candle
+        """
+        now = self.index
+        if now >= len(self.date_time_list):
+            return None
+
+        self.index = now + 1
+        self.logger.info(f"[DATA] @ {self.date_time_list[now]}")
+        info = []
+        for idx, market in enumerate(self.markets):
+            # 캐시된 캔들은 다른 구성 요소와 공유하므로 복사본에 type을 추가
+            candle = dict(self.data[market][now])
+            candle["type"] = "primary_candle" if idx == 0 else "market_candle"
+            info.append(candle)
+        return info
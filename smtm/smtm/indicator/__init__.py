@@ -0,0 +1,28 @@
+"""
+Indicator Module
+지표 모듈
+
+Streaming technical indicators that update in constant time per candle,
+plus vectorized column helpers for whole-range computation.
+캔들 하나당 상수 시간에 갱신되는 스트리밍 기술 지표와
+전체 구간을 한 번에 계산하는 벡터화 헬퍼를 포함합니다.
+"""
+
+from .rolling import RollingMean, RollingStd, RollingMin, RollingMax, BollingerBand
+from .moving_average import Ema, Macd
+from .oscillator import Rsi, Stochastic, Atr
+from .precompute import IndicatorCache
+
+__all__ = [
+    "RollingMean",
+    "RollingStd",
+    "RollingMin",
+    "RollingMax",
+    "BollingerBand",
+    "Ema",
+    "Macd",
+    "Rsi",
+    "Stochastic",
+    "Atr",
+    "IndicatorCache",
+]
@@ -0,0 +1,71 @@
+"""
+Streaming Exponential Moving Average Indicators
+스트리밍 지수 이동 평균 지표
+
+EMA and MACD that update in constant time per value.
+값 하나당 상수 시간에 갱신되는 EMA, MACD 지표입니다.
+"""
+
+from typing import Tuple
+
+NAN = float("nan")
+
+
+class Ema:
+    """
+    Exponential Moving Average
+    지수 이동 평균
+
+    Same recurrence as pandas ``Series.ewm(span=span, adjust=False).mean()``,
+    seeded with the first value.
+    pandas ``ewm(span, adjust=False).mean()`` 과 동일한 점화식을 사용하며 첫 값으로 시작합니다.
+    """
+
+    def __init__(self, span: int):
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = NAN
+        self.count = 0
+        self._old_weight = 1.0 - self.alpha
+
+    def update(self, x: float) -> float:
+        """
+        Push a new value and return the current EMA
+        새 값을 추가하고 현재 EMA를 반환합니다.
+        """
+        x = float(x)
+        self.count += 1
+        if self.count == 1:
+            self.value = x
+        else:
+            self.value = (self._old_weight * self.value + self.alpha * x) / (
+                self._old_weight + self.alpha
+            )
+        return self.value
+
+
+class Macd:
+    """
+    Moving Average Convergence Divergence
+    MACD
+
+    line = EMA(fast) - EMA(slow), signal = EMA(line, signal), histogram = line - signal
+    """
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.line = NAN
+        self.signal = NAN
+        self.histogram = NAN
+        self._fast = Ema(fast)
+        self._slow = Ema(slow)
+        self._signal = Ema(signal)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        """
+        Push a closing price and return (line, signal, histogram)
+        종가를 추가하고 (MACD, 시그널, 히스토그램)을 반환합니다.
+        """
+        self.line = self._fast.update(close) - self._slow.update(close)
+        self.signal = self._signal.update(self.line)
+        self.histogram = self.line - self.signal
+        return self.line, self.signal, self.histogram
@@ -0,0 +1,149 @@
+"""
+Streaming Oscillator Indicators
+스트리밍 오실레이터 지표
+
+RSI, Stochastic %K and ATR that update in constant time per candle.
+캔들 하나당 상수 시간에 갱신되는 RSI, 스토캐스틱 %K, ATR 지표입니다.
+"""
+
+import math
+from typing import Optional
+
+from .rolling import RollingMean, RollingMin, RollingMax
+
+NAN = float("nan")
+
+
+class Rsi:
+    """
+    Relative Strength Index
+    상대 강도 지수
+
+    method:
+        "sma": 단순 이동 평균, pandas ``diff().clip().rolling(period).mean()`` 과 동일
+        "wilder": Wilder smoothing, 첫 period 개의 단순 평균으로 시작
+
+    avg_loss가 0이면 pandas 구현과 동일하게 NaN을 반환합니다.
+    Returns NaN when avg_loss is 0, as the pandas implementation does.
+    """
+
+    def __init__(self, period: int = 14, method: str = "sma"):
+        if method not in ("sma", "wilder"):
+            raise UserWarning(f"not supported rsi method: {method}")
+        self.period = int(period)
+        self.method = method
+        self.value = NAN
+        self.avg_gain = NAN
+        self.avg_loss = NAN
+        self._prev = None
+        self._count = 0
+        self._gain_mean = RollingMean(period)
+        self._loss_mean = RollingMean(period)
+
+    def update(self, close: float) -> float:
+        """
+        Push a closing price and return the current RSI
+        종가를 추가하고 현재 RSI를 반환합니다.
+        """
+        close = float(close)
+        if self._prev is None:
+            gain = loss = NAN
+        else:
+            delta = close - self._prev
+            gain = max(delta, 0.0)
+            loss = max(-delta, 0.0)
+        self._prev = close
+
+        if self.method == "sma":
+            self.avg_gain = self._gain_mean.update(gain)
+            self.avg_loss = self._loss_mean.update(loss)
+        elif not math.isnan(gain):
+            self._count += 1
+            if self._count <= self.period:
+                self._gain_mean.update(gain)
+                self._loss_mean.update(loss)
+                if self._count == self.period:
+                    self.avg_gain = self._gain_mean.value
+                    self.avg_loss = self._loss_mean.value
+            else:
+                self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+                self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        if math.isnan(self.avg_gain) or math.isnan(self.avg_loss) or self.avg_loss == 0:
+            self.value = NAN
+        else:
+            rs = self.avg_gain / self.avg_loss
+            self.value = 100 - (100 / (1 + rs))
+        return self.value
+
+
+class Stochastic:
+    """
+    Stochastic Oscillator %K
+    스토캐스틱 %K
+
+    raw %K = (close - lowest low) / (highest high - lowest low) * 100
+    %K = SMA(raw %K, smooth)
+
+    최고가와 최저가가 같으면 raw %K는 NaN 입니다.
+    """
+
+    def __init__(self, period: int = 14, smooth: int = 3):
+        self.period = int(period)
+        self.smooth = int(smooth)
+        self.value = NAN
+        self.raw = NAN
+        self._low = RollingMin(period)
+        self._high = RollingMax(period)
+        self._smooth = RollingMean(smooth)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """
+        Push a candle and return the current smoothed %K
+        캔들을 추가하고 현재 %K를 반환합니다.
+        """
+        lowest = self._low.update(low)
+        highest = self._high.update(high)
+        denom = highest - lowest
+        if math.isnan(denom) or denom == 0:
+            self.raw = NAN
+        else:
+            self.raw = (float(close) - lowest) / denom * 100
+        self.value = self._smooth.update(self.raw)
+        return self.value
+
+
+class Atr:
+    """
+    Average True Range
+    평균 실제 범위
+
+    TR = max(high - low, |high - prev close|, |low - prev close|), ATR = SMA(TR, period)
+    첫 캔들의 TR은 high - low 입니다.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = int(period)
+        self.value = NAN
+        self.true_range = NAN
+        self._prev_close: Optional[float] = None
+        self._mean = RollingMean(period)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """
+        Push a candle and return the current ATR
+        캔들을 추가하고 현재 ATR을 반환합니다.
+        """
+        high = float(high)
+        low = float(low)
+        if self._prev_close is None:
+            self.true_range = high - low
+        else:
+            self.true_range = max(
+                high - low,
+                abs(high - self._prev_close),
+                abs(low - self._prev_close),
+            )
+        self._prev_close = float(close)
+        self.value = self._mean.update(self.true_range)
+        return self.value
@@ -0,0 +1,223 @@
+"""
+Indicator Precompute Cache
+지표 사전 계산 캐시
+
+Computes indicator columns over a whole backtest range once and keeps them in memory and on disk.
+Entries are keyed by a hash of the candle columns plus the indicator name and parameters,
+so runs that only change strategy thresholds reuse the same columns.
+전체 백테스트 구간의 지표 컬럼을 한 번 계산해서 메모리와 디스크(.npy)에 보관합니다.
+캔들 컬럼 해시와 지표 이름, 파라미터를 키로 사용하므로 임계값만 다른 실행은 같은 컬럼을 재사용합니다.
+"""
+
+import calendar
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..config import Config
+from ..log_manager import LogManager
+from .vectorized import bbi_indicator_columns
+
+
+def _bbi_columns(columns: Dict[str, np.ndarray], atr_period: int = 14, ema_period: int = 21) -> Dict[str, np.ndarray]:
+    return bbi_indicator_columns(
+        columns["closing_price"],
+        columns["high_price"],
+        columns["low_price"],
+        atr_period=atr_period,
+        ema_period=ema_period,
+    )
+
+
+class IndicatorCache:
+    """
+    Process-level cache of precomputed indicator columns
+    프로세스 단위로 공유되는 사전 계산 지표 컬럼 캐시
+
+    get(candles, name, params)는 {"epoch": 캔들 epoch, 지표 이름: float64 배열} 을 반환하며
+    i번째 값은 i번째 캔들까지 스트리밍으로 계산한 값과 같습니다.
+    반환된 배열은 여러 실행이 공유하므로 읽기 전용으로 다뤄야 합니다.
+    cache_dir이 주어지면 {cache_dir}/{key}/{컬럼}.npy 로 저장해서 다른 프로세스와 다음 실행에서도 사용합니다.
+
+    Returned arrays are shared between runs and must be treated as read-only.
+    """
+
+    PRICE_FIELDS = ("high_price", "low_price", "closing_price")
+    INDICATORS: Dict[str, Callable[..., Dict[str, np.ndarray]]] = {
+        "bbi": _bbi_columns,
+    }
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        if max_bytes is None:
+            max_bytes = Config.indicator_cache_size_mb * 2**20
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+
+    @classmethod
+    def get_instance(cls) -> "IndicatorCache":
+        """Return the process-wide instance / 프로세스 공용 인스턴스를 반환"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(cache_dir=Config.indicator_cache_dir or None)
+            return cls._instance
+
+    @staticmethod
+    def to_epoch(date_time: str) -> int:
+        """date_time 문자열을 UTC로 간주한 epoch 초 (ColumnStore와 같은 기준)"""
+        return calendar.timegm(datetime.fromisoformat(date_time).timetuple())
+
+    @classmethod
+    def to_columns(cls, candles: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Convert candle dicts to the columns used for hashing and computation
+        캔들 dict 리스트를 해시와 계산에 사용하는 컬럼으로 변환합니다.
+        """
+        columns = {
+            "epoch": np.fromiter(
+                (cls.to_epoch(candle["date_time"]) for candle in candles), dtype=np.int64, count=len(candles)
+            )
+        }
+        for field in cls.PRICE_FIELDS:
+            columns[field] = np.fromiter(
+                (candle[field] for candle in candles), dtype=np.float64, count=len(candles)
+            )
+        return columns
+
+    @classmethod
+    def make_key(cls, columns: Dict[str, np.ndarray], name: str, params: Dict[str, Any]) -> str:
+        """
+        Hash of the candle columns, indicator name and parameters
+        캔들 컬럼과 지표 이름, 파라미터의 해시
+        """
+        digest = hashlib.sha1()
+        for field in ("epoch",) + cls.PRICE_FIELDS:
+            digest.update(np.ascontiguousarray(columns[field]).tobytes())
+        digest.update(json.dumps([name, params], sort_keys=True).encode("utf-8"))
+        return f"{name}-{digest.hexdigest()}"
+
+    def get(
+        self, candles: List[Dict[str, Any]], name: str = "bbi", params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Return the indicator columns of the candles, computing them only on a miss
+        캔들의 지표 컬럼을 반환, 메모리와 디스크에 모두 없을 때만 계산합니다.
+
+        Args:
+            candles: Candles in ascending date_time order / date_time 오름차순 캔들 리스트
+            name: Indicator set name in INDICATORS / INDICATORS의 지표 묶음 이름
+            params: Keyword arguments of the indicator function / 지표 함수의 키워드 인자
+        """
+        if name not in self.INDICATORS:
+            raise UserWarning(f"not supported indicator: {name}")
+        params = dict(params or {})
+        columns = self.to_columns(candles)
+        key = self.make_key(columns, name, params)
+
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+
+            result = self._load(key)
+            if result is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                result = {"epoch": columns["epoch"]}
+                result.update(self.INDICATORS[name](columns, **params))
+                self._save(key, result)
+            for column in result.values():
+                column.flags.writeable = False
+            self._put(key, result)
+            return result
+
+    def _put(self, key: str, result: Dict[str, np.ndarray]) -> None:
+        size = sum(column.nbytes for column in result.values())
+        if size > self.max_bytes:
+            self.logger.info(f"too big to cache: {size} bytes, {key}")
+            return
+
+        self.entries[key] = result
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= sum(column.nbytes for column in evicted.values())
+
+    def _load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        if self.cache_dir is None:
+            return None
+        path = os.path.join(self.cache_dir, key)
+        if not os.path.isdir(path):
+            return None
+        try:
+            return {
+                os.path.splitext(filename)[0]: np.load(os.path.join(path, filename))
+                for filename in sorted(os.listdir(path))
+                if filename.endswith(".npy")
+            }
+        except (OSError, ValueError) as err:
+            self.logger.warning(f"failed to load indicator cache {path}: {err}")
+            return None
+
+    def _save(self, key: str, result: Dict[str, np.ndarray]) -> None:
+        if self.cache_dir is None:
+            return
+        path = os.path.join(self.cache_dir, key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 다른 프로세스가 반쯤 쓴 디렉터리를 읽지 않도록 임시 디렉터리에 쓰고 이름을 바꾼다
+            tmp = tempfile.mkdtemp(prefix=f".{key}-", dir=self.cache_dir)
+            for field, column in result.items():
+                np.save(os.path.join(tmp, f"{field}.npy"), column)
+            try:
+                os.rename(tmp, path)
+            except OSError:
+                # 다른 프로세스가 먼저 저장한 경우
+                shutil.rmtree(tmp, ignore_errors=True)
+        except OSError as err:
+            self.logger.warning(f"failed to save indicator cache {path}: {err}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return cache statistics / 캐시 통계 정보를 반환
+
+        Returns:
+            hits, disk_hits, misses(실제 계산 횟수), entries, bytes, max_bytes
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self) -> None:
+        """Clear memory entries and statistics / 메모리 항목과 통계를 초기화"""
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
@@ -0,0 +1,244 @@
+"""
+Streaming Rolling Window Indicators
+스트리밍 롤링 윈도우 지표
+
+Rolling mean/std/min/max that update in constant time per value.
+값 하나당 상수 시간에 갱신되는 이동 평균/표준편차/최소/최대 지표입니다.
+"""
+
+import math
+from collections import deque
+from typing import Tuple
+
+NAN = float("nan")
+
+
+class RollingMean:
+    """
+    Rolling Mean
+    이동 평균
+
+    Same semantics as pandas ``Series.rolling(period).mean()``:
+    NaN until ``period`` values are collected, NaN while a NaN is inside the window,
+    and the exact value when every value in the window is identical.
+    pandas ``rolling(period).mean()`` 와 동일한 규칙으로 동작합니다.
+    """
+
+    def __init__(self, period: int):
+        self.period = int(period)
+        self.window = deque()
+        self.value = NAN
+        self._sum = 0.0
+        self._compensation = 0.0
+        self._nan_count = 0
+        self._neg_count = 0
+        self._same_count = 0
+        self._last = None
+        self._updated = 0
+
+    def _add(self, x: float) -> None:
+        y = x - self._compensation
+        t = self._sum + y
+        self._compensation = t - self._sum - y
+        self._sum = t
+
+    def update(self, x: float) -> float:
+        """
+        Push a new value and return the current mean
+        새 값을 추가하고 현재 평균을 반환합니다.
+        """
+        x = float(x)
+        if len(self.window) == self.period:
+            old = self.window.popleft()
+            if math.isnan(old):
+                self._nan_count -= 1
+            else:
+                self._add(-old)
+                if old < 0:
+                    self._neg_count -= 1
+
+        self.window.append(x)
+        if math.isnan(x):
+            self._nan_count += 1
+        else:
+            self._add(x)
+            if x < 0:
+                self._neg_count += 1
+
+        if x == self._last:
+            self._same_count += 1
+        else:
+            self._same_count = 1
+        self._last = x
+
+        # 누적 오차가 쌓이지 않도록 주기적으로 윈도우 합을 다시 계산 (amortized O(1))
+        self._updated += 1
+        if self._updated % (self.period * 64) == 0:
+            self._sum = math.fsum(v for v in self.window if not math.isnan(v))
+            self._compensation = 0.0
+
+        if len(self.window) < self.period or self._nan_count > 0:
+            self.value = NAN
+        elif self._same_count >= self.period:
+            self.value = x
+        else:
+            self.value = self._sum / self.period
+            if self._neg_count == 0 and self.value < 0:
+                self.value = 0.0
+        return self.value
+
+
+class RollingStd:
+    """
+    Rolling Standard Deviation
+    이동 표준편차
+
+    Online add/remove variance (same algorithm as pandas ``rolling().std()``).
+    pandas ``rolling(period).std(ddof)`` 와 같은 온라인 분산 알고리즘을 사용합니다.
+    """
+
+    def __init__(self, period: int, ddof: int = 1):
+        self.period = int(period)
+        self.ddof = int(ddof)
+        self.window = deque()
+        self.value = NAN
+        self._nobs = 0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._compensation = 0.0
+        self._same_count = 0
+        self._last = None
+        self._updated = 0
+
+    def _add(self, x: float) -> None:
+        self._nobs += 1
+        delta = x - self._mean
+        y = delta / self._nobs - self._compensation
+        t = self._mean + y
+        self._compensation = t - self._mean - y
+        self._mean = t
+        self._ssqdm += (self._nobs - 1) * delta * delta / self._nobs
+
+    def _remove(self, x: float) -> None:
+        self._nobs -= 1
+        if self._nobs == 0:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+            self._compensation = 0.0
+            return
+        delta = x - self._mean
+        y = -delta / self._nobs - self._compensation
+        t = self._mean + y
+        self._compensation = t - self._mean - y
+        self._mean = t
+        self._ssqdm -= (self._nobs + 1) * delta * delta / self._nobs
+
+    def _resync(self) -> None:
+        self._nobs = len(self.window)
+        self._mean = math.fsum(self.window) / self._nobs
+        self._ssqdm = math.fsum((v - self._mean) ** 2 for v in self.window)
+        self._compensation = 0.0
+
+    def update(self, x: float) -> float:
+        """
+        Push a new value and return the current standard deviation
+        새 값을 추가하고 현재 표준편차를 반환합니다.
+        """
+        x = float(x)
+        if len(self.window) == self.period:
+            self._remove(self.window.popleft())
+        self.window.append(x)
+        self._add(x)
+
+        if x == self._last:
+            self._same_count += 1
+        else:
+            self._same_count = 1
+        self._last = x
+
+        self._updated += 1
+        if self._updated % (self.period * 64) == 0:
+            self._resync()
+
+        if len(self.window) < self.period or self._nobs <= self.ddof:
+            self.value = NAN
+        elif self._same_count >= self._nobs:
+            self.value = 0.0
+        else:
+            self.value = math.sqrt(max(self._ssqdm / (self._nobs - self.ddof), 0.0))
+        return self.value
+
+
+class RollingMin:
+    """
+    Rolling Minimum with a monotonic deque
+    단조 덱(monotonic deque)을 사용한 이동 최솟값
+    """
+
+    def __init__(self, period: int):
+        self.period = int(period)
+        self.value = NAN
+        self._queue = deque()
+        self._index = -1
+
+    def _is_dominated(self, old: float, new: float) -> bool:
+        return old >= new
+
+    def update(self, x: float) -> float:
+        """
+        Push a new value and return the current extreme value
+        새 값을 추가하고 현재 윈도우의 값을 반환합니다.
+        """
+        x = float(x)
+        self._index += 1
+        while self._queue and self._is_dominated(self._queue[-1][1], x):
+            self._queue.pop()
+        self._queue.append((self._index, x))
+        while self._queue[0][0] <= self._index - self.period:
+            self._queue.popleft()
+
+        if self._index + 1 < self.period:
+            self.value = NAN
+        else:
+            self.value = self._queue[0][1]
+        return self.value
+
+
+class RollingMax(RollingMin):
+    """
+    Rolling Maximum with a monotonic deque
+    단조 덱(monotonic deque)을 사용한 이동 최댓값
+    """
+
+    def _is_dominated(self, old: float, new: float) -> bool:
+        return old <= new
+
+
+class BollingerBand:
+    """
+    Bollinger Band
+    볼린저 밴드
+
+    middle = SMA(period), upper/lower = middle +/- k * std(period, ddof=1)
+    """
+
+    def __init__(self, period: int = 20, k: float = 2):
+        self.period = int(period)
+        self.k = k
+        self.middle = NAN
+        self.upper = NAN
+        self.lower = NAN
+        self._mean = RollingMean(period)
+        self._std = RollingStd(period)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        """
+        Push a closing price and return (middle, upper, lower)
+        종가를 추가하고 (중심선, 상단, 하단)을 반환합니다.
+        """
+        mean = self._mean.update(close)
+        std = self._std.update(close)
+        self.middle = mean
+        self.upper = mean + self.k * std
+        self.lower = mean - self.k * std
+        return self.middle, self.upper, self.lower
@@ -0,0 +1,94 @@
+"""
+Vectorized Indicator Columns
+벡터화 지표 컬럼
+
+Computes indicator columns over a whole candle series at once with pandas.
+Every indicator is causal, so the value at index i equals the streaming value after candle i.
+pandas로 전체 캔들 구간의 지표 컬럼을 한 번에 계산합니다.
+모든 지표는 인과적(causal)이므로 i번째 값은 i번째 캔들까지 스트리밍으로 계산한 값과 같습니다.
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def bbi_indicator_columns(
+    closes: Sequence[float],
+    highs: Sequence[float],
+    lows: Sequence[float],
+    atr_period: int = 14,
+    ema_period: int = 21,
+) -> Dict[str, np.ndarray]:
+    """
+    Compute the BBI strategy indicator columns
+    BBI 전략에서 사용하는 지표 컬럼을 계산합니다.
+
+    Args:
+        closes: Closing prices / 종가
+        highs: High prices / 고가
+        lows: Low prices / 저가
+        atr_period: ATR period / ATR 기간
+        ema_period: EMA span / EMA 기간
+
+    Returns:
+        Dictionary of float64 arrays: bb_lower, rsi, macd, stoch_k, atr, ema /
+        지표 이름별 float64 배열 딕셔너리
+    """
+    closes = pd.Series(closes, dtype="float")
+    highs = pd.Series(highs, dtype="float")
+    lows = pd.Series(lows, dtype="float")
+
+    ma20 = closes.rolling(20).mean()
+    std20 = closes.rolling(20).std()
+    bb_lower = ma20 - 2 * std20
+
+    delta = closes.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+    avg_gain = gain.rolling(14).mean()
+    avg_loss = loss.rolling(14).mean()
+    rs = avg_gain / avg_loss.replace(to_replace=0, value=np.nan)
+    rsi = 100 - (100 / (1 + rs))
+
+    ema12 = closes.ewm(span=12, adjust=False).mean()
+    ema26 = closes.ewm(span=26, adjust=False).mean()
+    macd = ema12 - ema26
+
+    low14 = lows.rolling(14).min()
+    high14 = highs.rolling(14).max()
+    denom = (high14 - low14).replace(to_replace=0, value=np.nan)
+    raw_k = (closes - low14) / denom * 100
+    stoch_k = raw_k.rolling(3).mean()
+
+    prev_closes = closes.shift(1)
+    tr1 = highs - lows
+    tr2 = (highs - prev_closes).abs()
+    tr3 = (lows - prev_closes).abs()
+    true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    atr = true_range.rolling(atr_period).mean()
+
+    ema = closes.ewm(span=ema_period, adjust=False).mean()
+
+    return {
+        "bb_lower": bb_lower.to_numpy(dtype="float64"),
+        "rsi": rsi.to_numpy(dtype="float64"),
+        "macd": macd.to_numpy(dtype="float64"),
+        "stoch_k": stoch_k.to_numpy(dtype="float64"),
+        "atr": atr.to_numpy(dtype="float64"),
+        "ema": ema.to_numpy(dtype="float64"),
+    }
+
+
+def forward_fill_nonzero(values: Sequence[int]) -> np.ndarray:
+    """
+    Carry the last non-zero value forward, zeros before the first one stay zero
+    0이 아닌 마지막 값을 이후 위치로 채웁니다. 첫 번째 0이 아닌 값 이전은 0으로 남습니다.
+
+    e.g. [0, 1, 0, 0, -1, 0] -> [0, 1, 1, 1, -1, -1]
+    """
+    values = np.asarray(values)
+    index = np.arange(len(values))
+    last = np.maximum.accumulate(np.where(values != 0, index, -1)) if len(values) > 0 else index
+    return np.where(last >= 0, values[np.maximum(last, 0)], 0).astype(values.dtype)
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+연속 절반 제거(successive halving) 파라미터 탐색
+
+- 모든 설정을 기간 앞부분(짧은 prefix)으로 먼저 실행하고 상위 1/eta만 남겨서 더 긴 prefix로 다시 실행한다.
+  rung 별 prefix 비율은 eta^-(rungs-1), ..., eta^-1, 1 이고 마지막 rung은 전체 기간이다.
+- --max_drawdown이 주어지면 실행 도중 낙폭이 한도를 넘은 설정은 바로 중단하고(DrawdownPruner)
+  다음 rung으로 올리지 않는다.
+- 실행한 캔들 턴 수를 모든 설정을 전체 기간으로 실행하는 grid 탐색과 비교해서 출력한다.
+- 캔들 공유, 프로세스 풀, 결과 표는 sweep 모듈을 그대로 사용한다.
+
+사용법:
+    python -m smtm.runner.halving --space space.json --strategy BBI-V3-SPEC-V16-VOL --currency BTC \\
+        --from_dash_to 251121.000000-251122.000000 --eta 3 --rungs 3 --max_drawdown 5
+    python -m smtm.runner.halving --space space.json --random 300 --seed 7 --process 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from smtm.runner import sweep
+
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+# -------------------------------
+# Schedule
+# -------------------------------
+
+def count_candles(spec: sweep.SweepSpec) -> int:
+    """spec 전체 기간의 캔들 수"""
+    start = datetime.strptime(spec.start, ISO_FORMAT)
+    end = datetime.strptime(spec.end, ISO_FORMAT)
+    return max(0, int((end - start).total_seconds()) // spec.term)
+
+def make_rungs(spec: sweep.SweepSpec, eta: int = 3, rungs: int = 3) -> List[Dict[str, Any]]:
+    """
+    rung 리스트를 반환, [{"fraction": prefix 비율, "candles": prefix 캔들 수, "end": prefix 종료 시간}]
+    """
+    if eta < 2:
+        raise ValueError("eta must be 2 or more")
+    if rungs < 1:
+        raise ValueError("rungs must be 1 or more")
+
+    total = count_candles(spec)
+    start = datetime.strptime(spec.start, ISO_FORMAT)
+    schedule = []
+    for rung in range(rungs):
+        fraction = float(eta) ** -(rungs - 1 - rung)
+        candles = max(1, min(total, math.ceil(total * fraction)))
+        end = start + timedelta(seconds=candles * spec.term)
+        schedule.append({"fraction": fraction, "candles": candles, "end": end.strftime(ISO_FORMAT)})
+    return schedule
+
+def promote(results: List[Dict[str, Any]], eta: int, sort_key: str = "final_return") -> List[int]:
+    """
+    낙폭으로 중단되지 않고 성공한 결과 중 상위 ceil(n/eta)개 설정의 idx 리스트를 반환
+    """
+    keep = math.ceil(len(results) / eta)
+    alive = [row for row in sweep.rank_results(results, sort_key) if row["ok"] and not row["pruned"]]
+    return [row["idx"] for row in alive[:keep]]
+
+def rank_rows(rows: List[Dict[str, Any]], sort_key: str = "final_return") -> List[Dict[str, Any]]:
+    """
+    설정별 마지막 rung 결과에 rank를 매겨 반환
+    낙폭으로 중단되지 않은 결과 중 더 높은 rung까지 올라간 설정이 앞에 오고, 같은 rung 안에서는 sort_key 순위
+    """
+    sweep.check_sort_key(sort_key)
+    ok = sorted(
+        (r for r in rows if r["ok"]),
+        key=lambda r: (r["pruned"], -r["rung"], sweep.sort_value(r, sort_key), r["idx"]),
+    )
+    failed = sorted((r for r in rows if not r["ok"]), key=lambda r: r["idx"])
+    ranked = ok + failed
+    for rank, row in enumerate(ranked, start=1):
+        row["rank"] = rank
+    return ranked
+
+
+# -------------------------------
+# Search
+# -------------------------------
+
+def run_halving(
+    spec: sweep.SweepSpec,
+    param_list: List[Dict[str, Any]],
+    eta: int = 3,
+    rungs: int = 3,
+    process: int = -1,
+    sort_key: str = "final_return",
+    drawdown_limit: Optional[float] = None,
+    check_interval: int = 30,
+    lean: bool = False,
+) -> Dict[str, Any]:
+    """
+    successive halving을 실행하고 결과를 반환
+    lean이 True이면 보고서 파일과 그래프 없이 요약 지표만 계산한다
+
+    Returns:
+        {
+            "ranked": 마지막 rung까지 남은 설정이 앞에 오는 결과 행 리스트 (rank 포함),
+            "rungs": rung 별 통계 리스트,
+            "turns": 실행한 캔들 턴 수,
+            "exhaustive_turns": 모든 설정을 전체 기간 실행할 때의 캔들 턴 수,
+        }
+    """
+    schedule = make_rungs(spec, eta, rungs)
+    process_num = sweep.get_process_num(process, len(param_list))
+    latest = {}
+    rung_stats = []
+    idx_list = list(range(len(param_list)))
+
+    started = time.perf_counter()
+    with sweep.open_worker_pool(spec, process_num) as pool:
+        for rung, info in enumerate(schedule):
+            if len(idx_list) == 0:
+                break
+
+            tasks = sweep.make_tasks(
+                spec,
+                [param_list[idx] for idx in idx_list],
+                end=info["end"],
+                drawdown_limit=drawdown_limit,
+                check_interval=check_interval,
+                idx_list=idx_list,
+                lean=lean,
+            )
+            results = sweep.evaluate(pool, tasks, label=f"Halving rung {rung}")
+            for row in results:
+                row["rung"] = rung
+                latest[row["idx"]] = row
+
+            stats = {
+                "rung": rung,
+                "configs": len(tasks),
+                "candles": info["candles"],
+                "turns": sum(row["turns"] for row in results),
+                "pruned": sum(1 for row in results if row["pruned"]),
+                "failed": sum(1 for row in results if not row["ok"]),
+            }
+            rung_stats.append(stats)
+            print(
+                f"[Halving] rung {rung}: {stats['configs']} configs x {stats['candles']} candles, "
+                f"turns {stats['turns']}, pruned {stats['pruned']}, failed {stats['failed']}",
+                flush=True,
+            )
+
+            if rung < len(schedule) - 1:
+                idx_list = promote(results, eta, sort_key)
+
+    ranked = rank_rows(list(latest.values()), sort_key)
+
+    turns = sum(stats["turns"] for stats in rung_stats)
+    exhaustive_turns = len(param_list) * count_candles(spec)
+    elapsed = time.perf_counter() - started
+    print(f"[Halving] {len(param_list)} configs, {process_num} process(es), {elapsed:.2f} sec", flush=True)
+    return {
+        "ranked": ranked,
+        "rungs": rung_stats,
+        "turns": turns,
+        "exhaustive_turns": exhaustive_turns,
+    }
+
+def print_savings(turns: int, exhaustive_turns: int) -> None:
+    saved = exhaustive_turns - turns
+    ratio = saved / exhaustive_turns * 100 if exhaustive_turns > 0 else 0.0
+    print(
+        f"[Halving] candle-turns {turns} / exhaustive grid {exhaustive_turns}, "
+        f"saved {saved} ({ratio:.1f}%)",
+        flush=True,
+    )
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="successive halving parameter search")
+    p.add_argument("--space", required=True, help="parameter space json path")
+    p.add_argument("--strategy", default="BBI-V3-SPEC-V16-VOL", help="strategy code")
+    p.add_argument("--currency", default="BTC", help="ex) BTC, ETH")
+    p.add_argument("--from_dash_to", default="251121.000000-251122.000000",
+                   help="period, ex) 251121.000000-251122.000000")
+    p.add_argument("--budget", type=int, default=1000000, help="budget (KRW)")
+    p.add_argument("--term", type=int, default=60, help="candle interval seconds (60, 180, 300, ...)")
+    p.add_argument("--random", type=int, default=0, help="random search count, 0 for grid search")
+    p.add_argument("--seed", type=int, default=None, help="random search seed")
+    p.add_argument("--eta", type=int, default=3, help="keep top 1/eta configs at each rung")
+    p.add_argument("--rungs", type=int, default=3, help="rung count, last rung runs the full period")
+    p.add_argument("--max_drawdown", type=float, default=None,
+                   help="stop a run when its drawdown (%%) reaches this value")
+    p.add_argument("--check_interval", type=int, default=30, help="turns between drawdown checks")
+    p.add_argument("--process", type=int, default=-1, help="process count, -1 to use cpu count")
+    p.add_argument("--sort", default="final_return", choices=sweep.SORT_KEYS, help="ranking metric")
+    p.add_argument("--lean", action="store_true", help="compute metrics only, without report files and graphs")
+    p.add_argument("--top", type=int, default=10, help="rows to print")
+    p.add_argument("--out", default="", help="ranked result csv path")
+    return p.parse_args(argv)
+
+def main(argv: list[str]) -> int:
+    ns = parse_args(argv)
+    param_list = sweep.make_param_list(ns)
+    if len(param_list) == 0:
+        print("[Halving][ERR] empty parameter list", flush=True)
+        return 2
+
+    spec = sweep.make_spec(ns)
+    out_path = ns.out or os.path.join("output", f"halving_{spec.strategy}_{ns.from_dash_to}.csv")
+
+    print(
+        f"[Halving] {spec.strategy} {spec.currency} {spec.start} ~ {spec.end}, "
+        f"{len(param_list)} configs, eta {ns.eta}, rungs {ns.rungs}",
+        flush=True,
+    )
+    result = run_halving(
+        spec,
+        param_list,
+        eta=ns.eta,
+        rungs=ns.rungs,
+        process=ns.process,
+        sort_key=ns.sort,
+        drawdown_limit=ns.max_drawdown,
+        check_interval=ns.check_interval,
+        lean=ns.lean,
+    )
+    sweep.write_table(out_path, result["ranked"], sweep.RESULT_FIELDS + ("rung",))
+    sweep.print_table(result["ranked"], ns.top)
+    print_savings(result["turns"], result["exhaustive_turns"])
+    print(f"[Halving] ranked table: {out_path}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
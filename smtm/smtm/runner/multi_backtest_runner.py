@@ -170,6 +170,8 @@ def normalize_engine_result(
 
     roi = pick_float("roi", "profit_rate", "pnl_rate", "return", default=0.0)
     mdd = pick_float("max_drawdown", "mdd", default=0.0)
+    metrics = engine_result.get("metrics")
+    metrics = metrics if isinstance(metrics, dict) else {}
     trades = pick_int("trades", "trade_count", default=0)
 
     chart_exists = bool(chart_path and os.path.exists(chart_path))
@@ -188,6 +190,9 @@ def normalize_engine_result(
         "profit_rate": roi,
         "trades": trades,
         "max_drawdown": mdd,
+        "sharpe": pick_float("sharpe", default=0.0),
+        "sortino": pick_float("sortino", default=0.0),
+        "metrics": metrics,
         "chart_exists": chart_exists,
         "chart_path": chart_path,
         "windows_csv_exists": csv_exists,
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+포트폴리오 백테스트 (여러 마켓, 하나의 현금 잔고)
+
+- 통화마다 같은 전략을 만들어 StrategyPortfolio로 묶고, 같은 시간축으로 정렬한 캔들을 한 턴에 모두 전달한다.
+- PortfolioVirtualMarket이 한 턴의 요청을 모두 처리한다. 매도를 먼저 처리하므로 같은 턴에 매도 대금으로 매수할 수 있다.
+- 기존 SimulationOperator와 Analyzer를 그대로 사용하므로 수익률 리포트는 단일 마켓 백테스트와 같은 형식이다.
+
+사용법:
+    python -m smtm.runner.portfolio_backtest --strategy SMA --currencies BTC,ETH,XRP \\
+        --from_dash_to 251121.000000-251122.000000 --budget 1000000
+    python -m smtm.runner.portfolio_backtest --strategy RSI --currencies BTC,ETH --weights 0.7,0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Any, Dict, List, Optional
+
+from smtm.config import Config
+from smtm.date_converter import DateConverter
+from smtm.analyzer.analyzer import Analyzer
+from smtm.simulation_operator import SimulationOperator
+from smtm.data.simulation_portfolio_data_provider import SimulationPortfolioDataProvider
+from smtm.trader.portfolio_simulation_trader import PortfolioSimulationTrader
+from smtm.strategy.strategy_portfolio import StrategyPortfolio
+
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def get_initialized_operator(
+    budget: int,
+    strategy_code: str,
+    currencies: List[str],
+    start: str,
+    end: str,
+    tag: str,
+    weights: Optional[List[float]] = None,
+    strategy_params: Optional[Dict[str, Any]] = None,
+) -> SimulationOperator:
+    """포트폴리오 구성 요소로 초기화된 SimulationOperator 반환"""
+    dt = DateConverter.to_end_min(start_iso=start, end_iso=end, interval_min=Config.candle_interval / 60)
+    if dt is None:
+        raise UserWarning(f"Invalid Period! {start} ~ {end}")
+    end = dt[0][1]
+    count = dt[0][2]
+
+    data_provider = SimulationPortfolioDataProvider(currencies=currencies, interval=Config.candle_interval)
+    data_provider.initialize_simulation(end=end, count=count)
+
+    markets = data_provider.markets
+    if weights is not None:
+        if len(weights) != len(markets):
+            raise UserWarning(f"weight count is different from currency count: {weights}")
+        weights = dict(zip(markets, weights))
+    strategy = StrategyPortfolio.create(strategy_code, markets, weights=weights, params=strategy_params)
+    strategy.is_simulation = True
+
+    trader = PortfolioSimulationTrader(currencies=markets, interval=Config.candle_interval)
+    trader.initialize_simulation(end=end, count=count, budget=budget)
+
+    analyzer = Analyzer()
+    analyzer.is_simulation = True
+
+    operator = SimulationOperator(periodic_record_enable=False)
+    operator.initialize(data_provider, strategy, trader, analyzer, budget=budget)
+    operator.tag = tag
+    operator.set_interval(0)
+    return operator
+
+
+def run(operator: SimulationOperator) -> Dict[str, Any]:
+    """시뮬레이션을 끝까지 실행하고 요약 결과를 반환"""
+    operator.run_to_completion()
+    report = None
+
+    def get_score_callback(score):
+        nonlocal report
+        report = score
+
+    operator.get_score(get_score_callback)
+    account = operator.trader.get_account_info()
+    trades = {market: 0 for market in operator.trader.markets}
+    for result in operator.analyzer.get_trading_results():
+        market = result.get("market")
+        if market in trades:
+            trades[market] += 1
+    operator.stop()
+    return {"report": report, "account": account, "trades": trades}
+
+
+def print_summary(result: Dict[str, Any]) -> None:
+    report = result["report"]
+    account = result["account"]
+    if report is not None and report[0] is not None:
+        print(
+            f"[Portfolio] start {report[0]:.0f}, final {report[1]:.0f}, return {report[2]}%, "
+            f"min {report[6]}%, max {report[7]}%",
+            flush=True,
+        )
+    print(f"[Portfolio] balance {account['balance']}", flush=True)
+    for market, count in result["trades"].items():
+        avg_price, amount = account["asset"].get(market, (0, 0))
+        print(
+            f"  {market:>10}: trades {count:4}, amount {amount}, avg {avg_price}, "
+            f"price {account['quote'][market]}",
+            flush=True,
+        )
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="portfolio backtest over several markets")
+    p.add_argument("--strategy", default="SMA", help="strategy code for every market")
+    p.add_argument("--currencies", default="BTC,ETH", help="comma separated, ex) BTC,ETH,XRP")
+    p.add_argument("--weights", default="", help="comma separated budget weights, default equal")
+    p.add_argument("--from_dash_to", default="251121.000000-251122.000000",
+                   help="simulation period, ex) 251121.000000-251122.000000")
+    p.add_argument("--budget", type=int, default=1000000, help="budget (KRW)")
+    p.add_argument("--term", type=int, default=60, help="candle interval seconds (60, 180, 300, ...)")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    ns = parse_args(argv)
+    Config.candle_interval = ns.term
+    currencies = [c.strip().upper() for c in ns.currencies.split(",") if c.strip()]
+    weights = [float(w) for w in ns.weights.split(",")] if ns.weights else None
+    start_end = ns.from_dash_to.split("-")
+    start = DateConverter.num_2_datetime(start_end[0]).strftime(ISO_FORMAT)
+    end = DateConverter.num_2_datetime(start_end[1]).strftime(ISO_FORMAT)
+
+    print(f"[Portfolio] {ns.strategy} {','.join(currencies)} {start} ~ {end}", flush=True)
+    operator = get_initialized_operator(
+        ns.budget, ns.strategy, currencies, start, end, f"PFO-{ns.strategy}-{ns.from_dash_to}", weights=weights
+    )
+    print_summary(run(operator))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+전략 비교 백테스트 (하나의 데이터 스트림, 여러 전략)
+
+- 같은 기간의 캔들을 SimulationDataProvider로 한 번만 로딩하고 BroadcastDataProvider로 모든 전략에 나눠 준다.
+  get_info가 만드는 캔들 복사본도 턴마다 한 번만 만들어 모든 전략이 공유한다.
+- 전략마다 자신의 VirtualMarket 계좌(SimulationTrader)와 Analyzer를 가지며,
+  SimulationOperator.run_lockstep으로 모든 전략을 한 루프에서 같은 턴씩 진행한다.
+- VirtualMarket의 캔들은 CandleCache를 통해 같은 리스트를 공유하므로 전략 수와 관계없이 한 번만 로딩한다.
+- 전략별 결과를 나란히 비교하는 표를 출력하고 CSV로 저장한다.
+
+사용법:
+    python -m smtm.runner.strategy_compare --strategies BNH,SMA,BBI-V3-SPEC-V16-VOL --currency BTC \\
+        --from_dash_to 251121.000000-251122.000000 --budget 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from smtm.config import Config
+from smtm.date_converter import DateConverter
+from smtm.analyzer.analyzer import Analyzer
+from smtm.simulation_operator import SimulationOperator
+from smtm.data.simulation_data_provider import SimulationDataProvider
+from smtm.data.broadcast_data_provider import BroadcastDataProvider
+from smtm.strategy.strategy_factory import StrategyFactory
+from smtm.trader.simulation_trader import SimulationTrader
+
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%S"
+COMPARE_FIELDS = (
+    "strategy", "name", "start_value", "final_value", "final_return", "min_return", "max_return", "trades", "error",
+)
+
+
+def get_initialized_operators(
+    budget: int,
+    strategy_codes: List[str],
+    currency: str,
+    start: str,
+    end: str,
+    tag: str,
+    strategy_params: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[SimulationOperator]:
+    """
+    하나의 데이터 스트림을 공유하는 전략별 SimulationOperator 리스트를 반환
+
+    strategy_params: {전략 코드: 전략 파라미터}
+    """
+    dt = DateConverter.to_end_min(start_iso=start, end_iso=end, interval_min=Config.candle_interval / 60)
+    if dt is None:
+        raise UserWarning(f"Invalid Period! {start} ~ {end}")
+    end = dt[0][1]
+    count = dt[0][2]
+
+    data_provider = SimulationDataProvider(currency=currency, interval=Config.candle_interval)
+    data_provider.initialize_simulation(end=end, count=count)
+    broadcast = BroadcastDataProvider(data_provider)
+    strategy_params = strategy_params or {}
+
+    operators = []
+    for code in strategy_codes:
+        strategy = StrategyFactory.create(code, params=strategy_params.get(code))
+        if strategy is None:
+            raise UserWarning(f"Invalid Strategy! {code}")
+        strategy.is_simulation = True
+
+        trader = SimulationTrader(currency=currency, interval=Config.candle_interval)
+        trader.initialize_simulation(end=end, count=count, budget=budget)
+
+        analyzer = Analyzer()
+        analyzer.is_simulation = True
+
+        operator = SimulationOperator(periodic_record_enable=False)
+        operator.initialize(broadcast.create_view(), strategy, trader, analyzer, budget=budget)
+        operator.tag = f"{tag}-{code}"
+        operator.set_interval(0)
+        operators.append(operator)
+    return operators
+
+
+def compare(operators: List[SimulationOperator]) -> List[Dict[str, Any]]:
+    """모든 전략을 한 루프에서 끝까지 실행하고 전략별 결과 행을 반환"""
+    SimulationOperator.run_lockstep(operators)
+    rows = []
+    for operator in operators:
+        row = {field: "" for field in COMPARE_FIELDS}
+        row["strategy"] = operator.strategy.CODE
+        row["name"] = operator.strategy.NAME
+        report = None
+
+        def get_score_callback(score):
+            nonlocal report
+            report = score
+
+        operator.get_score(get_score_callback)
+        if report is None or report[0] is None:
+            row["error"] = "no report"
+        else:
+            row["start_value"] = report[0]
+            row["final_value"] = report[1]
+            row["final_return"] = report[2]
+            row["min_return"] = report[6]
+            row["max_return"] = report[7]
+        row["trades"] = len(operator.analyzer.get_trading_results())
+        operator.stop()
+        rows.append(row)
+    return rows
+
+
+def write_table(path: str, rows: List[Dict[str, Any]]) -> None:
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COMPARE_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'strategy':>22} {'final_value':>12} {'return':>9} {'min':>9} {'max':>9} {'trades':>7}", flush=True)
+    for row in rows:
+        if row["error"]:
+            print(f"{row['strategy']:>22} {row['error']}", flush=True)
+            continue
+        print(
+            f"{row['strategy']:>22} {row['final_value']:>12.0f} {row['final_return']:>8.3f}% "
+            f"{row['min_return']:>8.3f}% {row['max_return']:>8.3f}% {row['trades']:>7}",
+            flush=True,
+        )
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="compare strategies over one data stream")
+    p.add_argument("--strategies", default="BNH,SMA,RSI", help="comma separated strategy codes")
+    p.add_argument("--currency", default="BTC", help="ex) BTC, ETH")
+    p.add_argument("--from_dash_to", default="251121.000000-251122.000000",
+                   help="simulation period, ex) 251121.000000-251122.000000")
+    p.add_argument("--budget", type=int, default=1000000, help="budget (KRW)")
+    p.add_argument("--term", type=int, default=60, help="candle interval seconds (60, 180, 300, ...)")
+    p.add_argument("--out", default="", help="comparison csv path")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    ns = parse_args(argv)
+    Config.candle_interval = ns.term
+    codes = [c.strip() for c in ns.strategies.split(",") if c.strip()]
+    if len(codes) == 0:
+        print("[Compare][ERR] empty strategy list", flush=True)
+        return 2
+
+    start_end = ns.from_dash_to.split("-")
+    start = DateConverter.num_2_datetime(start_end[0]).strftime(ISO_FORMAT)
+    end = DateConverter.num_2_datetime(start_end[1]).strftime(ISO_FORMAT)
+    out_path = ns.out or os.path.join("output", f"compare_{ns.currency.upper()}_{ns.from_dash_to}.csv")
+
+    print(f"[Compare] {','.join(codes)} {ns.currency.upper()} {start} ~ {end}", flush=True)
+    started = time.perf_counter()
+    operators = get_initialized_operators(
+        ns.budget, codes, ns.currency.upper(), start, end, f"CMP-{ns.from_dash_to}"
+    )
+    rows = compare(operators)
+    write_table(out_path, rows)
+    print_table(rows)
+    print(f"[Compare] {time.perf_counter() - started:.1f}s, table: {out_path}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
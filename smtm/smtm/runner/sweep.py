@@ -0,0 +1,474 @@
+# -*- coding: utf-8 -*-
+"""
+전략 파라미터 스윕 엔진 (grid / random search)
+
+- 전략 클래스 속성(DRAWDOWN_THRESHOLDS, BUY_WEIGHTS, VOL_SPIKE_FACTOR, ...)의 조합을 만들어
+  설정마다 StrategyFactory.create(code, params)로 주입한다. (전역 튜닝 파일 사용 안 함)
+- 캔들은 부모 프로세스에서 한 번 로딩해서 공유 메모리(SharedCandleStore)로 워커들과 공유한다.
+- 워커는 설정을 하나씩 가져가서(imap_unordered, chunksize=1) 실행하므로 코어 수에 비례해서 빨라진다.
+- 결과는 정렬 기준 지표 순으로 순위를 매겨 CSV 표로 저장한다.
+
+space 파일 (json):
+    grid: {"VOL_SPIKE_FACTOR": [2.0, 2.5, 3.0], "BUY_WEIGHTS": [[7, 5, 3.6, 2.4, 2], [5, 5, 5, 5, 5]]}
+    random: 리스트는 그 중 하나를 고르고, {"min": 1.5, "max": 3.5}는 구간에서 균등 분포로 고른다
+            (min, max가 모두 정수면 정수)
+
+사용법:
+    python -m smtm.runner.sweep --space space.json --strategy BBI-V3-SPEC-V16-VOL --currency BTC \\
+        --from_dash_to 251121.000000-251122.000000 --budget 1000000 --term 60
+    python -m smtm.runner.sweep --space space.json --random 300 --seed 7 --process 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import Pool, current_process
+from typing import Any, Dict, List, Optional
+
+from smtm.config import Config
+from smtm.log_manager import LogManager
+from smtm.date_converter import DateConverter
+from smtm.controller.mass_simulator import MassSimulator
+from smtm.data.candle_cache import CandleCache
+from smtm.data.shared_candle_store import SharedCandleStore
+
+
+# 결과 행에 복사하는 analyzer 성과 지표 (max_drawdown은 별도 열)
+METRIC_FIELDS = ("sharpe", "sortino", "max_drawdown_duration", "exposure", "win_rate")
+SORT_KEYS = (
+    "final_return", "max_return", "min_return", "sharpe", "sortino", "win_rate",
+    "max_drawdown", "max_drawdown_duration",
+)
+# 작을수록 좋은 정렬 기준, 나머지는 클수록 좋다
+ASCENDING_SORT_KEYS = ("max_drawdown", "max_drawdown_duration")
+RESULT_FIELDS = (
+    ("rank", "idx", "final_return", "max_return", "min_return", "trades", "turns", "max_drawdown")
+    + METRIC_FIELDS
+    + ("pruned", "elapsed_sec", "error")
+)
+
+
+@dataclass
+class SweepSpec:
+    strategy: str
+    currency: str
+    start: str
+    end: str
+    budget: int
+    term: int
+
+
+# -------------------------------
+# Parameter space
+# -------------------------------
+
+def load_space(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        space = json.load(f)
+    if not isinstance(space, dict) or len(space) == 0:
+        raise ValueError("space JSON must be a non-empty dict")
+    return space
+
+def make_grid(space: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """모든 값 조합(cartesian product)의 파라미터 리스트를 반환"""
+    names = list(space.keys())
+    for name in names:
+        if not isinstance(space[name], list) or len(space[name]) == 0:
+            raise ValueError(f"grid values of {name} must be a non-empty list")
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+def make_random(space: Dict[str, Any], count: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """space에서 count개의 파라미터를 무작위로 뽑아 반환, seed가 같으면 결과도 같다"""
+    rng = random.Random(seed)
+    param_list = []
+    for _ in range(count):
+        params = {}
+        for name, values in space.items():
+            if isinstance(values, list):
+                params[name] = rng.choice(values)
+            elif isinstance(values, dict) and "min" in values and "max" in values:
+                low, high = values["min"], values["max"]
+                if isinstance(low, int) and isinstance(high, int):
+                    params[name] = rng.randint(low, high)
+                else:
+                    params[name] = rng.uniform(low, high)
+            else:
+                raise ValueError(f"random space of {name} must be a list or {{min, max}}")
+        param_list.append(params)
+    return param_list
+
+
+# -------------------------------
+# Drawdown pruning
+# -------------------------------
+
+class DrawdownPruner:
+    """
+    SimulationOperator.run_to_completion의 stop_condition으로 사용하는 낙폭 기준 조기 종료 조건
+
+    - 매 턴 호출되어 진행한 턴(캔들) 수를 센다.
+    - check_interval 턴마다 analyzer의 score record(체결 시점 누적 수익률)와
+      현재 평가 금액으로 만든 score record(저장하지 않음)로 최대 낙폭(%)을 갱신한다.
+    - 최대 낙폭이 limit(%) 이상이면 True를 반환해서 시뮬레이션을 중단시킨다.
+    """
+
+    def __init__(self, limit: Optional[float] = None, check_interval: int = 30):
+        self.limit = limit
+        self.check_interval = max(1, int(check_interval))
+        self.turns = 0
+        self.peak = 1.0
+        self.max_drawdown = 0.0
+        self.pruned = False
+        self.seen = 0
+
+    def update(self, cumulative_return: float) -> None:
+        """누적 수익률(%) 하나로 고점과 최대 낙폭을 갱신"""
+        equity = 1 + cumulative_return / 100
+        if equity > self.peak:
+            self.peak = equity
+        drawdown = (self.peak - equity) / self.peak * 100
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+
+    def __call__(self, operator: Any) -> bool:
+        self.turns += 1
+        if self.limit is None or self.turns % self.check_interval != 0:
+            return False
+
+        analyzer = operator.analyzer
+        score_list = analyzer.data_repository.score_list
+        for record in score_list[self.seen:]:
+            if "cumulative_return" in record:
+                self.update(record["cumulative_return"])
+        self.seen = len(score_list)
+
+        start_asset_info = analyzer.data_repository.start_asset_info
+        if start_asset_info is not None and analyzer.get_asset_info_func is not None:
+            probe = analyzer.data_analyzer.create_score_record(
+                start_asset_info, analyzer.get_asset_info_func()
+            )
+            if "cumulative_return" in probe:
+                self.update(probe["cumulative_return"])
+
+        if self.max_drawdown >= self.limit:
+            self.pruned = True
+        return self.pruned
+
+
+# -------------------------------
+# Worker
+# -------------------------------
+
+def _init_worker(descriptor: Optional[Dict[str, Any]], candle_interval: int, log_level: int) -> None:
+    """워커 프로세스 초기화, 공유 캔들에 연결"""
+    Config.candle_interval = candle_interval
+    LogManager.set_stream_level(log_level)
+    LogManager.change_log_file(f"sweep-{current_process().name}.log")
+    if descriptor is not None:
+        CandleCache.get_instance().set_store(SharedCandleStore.attach(descriptor))
+
+def run_config(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    파라미터 설정 하나를 시뮬레이션하고 결과 행을 반환
+
+    task: {"idx", "params", "strategy", "currency", "start", "end", "budget",
+           "drawdown_limit"(선택), "check_interval"(선택), "curve"(선택), "lean"(선택)}
+    curve가 True이면 결과 행에 [[date_time, cumulative_return], ...] 수익률 곡선을 추가한다
+    lean이 True이면 보고서 파일과 그래프 없이 요약 지표만 계산한다
+    """
+    row = {
+        "idx": task["idx"],
+        "params": task["params"],
+        "ok": False,
+        "final_return": None,
+        "max_return": None,
+        "min_return": None,
+        "trades": 0,
+        "turns": 0,
+        "max_drawdown": 0.0,
+        **{key: None for key in METRIC_FIELDS},
+        "pruned": False,
+        "elapsed_sec": 0.0,
+        "error": "",
+    }
+    pruner = DrawdownPruner(task.get("drawdown_limit"), task.get("check_interval", 30))
+    started = time.perf_counter()
+    try:
+        operator = MassSimulator.get_initialized_operator(
+            task["budget"],
+            task["strategy"],
+            0,
+            task["currency"],
+            task["start"],
+            task["end"],
+            f"SWEEP-{task['idx']}",
+            strategy_params=task["params"],
+            lean=task.get("lean", False),
+        )
+        report = MassSimulator.run_single(operator, stop_condition=pruner)
+        if report is None or report[0] is None:
+            raise RuntimeError("no report")
+        row["final_return"] = report[2]
+        row["min_return"] = report[6]
+        row["max_return"] = report[7]
+        row["trades"] = len(operator.analyzer.get_trading_results())
+        # 낙폭은 보고서를 만들 때 전체 구간으로 계산한 지표를 사용, pruner는 중단 판단에만 사용
+        metrics = operator.analyzer.metrics
+        row["max_drawdown"] = metrics.get("max_drawdown", 0.0)
+        for key in METRIC_FIELDS:
+            row[key] = metrics.get(key)
+        if task.get("curve", False):
+            row["curve"] = [
+                [record["date_time"], record["cumulative_return"]]
+                for record in operator.analyzer.data_repository.score_list
+                if "cumulative_return" in record
+            ]
+        row["ok"] = True
+    except Exception as e:
+        row["error"] = str(e)
+    row["turns"] = pruner.turns
+    row["pruned"] = pruner.pruned
+    row["elapsed_sec"] = round(time.perf_counter() - started, 3)
+    return row
+
+
+# -------------------------------
+# Ranking / output
+# -------------------------------
+
+def check_sort_key(sort_key: str) -> None:
+    if sort_key not in SORT_KEYS:
+        raise ValueError(f"sort key must be one of {SORT_KEYS}")
+
+def sort_value(row: Dict[str, Any], sort_key: str) -> float:
+    """좋은 결과일수록 작은 정렬 값, 지표가 없는 결과는 맨 뒤"""
+    value = row.get(sort_key)
+    if value is None:
+        return float("inf")
+    return value if sort_key in ASCENDING_SORT_KEYS else -value
+
+def rank_results(results: List[Dict[str, Any]], sort_key: str = "final_return") -> List[Dict[str, Any]]:
+    """
+    성공한 결과는 sort_key 순위(낙폭 지표는 오름차순, 나머지는 내림차순),
+    낙폭으로 중단된 결과와 실패한 결과는 그 뒤에 두고 rank를 매겨 반환
+    """
+    check_sort_key(sort_key)
+    ok = sorted(
+        (r for r in results if r["ok"]),
+        key=lambda r: (r.get("pruned", False), sort_value(r, sort_key), r["idx"]),
+    )
+    failed = sorted((r for r in results if not r["ok"]), key=lambda r: r["idx"])
+    ranked = ok + failed
+    for rank, row in enumerate(ranked, start=1):
+        row["rank"] = rank
+    return ranked
+
+def write_table(path: str, ranked: List[Dict[str, Any]], fields: tuple = RESULT_FIELDS) -> None:
+    """순위 표를 CSV로 저장, 파라미터는 이름별 열로 쓰고 리스트 값은 JSON 문자열로 쓴다"""
+    param_names: List[str] = []
+    for row in ranked:
+        for name in row["params"]:
+            if name not in param_names:
+                param_names.append(name)
+
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(fields) + param_names)
+        for row in ranked:
+            values = [row.get(field) for field in fields]
+            for name in param_names:
+                value = row["params"].get(name)
+                values.append(json.dumps(value) if isinstance(value, (list, dict)) else value)
+            writer.writerow(values)
+    os.replace(tmp, path)
+
+def print_table(ranked: List[Dict[str, Any]], top: int = 10) -> None:
+    print(
+        f"{'rank':>4} {'idx':>5} {'final':>8} {'max':>8} {'min':>8} {'mdd':>8} {'sharpe':>8} {'trades':>6}  params",
+        flush=True,
+    )
+    for row in ranked[:top]:
+        if not row["ok"]:
+            print(f"{row['rank']:>4} {row['idx']:>5} failed: {row['error']}", flush=True)
+            continue
+        pruned = " (pruned)" if row.get("pruned") else ""
+        print(
+            f"{row['rank']:>4} {row['idx']:>5} {row['final_return']:>8.3f} {row['max_return']:>8.3f} "
+            f"{row['min_return']:>8.3f} {row['max_drawdown']:>8.3f} {row.get('sharpe') or 0.0:>8.3f} "
+            f"{row['trades']:>6}  {json.dumps(row['params'])}{pruned}",
+            flush=True,
+        )
+
+
+# -------------------------------
+# Sweep
+# -------------------------------
+
+def get_process_num(process: int, task_count: int) -> int:
+    process_num = process if process > 0 else (os.cpu_count() or 1)
+    return max(1, min(process_num, task_count))
+
+def make_tasks(
+    spec: SweepSpec,
+    param_list: List[Dict[str, Any]],
+    end: Optional[str] = None,
+    drawdown_limit: Optional[float] = None,
+    check_interval: int = 30,
+    idx_list: Optional[List[int]] = None,
+    lean: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    param_list로 run_config 작업 리스트를 만든다, end가 주어지면 spec.start ~ end 구간만 실행
+    lean이 True이면 보고서 파일과 그래프 없이 요약 지표만 계산한다
+    """
+    if idx_list is None:
+        idx_list = list(range(len(param_list)))
+    return [
+        {
+            "idx": idx,
+            "params": params,
+            "strategy": spec.strategy,
+            "currency": spec.currency,
+            "start": spec.start,
+            "end": end or spec.end,
+            "budget": spec.budget,
+            "drawdown_limit": drawdown_limit,
+            "check_interval": check_interval,
+            "lean": lean,
+        }
+        for idx, params in zip(idx_list, param_list)
+    ]
+
+@contextmanager
+def open_worker_pool(spec: SweepSpec, process_num: int):
+    """spec 구간의 캔들을 공유 메모리에 올리고 그 캔들을 쓰는 프로세스 풀을 연다"""
+    Config.candle_interval = spec.term
+    store = MassSimulator.load_shared_store(spec.currency, [{"start": spec.start, "end": spec.end}])
+    descriptor = store.get_descriptor() if store is not None else None
+    try:
+        with Pool(
+            processes=process_num,
+            initializer=_init_worker,
+            initargs=(descriptor, spec.term, Config.operation_log_level),
+        ) as pool:
+            yield pool
+    finally:
+        if store is not None:
+            store.close()
+
+def evaluate(pool: Any, tasks: List[Dict[str, Any]], label: str = "Sweep") -> List[Dict[str, Any]]:
+    """작업을 풀에 하나씩 나눠 주고(imap_unordered, chunksize=1) 결과 행 리스트를 반환"""
+    results = []
+    started = time.perf_counter()
+    for row in pool.imap_unordered(run_config, tasks, chunksize=1):
+        results.append(row)
+        if len(results) % max(1, len(tasks) // 20) == 0 or len(results) == len(tasks):
+            elapsed = time.perf_counter() - started
+            print(
+                f"[{label}] {len(results)}/{len(tasks)} done, "
+                f"{len(results) / elapsed:.2f} configs/sec",
+                flush=True,
+            )
+    return results
+
+def run_sweep(
+    spec: SweepSpec,
+    param_list: List[Dict[str, Any]],
+    process: int = -1,
+    sort_key: str = "final_return",
+    drawdown_limit: Optional[float] = None,
+    lean: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    param_list의 모든 설정을 프로세스 풀에서 실행하고 순위가 매겨진 결과 리스트를 반환
+    """
+    process_num = get_process_num(process, len(param_list))
+    tasks = make_tasks(spec, param_list, drawdown_limit=drawdown_limit, lean=lean)
+
+    started = time.perf_counter()
+    with open_worker_pool(spec, process_num) as pool:
+        results = evaluate(pool, tasks)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"[Sweep] {len(tasks)} configs, {process_num} process(es), {elapsed:.2f} sec, "
+        f"{len(tasks) / elapsed:.2f} configs/sec",
+        flush=True,
+    )
+    return rank_results(results, sort_key)
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(prog="sweep", description="전략 파라미터 grid/random 스윕")
+    p.add_argument("--space", required=True, help="parameter space json path")
+    p.add_argument("--strategy", default="BBI-V3-SPEC-V16-VOL", help="strategy code")
+    p.add_argument("--currency", default="BTC", help="ex) BTC, ETH")
+    p.add_argument("--from_dash_to", default="251121.000000-251122.000000",
+                   help="simulation period ex) 251121.000000-251122.000000")
+    p.add_argument("--budget", type=int, default=1000000, help="budget (KRW)")
+    p.add_argument("--term", type=int, default=60, help="candle interval seconds (60, 180, 300, ...)")
+    p.add_argument("--random", type=int, default=0, help="random search count, 0 for grid search")
+    p.add_argument("--seed", type=int, default=None, help="random search seed")
+    p.add_argument("--process", type=int, default=-1, help="process count, -1 to use cpu count")
+    p.add_argument("--sort", default="final_return", choices=SORT_KEYS, help="ranking metric")
+    p.add_argument("--max_drawdown", type=float, default=None,
+                   help="stop a run when its drawdown (%%) reaches this value")
+    p.add_argument("--lean", action="store_true", help="compute metrics only, without report files and graphs")
+    p.add_argument("--top", type=int, default=10, help="rows to print")
+    p.add_argument("--out", default="", help="ranked result csv path")
+    return p.parse_args(argv)
+
+def make_spec(ns: argparse.Namespace) -> SweepSpec:
+    start_end = ns.from_dash_to.split("-")
+    iso_format = "%Y-%m-%dT%H:%M:%S"
+    return SweepSpec(
+        strategy=ns.strategy,
+        currency=ns.currency.upper(),
+        start=DateConverter.num_2_datetime(start_end[0]).strftime(iso_format),
+        end=DateConverter.num_2_datetime(start_end[1]).strftime(iso_format),
+        budget=ns.budget,
+        term=ns.term,
+    )
+
+def make_param_list(ns: argparse.Namespace) -> List[Dict[str, Any]]:
+    space = load_space(ns.space)
+    return make_random(space, ns.random, ns.seed) if ns.random > 0 else make_grid(space)
+
+def main(argv: list[str]) -> int:
+    ns = parse_args(argv)
+    param_list = make_param_list(ns)
+    if len(param_list) == 0:
+        print("[Sweep][ERR] empty parameter list", flush=True)
+        return 2
+
+    spec = make_spec(ns)
+    out_path = ns.out or os.path.join("output", f"sweep_{spec.strategy}_{ns.from_dash_to}.csv")
+
+    print(f"[Sweep] {spec.strategy} {spec.currency} {spec.start} ~ {spec.end}, {len(param_list)} configs", flush=True)
+    ranked = run_sweep(
+        spec, param_list, process=ns.process, sort_key=ns.sort, drawdown_limit=ns.max_drawdown, lean=ns.lean
+    )
+    write_table(out_path, ranked)
+    print_table(ranked, ns.top)
+    print(f"[Sweep] ranked table: {out_path}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
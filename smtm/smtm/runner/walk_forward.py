@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+walk-forward 최적화 (튜닝 프리셋/파라미터 과최적화 검증)
+
+- 전체 기간을 train / test 창으로 나누고 step 만큼 밀면서 반복한다.
+  [train][test]
+         [train][test]  (step = test 이면 test 창이 이어져서 전체 out-of-sample 구간이 된다)
+- 각 train 창에서 후보 설정(프리셋 SAFE/BALANCED/AGGRESSIVE, --space grid/random)을 모두 실행해서
+  정렬 기준 1위를 고르고, 바로 다음 test 창에서 그 설정만 실행한다.
+- test 창의 수익률 곡선을 이어 붙여서 out-of-sample 자산 곡선을 만든다.
+- 전체 기간 캔들은 한 번만 로딩해서 공유 메모리로 올리고, 모든 창이 같은 프로세스 풀을 사용한다.
+  모든 창의 train 실행을 한 번에 풀에 넣으므로 창 수와 관계없이 코어를 계속 사용한다.
+
+사용법:
+    python -m smtm.runner.walk_forward --presets SAFE,BALANCED,AGGRESSIVE --currency BTC \\
+        --from_dash_to 251121.000000-251128.000000 --train 2d --test 1d
+    python -m smtm.runner.walk_forward --space space.json --random 50 --seed 7 --train 3d --test 1d --process 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import dataclasses
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from smtm.runner import sweep
+from smtm.strategy.tuning_presets import PRESETS
+
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%S"
+DURATION_UNITS = {"m": 60, "h": 3600, "d": 86400}
+TEST_METRIC_FIELDS = tuple(f"test_{key}" for key in sweep.METRIC_FIELDS)
+WINDOW_FIELDS = (
+    (
+        "window", "train_start", "train_end", "test_start", "test_end", "candidate",
+        "train_return", "test_return", "test_max_drawdown",
+    )
+    + TEST_METRIC_FIELDS
+    + ("test_trades", "oos_return", "error")
+)
+
+
+# -------------------------------
+# Windows / candidates
+# -------------------------------
+
+def parse_duration(text: str) -> timedelta:
+    """"2d", "12h", "90m" 형식의 기간을 timedelta로 변환"""
+    text = (text or "").strip().lower()
+    if len(text) < 2 or text[-1] not in DURATION_UNITS or not text[:-1].isdigit():
+        raise ValueError(f"invalid duration: {text}, ex) 2d, 12h, 90m")
+    return timedelta(seconds=int(text[:-1]) * DURATION_UNITS[text[-1]])
+
+def make_windows(start: str, end: str, train: timedelta, test: timedelta, step: Optional[timedelta] = None) -> List[Dict[str, str]]:
+    """
+    [start, end) 안에 들어가는 train / test 창 리스트를 반환, step이 없으면 test 길이만큼 민다
+    """
+    step = step or test
+    if train <= timedelta(0) or test <= timedelta(0) or step <= timedelta(0):
+        raise ValueError("train, test, step must be positive")
+
+    end_dt = datetime.strptime(end, ISO_FORMAT)
+    train_start = datetime.strptime(start, ISO_FORMAT)
+    windows = []
+    while train_start + train + test <= end_dt:
+        test_start = train_start + train
+        windows.append(
+            {
+                "train_start": train_start.strftime(ISO_FORMAT),
+                "train_end": test_start.strftime(ISO_FORMAT),
+                "test_start": test_start.strftime(ISO_FORMAT),
+                "test_end": (test_start + test).strftime(ISO_FORMAT),
+            }
+        )
+        train_start += step
+    return windows
+
+def make_candidates(preset_names: List[str], param_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """프리셋 이름과 파라미터 리스트로 [{"name", "params"}] 후보 리스트를 만든다"""
+    candidates = []
+    for name in preset_names:
+        if name not in PRESETS:
+            raise ValueError(f"unknown preset: {name}, one of {list(PRESETS)}")
+        candidates.append({"name": name, "params": dict(PRESETS[name])})
+    for idx, params in enumerate(param_list):
+        candidates.append({"name": f"space-{idx}", "params": params})
+    return candidates
+
+
+# -------------------------------
+# Walk-forward
+# -------------------------------
+
+def select_best(rows: List[Dict[str, Any]], sort_key: str = "final_return") -> Optional[Dict[str, Any]]:
+    """한 train 창의 결과 중 낙폭으로 중단되지 않고 성공한 1위 결과, 없으면 None"""
+    for row in sweep.rank_results(rows, sort_key):
+        if row["ok"] and not row["pruned"]:
+            return row
+    return None
+
+def stitch_equity(test_rows: List[Optional[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    창 순서대로 test 결과의 수익률 곡선을 이어 붙인 자산 곡선을 반환 (시작 자산 1.0)
+    [{"window", "date_time", "equity"}], 결과가 없는 창은 자산 변화 없이 건너뛴다
+    """
+    equity = 1.0
+    curve = []
+    for window, row in enumerate(test_rows):
+        if row is None or not row["ok"]:
+            continue
+        base = equity
+        for date_time, cumulative_return in row.get("curve", []):
+            equity = base * (1 + cumulative_return / 100)
+            curve.append({"window": window, "date_time": date_time, "equity": equity})
+        equity = base * (1 + row["final_return"] / 100)
+    return curve
+
+def run_walk_forward(
+    spec: sweep.SweepSpec,
+    windows: List[Dict[str, str]],
+    candidates: List[Dict[str, Any]],
+    process: int = -1,
+    sort_key: str = "final_return",
+    drawdown_limit: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    모든 창의 train 실행 후 창별 1위 설정으로 test 실행, 창별 결과와 이어 붙인 자산 곡선을 반환
+
+    Returns:
+        {
+            "windows": WINDOW_FIELDS를 가진 창별 결과 리스트,
+            "equity": stitch_equity 결과,
+            "oos_return": 전체 out-of-sample 수익률(%),
+        }
+    """
+    count = len(candidates)
+    param_list = [candidate["params"] for candidate in candidates]
+    # 작업 idx = 창 번호 * 후보 수 + 후보 번호
+    train_tasks = []
+    for window, info in enumerate(windows):
+        train_spec = dataclasses.replace(spec, start=info["train_start"], end=info["train_end"])
+        train_tasks.extend(
+            sweep.make_tasks(
+                train_spec,
+                param_list,
+                drawdown_limit=drawdown_limit,
+                idx_list=[window * count + idx for idx in range(count)],
+            )
+        )
+
+    process_num = sweep.get_process_num(process, len(train_tasks))
+    started = time.perf_counter()
+    with sweep.open_worker_pool(spec, process_num) as pool:
+        train_rows: List[List[Dict[str, Any]]] = [[] for _ in windows]
+        for row in sweep.evaluate(pool, train_tasks, label="WalkForward train"):
+            train_rows[row["idx"] // count].append(row)
+
+        best_list = [select_best(rows, sort_key) for rows in train_rows]
+        test_tasks = []
+        for window, (info, best) in enumerate(zip(windows, best_list)):
+            if best is None:
+                continue
+            test_spec = dataclasses.replace(spec, start=info["test_start"], end=info["test_end"])
+            task = sweep.make_tasks(test_spec, [best["params"]], idx_list=[best["idx"]])[0]
+            task["curve"] = True
+            test_tasks.append(task)
+
+        test_rows: List[Optional[Dict[str, Any]]] = [None for _ in windows]
+        for row in sweep.evaluate(pool, test_tasks, label="WalkForward test"):
+            test_rows[row["idx"] // count] = row
+
+    equity = stitch_equity(test_rows)
+    window_rows = []
+    oos_equity = 1.0
+    for window, (info, best, test) in enumerate(zip(windows, best_list, test_rows)):
+        item = dict(info)
+        item.update({"window": window, "candidate": "", "train_return": None, "test_return": None,
+                     "test_max_drawdown": None, "test_trades": None, "error": ""})
+        item.update({field: None for field in TEST_METRIC_FIELDS})
+        if best is None:
+            item["error"] = "no valid train result"
+        else:
+            item["candidate"] = candidates[best["idx"] % count]["name"]
+            item["train_return"] = best["final_return"]
+        if test is not None:
+            if test["ok"]:
+                item["test_return"] = test["final_return"]
+                item["test_max_drawdown"] = test["max_drawdown"]
+                for key in sweep.METRIC_FIELDS:
+                    item[f"test_{key}"] = test.get(key)
+                item["test_trades"] = test["trades"]
+                oos_equity *= 1 + test["final_return"] / 100
+            else:
+                item["error"] = test["error"]
+        item["oos_return"] = round((oos_equity - 1) * 100, 3)
+        window_rows.append(item)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"[WalkForward] {len(windows)} windows x {count} candidates, {process_num} process(es), "
+        f"{elapsed:.2f} sec",
+        flush=True,
+    )
+    return {"windows": window_rows, "equity": equity, "oos_return": round((oos_equity - 1) * 100, 3)}
+
+
+# -------------------------------
+# Output
+# -------------------------------
+
+def write_csv(path: str, fields: tuple, rows: List[Dict[str, Any]]) -> None:
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow([row.get(field) for field in fields])
+    os.replace(tmp, path)
+
+def print_windows(window_rows: List[Dict[str, Any]]) -> None:
+    print(f"{'win':>3} {'test_start':<19} {'candidate':<12} {'train':>8} {'test':>8} {'oos':>8}", flush=True)
+    for item in window_rows:
+        def fmt(value):
+            return f"{value:>8.3f}" if value is not None else f"{'-':>8}"
+
+        print(
+            f"{item['window']:>3} {item['test_start']:<19} {item['candidate'] or '-':<12} "
+            f"{fmt(item['train_return'])} {fmt(item['test_return'])} {fmt(item['oos_return'])}"
+            f"{'  ' + item['error'] if item['error'] else ''}",
+            flush=True,
+        )
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="walk-forward optimization")
+    p.add_argument("--presets", default=",".join(PRESETS),
+                   help="comma separated tuning presets, empty to use --space only")
+    p.add_argument("--space", default="", help="optional parameter space json path")
+    p.add_argument("--strategy", default="BBI-V3-SPEC-V16-VOL", help="strategy code")
+    p.add_argument("--currency", default="BTC", help="ex) BTC, ETH")
+    p.add_argument("--from_dash_to", default="251121.000000-251128.000000",
+                   help="period, ex) 251121.000000-251128.000000")
+    p.add_argument("--train", default="2d", help="train window, ex) 2d, 12h, 90m")
+    p.add_argument("--test", default="1d", help="test window, ex) 1d, 6h")
+    p.add_argument("--step", default="", help="window step, default test window")
+    p.add_argument("--budget", type=int, default=1000000, help="budget (KRW)")
+    p.add_argument("--term", type=int, default=60, help="candle interval seconds (60, 180, 300, ...)")
+    p.add_argument("--random", type=int, default=0, help="random search count of --space, 0 for grid")
+    p.add_argument("--seed", type=int, default=None, help="random search seed")
+    p.add_argument("--max_drawdown", type=float, default=None,
+                   help="stop a train run when its drawdown (%%) reaches this value")
+    p.add_argument("--process", type=int, default=-1, help="process count, -1 to use cpu count")
+    p.add_argument("--sort", default="final_return", choices=sweep.SORT_KEYS, help="ranking metric")
+    p.add_argument("--out", default="", help="window result csv path")
+    return p.parse_args(argv)
+
+def main(argv: list[str]) -> int:
+    ns = parse_args(argv)
+    try:
+        preset_names = [name.strip().upper() for name in ns.presets.split(",") if name.strip()]
+        param_list = sweep.make_param_list(ns) if ns.space else []
+        candidates = make_candidates(preset_names, param_list)
+        spec = sweep.make_spec(ns)
+        windows = make_windows(
+            spec.start,
+            spec.end,
+            parse_duration(ns.train),
+            parse_duration(ns.test),
+            parse_duration(ns.step) if ns.step else None,
+        )
+    except ValueError as e:
+        print(f"[WalkForward][ERR] {e}", flush=True)
+        return 2
+    if len(candidates) == 0 or len(windows) == 0:
+        print("[WalkForward][ERR] no candidate or no window in the period", flush=True)
+        return 2
+
+    out_path = ns.out or os.path.join("output", f"walk_forward_{spec.strategy}_{ns.from_dash_to}.csv")
+    equity_path = os.path.splitext(out_path)[0] + "_equity.csv"
+
+    print(
+        f"[WalkForward] {spec.strategy} {spec.currency} {spec.start} ~ {spec.end}, "
+        f"{len(windows)} windows (train {ns.train}, test {ns.test}), {len(candidates)} candidates",
+        flush=True,
+    )
+    result = run_walk_forward(
+        spec, windows, candidates, process=ns.process, sort_key=ns.sort, drawdown_limit=ns.max_drawdown
+    )
+    write_csv(out_path, WINDOW_FIELDS, result["windows"])
+    write_csv(equity_path, ("window", "date_time", "equity"), result["equity"])
+    print_windows(result["windows"])
+    print(f"[WalkForward] out-of-sample return {result['oos_return']:.3f}%", flush=True)
+    print(f"[WalkForward] windows: {out_path}, equity: {equity_path}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
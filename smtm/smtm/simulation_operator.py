@@ -1,6 +1,7 @@
 import time
 from datetime import datetime
 
+from .config import Config
 from .log_manager import LogManager
 from .operator import Operator
 from typing import Any, Dict, Optional
@@ -9,6 +10,7 @@ from typing import Any, Dict, Optional
 class SimulationOperator(Operator):
     PERIODIC_RECORD_INFO = (360, -1)
     PERIODIC_RECORD_INTERVAL_TURN = 300
+    BATCH_MAX_CONSECUTIVE_FAILURES = 3
 
     def __init__(self, periodic_record_enable=False):
         super().__init__()
@@ -19,9 +21,95 @@ class SimulationOperator(Operator):
         self.last_periodic_turn = 0
         self.periodic_record_enable = periodic_record_enable
         self.last_report = None
+        self.is_batch = False
+        self.consecutive_failures = 0
+
+    def initialize(self, data_provider, strategy, trader, analyzer, budget=500):
+        """
+        Operator.initialize 후 시뮬레이션 전체 캔들을 제공할 수 있는 DataProvider이면
+        전략이 지표를 미리 계산하도록 Strategy.precompute를 호출한다 (Config.indicator_precompute)
+        """
+        is_ready = self.state is None
+        super().initialize(data_provider, strategy, trader, analyzer, budget=budget)
+        get_candles = getattr(data_provider, "get_candles", None)
+        if is_ready and Config.indicator_precompute and get_candles is not None:
+            try:
+                self.strategy.precompute(get_candles())
+            except Exception as err:
+                self.logger.warning(f"failed to precompute strategy indicators: {err}")
+
+    def run_to_completion(self, stop_condition=None):
+        """
+        Worker 스레드와 타이머 없이 호출한 스레드에서 시뮬레이션을 끝까지 진행한다
+        Drive the simulation to the end on the calling thread without Worker thread and timer
+
+        데이터가 소진되거나 game-over 결과를 받을 때까지 매 턴을 직접 수행하며
+        start() 경로와 동일한 리포트를 만든다.
+
+        stop_condition: 매 턴이 끝난 후 operator를 인자로 호출되며, True를 반환하면
+            그 시점까지의 리포트를 만들고 시뮬레이션을 중단한다 (예: 낙폭 기준 조기 종료)
+            Called with the operator after every turn, True stops with a report so far
+
+        턴 수행이 BATCH_MAX_CONSECUTIVE_FAILURES 번 연속 실패하면 state를 "error"로 바꾸고 중단한다
+        Stops with "error" state after BATCH_MAX_CONSECUTIVE_FAILURES consecutive failed turns
+
+        Returns:
+            마지막 리포트, 시작할 수 없는 상태이면 None
+        """
+        if self._start_batch() is not True:
+            return None
+
+        while self.state == "running":
+            self._run_turn()
+            if self.state == "running" and stop_condition is not None and stop_condition(self):
+                try:
+                    self.last_report = self.analyzer.create_report(tag=self.tag)
+                except Exception as err:
+                    self.logger.error(f"failed to create report at stop condition: {err}")
+                    self.last_report = None
+                self.state = "simulation_terminated"
+                self.logger.info(f"Simulation stopped by stop condition (turn={self.current_turn}).")
+        return self.last_report
+
+    @staticmethod
+    def run_lockstep(operators):
+        """
+        여러 operator를 한 루프에서 턴 단위로 함께 진행한다
+        Drive several operators turn by turn in one loop on the calling thread
+
+        매 턴마다 진행 중인 operator의 턴을 순서대로 한 번씩 수행하므로, 같은 데이터 스트림을
+        나눠 받는 operator들이 같은 캔들을 같은 턴에 처리한다 (BroadcastDataProvider 참고)
+        각 operator는 run_to_completion과 동일한 리포트를 만든다
+
+        Returns:
+            operator 순서대로 마지막 리포트 리스트, 시작할 수 없는 operator는 None
+        """
+        running = [operator for operator in operators if operator._start_batch()]
+        while len(running) > 0:
+            for operator in running:
+                operator._run_turn()
+            running = [operator for operator in running if operator.state == "running"]
+        return [operator.last_report for operator in operators]
+
+    def _start_batch(self):
+        """배치 실행 상태로 전환하고 시작점을 기록, 시작할 수 없는 상태이면 False"""
+        if self.state != "ready":
+            self.logger.warning(f"invalid state : {self.state}")
+            return False
+
+        self.logger.info("===== Start operating (batch) =====")
+        self.is_batch = True
+        self.state = "running"
+        self.analyzer.make_start_point()
+        return True
 
     def _execute_trading(self, task):
         del task
+        self._run_turn()
+        self._start_timer()
+
+    def _run_turn(self):
+        """한 턴의 매매 프로세스를 수행한다, 타이머는 호출하는 쪽에서 처리한다"""
         self.logger.info(
             f"############# Simulation trading START (turn={self.turn + 1})"
         )
@@ -41,7 +129,6 @@ class SimulationOperator(Operator):
                         "[WARN] get_info() returned None on first turn. Retrying..."
                     )
                     self.turn += 1
-                    self._start_timer()
                     return
 
                 self.logger.warning(
@@ -99,7 +186,8 @@ class SimulationOperator(Operator):
                     return
 
                 self.strategy.update_result(result)
-                self.analyzer.put_result(result)
+                if result.get("state") != "requested":
+                    self.analyzer.put_result(result)
 
             # ==========================================================
             # 3) 전략에서 주문 요청 받아 트레이더로 전달
@@ -146,11 +234,20 @@ class SimulationOperator(Operator):
             if self.periodic_record_enable:
                 self._periodic_internal_get_score()
 
+            self.consecutive_failures = 0
+
         except Exception as err:
             self.logger.error(f"executing fail: {err}", exc_info=True)
+            self.consecutive_failures += 1
+            # 배치 실행은 타이머 없이 바로 다음 턴을 수행하므로 계속 실패하면 끝나지 않는다
+            if self.is_batch and self.consecutive_failures >= self.BATCH_MAX_CONSECUTIVE_FAILURES:
+                self.logger.error(
+                    f"Simulation stopped after {self.consecutive_failures} consecutive failures."
+                )
+                self.last_report = None
+                self.state = "error"
 
         self.turn += 1
-        self._start_timer()
 
     # 이하 기존 코드 동일
 
@@ -193,13 +290,16 @@ class SimulationOperator(Operator):
             except TypeError as err:
                 self.logger.error(f"invalid callback: {err}", exc_info=True)
 
-        self.worker.post_task(
-            {
-                "runnable": get_score_callback,
-                "callback": callback,
-                "index_info": index_info,
-            }
-        )
+        task = {
+            "runnable": get_score_callback,
+            "callback": callback,
+            "index_info": index_info,
+        }
+        if self.is_batch:
+            get_score_callback(task)
+            return
+
+        self.worker.post_task(task)
 
     def _periodic_internal_get_score(self):
         if (
@@ -297,10 +397,12 @@ def run_single_backtest(
     budget: int,
     tuning_params: Optional[Dict[str, Any]] = None,
     data_path: Optional[str] = None,
+    lean: bool = False,
 ) -> Dict[str, Any]:
     """
     UI Step2-C/Step3-B'가 호출하는 '단일 백테스트' 엔트리포인트.
     - 기존 Simulator를 그대로 사용해서 프로젝트 구조를 보존
+    - lean=True이면 보고서 파일, 차트, result/ 산출물 없이 요약 지표만 계산
     """
     term_seconds = _tf_to_term_seconds(tf)
     from_dash_to = f"{_yyyy_mm_dd_to_dash_tag(start)}-{_yyyy_mm_dd_to_dash_tag(end)}"
@@ -320,6 +422,8 @@ def run_single_backtest(
         strategy=str(strategy_code),
         currency=str(ticker).upper(),
         from_dash_to=from_dash_to,
+        batch=True,
+        lean=lean,
     )
 
     sim.run_single()
@@ -346,6 +450,10 @@ def run_single_backtest(
     except Exception:
         pass
 
+    # 성과 지표 (낙폭, 샤프 등)
+    metrics = report.get("metrics") if isinstance(report, dict) else None
+    metrics = metrics if isinstance(metrics, dict) else {}
+
     # 체결 수 대략
     try:
         repo = getattr(getattr(getattr(sim, "operator", None), "analyzer", None), "data_repository", None)
@@ -359,6 +467,10 @@ def run_single_backtest(
         "profit_rate": roi,
         "min_return": min_return,
         "max_return": max_return,
+        "max_drawdown": metrics.get("max_drawdown", 0.0),
+        "sharpe": metrics.get("sharpe", 0.0),
+        "sortino": metrics.get("sortino", 0.0),
+        "metrics": metrics,
         "trades": trades,
         "report": report,
     }
@@ -1,5 +1,157 @@
+import calendar
 from abc import ABCMeta, abstractmethod
-from typing import Dict, Any, Callable, Optional, List
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterable, Optional, List
+
+import numpy as np
+
+
+class CandleHistory:
+    """
+    고정 용량의 NumPy 링 버퍼로 최근 캔들을 보관하는 전략 공용 캔들 이력
+
+    Fixed capacity candle history backed by NumPy ring buffers, shared by strategies
+
+    각 컬럼은 용량의 두 배 크기 버퍼에 같은 값을 두 번 기록하므로 최근 n개 구간은 항상
+    연속된 메모리이며 window()는 복사 없이 view를 반환한다.
+    len()은 지금까지 추가된 전체 캔들 수이고, 인덱스는 리스트와 같은 절대 인덱스를 사용한다.
+    용량을 넘어 밀려난 캔들에 접근하면 IndexError가 발생한다.
+
+    capacity: 보관할 최대 캔들 수, 전략의 가장 긴 lookback 이상이어야 한다
+    extra_fields: 지표 값 등 캔들별로 추가 보관할 필드 이름, 임의의 파이썬 값을 저장한다
+    """
+
+    PRICE_FIELDS = (
+        "opening_price",
+        "high_price",
+        "low_price",
+        "closing_price",
+        "acc_price",
+        "acc_volume",
+    )
+    TEXT_FIELDS = ("type", "market", "date_time")
+
+    def __init__(self, capacity: int, extra_fields: Iterable[str] = ()):
+        if capacity <= 0:
+            raise UserWarning(f"invalid capacity: {capacity}")
+        self.capacity = int(capacity)
+        self.extra_fields = tuple(extra_fields)
+        self._count = 0
+        self._size = 0
+        buffer_size = self.capacity * 2
+        self._epoch = np.zeros(buffer_size, dtype=np.int64)
+        self._columns = {
+            field: np.full(buffer_size, np.nan, dtype=np.float64)
+            for field in self.PRICE_FIELDS
+        }
+        self._objects = {
+            field: np.full(self.capacity, None, dtype=object)
+            for field in self.TEXT_FIELDS + self.extra_fields
+        }
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def size(self) -> int:
+        """현재 보관 중인 캔들 수"""
+        return self._size
+
+    @property
+    def first_index(self) -> int:
+        """보관 중인 가장 오래된 캔들의 절대 인덱스"""
+        return self._count - self.size
+
+    @staticmethod
+    def to_epoch(date_time: Optional[str]) -> int:
+        """ISO 형식 시간 문자열을 epoch 초로 변환, 변환할 수 없으면 -1"""
+        try:
+            return calendar.timegm(datetime.fromisoformat(date_time).timetuple())
+        except (TypeError, ValueError):
+            return -1
+
+    def _slot(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if index < self.first_index or index >= self._count:
+            raise IndexError(f"candle index out of range: {index}")
+        return index % self.capacity
+
+    def append(self, candle: Dict[str, Any]) -> None:
+        """캔들 정보를 추가한다, 용량을 넘으면 가장 오래된 캔들이 밀려난다"""
+        slot = self._count % self.capacity
+        mirror = slot + self.capacity
+        self._epoch[slot] = self._epoch[mirror] = self.to_epoch(candle.get("date_time"))
+        for field, column in self._columns.items():
+            value = candle.get(field)
+            column[slot] = column[mirror] = np.nan if value is None else value
+        for field, column in self._objects.items():
+            column[slot] = candle.get(field)
+        self._count += 1
+        self._size = min(self._size + 1, self.capacity)
+
+    def pop(self) -> Dict[str, Any]:
+        """마지막 캔들을 제거하고 반환한다"""
+        last = self[-1]
+        self._count -= 1
+        self._size -= 1
+        return last
+
+    def window(self, field: str, count: Optional[int] = None) -> np.ndarray:
+        """
+        최근 count개 값의 읽기 전용 view를 반환한다, count가 없으면 보관 중인 전체
+
+        field: PRICE_FIELDS 중 하나 또는 "epoch"
+        """
+        size = self.size
+        count = size if count is None else min(int(count), size)
+        column = self._epoch if field == "epoch" else self._columns[field]
+        end = (self._count - 1) % self.capacity + self.capacity + 1 if size else 0
+        view = column[end - count : end]
+        view.flags.writeable = False
+        return view
+
+    def get(self, field: str, index: int = -1) -> Any:
+        """index 위치 캔들의 field 값을 반환한다"""
+        slot = self._slot(index)
+        if field == "epoch":
+            return int(self._epoch[slot])
+        if field in self._columns:
+            return float(self._columns[field][slot])
+        return self._objects[field][slot]
+
+    def set(self, field: str, value: Any, index: int = -1) -> None:
+        """index 위치 캔들의 field 값을 변경한다"""
+        slot = self._slot(index)
+        if field in self._columns:
+            column = self._columns[field]
+            column[slot] = column[slot + self.capacity] = np.nan if value is None else value
+        else:
+            self._objects[field][slot] = value
+
+    def __iter__(self):
+        for index in range(self.first_index, self._count):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """
+        index 위치 캔들을 dict로 반환한다, 기존 list of dict 사용 코드와의 호환용
+        값이 없는 가격 필드는 포함하지 않는다
+        """
+        slot = self._slot(index)
+        candle = {}
+        for field in self.TEXT_FIELDS:
+            value = self._objects[field][slot]
+            if value is not None:
+                candle[field] = value
+        for field, column in self._columns.items():
+            value = column[slot]
+            if not np.isnan(value):
+                candle[field] = float(value)
+        for field in self.extra_fields:
+            candle[field] = self._objects[field][slot]
+        return candle
+
 
 
 class Strategy(metaclass=ABCMeta):
@@ -88,3 +240,49 @@ class Strategy(metaclass=ABCMeta):
             "date_time": 거래 체결 시간, 시뮬레이션 모드에서는 데이터 시간 +2초
         }
         """
+
+    def precompute(self, candles: List[Dict[str, Any]]) -> None:
+        """
+        시뮬레이션 전체 구간의 캔들로 필요한 값을 미리 계산, 기본 동작은 없음
+        initialize 이후 update_trading_info가 처음 호출되기 전에 SimulationOperator가 호출한다
+        candles는 update_trading_info로 전달될 캔들과 같은 순서이며 읽기 전용이다
+
+        Precompute values from all candles of the simulation, no-op by default
+        """
+
+    def get_vectorized_signals(self, columns: Dict[str, np.ndarray]) -> Optional[Dict[str, np.ndarray]]:
+        """
+        전체 캔들 컬럼으로 벡터화 백테스트용 매수, 매도 신호 배열을 만든다, 지원하지 않으면 None
+        i번째 값은 i번째 캔들까지 update_trading_info를 호출한 후 get_request가 매수(매도)를 시도하는지 여부이다
+
+        Build buy/sell signal arrays for the vectorized backtest, None if not supported
+
+        columns: VectorizedMarket.make_columns의 결과, closing_price, high_price, low_price float64 배열
+        Returns:
+        {
+            "buy": 매수 시도 bool 배열
+            "sell": 매도 시도 bool 배열
+            "price": 주문 가격 배열, 생략하면 종가
+        }
+        """
+        return None
+
+    def get_vectorized_amount(self, side: str, price: float, account: Dict[str, float]) -> Optional[float]:
+        """
+        벡터화 백테스트에서 신호 캔들의 주문 수량을 계산, get_request와 같은 규칙을 사용해야 한다
+        주문하지 않으면 None 또는 0
+
+        Order amount at a signal candle of the vectorized backtest, following the get_request rules
+
+        side: buy, sell
+        price: 주문 가격
+        account:
+        {
+            "budget": 시작 예산
+            "balance": update_result로 갱신되는 전략 기준 잔고
+            "asset_amount": update_result로 갱신되는 전략 기준 보유 수량
+            "run_balance": 같은 신호가 연속으로 시작된 캔들의 balance
+            "run_asset_amount": 같은 신호가 연속으로 시작된 캔들의 asset_amount
+        }
+        """
+        return None
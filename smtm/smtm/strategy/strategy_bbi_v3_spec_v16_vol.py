@@ -1,23 +1,25 @@
 import copy
 import math
+from collections import deque
 from datetime import datetime
 
 import json
 import os
 
 import numpy as np
-import pandas as pd
 
 try:
-    from smtm.strategy.strategy import Strategy
+    from smtm.strategy.strategy import Strategy, CandleHistory
     from smtm.log_manager import LogManager
     from smtm.date_converter import DateConverter
+    from smtm.indicator import BollingerBand, Rsi, Macd, Stochastic, Atr, Ema, IndicatorCache
 except ImportError:
     import sys
     sys.path.insert(0, '/home/claude/smtm')
-    from strategy.strategy import Strategy
+    from strategy.strategy import Strategy, CandleHistory
     from log_manager import LogManager
     from date_converter import DateConverter
+    from indicator import BollingerBand, Rsi, Macd, Stochastic, Atr, Ema, IndicatorCache
 
 
 class StrategyBBI_V3_Spec_V16_Vol(Strategy):
@@ -109,6 +111,11 @@ class StrategyBBI_V3_Spec_V16_Vol(Strategy):
     VOL_SPIKE_FACTOR = 2.5        # 평균의 2.5배 이상이면 스파이크
     VOL_MIN_SAMPLES = 10          # 평균 계산에 필요한 최소 유효 샘플 수
 
+    # ===== 캔들 이력 =====
+    # 지표는 스트리밍으로 갱신되므로 현재 캔들과 볼륨 평균 구간만 보관
+    HISTORY_CAPACITY = VOL_MA_PERIOD
+    INDICATOR_FIELDS = ("bb_lower", "rsi", "macd", "stoch_k", "atr", "ema")
+
     # ===== 수량 정밀도 =====
     AMOUNT_DECIMALS = 6
     AMOUNT_SCALE = 10 ** AMOUNT_DECIMALS
@@ -121,7 +128,7 @@ class StrategyBBI_V3_Spec_V16_Vol(Strategy):
         self.is_intialized = False
         self.is_simulation = False
 
-        self.data = []
+        self.data = CandleHistory(self.HISTORY_CAPACITY, self.INDICATOR_FIELDS)
         self.result = []
         self.request = None
 
@@ -140,7 +147,18 @@ class StrategyBBI_V3_Spec_V16_Vol(Strategy):
         self.trailing_active = False
         self.max_price_after_target = 0
 
-        self.atr_values = []
+        self.atr_values = deque(maxlen=self.ATR_HISTORY_SIZE)
+
+        # 스트리밍 지표 (initialize()에서 튜닝 파라미터 적용 후 생성)
+        self.bb_indicator = None
+        self.rsi_indicator = None
+        self.macd_indicator = None
+        self.stoch_indicator = None
+        self.atr_indicator = None
+        self.ema_indicator = None
+        # precompute()로 미리 계산한 지표 컬럼, 있으면 캔들 인덱스로 읽는다
+        self.precomputed = None
+        self.precomputed_candles = None
 
         self.in_window = False
         self.window_start_idx = None
@@ -166,12 +184,15 @@ class StrategyBBI_V3_Spec_V16_Vol(Strategy):
         self.rally_active = False
         self.rally_high_price = 0.0
 
-        # 볼륨 히스토리
-        self.volumes = []
+        # 볼륨 히스토리 (최근 VOL_MA_PERIOD개)
+        self.volumes = deque(maxlen=self.VOL_MA_PERIOD)
 
         self.waiting_requests = {}
         self.add_spot_callback = None
 
+        # None이 아니면 튜닝 파일 대신 사용할 파라미터 (StrategyFactory.apply_params)
+        self.tuning_params = None
+
     # =====================================================================
     # 튜닝 파라미터 로딩
     # =====================================================================
@@ -180,17 +201,22 @@ class StrategyBBI_V3_Spec_V16_Vol(Strategy):
         """
         PyQt 튜닝 UI에서 저장한 JSON 파일(bbi_v16_vol_tuning.json)을 읽어
         동일한 이름의 속성이 있으면 self.<key> 값으로 덮어쓴다.
+        tuning_params가 지정되어 있으면 파일 대신 그 값을 사용한다. (파라미터 스윕)
         """
-        path = self.TUNING_FILE
-        if not os.path.exists(path):
-            return
+        if self.tuning_params is not None:
+            path = "tuning_params"
+            data = self.tuning_params
+        else:
+            path = self.TUNING_FILE
+            if not os.path.exists(path):
+                return
 
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception as e:
-            self.logger.error(f"[TUNING] Failed to load {path}: {e}")
-            return
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                self.logger.error(f"[TUNING] Failed to load {path}: {e}")
+                return
 
         if not isinstance(data, dict):
             self.logger.error(f"[TUNING] Invalid format in {path} (expected dict)")
@@ -250,6 +276,8 @@ class StrategyBBI_V3_Spec_V16_Vol(Strategy):
 
         self.BASE_POSITION_SIZE = int(budget * self.POSITION_SIZE_PERCENT)
 
+        self._init_indicators()
+
         self.logger.info(
             f"[INIT] Budget: {budget:,}, "
             f"BASE_POSITION_SIZE: {self.BASE_POSITION_SIZE:,} "
@@ -279,7 +307,7 @@ class StrategyBBI_V3_Spec_V16_Vol(Strategy):
         if candle is None:
             return
 
-        self.data.append(copy.deepcopy(candle))
+        self.data.append(candle)
 
         # 볼륨 기록 (volume 키가 없으면 acc_trade_volume/candle_acc_trade_volume도 시도)
         vol = None
@@ -306,73 +334,103 @@ class StrategyBBI_V3_Spec_V16_Vol(Strategy):
     # 지표 계산
     # =====================================================================
 
+    def _init_indicators(self):
+        """
+        튜닝 파라미터(ATR_PERIOD, EMA_PERIOD, ATR_HISTORY_SIZE)가 적용된 뒤
+        스트리밍 지표 객체를 생성한다. 캔들마다 상수 시간에 갱신된다.
+        """
+        self.bb_indicator = BollingerBand(20, 2)
+        self.rsi_indicator = Rsi(14)
+        self.macd_indicator = Macd(12, 26)
+        self.stoch_indicator = Stochastic(14, 3)
+        self.atr_indicator = Atr(self.ATR_PERIOD)
+        self.ema_indicator = Ema(self.EMA_PERIOD)
+        self.atr_values = deque(self.atr_values, maxlen=self.ATR_HISTORY_SIZE)
+        self.volumes = deque(self.volumes, maxlen=self.VOL_MA_PERIOD)
+
+    def precompute(self, candles):
+        """
+        시뮬레이션 전체 캔들의 지표 컬럼을 IndicatorCache에서 가져온다.
+        임계값만 다른 설정들은 같은 캔들 구간이면 같은 컬럼을 공유하며,
+        이후 캔들마다 스트리밍 지표 갱신 대신 캔들 인덱스로 값을 읽는다.
+        """
+        self.precomputed = None
+        self.precomputed_candles = None
+        if len(candles) == 0:
+            return
+        self.precomputed_candles = candles
+        self.precomputed = IndicatorCache.get_instance().get(
+            candles,
+            "bbi",
+            {"atr_period": self.ATR_PERIOD, "ema_period": self.EMA_PERIOD},
+        )
+
+    def _get_precomputed_indicators(self, idx):
+        """
+        idx 캔들의 사전 계산 지표, 캔들 시간이 맞지 않으면 스트리밍 지표로 전환하고 None
+        """
+        columns = self.precomputed
+        if idx < len(columns["epoch"]) and columns["epoch"][idx] == self.data.get("epoch"):
+            return tuple(
+                float(columns[name][idx])
+                for name in ("bb_lower", "rsi", "macd", "stoch_k", "atr", "ema")
+            )
+
+        self.logger.warning(
+            f"[INDICATOR] precomputed candle mismatch at {idx}, fall back to streaming"
+        )
+        # 이전 캔들은 모두 일치했으므로 사전 계산에 사용한 캔들로 스트리밍 지표를 다시 채운다
+        candles = self.precomputed_candles[:idx]
+        self.precomputed = None
+        self.precomputed_candles = None
+        self._init_indicators()
+        for candle in candles:
+            self._update_streaming_indicators(
+                candle["closing_price"], candle["high_price"], candle["low_price"]
+            )
+        return None
+
+    def _update_streaming_indicators(self, close, high, low):
+        _, _, bb_lower = self.bb_indicator.update(close)
+        rsi = self.rsi_indicator.update(close)
+        macd, _, _ = self.macd_indicator.update(close)
+        stoch_k = self.stoch_indicator.update(high, low, close)
+        atr = self.atr_indicator.update(high, low, close)
+        ema = self.ema_indicator.update(close)
+        return bb_lower, rsi, macd, stoch_k, atr, ema
+
     def _update_indicators_for_last_candle(self):
         n = len(self.data)
         if n == 0:
             return
 
-        closes = pd.Series([d["closing_price"] for d in self.data], dtype="float")
-        highs = pd.Series([d["high_price"] for d in self.data], dtype="float")
-        lows = pd.Series([d["low_price"] for d in self.data], dtype="float")
-
-        c = self.data[-1]
-
-        c["bb_lower"] = None
-        c["rsi"] = None
-        c["macd"] = None
-        c["stoch_k"] = None
-
-        if n >= 20:
-            ma20 = closes.rolling(20).mean()
-            std20 = closes.rolling(20).std()
-            bb_lower_series = ma20 - 2 * std20
-            c["bb_lower"] = float(bb_lower_series.iloc[-1])
-
-        if n >= 14:
-            delta = closes.diff()
-            gain = delta.clip(lower=0)
-            loss = -delta.clip(upper=0)
-            avg_gain = gain.rolling(14).mean()
-            avg_loss = loss.rolling(14).mean()
-            rs = avg_gain / avg_loss.replace(to_replace=0, value=np.nan)
-            rsi_series = 100 - (100 / (1 + rs))
-            c["rsi"] = float(rsi_series.iloc[-1])
-
-        if n >= 26:
-            ema12 = closes.ewm(span=12, adjust=False).mean()
-            ema26 = closes.ewm(span=26, adjust=False).mean()
-            macd_line = ema12 - ema26
-            c["macd"] = float(macd_line.iloc[-1])
-
-        if n >= 14:
-            low14 = lows.rolling(14).min()
-            high14 = highs.rolling(14).max()
-            denom = (high14 - low14).replace(to_replace=0, value=np.nan)
-            raw_k = (closes - low14) / denom * 100
-            smooth_k = raw_k.rolling(3).mean()
-            c["stoch_k"] = float(smooth_k.iloc[-1])
+        values = None
+        if self.precomputed is not None:
+            values = self._get_precomputed_indicators(n - 1)
+
+        if values is None:
+            if self.bb_indicator is None:
+                self._init_indicators()
+
+            close = self.data.get("closing_price")
+            high = self.data.get("high_price")
+            low = self.data.get("low_price")
+            values = self._update_streaming_indicators(close, high, low)
+
+        bb_lower, rsi, macd, stoch_k, atr, ema = values
+
+        self.data.set("bb_lower", bb_lower if n >= 20 else None)
+        self.data.set("rsi", rsi if n >= 14 else None)
+        self.data.set("macd", macd if n >= 26 else None)
+        self.data.set("stoch_k", stoch_k if n >= 14 else None)
 
         if n >= self.ATR_PERIOD + 1:
-            prev_closes = closes.shift(1)
-            tr1 = highs - lows
-            tr2 = (highs - prev_closes).abs()
-            tr3 = (lows - prev_closes).abs()
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr_series = tr.rolling(self.ATR_PERIOD).mean()
-            current_atr = float(atr_series.iloc[-1])
-            c["atr"] = current_atr
-
-            self.atr_values.append(current_atr)
-            if len(self.atr_values) > self.ATR_HISTORY_SIZE:
-                self.atr_values.pop(0)
+            self.data.set("atr", atr)
+            self.atr_values.append(atr)
         else:
-            c["atr"] = None
+            self.data.set("atr", None)
 
-        if n >= self.EMA_PERIOD:
-            ema_series = closes.ewm(span=self.EMA_PERIOD, adjust=False).mean()
-            c["ema"] = float(ema_series.iloc[-1])
-        else:
-            c["ema"] = None
+        self.data.set("ema", ema if n >= self.EMA_PERIOD else None)
 
     # =====================================================================
     # 3차 이상(3~5차) 보수적 진입 필터
@@ -430,15 +488,16 @@ class StrategyBBI_V3_Spec_V16_Vol(Strategy):
         현재 idx에서 볼륨 스파이크 여부 판단.
         - volume 데이터가 없거나 샘플 부족 시 False
         """
-        if idx < 0 or idx >= len(self.volumes):
+        offset = len(self.data) - len(self.volumes)
+        if idx < offset or idx >= len(self.data):
             return False
 
-        current_vol = self.volumes[idx]
+        current_vol = self.volumes[idx - offset]
         if current_vol is None or current_vol <= 0:
             return False
 
-        start = max(0, idx - self.VOL_MA_PERIOD + 1)
-        window = self.volumes[start:idx + 1]
+        start = max(offset, idx - self.VOL_MA_PERIOD + 1)
+        window = list(self.volumes)[start - offset:idx - offset + 1]
         window = [v for v in window if v is not None and v > 0]
 
         if len(window) < self.VOL_MIN_SAMPLES:
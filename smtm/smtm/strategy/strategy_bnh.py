@@ -1,7 +1,8 @@
 import copy
 import math
+import numpy as np
 from datetime import datetime
-from .strategy import Strategy
+from .strategy import Strategy, CandleHistory
 from ..log_manager import LogManager
 from ..date_converter import DateConverter
 
@@ -25,11 +26,12 @@ class StrategyBuyAndHold(Strategy):
     COMMISSION_RATIO = 0.0005
     NAME = "Buy and Hold"
     CODE = "BNH"
+    HISTORY_CAPACITY = 2
 
     def __init__(self):
         self.is_intialized = False
         self.is_simulation = False
-        self.data = []
+        self.data = CandleHistory(self.HISTORY_CAPACITY)
         self.budget = 0
         self.balance = 0.0
         self.min_price = 0
@@ -65,7 +67,7 @@ class StrategyBuyAndHold(Strategy):
         if target is None:
             return
 
-        self.data.append(copy.deepcopy(target))
+        self.data.append(target)
 
     def update_result(self, result):
         """요청한 거래의 결과를 업데이트
@@ -144,11 +146,10 @@ class StrategyBuyAndHold(Strategy):
             if self.is_simulation:
                 now = self.data[-1]["date_time"]
 
-            target_budget = self.budget / 5
-            if target_budget > self.balance:
-                target_budget = self.balance
+            amount = self._get_buy_amount(last_closing_price, self.balance)
+            if amount is None:
+                raise UserWarning("total_value or balance is too small")
 
-            amount = math.floor((target_budget / last_closing_price) * 10000) / 10000
             trading_request = {
                 "id": DateConverter.timestamp_id(),
                 "type": "buy",
@@ -157,10 +158,6 @@ class StrategyBuyAndHold(Strategy):
                 "date_time": now,
             }
             total_value = round(float(last_closing_price) * amount)
-
-            if self.min_price > total_value or total_value > self.balance:
-                raise UserWarning("total_value or balance is too small")
-
             self.logger.info(f"[REQ] id: {trading_request['id']} =====================")
             self.logger.info(f"price: {last_closing_price}, amount: {amount}")
             self.logger.info(f"type: buy, total value: {total_value}")
@@ -199,6 +196,36 @@ class StrategyBuyAndHold(Strategy):
                 ]
             return None
 
+    def _get_buy_amount(self, price, balance):
+        """
+        처음 예산의 1/5을 잔고 안에서 매수하는 수량, 주문할 수 없으면 None
+        Amount buying 1/5 of the initial budget within the balance, None if it can't be ordered
+        """
+        target_budget = self.budget / 5
+        if target_budget > balance:
+            target_budget = balance
+
+        amount = math.floor((target_budget / price) * 10000) / 10000
+        total_value = round(float(price) * amount)
+
+        if self.min_price > total_value or total_value > balance:
+            return None
+        return amount
+
+    def get_vectorized_signals(self, columns):
+        """
+        매 캔들 매수를 시도하는 get_request와 같은 신호 배열
+        Signal arrays trying to buy at every candle like get_request
+        """
+        count = len(columns["closing_price"])
+        return {"buy": np.ones(count, dtype=bool), "sell": np.zeros(count, dtype=bool)}
+
+    def get_vectorized_amount(self, side, price, account):
+        """get_request와 같은 분할 매수 수량"""
+        if side != "buy":
+            return None
+        return self._get_buy_amount(price, account["balance"])
+
     def initialize(
         self,
         budget,
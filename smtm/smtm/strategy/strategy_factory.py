@@ -32,13 +32,39 @@ class StrategyFactory:
     ]
 
     @staticmethod
-    def create(code):
-        """code에 해당하는 Strategy 객체를 생성하여 반환"""
+    def create(code, params=None):
+        """
+        code에 해당하는 Strategy 객체를 생성하여 반환
+        params가 주어지면 apply_params로 객체의 파라미터를 덮어쓴다
+        """
         for strategy in StrategyFactory.STRATEGY_LIST:
             if strategy.CODE == code:
-                return strategy()
+                instance = strategy()
+                if params:
+                    StrategyFactory.apply_params(instance, params)
+                return instance
         return None
 
+    @staticmethod
+    def apply_params(strategy, params):
+        """
+        Strategy 객체의 클래스 속성 값을 객체 단위로 덮어쓴다
+        Override class attribute values of the strategy on the instance
+
+        tuning_params 속성이 있는 전략은 튜닝 파일 대신 params를 initialize에서 적용한다
+        Strategies with tuning_params apply params in initialize instead of the tuning file
+        """
+        for key in params:
+            if not hasattr(strategy, key):
+                raise UserWarning(f"unknown parameter: {key} for {strategy.CODE}")
+
+        if hasattr(strategy, "tuning_params"):
+            strategy.tuning_params = dict(params)
+            return
+
+        for key, value in params.items():
+            setattr(strategy, key, value)
+
     @staticmethod
     def get_name(code):
         """code에 해당하는 Strategy 이름을 반환"""
@@ -1,4 +1,4 @@
-import copy
+from .strategy import CandleHistory
 from .strategy_sas import StrategySas
 from ..log_manager import LogManager
 import pandas as pd
@@ -32,11 +32,12 @@ class StrategyHey(StrategySas):
     MIN_MARGIN = 0.002
     ATR_PERIOD = 30
     VOLATILITY_BREAKOUT = 1.5
+    HISTORY_CAPACITY = SMA_LONG + 1
 
     def __init__(self):
         self.is_intialized = False
         self.is_simulation = False
-        self.data = []
+        self.data = CandleHistory(self.HISTORY_CAPACITY)
         self.budget = 0
         self.balance = 0
         self.asset_amount = 0
@@ -45,7 +46,6 @@ class StrategyHey(StrategySas):
         self.result = []
         self.current_process = "ready"
         self.loss_cut_alerted = False
-        self.closing_price_list = []
         self.buy_price = 0
         self.logger = LogManager.get_logger(__class__.__name__)
         self.waiting_requests = {}
@@ -100,26 +100,26 @@ class StrategyHey(StrategySas):
         if target is None:
             return
 
-        self.data.append(copy.deepcopy(target))
+        self.data.append(target)
         self._checking_sma(target)
         # 변동성 돌파 이벤트를 분봉을 기준으로 했을때, 너무 자주 발생됨
         # self._checking_volatility_breakout(target)
 
     def _checking_sma(self, info):
         current_price = info["closing_price"]
-        current_idx = len(self.closing_price_list)
-        self.closing_price_list.append(current_price)
+        current_idx = len(self.data) - 1
+        closing_prices = self.data.window("closing_price")
 
         sma_short_list = (
-            pd.Series(self.closing_price_list).rolling(self.SMA_SHORT).mean().values
+            pd.Series(closing_prices).rolling(self.SMA_SHORT).mean().values
         )
         sma_short = sma_short_list[-1]
         sma_mid_list = (
-            pd.Series(self.closing_price_list).rolling(self.SMA_MID).mean().values
+            pd.Series(closing_prices).rolling(self.SMA_MID).mean().values
         )
         sma_mid = sma_mid_list[-1]
         sma_long_list = (
-            pd.Series(self.closing_price_list).rolling(self.SMA_LONG).mean().values
+            pd.Series(closing_prices).rolling(self.SMA_LONG).mean().values
         )
         sma_long = sma_long_list[-1]
 
@@ -0,0 +1,145 @@
+import copy
+from .strategy import Strategy
+from .strategy_factory import StrategyFactory
+from ..log_manager import LogManager
+
+
+class StrategyPortfolio(Strategy):
+    """
+    마켓별 전략을 묶어서 여러 마켓을 하나의 계좌로 거래하는 포트폴리오 전략
+
+    Portfolio strategy running one sub strategy per market on a shared account
+
+    - 마켓별 전략은 자신의 마켓 캔들을 primary_candle로 전달받으므로 단일 마켓 전략을 그대로 사용한다
+    - 마켓별 전략의 예산은 budget * weight, weight 합이 1보다 크면 같은 현금을 두고 경쟁한다
+    - 요청 정보에 market을 추가해서 전달하고, 결과는 요청의 market으로 해당 전략에 전달한다
+
+    strategies: {market: 전략 객체}
+    weights: {market: 예산 비율}, 생략하면 균등 분배
+    """
+
+    NAME = "Portfolio"
+    CODE = "PFO"
+
+    def __init__(self, strategies, weights=None):
+        if len(strategies) == 0:
+            raise UserWarning("empty strategy list")
+
+        self.strategies = dict(strategies)
+        if weights is None:
+            weights = {market: 1 / len(self.strategies) for market in self.strategies}
+        for market in self.strategies:
+            if market not in weights or weights[market] < 0:
+                raise UserWarning(f"invalid weight: {market}")
+        self.weights = {market: float(weights[market]) for market in self.strategies}
+
+        self.is_intialized = False
+        self.is_simulation = False
+        self.budget = 0
+        self.result = []
+        self.logger = LogManager.get_logger(__class__.__name__)
+
+    @classmethod
+    def create(cls, code, markets, weights=None, params=None):
+        """마켓마다 code에 해당하는 전략을 생성해서 포트폴리오 전략을 만든다"""
+        strategies = {}
+        for market in markets:
+            strategy = StrategyFactory.create(code, params=params)
+            if strategy is None:
+                raise UserWarning(f"Invalid Strategy! {code}")
+            strategies[market] = strategy
+        return cls(strategies, weights=weights)
+
+    def initialize(
+        self,
+        budget,
+        min_price=5000,
+        add_spot_callback=None,
+        add_line_callback=None,
+        alert_callback=None,
+    ):
+        if self.is_intialized:
+            return
+
+        self.is_intialized = True
+        self.budget = budget
+        for market, strategy in self.strategies.items():
+            strategy.is_simulation = self.is_simulation
+            strategy.initialize(
+                round(budget * self.weights[market]),
+                min_price=min_price,
+                add_spot_callback=add_spot_callback,
+                add_line_callback=add_line_callback,
+                alert_callback=alert_callback,
+            )
+
+    def update_trading_info(self, info):
+        """
+        마켓 캔들을 해당 마켓의 전략에 primary_candle로 전달한다
+        캔들이 아닌 정보는 모든 전략에 그대로 전달한다
+        """
+        if self.is_intialized is not True:
+            return
+
+        candles = {}
+        others = []
+        for item in info:
+            if item.get("type") in ("primary_candle", "market_candle"):
+                candles[item.get("market")] = item
+            else:
+                others.append(item)
+
+        for market, strategy in self.strategies.items():
+            if market not in candles:
+                continue
+            candle = dict(candles[market])
+            candle["type"] = "primary_candle"
+            strategy.update_trading_info([candle] + others)
+
+    def get_request(self):
+        """
+        마켓별 전략의 요청에 market을 추가해서 모은다
+        요청이 없으면 시뮬레이션에서는 턴 진행을 위해 0원 요청 한 개를 전달한다
+        """
+        if self.is_intialized is not True:
+            return None
+
+        request_list = []
+        last_request = None
+        for market, strategy in self.strategies.items():
+            requests = strategy.get_request()
+            if requests is None:
+                continue
+            if isinstance(requests, dict):
+                requests = [requests]
+            for request in requests:
+                last_request = request
+                if request.get("type") != "cancel" and (
+                    float(request.get("price", 0)) == 0 or float(request.get("amount", 0)) == 0
+                ):
+                    continue
+                request = dict(request)
+                request["market"] = market
+                request_list.append(request)
+
+        if len(request_list) > 0:
+            return request_list
+
+        if self.is_simulation and last_request is not None:
+            return [dict(last_request, price=0, amount=0)]
+        return None
+
+    def update_result(self, result):
+        """요청의 market에 해당하는 전략에 결과를 전달한다"""
+        if self.is_intialized is not True:
+            return
+
+        try:
+            market = result["request"]["market"]
+            if market not in self.strategies:
+                self.logger.warning(f"result of unknown market: {market}")
+                return
+            self.strategies[market].update_result(result)
+            self.result.append(copy.deepcopy(result))
+        except (KeyError, TypeError) as msg:
+            self.logger.error(msg)
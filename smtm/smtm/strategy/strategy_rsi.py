@@ -1,8 +1,10 @@
 import copy
+from collections import deque
 import math
 from datetime import datetime
 import numpy as np
-from .strategy import Strategy
+from .strategy import Strategy, CandleHistory
+from ..indicator.vectorized import forward_fill_nonzero
 from ..log_manager import LogManager
 from ..date_converter import DateConverter
 
@@ -22,13 +24,14 @@ class StrategyRsi(Strategy):
     RSI_COUNT = 14
     NAME = "RSI"
     CODE = "RSI"
+    HISTORY_CAPACITY = RSI_COUNT + 1
 
     def __init__(self):
         self.is_intialized = False
         self.is_simulation = False
         self.rsi_info = None
-        self.rsi = []
-        self.data = []
+        self.rsi = deque(maxlen=self.RSI_COUNT + 1)
+        self.data = CandleHistory(self.HISTORY_CAPACITY)
         self.result = []
         self.add_spot_callback = None
         self.budget = 0
@@ -180,7 +183,7 @@ class StrategyRsi(Strategy):
         if target is None:
             return
 
-        self.data.append(copy.deepcopy(target))
+        self.data.append(target)
 
         self._update_rsi(target["closing_price"])
         self._update_position()
@@ -305,21 +308,11 @@ class StrategyRsi(Strategy):
             self.logger.error(msg)
 
     def __create_buy(self, price, amount=0):
-        req_amount = amount
         req_price = float(price)
-        req_value = req_price * req_amount
-        total_req_value = req_value + (req_value * self.COMMISSION_RATIO)
-
-        # 총액이 잔액보다 크거나 수량이 0인 매수 요청의 경우 가능한 최대치로 수량 조정
-        if total_req_value > self.balance or amount == 0:
-            req_amount = self.balance / (req_price * (1 + self.COMMISSION_RATIO))
-
-        # 소숫점 4자리 아래 버림
-        req_amount = math.floor(req_amount * 10000) / 10000
-        final_value = req_amount * req_price
+        req_amount = self._get_buy_amount(req_price, amount, self.balance)
 
-        if self.min_price > final_value:
-            self.logger.info(f"target_value is too small {final_value}")
+        if req_amount is None:
+            self.logger.info(f"target_value is too small {req_price}, {self.balance}")
             if self.is_simulation:
                 return {
                     "id": DateConverter.timestamp_id(),
@@ -337,20 +330,11 @@ class StrategyRsi(Strategy):
         }
 
     def __create_sell(self, price, amount):
-        req_amount = amount
-
-        # 요청 수량이 보유 수량보다 큰 경우 보유 수량으로 조정
-        if req_amount > self.asset_amount:
-            req_amount = self.asset_amount
-
-        # 소숫점 4자리 아래 버림
-        req_amount = math.floor(amount * 10000) / 10000
-
         req_price = float(price)
-        total_value = req_price * req_amount
+        req_amount = self._get_sell_amount(req_price, amount, self.asset_amount)
 
-        if req_amount <= 0 or total_value < self.min_price:
-            self.logger.info(f"asset is too small {req_amount}, {total_value}")
+        if req_amount is None:
+            self.logger.info(f"asset is too small {amount}, {req_price}")
             if self.is_simulation:
                 return {
                     "id": DateConverter.timestamp_id(),
@@ -366,3 +350,91 @@ class StrategyRsi(Strategy):
             "price": req_price,
             "amount": req_amount,
         }
+
+    def _get_buy_amount(self, price, amount, balance):
+        """
+        요청 수량과 잔고로 매수 수량을 계산, 주문할 수 없으면 None
+        Buy amount for the requested amount and balance, None if it can't be ordered
+        """
+        req_amount = amount
+        req_value = price * req_amount
+        total_req_value = req_value + (req_value * self.COMMISSION_RATIO)
+
+        # 총액이 잔액보다 크거나 수량이 0인 매수 요청의 경우 가능한 최대치로 수량 조정
+        if total_req_value > balance or amount == 0:
+            req_amount = balance / (price * (1 + self.COMMISSION_RATIO))
+
+        # 소숫점 4자리 아래 버림
+        req_amount = math.floor(req_amount * 10000) / 10000
+        final_value = req_amount * price
+
+        if self.min_price > final_value:
+            return None
+        return req_amount
+
+    def _get_sell_amount(self, price, amount, asset_amount):
+        """
+        요청 수량과 보유 수량으로 매도 수량을 계산, 주문할 수 없으면 None
+        Sell amount for the requested amount and holdings, None if it can't be ordered
+        """
+        req_amount = amount
+
+        # 요청 수량이 보유 수량보다 큰 경우 보유 수량으로 조정
+        if req_amount > asset_amount:
+            req_amount = asset_amount
+
+        # 소숫점 4자리 아래 버림
+        req_amount = math.floor(amount * 10000) / 10000
+        total_value = price * req_amount
+
+        if req_amount <= 0 or total_value < self.min_price:
+            return None
+        return req_amount
+
+    def get_vectorized_signals(self, columns):
+        """
+        _update_rsi, _update_position과 같은 규칙으로 전체 구간의 매수, 매도 신호 배열을 만든다
+        RSI 평균은 이전 값으로 갱신되는 점화식이라 한 번 순회하며 계산하고 포지션은 배열 연산으로 만든다
+
+        Signal arrays of the whole range following _update_rsi and _update_position
+        """
+        closes = np.asarray(columns["closing_price"], dtype=np.float64)
+        count = len(closes)
+        rsi = np.full(count, np.nan)
+        if count > self.RSI_COUNT:
+            deltas = np.diff(closes[: self.RSI_COUNT + 1])
+            up_avg = float(deltas[deltas >= 0].sum() / self.RSI_COUNT)
+            down_avg = float(-deltas[deltas < 0].sum() / self.RSI_COUNT)
+            rsi[self.RSI_COUNT] = self._get_rsi_value(up_avg, down_avg)
+
+            price_list = closes.tolist()
+            for idx in range(self.RSI_COUNT + 1, count):
+                up_val = 0.0
+                down_val = 0.0
+                delta = price_list[idx] - price_list[idx - 1]
+                if delta > 0:
+                    up_val = delta
+                else:
+                    down_val = -delta
+                down_avg = (down_avg * (self.RSI_COUNT - 1) + down_val) / self.RSI_COUNT
+                up_avg = (up_avg * (self.RSI_COUNT - 1) + up_val) / self.RSI_COUNT
+                rsi[idx] = self._get_rsi_value(up_avg, down_avg)
+
+        code = np.zeros(count, dtype=np.int8)
+        code[rsi < self.RSI_LOW] = 1
+        code[rsi > self.RSI_HIGH] = -1
+        position = forward_fill_nonzero(code)
+        return {"buy": position > 0, "sell": position < 0}
+
+    @staticmethod
+    def _get_rsi_value(up_avg, down_avg):
+        # NumPy 스칼라로 계산하는 _update_rsi와 같이 0으로 나누면 inf, 0/0은 nan
+        if down_avg == 0:
+            return 100.0 if up_avg > 0 else np.nan
+        return 100.0 - 100.0 / (1.0 + up_avg / down_avg)
+
+    def get_vectorized_amount(self, side, price, account):
+        """종가로 최대 매수, 전량 매도하는 get_request와 같은 수량"""
+        if side == "buy":
+            return self._get_buy_amount(price, 0, account["balance"])
+        return self._get_sell_amount(price, account["asset_amount"], account["asset_amount"])
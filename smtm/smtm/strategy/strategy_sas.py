@@ -1,6 +1,6 @@
 import copy
 from datetime import datetime
-from .strategy import Strategy
+from .strategy import Strategy, CandleHistory
 from ..date_converter import DateConverter
 from ..log_manager import LogManager
 
@@ -25,11 +25,12 @@ class StrategySas(Strategy):
     NAME = "Simple Alert Strategy"
     CODE = "SAS"
     ALERT_INTERVAL_TICK = 5
+    HISTORY_CAPACITY = 2
 
     def __init__(self):
         self.is_intialized = False
         self.is_simulation = False
-        self.data = []
+        self.data = CandleHistory(self.HISTORY_CAPACITY)
         self.budget = 0
         self.balance = 0
         self.asset_amount = 0
@@ -87,7 +88,7 @@ class StrategySas(Strategy):
         if target is None:
             return
 
-        self.data.append(copy.deepcopy(target))
+        self.data.append(target)
         self._make_alert(info)
 
     def update_result(self, result):
@@ -3,7 +3,8 @@ from datetime import datetime
 import math
 import pandas as pd
 import numpy as np
-from .strategy import Strategy
+from .strategy import Strategy, CandleHistory
+from ..indicator.vectorized import forward_fill_nonzero
 from ..log_manager import LogManager
 from ..date_converter import DateConverter
 
@@ -15,7 +16,7 @@ class StrategySma0(Strategy):
     Basic strategy using moving average line
 
     is_intialized: 최초 잔고는 초기화 할 때만 갱신 된다
-    data: 거래 데이터 리스트, OHLCV 데이터
+    data: 거래 데이터 이력, 최근 HISTORY_CAPACITY개를 보관하는 CandleHistory
     result: 거래 요청 결과 리스트
     request: 마지막 거래 요청
     budget: 시작 잔고
@@ -36,11 +37,12 @@ class StrategySma0(Strategy):
     STD_K = 25
     STD_RATIO = 0.00015
     PREDICT_N = 3
+    HISTORY_CAPACITY = LONG + STD_K
 
     def __init__(self):
         self.is_intialized = False
         self.is_simulation = False
-        self.data = []
+        self.data = CandleHistory(self.HISTORY_CAPACITY)
         self.budget = 0
         self.balance = 0
         self.asset_amount = 0
@@ -48,7 +50,6 @@ class StrategySma0(Strategy):
         self.result = []
         self.request = None
         self.current_process = "ready"
-        self.closing_price_list = []
         self.process_unit = (0, 0)  # budget and amount
         self.logger = LogManager.get_logger(__class__.__name__)
         self.waiting_requests = {}
@@ -81,7 +82,7 @@ class StrategySma0(Strategy):
         if target is None:
             return
 
-        self.data.append(copy.deepcopy(target))
+        self.data.append(target)
         self.__update_process(target)
 
     @staticmethod
@@ -98,12 +99,11 @@ class StrategySma0(Strategy):
     def __update_process(self, info):
         try:
             current_price = info["closing_price"]
-            current_idx = len(self.closing_price_list)
+            current_idx = len(self.data) - 1
             self.logger.info(f"# update process :: {current_idx}")
-            self.closing_price_list.append(current_price)
-            feeded_list = copy.deepcopy(self.closing_price_list)
-            for _ in range(self.PREDICT_N):
-                feeded_list.append(current_price)
+            feeded_list = np.append(
+                self.data.window("closing_price"), [current_price] * self.PREDICT_N
+            )
 
             sma_short = pd.Series(feeded_list).rolling(self.SHORT).mean().values[-1]
             sma_mid = pd.Series(feeded_list).rolling(self.MID).mean().values[-1]
@@ -292,23 +292,10 @@ class StrategySma0(Strategy):
             self.logger.error(msg)
 
     def __create_buy(self):
-        budget = self.process_unit[0]
-        if budget > self.balance:
-            budget = self.balance
-
-        budget -= budget * self.COMMISSION_RATIO
         price = float(self.data[-1]["closing_price"])
-        amount = budget / price
-
-        # 소숫점 4자리 아래 버림
-        amount = math.floor(amount * 10000) / 10000
-        final_value = amount * price
+        amount = self._get_buy_amount(price, self.process_unit[0], self.balance)
 
-        if (
-            self.min_price > budget
-            or self.process_unit[0] <= 0
-            or final_value > self.balance
-        ):
+        if amount is None:
             self.logger.info(
                 f"target_budget is too small or invalid unit {self.process_unit}"
             )
@@ -329,17 +316,10 @@ class StrategySma0(Strategy):
         }
 
     def __create_sell(self):
-        amount = self.process_unit[1]
-        if amount > self.asset_amount:
-            amount = self.asset_amount
-
-        # 소숫점 4자리 아래 버림
-        amount = math.floor(amount * 10000) / 10000
-
         price = float(self.data[-1]["closing_price"])
-        total_value = price * amount
+        amount = self._get_sell_amount(price, self.process_unit[1], self.asset_amount)
 
-        if amount <= 0 or total_value < self.min_price:
+        if amount is None:
             self.logger.info(f"asset is too small or invalid unit {self.process_unit}")
             if self.is_simulation:
                 return {
@@ -357,6 +337,108 @@ class StrategySma0(Strategy):
             "amount": amount,
         }
 
+    def _get_buy_amount(self, price, unit_budget, balance):
+        """
+        매수 단위 예산과 잔고로 매수 수량을 계산, 주문할 수 없으면 None
+        Buy amount for the unit budget and balance, None if it can't be ordered
+        """
+        budget = unit_budget
+        if budget > balance:
+            budget = balance
+
+        budget -= budget * self.COMMISSION_RATIO
+        amount = budget / price
+
+        # 소숫점 4자리 아래 버림
+        amount = math.floor(amount * 10000) / 10000
+        final_value = amount * price
+
+        if self.min_price > budget or unit_budget <= 0 or final_value > balance:
+            return None
+        return amount
+
+    def _get_sell_amount(self, price, unit_amount, asset_amount):
+        """
+        매도 단위 수량과 보유 수량으로 매도 수량을 계산, 주문할 수 없으면 None
+        Sell amount for the unit amount and holdings, None if it can't be ordered
+        """
+        amount = unit_amount
+        if amount > asset_amount:
+            amount = asset_amount
+
+        # 소숫점 4자리 아래 버림
+        amount = math.floor(amount * 10000) / 10000
+        total_value = price * amount
+
+        if amount <= 0 or total_value < self.min_price:
+            return None
+        return amount
+
+    def get_vectorized_signals(self, columns):
+        """
+        update_trading_info, get_request와 같은 규칙으로 전체 구간의 매수, 매도 신호 배열을 만든다
+        PREDICT_N개의 현재가를 덧붙인 이동 평균은 누적 합으로 한 번에 계산하고
+        표준 편차로 매수를 건너뛰는지는 교차 캔들에서만 확인한다.
+        정수 가격에서는 매 턴 계산과 같은 값이며, 소수 가격에서는 평균이 같은 경우 반올림 오차로 다를 수 있다.
+
+        Signal arrays of the whole range following update_trading_info and get_request
+        """
+        closes = np.asarray(columns["closing_price"], dtype=np.float64)
+        count = len(closes)
+        index = np.arange(count)
+        cumsum = np.concatenate(([0.0], np.cumsum(closes)))
+
+        def predicted_sma(window):
+            start = np.maximum(index + 1 - (window - self.PREDICT_N), 0)
+            return (cumsum[index + 1] - cumsum[start] + closes * self.PREDICT_N) / window
+
+        sma_short = predicted_sma(self.SHORT)
+        sma_mid = predicted_sma(self.MID)
+        sma_long = predicted_sma(self.LONG)
+        is_ready = index + 1 >= self.LONG
+        code = np.zeros(count, dtype=np.int8)
+        code[is_ready & (sma_short > sma_mid) & (sma_mid > sma_long)] = 1
+        code[is_ready & (sma_short < sma_mid) & (sma_mid < sma_long)] = -1
+
+        # current_process: 마지막으로 조건을 만족한 매매 타입, 바뀌는 캔들이 교차 지점
+        process = forward_fill_nonzero(code)
+        is_cross = (process != np.concatenate(([0], process[:-1]))) & (process != 0)
+        cross_list = np.flatnonzero(is_cross)
+
+        # 첫 교차와 표준 편차로 건너뛴 매수 교차 이후에는 다음 교차까지 요청하지 않는다
+        is_active = np.ones(len(cross_list), dtype=bool)
+        if len(cross_list) > 0:
+            is_active[0] = False
+        for number, cross_idx in enumerate(cross_list):
+            if process[cross_idx] > 0 and self._is_unstable_cross(closes, int(cross_idx)):
+                is_active[number] = False
+
+        segment = np.cumsum(is_cross) - 1
+        enabled = np.zeros(count, dtype=bool)
+        enabled[segment >= 0] = is_active[segment[segment >= 0]]
+        return {"buy": enabled & (process > 0), "sell": enabled & (process < 0)}
+
+    def _is_unstable_cross(self, closes, current_idx):
+        """매수 교차 시점의 장기 이동 평균 표준 편차 비율이 STD_RATIO보다 큰지 확인"""
+        if current_idx <= self.LONG:
+            return False
+        deviation_count = min(current_idx - self.LONG, self.STD_K)
+        window = closes[max(0, current_idx + 1 - self.HISTORY_CAPACITY) : current_idx + 1]
+        feeded_list = np.append(window, [closes[current_idx]] * self.PREDICT_N)
+        sma_long_list = pd.Series(feeded_list).rolling(self.LONG).mean().values
+        std_ratio = self._get_deviation_ratio(
+            np.std(sma_long_list[-deviation_count:]), sma_long_list[-1]
+        )
+        return std_ratio > self.STD_RATIO
+
+    def get_vectorized_amount(self, side, price, account):
+        """교차 시점의 잔고(수량)를 분할 단위로 사용하는 __create_buy, __create_sell과 같은 수량"""
+        if side == "buy":
+            unit_budget = round(account["run_balance"] / self.STEP)
+            return self._get_buy_amount(price, unit_budget, account["balance"])
+        unit_amount = account["run_asset_amount"] / self.STEP
+        return self._get_sell_amount(price, unit_amount, account["asset_amount"])
+
     def initialize(
         self,
         budget,
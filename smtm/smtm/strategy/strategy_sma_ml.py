@@ -4,7 +4,7 @@ from decimal import Decimal, ROUND_DOWN
 from sklearn.linear_model import LinearRegression
 import pandas as pd
 import numpy as np
-from .strategy import Strategy
+from .strategy import Strategy, CandleHistory
 from ..log_manager import LogManager
 from ..date_converter import DateConverter
 
@@ -64,11 +64,12 @@ class StrategySmaMl(Strategy):
     LR_LOWER_LIMIT = -0.0000068
     LR_MID_LIMIT = -0.0000027
     LR_UPPER_LIMIT = 0.000014
+    HISTORY_CAPACITY = max(LONG + L_LR_COUNT, MID + M_LR_COUNT)
 
     def __init__(self):
         self.is_intialized = False
         self.is_simulation = False
-        self.data = []
+        self.data = CandleHistory(self.HISTORY_CAPACITY)
         self.budget = 0
         self.balance = 0
         self.asset_amount = 0
@@ -77,7 +78,6 @@ class StrategySmaMl(Strategy):
         self.result = []
         self.request = None
         self.current_process = "ready"
-        self.closing_price_list = []
         self.process_unit = (0, 0)  # budget and amount
         self.logger = LogManager.get_logger(__class__.__name__)
         self.waiting_requests = {}
@@ -136,7 +136,7 @@ class StrategySmaMl(Strategy):
         if target is None:
             return
 
-        self.data.append(copy.deepcopy(target))
+        self.data.append(target)
         self.__update_process(target)
 
     def __add_drawing_spot(self, date_time, value):
@@ -178,20 +178,20 @@ class StrategySmaMl(Strategy):
     def __update_process(self, info):
         try:
             current_price = info["closing_price"]
-            current_idx = len(self.closing_price_list)
+            current_idx = len(self.data) - 1
             self.logger.info(f"# update process :: {current_idx}")
-            self.closing_price_list.append(current_price)
+            closing_prices = self.data.window("closing_price")
 
             sma_short_list = (
-                pd.Series(self.closing_price_list).rolling(self.SHORT).mean().values
+                pd.Series(closing_prices).rolling(self.SHORT).mean().values
             )
             sma_short = sma_short_list[-1]
             sma_mid_list = (
-                pd.Series(self.closing_price_list).rolling(self.MID).mean().values
+                pd.Series(closing_prices).rolling(self.MID).mean().values
             )
             sma_mid = sma_mid_list[-1]
             sma_long_list = (
-                pd.Series(self.closing_price_list).rolling(self.LONG).mean().values
+                pd.Series(closing_prices).rolling(self.LONG).mean().values
             )
             sma_long = sma_long_list[-1]
 
@@ -342,7 +342,7 @@ class StrategySmaMl(Strategy):
         """check request index is too old, so spoiled
         요청 index가 너무 오래되어서 유효한지 확인, 오래 체결안되는 경우에 대한 예외처리
         """
-        current_idx = len(self.closing_price_list)
+        current_idx = len(self.data)
         not_spoiled = current_idx - index < self.SPOIL_LIMIT
         if not_spoiled is False:
             self.logger.info(f"Spoiled! current_idx: {current_idx}, index: {index}")
@@ -396,7 +396,7 @@ class StrategySmaMl(Strategy):
                     }
                 ]
 
-            current_idx = len(self.closing_price_list)
+            current_idx = len(self.data)
             request = None
             if self.cross_info[0]["price"] <= 0 or self.cross_info[1]["price"] <= 0:
                 request = None
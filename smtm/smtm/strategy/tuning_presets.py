@@ -0,0 +1,78 @@
+"""
+StrategyBBI_V3_Spec_V16_Vol 튜닝 프리셋
+
+튜닝 UI(ui_tuning_simulator)와 walk-forward 검증(smtm.runner.walk_forward)에서 같은 값을 사용한다.
+키는 전략 클래스 속성 이름이며 StrategyFactory.create(code, params)로 주입할 수 있다.
+"""
+
+from typing import Any, Dict
+
+PRESET_BALANCED: Dict[str, Any] = {
+    "EMERGENCY_STOP_LOSS": 0.08,
+    "EMERGENCY_STOP_MAX_BUY_COUNT": 2,
+    "MAX_LOSS_AFTER_5TH": 0.02,
+    "DRAWDOWN_THRESHOLDS": [0.0, 0.02, 0.03, 0.04, 0.05],
+    "BUY_WEIGHTS": [7.0, 5.0, 3.6, 2.4, 2.0],
+    "BUY_COOLDOWN_TICKS": 15,
+    "VOL_SPIKE_FACTOR": 2.5,
+    "VOL_MA_PERIOD": 20,
+    "LATE_RSI_LIMIT": 60,
+    "LATE_MACD_LIMIT": -250000,
+    "LATE_STOCH_LIMIT": 2.5,
+    "LATE_EMA_DISTANCE_MIN": 0.37,
+    "BREAKEVEN_EXIT_THRESHOLDS": [0.01, 0.009, 0.008, 0.007, 0.006],
+    "RALLY_START_PROFIT": 0.02,
+    "RALLY_TRAIL_DROP": 0.01,
+    "ATR_PERCENTILE": 40,
+    "EMA_DISTANCE_PERCENT_MIN": 0.37,
+    "SELL_COOLDOWN_TICKS": 5,
+}
+
+PRESET_SAFE: Dict[str, Any] = {
+    "EMERGENCY_STOP_LOSS": 0.07,
+    "EMERGENCY_STOP_MAX_BUY_COUNT": 2,
+    "MAX_LOSS_AFTER_5TH": 0.018,
+    "DRAWDOWN_THRESHOLDS": [0.0, 0.025, 0.035, 0.045, 0.055],
+    "BUY_WEIGHTS": [6.5, 4.5, 3.2, 2.2, 1.8],
+    "BUY_COOLDOWN_TICKS": 18,
+    "VOL_SPIKE_FACTOR": 2.7,
+    "VOL_MA_PERIOD": 22,
+    "LATE_RSI_LIMIT": 58,
+    "LATE_MACD_LIMIT": -260000,
+    "LATE_STOCH_LIMIT": 2.3,
+    "LATE_EMA_DISTANCE_MIN": 0.40,
+    "BREAKEVEN_EXIT_THRESHOLDS": [0.009, 0.008, 0.007, 0.006, 0.005],
+    "RALLY_START_PROFIT": 0.022,
+    "RALLY_TRAIL_DROP": 0.009,
+    "ATR_PERCENTILE": 45,
+    "EMA_DISTANCE_PERCENT_MIN": 0.40,
+    "SELL_COOLDOWN_TICKS": 7,
+}
+
+PRESET_AGGRESSIVE: Dict[str, Any] = {
+    "EMERGENCY_STOP_LOSS": 0.09,
+    "EMERGENCY_STOP_MAX_BUY_COUNT": 2,
+    "MAX_LOSS_AFTER_5TH": 0.025,
+    "DRAWDOWN_THRESHOLDS": [0.0, 0.015, 0.025, 0.035, 0.045],
+    "BUY_WEIGHTS": [8.0, 6.0, 4.5, 3.0, 2.5],
+    "BUY_COOLDOWN_TICKS": 12,
+    "VOL_SPIKE_FACTOR": 2.2,
+    "VOL_MA_PERIOD": 18,
+    "LATE_RSI_LIMIT": 63,
+    "LATE_MACD_LIMIT": -220000,
+    "LATE_STOCH_LIMIT": 3.0,
+    "LATE_EMA_DISTANCE_MIN": 0.32,
+    "BREAKEVEN_EXIT_THRESHOLDS": [0.012, 0.010, 0.009, 0.008, 0.007],
+    "RALLY_START_PROFIT": 0.018,
+    "RALLY_TRAIL_DROP": 0.012,
+    "ATR_PERCENTILE": 35,
+    "EMA_DISTANCE_PERCENT_MIN": 0.33,
+    "SELL_COOLDOWN_TICKS": 4,
+}
+
+
+PRESETS: Dict[str, Dict[str, Any]] = {
+    "SAFE": PRESET_SAFE,
+    "BALANCED": PRESET_BALANCED,
+    "AGGRESSIVE": PRESET_AGGRESSIVE,
+}
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""BBI V16 지표 계산 벤치마크 (turns/sec)
+
+사용 예)
+  python -m smtm.tools.bench_bbi_indicators
+  python -m smtm.tools.bench_bbi_indicators --candles 5000
+
+비교 대상
+  - legacy    : 매 캔들마다 전체 이력을 pandas로 다시 계산 (기존 O(n^2) 방식)
+  - streaming : smtm.indicator 스트리밍 지표로 캔들당 O(1) 갱신
+  - precomputed : IndicatorCache에 미리 계산된 컬럼을 캔들 인덱스로 읽음
+                  (스윕처럼 같은 구간을 반복 실행하는 경우, 캐시 조회 시간 포함)
+
+출력
+  - 방식별 처리 캔들 수, 소요 시간, turns/sec, 속도 비율
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from smtm.indicator import IndicatorCache
+from smtm.indicator.vectorized import bbi_indicator_columns
+from smtm.strategy.strategy_bbi_v3_spec_v16_vol import StrategyBBI_V3_Spec_V16_Vol
+
+
+class _LegacyBBI(StrategyBBI_V3_Spec_V16_Vol):
+    """매 턴마다 전체 이력으로 지표를 다시 계산하던 기존 방식"""
+
+    def __init__(self):
+        super().__init__()
+        self.history = []
+
+    def _update_indicators_for_last_candle(self):
+        self.history.append(self.data[-1])
+        n = len(self.history)
+        columns = bbi_indicator_columns(
+            [d["closing_price"] for d in self.history],
+            [d["high_price"] for d in self.history],
+            [d["low_price"] for d in self.history],
+            atr_period=self.ATR_PERIOD,
+            ema_period=self.EMA_PERIOD,
+        )
+        self.data.set("bb_lower", float(columns["bb_lower"][-1]) if n >= 20 else None)
+        self.data.set("rsi", float(columns["rsi"][-1]) if n >= 14 else None)
+        self.data.set("macd", float(columns["macd"][-1]) if n >= 26 else None)
+        self.data.set("stoch_k", float(columns["stoch_k"][-1]) if n >= 14 else None)
+        if n >= self.ATR_PERIOD + 1:
+            atr = float(columns["atr"][-1])
+            self.data.set("atr", atr)
+            self.atr_values.append(atr)
+        else:
+            self.data.set("atr", None)
+        self.data.set("ema", float(columns["ema"][-1]) if n >= self.EMA_PERIOD else None)
+
+
+def make_candles(count: int, seed: int = 1) -> list:
+    rnd = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    price = 50000.0
+    candles = []
+    for i in range(count):
+        close = round(price * (1 + rnd.gauss(0, 0.003)), 0)
+        candles.append(
+            {
+                "type": "primary_candle",
+                "market": "KRW-BTC",
+                "date_time": (start + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%S"),
+                "opening_price": price,
+                "high_price": max(price, close) + round(rnd.random() * 30, 0),
+                "low_price": min(price, close) - round(rnd.random() * 30, 0),
+                "closing_price": close,
+                "acc_price": close * 0.5,
+                "acc_volume": 0.5 + rnd.random(),
+            }
+        )
+        price = close
+    return candles
+
+
+def run(strategy_cls, candles: list, precompute: bool = False) -> float:
+    strategy = strategy_cls()
+    strategy._apply_tuning_params = lambda: None
+    strategy.is_simulation = True
+    strategy.initialize(10_000_000, 5000)
+
+    started = time.perf_counter()
+    if precompute:
+        strategy.precompute(candles)
+    for candle in candles:
+        strategy.update_trading_info([candle])
+        strategy.request = None
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--candles", type=int, default=3000, help="number of candles")
+    args = ap.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    candles = make_candles(args.candles)
+
+    # 첫 실행에서 계산된 컬럼은 메모리 캐시에 남으므로 precomputed는 이후 실행의 비용을 잰다
+    IndicatorCache._instance = IndicatorCache(cache_dir=None)
+    run(StrategyBBI_V3_Spec_V16_Vol, candles, precompute=True)
+
+    results = {}
+    for name, cls, precompute in (
+        ("legacy", _LegacyBBI, False),
+        ("streaming", StrategyBBI_V3_Spec_V16_Vol, False),
+        ("precomputed", StrategyBBI_V3_Spec_V16_Vol, True),
+    ):
+        elapsed = run(cls, candles, precompute)
+        results[name] = len(candles) / elapsed
+        print(f"{name:>11}: {len(candles)} candles, {elapsed:8.3f}s, {results[name]:12.1f} turns/sec")
+
+    print(f"{'speedup':>11}: x{results['streaming'] / results['legacy']:.1f} (streaming / legacy)")
+    print(f"{'':>11}  x{results['precomputed'] / results['streaming']:.1f} (precomputed / streaming)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""캔들 테이블 스키마 v1/v2 조회 성능 벤치마크
+
+사용 예)
+  python -m smtm.tools.bench_candle_query
+  python -m smtm.tools.bench_candle_query --days 30 --markets 4 --repeat 5
+
+비교 대상
+  - v1 : TEXT id PRIMARY KEY, date_time 문자열 조건 + ORDER BY datetime(date_time) (인덱스 없음)
+  - v2 : (market, period, ts_epoch) PRIMARY KEY WITHOUT ROWID, WAL, PK 범위 스캔
+
+여러 market의 1분봉을 임시 DB에 만들고, 그 중 한 market의 전체 기간(기본 1개월)을 dict 행으로 조회한다.
+
+출력
+  - sql   : tuple 행으로 조회한 SQL 자체 시간
+  - query : Database.query와 같은 dict 행으로 조회한 시간
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from smtm.data.database import Database
+
+V1_COLUMNS = "id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume"
+
+
+def make_v1_db(path: str, days: int, markets: int) -> tuple:
+    rnd = random.Random(1)
+    start = datetime(2024, 1, 1)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE upbit (id TEXT PRIMARY KEY, period INT, recovered INT, market TEXT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT)"
+    )
+    conn.execute(
+        "CREATE TABLE binance (id TEXT PRIMARY KEY, period INT, recovered INT, market TEXT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT)"
+    )
+    rows = []
+    for m in range(markets):
+        market = f"KRW-M{m}"
+        for i in range(days * 1440):
+            date_time = (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S")
+            price = 1000.0 + rnd.random()
+            # v1의 id에는 market이 없으므로 market별로 다른 id를 만들어 모두 저장되게 한다
+            rows.append((f"60S-{market}-{date_time}", 60, 0, market, date_time, price, price, price, price, 1.0, 1.0))
+    conn.executemany(f"INSERT INTO upbit ({V1_COLUMNS}) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    end = start + timedelta(days=days)
+    return start.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def measure(func, repeat: int) -> tuple:
+    elapsed = []
+    count = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = len(func())
+        elapsed.append(time.perf_counter() - started)
+    return count, sum(elapsed) / len(elapsed)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, default=30, help="days of 1m candles per market")
+    ap.add_argument("--markets", type=int, default=4, help="number of markets in the table")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        start, end = make_v1_db(path, args.days, args.markets)
+
+        conn = sqlite3.connect(path)
+        v1_sql = f"SELECT {V1_COLUMNS} FROM upbit WHERE market = ? AND period = ? AND date_time >= ? AND date_time < ? ORDER BY datetime(date_time) ASC"
+        v1_raw = measure(lambda: conn.execute(v1_sql, ("KRW-M0", 60, start, end)).fetchall(), args.repeat)
+        # Database.query와 같은 dict 행
+        conn.row_factory = lambda cursor, row: {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
+        v1_dict = measure(lambda: conn.execute(v1_sql, ("KRW-M0", 60, start, end)).fetchall(), args.repeat)
+        conn.close()
+
+        started = time.perf_counter()
+        database = Database(path)
+        migration_time = time.perf_counter() - started
+        v2_dict = measure(lambda: database.query(start, end, "KRW-M0"), args.repeat)
+        raw_cursor = database.conn.cursor()
+        raw_cursor.row_factory = None
+        v2_sql = "SELECT market, period, recovered, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume FROM upbit WHERE market = ? AND period = ? AND ts_epoch >= ? AND ts_epoch < ? ORDER BY ts_epoch ASC"
+        v2_raw = measure(
+            lambda: raw_cursor.execute(
+                v2_sql, ("KRW-M0", 60, Database.to_epoch(start), Database.to_epoch(end))
+            ).fetchall(),
+            args.repeat,
+        )
+        raw_cursor.close()
+        del database
+
+    print(f"{'migration':>10}: {migration_time:8.3f}s")
+    for name, v1, v2 in (("sql", v1_raw, v2_raw), ("query", v1_dict, v2_dict)):
+        print(f"{name:>10}: {v1[0]} candles, v1 {v1[1] * 1000:8.1f} ms, v2 {v2[1] * 1000:8.1f} ms, x{v1[1] / v2[1]:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""lean 분석기 벤치마크 (대량 시뮬레이션 구간 처리 속도)
+
+사용 예)
+  python -m smtm.tools.bench_lean_analyzer
+  python -m smtm.tools.bench_lean_analyzer --strategy SMA --currency BTC --start 2025-11-21T00:00:00 --periods 12 --minutes 120
+
+비교 대상
+  - full : MassSimulator 구간마다 거래 표, 보고서 파일, 그래프를 만드는 기본 Analyzer
+  - lean : 자산 곡선과 거래 결과만 기록하고 요약 지표만 계산하는 Analyzer(lean=True)
+
+캔들은 로컬 DB(smtm.db)의 데이터를 사용하고 full 실행은 output/ 에 보고서와 그래프를 만든다.
+캔들 로딩 시간이 섞이지 않도록 첫 구간을 한 번 실행해서 캔들 캐시를 채운 뒤 측정한다.
+
+출력
+  - 방식별 구간 수, 소요 시간, periods/sec, 요약 지표 일치 여부
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+
+from smtm.config import Config
+from smtm.controller.mass_simulator import MassSimulator
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def make_periods(start: str, periods: int, minutes: int) -> list:
+    start_dt = datetime.strptime(start, ISO_FORMAT)
+    return [
+        (
+            (start_dt + timedelta(minutes=minutes * idx)).strftime(ISO_FORMAT),
+            (start_dt + timedelta(minutes=minutes * (idx + 1))).strftime(ISO_FORMAT),
+        )
+        for idx in range(periods)
+    ]
+
+
+def run_periods(args, periods: list, lean: bool) -> tuple:
+    reports = []
+    started = time.perf_counter()
+    for idx, (start, end) in enumerate(periods):
+        operator = MassSimulator.get_initialized_operator(
+            args.budget, args.strategy, 0, args.currency, start, end, f"BENCH-{idx}", lean=lean
+        )
+        reports.append(MassSimulator.run_single(operator)[:4])
+    return reports, time.perf_counter() - started
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--strategy", default="SMA", help="strategy code")
+    ap.add_argument("--currency", default="BTC", help="ex) BTC, ETH")
+    ap.add_argument("--start", default="2025-11-21T00:00:00", help="first period start")
+    ap.add_argument("--periods", type=int, default=12, help="number of periods")
+    ap.add_argument("--minutes", type=int, default=120, help="period length (minutes)")
+    ap.add_argument("--budget", type=int, default=1000000)
+    args = ap.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    Config.candle_interval = 60
+    periods = make_periods(args.start, args.periods, args.minutes)
+    run_periods(args, periods[:1], lean=True)
+
+    full, full_time = run_periods(args, periods, lean=False)
+    lean, lean_time = run_periods(args, periods, lean=True)
+
+    for name, elapsed in (("full", full_time), ("lean", lean_time)):
+        print(f"{name:>5}: {len(periods)} periods, {elapsed:8.2f}s, {len(periods) / elapsed:8.2f} periods/sec")
+    print(f"speedup: x{full_time / lean_time:.1f}, same summary: {full == lean}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
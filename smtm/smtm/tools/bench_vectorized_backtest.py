@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""벡터화 백테스트 벤치마크 (이벤트 방식 대비 소요 시간, 체결 일치 여부)
+
+사용 예)
+  python -m smtm.tools.bench_vectorized_backtest
+  python -m smtm.tools.bench_vectorized_backtest --candles 20000 --volatility 0.0005
+
+비교 대상
+  - event      : 캔들마다 전략 update_trading_info/get_request 후 VirtualMarket.handle_request
+                 (SimulationOperator 턴과 같은 순서, 분석기와 리포트 제외)
+  - vectorized : VectorizedMarket.run_strategy, 전략의 신호 배열과 신호 캔들의 주문만 처리
+
+출력
+  - 전략별 체결 수, 방식별 소요 시간, 속도 비율, 체결 내역 일치 여부
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from smtm.strategy.strategy_bnh import StrategyBuyAndHold
+from smtm.strategy.strategy_rsi import StrategyRsi
+from smtm.strategy.strategy_sma_0 import StrategySma0
+from smtm.trader.vectorized_market import VectorizedMarket
+from smtm.trader.virtual_market import VirtualMarket
+
+
+STRATEGIES = (StrategySma0, StrategyRsi, StrategyBuyAndHold)
+
+
+def make_candles(count: int, seed: int = 1, volatility: float = 0.0005) -> list:
+    rnd = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    price = 50000000.0
+    drift = 0.0
+    candles = []
+    for i in range(count):
+        # 200캔들마다 추세를 바꿔서 이동 평균 교차가 생기도록 한다
+        if i % 200 == 0:
+            drift = rnd.choice([-0.001, 0.0, 0.001])
+        close = round(price * (1 + drift + rnd.gauss(0, volatility)), 0)
+        candles.append(
+            {
+                "type": "primary_candle",
+                "market": "KRW-BTC",
+                "date_time": (start + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%S"),
+                "opening_price": price,
+                "high_price": max(price, close) + round(rnd.random() * price * 0.002, 0),
+                "low_price": min(price, close) - round(rnd.random() * price * 0.002, 0),
+                "closing_price": close,
+                "acc_price": close * 0.5,
+                "acc_volume": 0.5 + rnd.random(),
+            }
+        )
+        price = close
+    return candles
+
+
+def run_event(strategy_cls, candles: list, budget: int) -> list:
+    with patch("smtm.trader.virtual_market.DataRepository"):
+        market = VirtualMarket()
+    market.data = candles
+    market.balance = budget
+    market.is_initialized = True
+    strategy = strategy_cls()
+    strategy.is_simulation = True
+    strategy.initialize(budget)
+
+    trades = []
+    for candle in candles:
+        strategy.update_trading_info([dict(candle)])
+        result = market.handle_request(strategy.get_request()[0])
+        if isinstance(result, dict) and result["msg"] == "game-over":
+            break
+        if isinstance(result, dict):
+            strategy.update_result(result)
+            trades.append((result["type"], float(result["price"]), float(result["amount"]), result["balance"]))
+    return trades
+
+
+def run_vectorized(strategy_cls, candles: list, budget: int) -> list:
+    result = VectorizedMarket().run_strategy(strategy_cls(), candles, budget)
+    return [(t["type"], t["price"], t["amount"], t["balance"]) for t in result["trades"]]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--candles", type=int, default=5000, help="number of candles")
+    ap.add_argument("--volatility", type=float, default=0.0005, help="per candle price volatility")
+    ap.add_argument("--budget", type=int, default=10_000_000, help="budget (KRW)")
+    args = ap.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    candles = make_candles(args.candles, volatility=args.volatility)
+
+    for strategy_cls in STRATEGIES:
+        started = time.perf_counter()
+        expected = run_event(strategy_cls, candles, args.budget)
+        event_sec = time.perf_counter() - started
+
+        started = time.perf_counter()
+        trades = run_vectorized(strategy_cls, candles, args.budget)
+        vectorized_sec = time.perf_counter() - started
+
+        print(
+            f"{strategy_cls.CODE:>4}: {len(candles)} candles, {len(trades):4} trades, "
+            f"event {event_sec * 1000:9.1f}ms, vectorized {vectorized_sec * 1000:7.1f}ms, "
+            f"x{event_sec / vectorized_sec:.0f}, match {trades == expected}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
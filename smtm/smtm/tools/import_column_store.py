@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""SQLite(smtm.db) 캔들 데이터를 ColumnStore(memmap) 파일로 가져오기
+
+사용 예)
+  python -m smtm.tools.import_column_store --market KRW-BTC
+  python -m smtm.tools.import_column_store --source binance --market BTCUSDT --interval 60
+  python -m smtm.tools.import_column_store --market KRW-BTC --market KRW-XRP --db smtm.db --out column_store
+
+가져온 뒤 Config.simulation_data_backend = "column" 으로 설정하면 백테스트가 ColumnStore를 먼저 사용한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from smtm.config import Config
+from smtm.data.column_store import ColumnStore
+from smtm.data.database import Database
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default="smtm.db", help="SQLite database file")
+    ap.add_argument("--out", default=Config.column_store_dir, help="column store directory")
+    ap.add_argument("--source", default="upbit", choices=("upbit", "binance"))
+    ap.add_argument("--market", action="append", required=True, help="market, repeatable")
+    ap.add_argument("--interval", type=int, default=60, help="candle interval seconds")
+    args = ap.parse_args()
+
+    database = Database(args.db)
+    store = ColumnStore(args.out)
+    for market in args.market:
+        started = time.perf_counter()
+        count = store.import_from_database(
+            database, market, interval=args.interval, is_upbit=args.source == "upbit"
+        )
+        elapsed = time.perf_counter() - started
+        path = store.get_path(args.source, market, args.interval)
+        print(f"{market}: {count} candles -> {path} ({elapsed:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
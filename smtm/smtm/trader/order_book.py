@@ -0,0 +1,126 @@
+"""
+Order Book
+가상 거래소의 대기 주문 장부
+
+Keeps resting limit orders of the virtual market in price-sorted heaps per side.
+Buy orders are kept highest price first and sell orders lowest price first, ties in arrival order,
+so matching a candle only touches the orders that can be filled by it.
+Cancelled or finished orders are removed lazily when they reach the top of the heap.
+가상 거래소의 대기 지정가 주문을 매수, 매도별 가격 정렬 힙으로 보관합니다.
+매수는 높은 가격, 매도는 낮은 가격 순이며 같은 가격은 먼저 들어온 순서이므로
+캔들 체결 판단은 그 캔들로 체결될 수 있는 주문만 확인합니다.
+취소되거나 완료된 주문은 힙의 맨 앞에 올 때 제거합니다.
+"""
+
+import heapq
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class RestingOrder:
+    """대기 주문 한 개, request는 전략이 보낸 요청 정보 그대로 보관한다"""
+
+    __slots__ = ("request", "side", "price", "amount", "remaining", "turn", "seq", "is_open")
+
+    def __init__(self, request: Dict[str, Any], turn: int, seq: int):
+        self.request = request
+        self.side = request["type"]
+        self.price = float(request["price"])
+        self.amount = float(request["amount"])
+        self.remaining = self.amount
+        self.turn = turn
+        self.seq = seq
+        self.is_open = True
+
+
+class OrderBook:
+    """
+    매수, 매도 가격 정렬 힙으로 대기 주문을 관리하는 주문 장부
+    Order book keeping resting orders in price-sorted heaps per side
+    """
+
+    COMPACT_MIN = 256
+
+    def __init__(self):
+        self._heaps = {"buy": [], "sell": []}
+        self._orders = {}
+        self._by_time = deque()
+        self._seq = 0
+        self._stale = 0
+        self.open_count = 0
+
+    def __len__(self) -> int:
+        return self.open_count
+
+    def add(self, request: Dict[str, Any], turn: int) -> RestingOrder:
+        """요청을 대기 주문으로 추가한다, request type은 buy 또는 sell"""
+        order = RestingOrder(request, turn, self._seq)
+        self._seq += 1
+        key = order.price if order.side == "sell" else -order.price
+        heapq.heappush(self._heaps[order.side], (key, order.seq, order))
+        self._orders.setdefault(request.get("id"), []).append(order)
+        self._by_time.append(order)
+        self.open_count += 1
+        return order
+
+    def close(self, order: RestingOrder) -> None:
+        """체결 완료, 취소, 만료된 주문을 장부에서 닫는다"""
+        if not order.is_open:
+            return
+        order.is_open = False
+        self.open_count -= 1
+        orders = self._orders.get(order.request.get("id"))
+        if orders is not None:
+            orders.remove(order)
+            if len(orders) == 0:
+                del self._orders[order.request.get("id")]
+        while self._by_time and not self._by_time[0].is_open:
+            self._by_time.popleft()
+
+        # 닫힌 주문이 열린 주문보다 많이 쌓이면 힙을 다시 만든다
+        self._stale += 1
+        if self._stale > self.COMPACT_MIN and self._stale > self.open_count:
+            for heap in self._heaps.values():
+                heap[:] = [item for item in heap if item[2].is_open]
+                heapq.heapify(heap)
+            self._stale = 0
+
+    def get_orders(self, request_id: Optional[str] = None) -> List[RestingOrder]:
+        """request_id의 대기 주문 리스트, None이면 전체 대기 주문을 들어온 순서로 반환"""
+        if request_id is not None:
+            return list(self._orders.get(request_id, []))
+        return [order for order in self._by_time if order.is_open]
+
+    def iter_matchable(self, side: str, low: float, high: float) -> Iterator[RestingOrder]:
+        """
+        가격 우선, 시간 우선 순서로 캔들에서 체결 가능한 주문을 반환한다
+        매수는 가격이 low 이상, 매도는 가격이 high 미만인 주문
+        반환한 주문은 힙에서 꺼내므로 끝나지 않은 주문은 restore로 되돌려야 한다
+        """
+        heap = self._heaps[side]
+        while heap:
+            key, _, order = heap[0]
+            if not order.is_open:
+                heapq.heappop(heap)
+                continue
+            if (side == "buy" and -key < low) or (side == "sell" and key >= high):
+                return
+            heapq.heappop(heap)
+            yield order
+
+    def restore(self, orders: List[RestingOrder]) -> None:
+        """iter_matchable로 꺼낸 주문 중 열려 있는 주문을 힙에 되돌린다"""
+        for order in orders:
+            if order.is_open:
+                key = order.price if order.side == "sell" else -order.price
+                heapq.heappush(self._heaps[order.side], (key, order.seq, order))
+
+    def pop_expired(self, turn: int) -> List[RestingOrder]:
+        """turn 이전에 들어온 열린 주문을 닫고 반환한다"""
+        expired = []
+        while self._by_time and self._by_time[0].turn < turn:
+            order = self._by_time.popleft()
+            if order.is_open:
+                self.close(order)
+                expired.append(order)
+        return expired
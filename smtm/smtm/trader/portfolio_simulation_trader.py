@@ -0,0 +1,59 @@
+import os
+
+from ..log_manager import LogManager
+from .trader import Trader
+from .simulation_trader import SimulationTrader
+from .portfolio_virtual_market import PortfolioVirtualMarket
+
+
+class PortfolioSimulationTrader(Trader):
+    """
+    여러 마켓을 하나의 현금 잔고로 거래하는 시뮬레이션용 가상 트레이더
+
+    Simulation trader for several markets sharing one cash balance
+
+    요청 정보의 market으로 거래할 마켓을 구분하며 market이 없으면 첫 번째 통화의 마켓으로 처리한다
+    한 턴의 요청 리스트를 모두 PortfolioVirtualMarket에 전달하고 체결 결과마다 callback을 호출한다
+    """
+
+    NAME = "Portfolio Simulation"
+
+    def __init__(self, currencies=("BTC",), interval=60):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.markets = [SimulationTrader.get_market(currency) for currency in currencies]
+        sim_verbose = os.getenv("SMTM_SIM_VERBOSE", "0") in ("1", "true", "True", "YES", "yes")
+        self.v_market = PortfolioVirtualMarket(self.markets, interval=interval, verbose=sim_verbose)
+        self.is_initialized = False
+
+    def initialize_simulation(self, end, count, budget):
+        self.v_market.initialize(end, count, budget)
+        self.is_initialized = True
+
+    def send_request(self, request_list, callback):
+        if self.is_initialized is not True:
+            raise UserWarning("Not initialzed")
+
+        try:
+            for result in self.v_market.handle_requests(request_list):
+                callback(result)
+        except (TypeError, AttributeError) as msg:
+            self.logger.error(f"invalid state {msg}")
+            raise UserWarning("invalid state") from msg
+
+    def get_account_info(self):
+        if self.is_initialized is not True:
+            raise UserWarning("Not initialzed")
+
+        try:
+            return self.v_market.get_balance()
+        except (TypeError, AttributeError) as msg:
+            self.logger.error(f"invalid state {msg}")
+            raise UserWarning("invalid state") from msg
+
+    def cancel_request(self, request_id):
+        """대기 주문이 없으므로 취소할 요청이 없다"""
+        return None
+
+    def cancel_all_requests(self):
+        """대기 주문이 없으므로 취소할 요청이 없다"""
+        return None
@@ -0,0 +1,255 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ..config import Config
+from ..log_manager import LogManager
+from ..data.data_repository import DataRepository
+from ..data.candle_cache import CandleCache
+from ..data.candle_alignment import align_candles
+
+
+class PortfolioVirtualMarket:
+    """
+    여러 마켓의 과거 캔들을 같은 시간축으로 정렬해서 하나의 현금 잔고로 거래하는 가상 거래소
+
+    Virtual market trading several markets with one shared cash balance over time-aligned candles
+
+    - handle_requests() 호출 1회 = turn 1회 진행, 해당 턴의 모든 요청을 처리한다
+    - 매도 요청을 먼저 처리한 후 매수 요청을 처리하므로 같은 턴에 매도 대금으로 다른 마켓을 매수할 수 있다
+    - 체결 규칙과 수수료는 VirtualMarket과 같다, 요청가로 다음 캔들의 저가(매수), 고가(매도)와 비교
+    - 다음 캔들이 거래가 없어 채워진 캔들이면 체결되지 않는다
+
+    주요 필드
+    - markets: 마켓 이름 리스트, 요청에 market이 없으면 첫 번째 마켓으로 처리
+    - data: {market: 정렬된 캔들 리스트}, CandleCache와 공유하므로 읽기 전용
+    - high, low, close: (마켓 수, 캔들 수) 가격 배열
+    - is_traded: (마켓 수, 캔들 수) 실제 거래가 있는 캔들 여부
+    - balance: 공유 현금 잔고
+    - asset: 보유자산 {market: (avg_price, amount)}
+    """
+
+    def __init__(self, markets, interval=60, *, verbose=False):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        if len(markets) == 0:
+            raise UserWarning("empty market list")
+        if len(set(markets)) != len(markets):
+            raise UserWarning(f"duplicated market: {markets}")
+
+        self.verbose = bool(verbose)
+        self.repo = DataRepository(
+            "smtm.db",
+            interval=interval,
+            source=Config.simulation_source,
+        )
+        self.markets = list(markets)
+        self.market_index = {market: idx for idx, market in enumerate(self.markets)}
+        self.interval = interval
+
+        self.data = {}
+        self.date_time_list = []
+        self.high = None
+        self.low = None
+        self.close = None
+        self.is_traded = None
+        self.turn_count = 0
+        self.balance = 0
+        self.commission_ratio = 0.0005
+        self.asset = {}
+        self.is_initialized = False
+
+    def initialize(self, end: str = None, count: int = 100, budget: float = 0):
+        """
+        마켓별 과거 데이터 로딩 및 시간 정렬 후 가상 마켓 초기화
+
+        end: "%Y-%m-%dT%H:%M:%S"
+        count: end 기준 과거로 몇 개 캔들을 로딩할지
+        budget: 초기 예산(공유 현금)
+        """
+        end_dt = datetime.strptime(end, "%Y-%m-%dT%H:%M:%S")
+        start_dt = end_dt - timedelta(minutes=count * (self.interval / 60))
+        start = start_dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+        cache = CandleCache.get_instance()
+        self.set_data(
+            {market: cache.get_data(self.repo, start, end, market=market) for market in self.markets}
+        )
+        self.balance = budget
+        self.turn_count = 0
+        self.asset = {}
+        self.is_initialized = True
+        self.logger.debug(
+            f"Portfolio Virtual Market is initialized end: {end}, count: {count}, markets: {len(self.markets)}"
+        )
+
+    def set_data(self, data):
+        """마켓별 캔들 리스트를 시간 정렬해서 가격 배열을 만든다 {market: 캔들 리스트}"""
+        self.date_time_list, self.data, traded = align_candles(data)
+        for field, name in (("high_price", "high"), ("low_price", "low"), ("closing_price", "close")):
+            setattr(
+                self,
+                name,
+                np.array([[candle[field] for candle in self.data[m]] for m in self.markets], dtype=np.float64),
+            )
+        self.is_traded = np.array([traded[m] for m in self.markets], dtype=bool)
+
+    def get_balance(self):
+        """
+        현금+자산 정보 반환
+
+        returns:
+        {
+            balance: 공유 현금 잔고
+            asset: {market: (avg_price, amount)}
+            quote: {market: current_price}, 모든 마켓의 현재가
+            date_time: 기준 데이터 시간
+        }
+        """
+        try:
+            quote = {market: float(self.close[idx, self.turn_count]) for idx, market in enumerate(self.markets)}
+            date_time = self.date_time_list[self.turn_count]
+        except (TypeError, IndexError) as msg:
+            self.logger.error(f"invalid trading data {msg}")
+            return None
+
+        return {
+            "balance": self.balance,
+            "asset": self.asset,
+            "quote": quote,
+            "date_time": date_time,
+        }
+
+    def handle_requests(self, request_list):
+        """
+        한 턴의 거래 요청을 모두 처리하고 턴을 진행한다
+
+        request_list: [{"market": 마켓, "type": buy, sell, "price", "amount", ...}]
+            0원/0수량 요청과 cancel 요청은 처리하지 않는다 (대기 주문이 없음)
+
+        return:
+            체결 결과 dict 리스트, 체결되지 않은 요청은 포함하지 않는다
+            데이터가 끝나면 game-over 결과 하나
+        """
+        if self.is_initialized is not True:
+            self.logger.error("portfolio virtual market is NOT initialized")
+            return []
+
+        now = self.date_time_list[self.turn_count]
+        self.turn_count += 1
+        next_index = self.turn_count
+
+        if next_index >= len(self.date_time_list) - 1:
+            request = request_list[0] if len(request_list) > 0 else None
+            return [
+                {
+                    "request": request,
+                    "type": request.get("type") if request is not None else None,
+                    "price": 0,
+                    "amount": 0,
+                    "balance": self.balance,
+                    "msg": "game-over",
+                    "date_time": now,
+                    "state": "done",
+                }
+            ]
+
+        # 매도를 먼저 처리해서 확보한 현금으로 같은 턴의 매수를 처리한다
+        ordered = [r for r in request_list if r.get("type") == "sell"]
+        ordered += [r for r in request_list if r.get("type") != "sell"]
+        results = []
+        for request in ordered:
+            result = self._handle_request(request, next_index, now)
+            if isinstance(result, dict):
+                results.append(result)
+        return results
+
+    def _handle_request(self, request, next_index, dt):
+        try:
+            if request.get("type") == "cancel":
+                return None
+            if float(request.get("price", 0)) == 0 or float(request.get("amount", 0)) == 0:
+                return None
+        except (TypeError, ValueError):
+            self.logger.warning("invalid request payload")
+            return "error!"
+
+        market = request.get("market") or self.markets[0]
+        if market not in self.market_index:
+            self.logger.warning(f"not supported market: {market}")
+            return "error!"
+
+        if request.get("type") == "buy":
+            return self._handle_buy_request(request, market, next_index, dt)
+        if request.get("type") == "sell":
+            return self._handle_sell_request(request, market, next_index, dt)
+
+        self.logger.warning("invalid type request")
+        return "error!"
+
+    def _handle_buy_request(self, request, market, next_index, dt):
+        idx = self.market_index[market]
+        price = float(request["price"])
+        amount = float(request["amount"])
+        buy_value = price * amount
+        buy_total_value = buy_value * (1 + self.commission_ratio)
+
+        if buy_total_value > self.balance:
+            self._log(f"no money {market}")
+            return "pass"
+
+        if not self.is_traded[idx, next_index] or price < self.low[idx, next_index]:
+            self._log(f"not matched {market}")
+            return "pass"
+
+        if market in self.asset:
+            asset = self.asset[market]
+            new_amount = round(asset[1] + amount, 6)
+            new_value = (amount * price) + (asset[0] * asset[1])
+            self.asset[market] = (round(new_value / new_amount), new_amount)
+        else:
+            self.asset[market] = (price, amount)
+
+        self.balance -= buy_total_value
+        self.balance = round(self.balance)
+        return self._make_result(request, market, request["amount"], dt)
+
+    def _handle_sell_request(self, request, market, next_index, dt):
+        idx = self.market_index[market]
+        price = float(request["price"])
+        amount = float(request["amount"])
+
+        if market not in self.asset:
+            self._log(f"asset empty {market}")
+            return "error!"
+
+        if not self.is_traded[idx, next_index] or price >= self.high[idx, next_index]:
+            self._log(f"not matched {market}")
+            return "pass"
+
+        sell_amount = amount
+        if amount > self.asset[market][1]:
+            sell_amount = self.asset[market][1]
+            del self.asset[market]
+        else:
+            self.asset[market] = (self.asset[market][0], round(self.asset[market][1] - sell_amount, 6))
+
+        self.balance += sell_amount * price * (1 - self.commission_ratio)
+        self.balance = round(self.balance)
+        return self._make_result(request, market, sell_amount, dt)
+
+    def _make_result(self, request, market, amount, dt):
+        return {
+            "request": request,
+            "market": market,
+            "type": request["type"],
+            "price": request["price"],
+            "amount": amount,
+            "msg": "success",
+            "balance": self.balance,
+            "state": "done",
+            "date_time": dt,
+        }
+
+    def _log(self, msg):
+        if self.verbose:
+            self.logger.info(msg)
@@ -22,41 +22,52 @@ class SimulationTrader(Trader):
     }
     NAME = "Simulation"
 
-    def __init__(self, currency="BTC", interval=60):
+    def __init__(self, currency="BTC", interval=60, order_book=None):
+        """
+        order_book: 체결되지 않은 주문을 대기시킬지 여부, None이면 Config.simulation_order_book
+            켜면 한 턴의 요청을 모두 VirtualMarket.handle_requests로 처리하고 결과마다 callback을 호출
+        """
         if Config.simulation_source not in ("upbit", "binance"):
             raise UserWarning(f"not supported source: {Config.simulation_source}")
 
         self.logger = LogManager.get_logger(__class__.__name__)
-
-        # upbit: KRW 전체 코인을 자동 매핑
-        if Config.simulation_source == "upbit":
-            market_map = krw_market_map(force_refresh=False)
-
-            if isinstance(currency, str) and currency.upper().startswith("KRW-"):
-                market = currency.upper()
-            else:
-                c = str(currency).upper()
-                if c not in market_map:
-                    raise UserWarning(f"not supported currency (upbit KRW market not found): {c}")
-                market = market_map[c]
-        else:
-            c = str(currency).upper()
-            if c not in self.AVAILABLE_CURRENCY["binance"]:
-                raise UserWarning(f"not supported currency: {c}")
-            market = self.AVAILABLE_CURRENCY["binance"][c]
+        market = self.get_market(currency)
 
         # ✅ 추가 옵션(상세 로그)은 기본 OFF
         #    실주문/디버그 상황에서만 환경변수로 켜세요.
         sim_verbose = os.getenv("SMTM_SIM_VERBOSE", "0") in ("1", "true", "True", "YES", "yes")
 
+        self.use_order_book = bool(Config.simulation_order_book if order_book is None else order_book)
         self.v_market = VirtualMarket(
             market=market,
             interval=interval,
             verbose=sim_verbose,
             log_noop=sim_verbose,
+            order_book=self.use_order_book,
+            participation_rate=Config.simulation_participation_rate,
+            order_expire_turn=Config.simulation_order_expire_turn,
         )
         self.is_initialized = False
 
+    @classmethod
+    def get_market(cls, currency):
+        """Config.simulation_source 기준으로 통화에 해당하는 마켓 이름을 반환"""
+        # upbit: KRW 전체 코인을 자동 매핑
+        if Config.simulation_source == "upbit":
+            if isinstance(currency, str) and currency.upper().startswith("KRW-"):
+                return currency.upper()
+
+            market_map = krw_market_map(force_refresh=False)
+            c = str(currency).upper()
+            if c not in market_map:
+                raise UserWarning(f"not supported currency (upbit KRW market not found): {c}")
+            return market_map[c]
+
+        c = str(currency).upper()
+        if c not in cls.AVAILABLE_CURRENCY["binance"]:
+            raise UserWarning(f"not supported currency: {c}")
+        return cls.AVAILABLE_CURRENCY["binance"][c]
+
     def initialize_simulation(self, end, count, budget):
         self.v_market.initialize(end, count, budget)
         self.is_initialized = True
@@ -66,6 +77,11 @@ class SimulationTrader(Trader):
             raise UserWarning("Not initialzed")
 
         try:
+            if self.use_order_book:
+                for result in self.v_market.handle_requests(request_list):
+                    callback(result)
+                return
+
             result = self.v_market.handle_request(request_list[0])
             if result is not None:
                 callback(result)
@@ -88,6 +104,7 @@ class SimulationTrader(Trader):
         시뮬레이션에서는 실거래 주문취소 개념이 없거나 단순화될 수 있습니다.
         VirtualMarket이 취소를 지원하면 거기로 위임하고,
         없으면 no-op 처리합니다.
+        order_book 옵션이 켜져 있으면 대기 주문을 취소하고 취소 결과 리스트를 반환합니다.
         """
         if getattr(self, "v_market", None) is None:
             return None
@@ -0,0 +1,215 @@
+"""
+Vectorized Market
+벡터화 백테스트 엔진
+
+Backtests a strategy from whole-range buy/sell signal arrays instead of feeding candles one by one.
+Fills follow the VirtualMarket rules: a request made at candle i is matched against candle i+1,
+a buy fills when its price is not below the next low, a sell when its price is below the next high,
+and the same commission and rounding are applied.
+매 캔들을 전략에 전달하는 대신 전체 구간의 매수, 매도 신호 배열로 백테스트합니다.
+체결 규칙은 VirtualMarket과 같습니다. i번째 캔들의 요청은 i+1번째 캔들로 체결을 판단하며
+매수는 다음 캔들 저가 이상, 매도는 다음 캔들 고가 미만일 때 체결되고 같은 수수료와 반올림을 적용합니다.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..log_manager import LogManager
+
+
+class VectorizedMarket:
+    """
+    신호 배열 기반 벡터화 백테스트 엔진
+    Vectorized backtest engine driven by signal arrays
+
+    신호와 체결 판정, 자산 곡선은 NumPy 배열 연산으로 계산하고
+    잔고에 따라 수량이 달라지는 주문만 신호 캔들에서 차례대로 처리한다.
+    전략은 Strategy.get_vectorized_signals, get_vectorized_amount로 벡터화 구현을 제공한다.
+
+    시뮬레이션과 같이 마지막 두 캔들에서는 주문하지 않는다 (VirtualMarket의 game-over 시점)
+    """
+
+    COMMISSION_RATIO = 0.0005
+    PRICE_FIELDS = ("high_price", "low_price", "closing_price")
+
+    def __init__(self, commission_ratio: float = COMMISSION_RATIO):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.commission_ratio = commission_ratio
+
+    @classmethod
+    def make_columns(cls, candles: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        캔들 dict 리스트를 float64 가격 컬럼과 date_time 배열로 변환
+        Convert candle dicts to float64 price columns and a date_time array
+        """
+        columns = {
+            field: np.fromiter((candle[field] for candle in candles), dtype=np.float64, count=len(candles))
+            for field in cls.PRICE_FIELDS
+        }
+        columns["date_time"] = np.array([candle["date_time"] for candle in candles], dtype=object)
+        return columns
+
+    def run(
+        self,
+        columns: Dict[str, np.ndarray],
+        signals: Dict[str, np.ndarray],
+        budget: float,
+        get_amount: Callable[[str, float, Dict[str, float]], Optional[float]],
+    ) -> Dict[str, Any]:
+        """
+        신호 배열로 백테스트를 실행한다
+        Run a backtest from signal arrays
+
+        columns: make_columns의 결과
+        signals: {"buy": bool 배열, "sell": bool 배열, "price": 주문 가격 배열(생략하면 종가)}
+        budget: 시작 예산
+        get_amount(side, price, account): 신호 캔들의 주문 수량, None 또는 0이면 주문하지 않음
+            account는 Strategy.get_vectorized_amount 설명 참고
+
+        Returns:
+        {
+            "equity": 캔들별 종가 기준 평가 금액 배열
+            "balance": 캔들별 현금 잔고 배열
+            "asset_amount": 캔들별 보유 수량 배열
+            "trades": 체결 리스트, VirtualMarket 결과와 같은 type, price, amount, balance, msg, date_time과
+                요청 캔들 index
+            "final_balance": 마지막 현금 잔고
+            "final_return": 마지막 평가 금액의 수익률 (%)
+        }
+        """
+        close = np.asarray(columns["closing_price"], dtype=np.float64)
+        high = np.asarray(columns["high_price"], dtype=np.float64)
+        low = np.asarray(columns["low_price"], dtype=np.float64)
+        date_time = columns.get("date_time")
+        count = len(close)
+
+        buy = np.asarray(signals["buy"], dtype=bool)
+        sell = np.asarray(signals["sell"], dtype=bool)
+        price = np.asarray(signals.get("price", close), dtype=np.float64)
+        if not len(buy) == len(sell) == len(price) == count:
+            raise UserWarning("signal length is different from candle count")
+        if np.any(buy & sell):
+            raise UserWarning("buy and sell signals overlap")
+
+        # i번째 요청은 i+1번째 캔들로 판단하며, count-2 번째 턴은 game-over
+        last = max(count - 2, 0)
+        side = np.zeros(count, dtype=np.int8)
+        side[buy] = 1
+        side[sell] = -1
+        side[last:] = 0
+        run_start = side != np.concatenate(([0], side[:-1]))
+        buy_matched = np.zeros(count, dtype=bool)
+        sell_matched = np.zeros(count, dtype=bool)
+        buy_matched[:-1] = price[:-1] >= low[1:]
+        sell_matched[:-1] = price[:-1] < high[1:]
+
+        ratio = self.commission_ratio
+        balance = budget
+        amount = 0.0
+        has_asset = False
+        account = {
+            "budget": budget,
+            "balance": budget,
+            "asset_amount": 0.0,
+            "run_balance": budget,
+            "run_asset_amount": 0.0,
+        }
+        trades = []
+        fill_index = []
+        balance_steps = [budget]
+        amount_steps = [0.0]
+
+        for idx in np.flatnonzero(side):
+            idx = int(idx)
+            if run_start[idx]:
+                account["run_balance"] = account["balance"]
+                account["run_asset_amount"] = account["asset_amount"]
+
+            is_buy = side[idx] > 0
+            order_price = float(price[idx])
+            order_amount = get_amount("buy" if is_buy else "sell", order_price, account)
+            if not order_amount or order_price == 0:
+                continue
+
+            if is_buy:
+                total_value = order_price * order_amount * (1 + ratio)
+                if total_value > balance or not buy_matched[idx]:
+                    continue
+                amount = round(amount + order_amount, 6) if has_asset else order_amount
+                has_asset = True
+                balance = round(balance - total_value)
+                filled = order_amount
+            else:
+                if not has_asset or not sell_matched[idx]:
+                    continue
+                filled = order_amount
+                if order_amount > amount:
+                    filled = amount
+                    amount = 0.0
+                    has_asset = False
+                else:
+                    amount = round(amount - order_amount, 6)
+                balance = round(balance + filled * order_price * (1 - ratio))
+
+            # 전략이 update_result로 갱신하는 잔고와 수량
+            total = order_price * filled
+            fee = total * ratio
+            if is_buy:
+                account["balance"] -= round(total + fee)
+                account["asset_amount"] = round(account["asset_amount"] + filled, 6)
+            else:
+                account["balance"] += round(total - fee)
+                account["asset_amount"] = round(account["asset_amount"] - filled, 6)
+
+            trades.append(
+                {
+                    "index": idx,
+                    "type": "buy" if is_buy else "sell",
+                    "price": order_price,
+                    "amount": filled,
+                    "msg": "success",
+                    "balance": balance,
+                    "date_time": date_time[idx] if date_time is not None else idx,
+                }
+            )
+            fill_index.append(idx + 1)
+            balance_steps.append(balance)
+            amount_steps.append(amount)
+
+        # 체결은 다음 캔들에서 일어나므로 그 캔들부터 잔고와 수량에 반영
+        steps = np.searchsorted(np.asarray(fill_index, dtype=np.int64), np.arange(count), side="right")
+        balance_curve = np.asarray(balance_steps, dtype=np.float64)[steps]
+        amount_curve = np.asarray(amount_steps, dtype=np.float64)[steps]
+        equity = balance_curve + amount_curve * close
+        final_value = float(equity[-1]) if count > 0 else float(budget)
+        final_return = (final_value - budget) / budget * 100 if budget else 0.0
+        return {
+            "equity": equity,
+            "balance": balance_curve,
+            "asset_amount": amount_curve,
+            "trades": trades,
+            "final_balance": balance,
+            "final_return": round(final_return, 3),
+        }
+
+    def run_strategy(self, strategy, candles: List[Dict[str, Any]], budget: float, min_price: Optional[float] = None):
+        """
+        전략의 벡터화 구현으로 캔들 전체 구간을 백테스트한다
+        Backtest a strategy over the candles through its vectorized implementation
+
+        strategy: get_vectorized_signals를 구현한 초기화 전 전략 객체
+        min_price: 최소 주문 금액, None이면 전략의 기본값
+
+        Returns: run의 결과
+        """
+        if min_price is None:
+            strategy.initialize(budget)
+        else:
+            strategy.initialize(budget, min_price=min_price)
+
+        columns = self.make_columns(candles)
+        signals = strategy.get_vectorized_signals(columns)
+        if signals is None:
+            raise UserWarning(f"vectorized backtest is not supported: {strategy.CODE}")
+        return self.run(columns, signals, budget, strategy.get_vectorized_amount)
@@ -3,6 +3,8 @@ from datetime import datetime, timedelta
 from ..config import Config
 from ..log_manager import LogManager
 from ..data.data_repository import DataRepository
+from ..data.candle_cache import CandleCache
+from .order_book import OrderBook
 
 
 class VirtualMarket:
@@ -12,13 +14,18 @@ class VirtualMarket:
     - handle_request() 호출 1회 = turn 1회 진행
     - 요청이 0원/0수량이면(no-op) 기본적으로 아무 로그도 남기지 않고 turn만 진행
       (verbose+log_noop 옵션을 켜면 no-op도 로그 가능)
+    - order_book 옵션을 켜면 handle_requests()로 한 턴의 요청을 모두 받아서
+      체결되지 않은 지정가 주문을 취소, 만료될 때까지 대기시키고 매 턴 다음 캔들로 체결을 판단
+      (participation_rate: 캔들 거래량 대비 한 턴에 체결 가능한 비율, 0이면 제한 없음
+       order_expire_turn: 주문이 체결을 시도하는 최대 턴 수, 0이면 만료 없음)
 
     주요 필드
-    - data: 캔들 목록(dict)
+    - data: 캔들 목록(dict), CandleCache와 공유하므로 읽기 전용
     - turn_count: 현재 진행된 인덱스(턴)
     - balance: 현금 잔고
     - commission_ratio: 수수료율
     - asset: 보유자산 {market: (avg_price, amount)}
+    - order_book: 대기 주문 장부, order_book 옵션을 끄면 None
     """
 
     def __init__(
@@ -28,6 +35,9 @@ class VirtualMarket:
         *,
         verbose: bool = False,
         log_noop: bool = False,
+        order_book: bool = False,
+        participation_rate: float = 0.0,
+        order_expire_turn: int = 0,
     ):
         self.logger = LogManager.get_logger(__class__.__name__)
 
@@ -51,6 +61,10 @@ class VirtualMarket:
         self.market = market
         self.interval = interval
 
+        self.order_book = OrderBook() if order_book else None
+        self.participation_rate = float(participation_rate or 0)
+        self.order_expire_turn = int(order_expire_turn or 0)
+
     def initialize(self, end: str = None, count: int = 100, budget: float = 0):
         """
         과거 데이터 로딩 후 가상 마켓 초기화
@@ -63,7 +77,9 @@ class VirtualMarket:
         start_dt = end_dt - timedelta(minutes=count * (self.interval / 60))
         start = start_dt.strftime("%Y-%m-%dT%H:%M:%S")
 
-        self.data = self.repo.get_data(start, end, market=self.market)
+        self.data = CandleCache.get_instance().get_data(
+            self.repo, start, end, market=self.market
+        )
         self.balance = budget
         self.is_initialized = True
         self.logger.debug(f"Virtual Market is initialized end: {end}, count: {count}")
@@ -166,6 +182,175 @@ class VirtualMarket:
             result = "error!"
         return result
 
+    def handle_requests(self, request_list):
+        """
+        한 턴의 거래 요청을 모두 처리하고 turn을 진행한다
+
+        order_book 옵션이 꺼져 있으면 첫 번째 요청을 handle_request로 처리한다
+        order_book 옵션이 켜져 있으면
+        - buy, sell 요청은 대기 주문으로 추가하고 state requested 결과를 반환
+        - cancel 요청은 같은 id의 대기 주문을 취소하고 state done, amount 0 결과를 반환
+        - 대기 주문 전체를 다음 캔들로 체결 판단, 매도를 먼저 처리하고 가격 우선, 시간 우선 순서로 체결
+          체결 수량은 캔들 거래량 * participation_rate로 제한되며 남은 수량은 계속 대기
+          일부 체결은 state partially_done, 주문 수량을 모두 채우면 state done 결과를 반환
+
+        return:
+            결과 dict 리스트, 데이터가 끝나면 game-over 결과 하나
+        """
+        if self.order_book is None:
+            result = self.handle_request(request_list[0])
+            return [result] if result is not None else []
+
+        if self.is_initialized is not True:
+            self.logger.error("virtual market is NOT initialized")
+            return []
+
+        now = self.data[self.turn_count]["date_time"]
+        self.turn_count += 1
+        next_index = self.turn_count
+
+        if next_index >= len(self.data) - 1:
+            request = request_list[0] if len(request_list) > 0 else {}
+            return [
+                {
+                    "request": request,
+                    "type": request.get("type"),
+                    "price": 0,
+                    "amount": 0,
+                    "balance": self.balance,
+                    "msg": "game-over",
+                    "date_time": now,
+                    "state": "done",
+                }
+            ]
+
+        results = []
+        for request in request_list:
+            rtype = request.get("type")
+            if rtype == "cancel":
+                orders = self.order_book.get_orders(request.get("id"))
+                results += self.__close_orders(orders, "canceled", now)
+                continue
+
+            try:
+                if float(request.get("price", 0)) == 0 or float(request.get("amount", 0)) == 0:
+                    continue
+            except (TypeError, ValueError):
+                self.logger.warning("invalid request payload")
+                continue
+
+            if rtype not in ("buy", "sell"):
+                self.logger.warning("invalid type request")
+                continue
+
+            self.order_book.add(request, next_index - 1)
+            results.append(self.__make_order_result(request, request["amount"], "success", "requested", now))
+
+        if self.order_expire_turn > 0:
+            expired = self.order_book.pop_expired(next_index - self.order_expire_turn)
+            results += self.__close_orders(expired, "expired", now, is_closed=True)
+
+        results += self.__match_order_book(next_index, now)
+        return results
+
+    def cancel_request(self, request_id):
+        """
+        같은 id의 대기 주문을 취소하고 취소 결과 리스트를 반환, order_book 옵션이 꺼져 있으면 None
+        """
+        if self.order_book is None or self.is_initialized is not True:
+            return None
+        orders = self.order_book.get_orders(request_id)
+        return self.__close_orders(orders, "canceled", self.data[self.turn_count]["date_time"])
+
+    def cancel_all_requests(self):
+        """
+        모든 대기 주문을 취소하고 취소 결과 리스트를 반환, order_book 옵션이 꺼져 있으면 None
+        """
+        if self.order_book is None or self.is_initialized is not True:
+            return None
+        orders = self.order_book.get_orders()
+        return self.__close_orders(orders, "canceled", self.data[self.turn_count]["date_time"])
+
+    def __close_orders(self, orders, msg, dt, is_closed=False):
+        results = []
+        for order in orders:
+            if not is_closed:
+                self.order_book.close(order)
+            results.append(self.__make_order_result(order.request, 0, msg, "done", dt))
+        return results
+
+    def __match_order_book(self, next_index, dt):
+        candle = self.data[next_index]
+        volume_limit = float("inf")
+        if self.participation_rate > 0:
+            volume_limit = float(candle.get("acc_volume", 0)) * self.participation_rate
+
+        results = []
+        # 매도 대금으로 같은 턴의 매수를 체결할 수 있도록 매도를 먼저 처리
+        for side in ("sell", "buy"):
+            volume = volume_limit
+            popped = []
+            for order in self.order_book.iter_matchable(side, candle["low_price"], candle["high_price"]):
+                popped.append(order)
+                if volume <= 0:
+                    break
+                filled = self.__fill_order(order, candle["market"], min(order.remaining, volume))
+                if filled <= 0:
+                    continue
+
+                volume -= filled
+                order.remaining = round(order.remaining - filled, 8)
+                state = "partially_done"
+                if order.remaining <= 0:
+                    self.order_book.close(order)
+                    state = "done"
+                results.append(self.__make_order_result(order.request, filled, "success", state, dt))
+            self.order_book.restore(popped)
+        return results
+
+    def __fill_order(self, order, name, amount):
+        """대기 주문을 amount만큼 체결하고 실제 체결 수량을 반환, 체결할 수 없으면 0"""
+        amount = round(amount, 8)
+        if amount <= 0:
+            return 0
+        old_balance = self.balance
+
+        if order.side == "buy":
+            buy_value = order.price * amount
+            buy_total_value = buy_value * (1 + self.commission_ratio)
+            if buy_total_value > self.balance:
+                self.__log("no money")
+                return 0
+            self.__add_asset(name, order.price, amount)
+            self.balance = round(self.balance - buy_total_value)
+            self.__print_balance_info("buy", old_balance, self.balance, buy_value)
+            return amount
+
+        if name not in self.asset:
+            self.__log("asset empty")
+            return 0
+        sell_amount = self.__remove_asset(name, amount)
+        sell_value = sell_amount * order.price
+        self.balance = round(self.balance + sell_value * (1 - self.commission_ratio))
+        self.__print_balance_info("sell", old_balance, self.balance, sell_value)
+        return sell_amount
+
+    def __make_order_result(self, request, amount, msg, state, dt):
+        return {
+            "request": request,
+            "type": request["type"],
+            "price": request["price"],
+            "amount": amount,
+            "msg": msg,
+            "balance": self.balance,
+            "state": state,
+            "date_time": dt,
+        }
+
+    def __log(self, msg):
+        if self.verbose:
+            self.logger.info(msg)
+
     def __handle_buy_request(self, request, next_index, dt):
         price = float(request["price"])
         amount = float(request["amount"])
@@ -184,16 +369,7 @@ class VirtualMarket:
                 self.logger.info("not matched")
                 return "pass"
 
-            name = self.data[next_index]["market"]
-            if name in self.asset:
-                asset = self.asset[name]
-                new_amount = asset[1] + amount
-                new_amount = round(new_amount, 6)
-                new_value = (amount * price) + (asset[0] * asset[1])
-                self.asset[name] = (round(new_value / new_amount), new_amount)
-            else:
-                self.asset[name] = (price, amount)
-
+            self.__add_asset(self.data[next_index]["market"], price, amount)
             self.balance -= buy_total_value
             self.balance = round(self.balance)
 
@@ -230,21 +406,7 @@ class VirtualMarket:
                 self.logger.info("not matched")
                 return "pass"
 
-            sell_amount = amount
-            if amount > self.asset[name][1]:
-                sell_amount = self.asset[name][1]
-                self.logger.warning(
-                    f"sell request is bigger than asset {amount} > {sell_amount}"
-                )
-                del self.asset[name]
-            else:
-                new_amount = self.asset[name][1] - sell_amount
-                new_amount = round(new_amount, 6)
-                self.asset[name] = (
-                    self.asset[name][0],
-                    new_amount,
-                )
-
+            sell_amount = self.__remove_asset(name, amount)
             sell_value = sell_amount * price
             self.balance += sell_amount * price * (1 - self.commission_ratio)
             self.balance = round(self.balance)
@@ -265,6 +427,34 @@ class VirtualMarket:
             self.logger.error(f"invalid trading data {msg}")
             return "error!"
 
+    def __add_asset(self, name, price, amount):
+        if name in self.asset:
+            asset = self.asset[name]
+            new_amount = asset[1] + amount
+            new_amount = round(new_amount, 6)
+            new_value = (amount * price) + (asset[0] * asset[1])
+            self.asset[name] = (round(new_value / new_amount), new_amount)
+        else:
+            self.asset[name] = (price, amount)
+
+    def __remove_asset(self, name, amount):
+        """보유 수량만큼만 매도하고 실제 매도 수량을 반환"""
+        sell_amount = amount
+        if amount > self.asset[name][1]:
+            sell_amount = self.asset[name][1]
+            self.logger.warning(
+                f"sell request is bigger than asset {amount} > {sell_amount}"
+            )
+            del self.asset[name]
+        else:
+            new_amount = self.asset[name][1] - sell_amount
+            new_amount = round(new_amount, 6)
+            self.asset[name] = (
+                self.asset[name][0],
+                new_amount,
+            )
+        return sell_amount
+
     def __print_balance_info(self, trading_type, old, new, total_asset_value):
         # debug 레벨로만 남김 (시뮬레이션 기본 출력 최소화)
         self.logger.debug(f"[Balance] from {old}")
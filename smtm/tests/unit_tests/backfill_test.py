@@ -0,0 +1,146 @@
+import json
+import threading
+import unittest
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from smtm.data.backfill import Backfill, TokenBucket
+from smtm.data.database import Database
+from unittest.mock import *
+
+
+class UpbitStandIn(BaseHTTPRequestHandler):
+    """업비트 분봉 API를 흉내내는 로컬 HTTP 서버 핸들러"""
+
+    requests = []
+    throttle_once = True
+    missing = {"2020-03-10T00:03:00"}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        with self.lock:
+            self.requests.append(query)
+            throttle = UpbitStandIn.throttle_once
+            UpbitStandIn.throttle_once = False
+        if throttle:
+            self.send_response(429)
+            self.send_header("Remaining-Req", "group=candles; min=0; sec=0")
+            self.send_header("Retry-After", "0.01")
+            self.end_headers()
+            return
+
+        to_utc = datetime.strptime(query["to"][0], "%Y-%m-%dT%H:%M:%SZ")
+        count = int(query["count"][0])
+        body = []
+        for i in range(1, count + 1):
+            kst = (to_utc + timedelta(hours=9) - timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%S")
+            if kst in self.missing:
+                continue
+            body.append(
+                {
+                    "market": query["market"][0],
+                    "candle_date_time_kst": kst,
+                    "opening_price": 100,
+                    "high_price": 110,
+                    "low_price": 90,
+                    "trade_price": 100 + i,
+                    "candle_acc_trade_price": 1000,
+                    "candle_acc_trade_volume": 10,
+                }
+            )
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Remaining-Req", "group=candles; min=1799; sec=9")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class BackfillTests(unittest.TestCase):
+    def setUp(self):
+        UpbitStandIn.requests = []
+        UpbitStandIn.throttle_once = True
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), UpbitStandIn)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.db = Database(":memory:")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def make_backfill(self):
+        return Backfill(base_url=self.base_url, database=self.db, workers=3, batch_chunks=2)
+
+    def test_run_fetch_all_chunks_concurrently_and_store_them(self):
+        result = self.make_backfill().run(
+            ["KRW-BTC", "KRW-ETH"], "2020-03-10T00:00:00", "2020-03-10T07:30:00"
+        )
+
+        self.assertEqual(result["chunks"], 6)
+        self.assertEqual(result["failed"], 0)
+        self.assertEqual(result["candles"], 900)
+        self.assertEqual(result["retries"], 1)
+        self.assertEqual(result["requests"], 7)
+        for market in ["KRW-BTC", "KRW-ETH"]:
+            data = self.db.query("2020-03-10 00:00:00", "2020-03-10 07:30:00", market)
+            self.assertEqual(len(data), 450)
+            self.assertEqual(data[0]["date_time"], "2020-03-10 00:00:00")
+            self.assertEqual(data[-1]["date_time"], "2020-03-10 07:29:00")
+            self.assertEqual(data[3]["recovered"], 1)
+            self.assertEqual(data[3]["closing_price"], data[2]["closing_price"])
+
+    def test_run_resume_from_ledger(self):
+        backfill = self.make_backfill()
+        backfill.run(["KRW-BTC"], "2020-03-10T00:00:00", "2020-03-10T03:20:00")
+        request_count = len(UpbitStandIn.requests)
+
+        result = self.make_backfill().run(["KRW-BTC"], "2020-03-10T00:00:00", "2020-03-10T07:30:00")
+
+        self.assertEqual(result["chunks"], 2)
+        self.assertEqual(result["skipped"], 1)
+        self.assertEqual(len(UpbitStandIn.requests), request_count + 2)
+        self.assertEqual(
+            len(self.db.query("2020-03-10 00:00:00", "2020-03-10 07:30:00", "KRW-BTC")), 450
+        )
+
+    def test_parse_upbit_remaining_req_return_remaining_count_in_second(self):
+        self.assertEqual(Backfill.parse_upbit_remaining_req("group=candles; min=1799; sec=9"), 9)
+        self.assertEqual(Backfill.parse_upbit_remaining_req("group=market; sec=0"), 0)
+        self.assertIsNone(Backfill.parse_upbit_remaining_req(None))
+
+
+class TokenBucketTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.slept = []
+
+        def sleep(seconds):
+            self.slept.append(seconds)
+            self.now += seconds
+
+        self.bucket = TokenBucket(10, 10, clock=lambda: self.now, sleep=sleep)
+
+    def test_acquire_wait_when_tokens_are_exhausted(self):
+        for _ in range(10):
+            self.bucket.acquire()
+        self.assertEqual(self.slept, [])
+
+        self.bucket.acquire()
+        self.assertAlmostEqual(sum(self.slept), 0.1)
+
+    def test_limit_remaining_reduce_tokens_to_server_remaining(self):
+        self.bucket.limit_remaining(1)
+        self.bucket.acquire()
+        self.bucket.acquire()
+        self.assertAlmostEqual(sum(self.slept), 0.1)
+
+    def test_pause_block_until_given_time(self):
+        self.bucket.pause(2)
+        self.bucket.acquire()
+        self.assertAlmostEqual(self.now, 2)
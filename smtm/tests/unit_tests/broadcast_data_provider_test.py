@@ -0,0 +1,90 @@
+import unittest
+from smtm.data.broadcast_data_provider import BroadcastDataProvider
+from smtm.simulation_operator import SimulationOperator
+from unittest.mock import *
+
+
+class BroadcastDataProviderTests(unittest.TestCase):
+    def setUp(self):
+        self.source = MagicMock()
+        self.source.get_info.side_effect = [["info0"], ["info1"], ["info2"], None]
+
+    def test_views_get_same_info_with_one_source_call_per_turn(self):
+        broadcast = BroadcastDataProvider(self.source)
+        first = broadcast.create_view()
+        second = broadcast.create_view()
+
+        info = first.get_info()
+        self.assertEqual(info, ["info0"])
+        self.assertEqual(first.get_info(), ["info1"])
+        self.assertIs(second.get_info(), info)
+        self.assertEqual(second.get_info(), ["info1"])
+        self.assertEqual(self.source.get_info.call_count, 2)
+
+    def test_release_info_consumed_by_every_view(self):
+        broadcast = BroadcastDataProvider(self.source)
+        first = broadcast.create_view()
+        second = broadcast.create_view()
+
+        first.get_info()
+        first.get_info()
+        self.assertEqual(len(broadcast.buffer), 2)
+        second.get_info()
+        self.assertEqual((broadcast.base_index, len(broadcast.buffer)), (1, 1))
+        with self.assertRaises(UserWarning):
+            broadcast.create_view()
+
+    def test_get_info_return_None_after_end_of_source(self):
+        broadcast = BroadcastDataProvider(self.source)
+        view = broadcast.create_view()
+
+        self.assertEqual([view.get_info() for _ in range(5)], [["info0"], ["info1"], ["info2"], None, None])
+        self.assertEqual(self.source.get_info.call_count, 4)
+
+    def test_view_provide_source_candles(self):
+        self.source.get_candles.return_value = ["candle"]
+        view = BroadcastDataProvider(self.source).create_view()
+        self.assertEqual(view.get_candles(), ["candle"])
+
+        del self.source.get_candles
+        self.assertFalse(hasattr(BroadcastDataProvider(self.source).create_view(), "get_candles"))
+
+
+class SimulationOperatorRunLockstepTests(unittest.TestCase):
+    def make_operator(self, broadcast, turns):
+        operator = SimulationOperator()
+        strategy = MagicMock()
+        strategy.get_request.return_value = None
+        operator.initialize(broadcast.create_view(), strategy, MagicMock(), MagicMock())
+        operator.analyzer.create_report.return_value = {"summary": turns}
+        return operator
+
+    def test_run_lockstep_run_every_operator_turn_by_turn(self):
+        broadcast = BroadcastDataProvider(self.source_with_candles())
+        operators = [self.make_operator(broadcast, "a"), self.make_operator(broadcast, "b")]
+        seen = []
+        for name, operator in zip("ab", operators):
+            operator.strategy.update_trading_info.side_effect = lambda info, name=name: seen.append((name, info[0]))
+
+        reports = SimulationOperator.run_lockstep(operators)
+
+        self.assertEqual(seen, [("a", 0), ("b", 0), ("a", 1), ("b", 1), ("a", 2), ("b", 2)])
+        self.assertEqual(reports, [{"summary": "a"}, {"summary": "b"}])
+        for operator in operators:
+            self.assertEqual(operator.state, "simulation_terminated")
+            operator.analyzer.make_start_point.assert_called_once()
+
+    def test_run_lockstep_skip_operator_not_ready(self):
+        broadcast = BroadcastDataProvider(self.source_with_candles())
+        operator = self.make_operator(broadcast, "a")
+        operator.state = None
+
+        self.assertEqual(SimulationOperator.run_lockstep([operator]), [None])
+        operator.strategy.update_trading_info.assert_not_called()
+
+    @staticmethod
+    def source_with_candles():
+        source = MagicMock()
+        source.get_info.side_effect = [[0], [1], [2], None]
+        del source.get_candles
+        return source
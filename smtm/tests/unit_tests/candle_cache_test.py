@@ -0,0 +1,105 @@
+import unittest
+from smtm.data.candle_cache import CandleCache
+from unittest.mock import *
+
+
+def make_repo(is_upbit=True, interval=60, db_file="smtm.db"):
+    repo = MagicMock()
+    repo.is_upbit = is_upbit
+    repo.interval = interval
+    repo.database.db_file = db_file
+    repo.backend = "sqlite"
+    repo.get_data.side_effect = lambda start, end, market: [
+        {"market": market, "date_time": start, "closing_price": 100}
+    ]
+    return repo
+
+
+class CandleCacheTests(unittest.TestCase):
+    def test_get_data_load_once_and_share_cached_data(self):
+        cache = CandleCache(max_bytes=2**20)
+        repo = make_repo()
+        other_repo = make_repo()
+
+        first = cache.get_data(repo, "2020-03-19T23:50:00", "2020-03-20T00:00:00", "KRW-BTC")
+        second = cache.get_data(other_repo, "2020-03-19T23:50:00", "2020-03-20T00:00:00", "KRW-BTC")
+
+        self.assertIs(first, second)
+        repo.get_data.assert_called_once_with(
+            "2020-03-19T23:50:00", "2020-03-20T00:00:00", market="KRW-BTC"
+        )
+        other_repo.get_data.assert_not_called()
+        stats = cache.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_get_data_use_different_key_for_source_interval_and_range(self):
+        cache = CandleCache(max_bytes=2**20)
+        cache.get_data(make_repo(), "2020-03-19T23:50:00", "2020-03-20T00:00:00", "KRW-BTC")
+        cache.get_data(make_repo(is_upbit=False), "2020-03-19T23:50:00", "2020-03-20T00:00:00", "KRW-BTC")
+        cache.get_data(make_repo(interval=180), "2020-03-19T23:50:00", "2020-03-20T00:00:00", "KRW-BTC")
+        cache.get_data(make_repo(), "2020-03-19T23:40:00", "2020-03-20T00:00:00", "KRW-BTC")
+        cache.get_data(make_repo(), "2020-03-19T23:50:00", "2020-03-20T00:00:00", "KRW-ETH")
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["hits"], 0)
+        self.assertEqual(stats["misses"], 5)
+        self.assertEqual(stats["entries"], 5)
+
+    def test_get_data_evict_least_recently_used_entry_when_over_max_bytes(self):
+        repo = make_repo()
+        entry_size = CandleCache.estimate_size(repo.get_data("s1", "e", "KRW-BTC"))
+        cache = CandleCache(max_bytes=entry_size * 2)
+
+        cache.get_data(repo, "s1", "e", "KRW-BTC")
+        cache.get_data(repo, "s2", "e", "KRW-BTC")
+        cache.get_data(repo, "s1", "e", "KRW-BTC")
+        cache.get_data(repo, "s3", "e", "KRW-BTC")
+
+        keys = [key[5] for key in cache.entries]
+        self.assertEqual(keys, ["s1", "s3"])
+        stats = cache.get_stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertLessEqual(stats["bytes"], stats["max_bytes"])
+
+    def test_get_data_not_cache_data_bigger_than_max_bytes(self):
+        cache = CandleCache(max_bytes=10)
+        repo = make_repo()
+        cache.get_data(repo, "s1", "e", "KRW-BTC")
+        cache.get_data(repo, "s1", "e", "KRW-BTC")
+
+        self.assertEqual(repo.get_data.call_count, 2)
+        self.assertEqual(cache.get_stats()["entries"], 0)
+
+    def test_clear_reset_entries_and_stats(self):
+        cache = CandleCache(max_bytes=2**20)
+        cache.get_data(make_repo(), "s1", "e", "KRW-BTC")
+        cache.clear()
+        self.assertEqual(
+            cache.get_stats(),
+            {"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "bytes": 0, "max_bytes": 2**20},
+        )
+
+    def test_get_instance_return_same_instance(self):
+        self.assertIs(CandleCache.get_instance(), CandleCache.get_instance())
+
+    def test_get_data_load_from_store_when_store_covers_range(self):
+        cache = CandleCache(max_bytes=2**20)
+        store = MagicMock()
+        store.covers.side_effect = lambda source, market, interval, start, end: market == "KRW-BTC"
+        store.get_data.return_value = [{"market": "KRW-BTC", "date_time": "shared"}]
+        cache.set_store(store)
+        repo = make_repo()
+
+        data = cache.get_data(repo, "2020-03-19T23:50:00", "2020-03-20T00:00:00", "KRW-BTC")
+        cache.get_data(repo, "2020-03-19T23:50:00", "2020-03-20T00:00:00", "KRW-ETH")
+
+        self.assertEqual(data[0]["date_time"], "shared")
+        store.covers.assert_any_call(
+            "upbit", "KRW-BTC", 60, "2020-03-19T23:50:00", "2020-03-20T00:00:00"
+        )
+        store.get_data.assert_called_once_with("2020-03-19T23:50:00", "2020-03-20T00:00:00")
+        repo.get_data.assert_called_once_with(
+            "2020-03-19T23:50:00", "2020-03-20T00:00:00", market="KRW-ETH"
+        )
@@ -0,0 +1,55 @@
+"""단위 테스트에서 함께 사용하는 1분 캔들 생성 함수"""
+
+import random
+from datetime import datetime, timedelta
+
+START = datetime(2024, 1, 1)
+
+
+def to_date_time(minute, start=START):
+    """start로부터 minute 분 후의 'YYYY-MM-DDTHH:MM:SS' 문자열"""
+    return (start + timedelta(minutes=minute)).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def make_candle(
+    minute, price, market="KRW-BTC", low=None, high=None, volume=1.0, opening=None, candle_type="primary_candle"
+):
+    """
+    start로부터 minute 분 후의 캔들, 고가와 저가를 주지 않으면 price의 +-10
+    candle_type이 None이면 DataProvider가 받는 원본 캔들처럼 "type"이 없는 캔들을 만든다
+    """
+    candle = {
+        "market": market,
+        "date_time": to_date_time(minute),
+        "opening_price": opening if opening is not None else price,
+        "high_price": high if high is not None else price + 10,
+        "low_price": low if low is not None else price - 10,
+        "closing_price": price,
+        "acc_price": 1000.0,
+        "acc_volume": volume,
+    }
+    if candle_type is not None:
+        candle["type"] = candle_type
+    return candle
+
+
+def make_candles(count, seed=1, price=50000000.0, volatility=0.003):
+    """200분마다 추세가 바뀌는 랜덤 워크 캔들 리스트"""
+    rnd = random.Random(seed)
+    drift = 0
+    candles = []
+    for i in range(count):
+        if i % 200 == 0:
+            drift = rnd.choice([-0.001, 0, 0.001])
+        close = round(price * (1 + drift + rnd.gauss(0, volatility)), 0)
+        candle = make_candle(
+            i,
+            close,
+            high=max(price, close) + round(rnd.random() * price * 0.002, 0),
+            low=min(price, close) - round(rnd.random() * price * 0.002, 0),
+            volume=0.1,
+            opening=price,
+        )
+        candles.append(candle)
+        price = close
+    return candles
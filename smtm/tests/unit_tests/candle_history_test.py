@@ -0,0 +1,99 @@
+import unittest
+from smtm.strategy.strategy import CandleHistory
+from unittest.mock import *
+
+
+def make_candle(index):
+    return {
+        "type": "primary_candle",
+        "market": "KRW-BTC",
+        "date_time": f"2020-02-25T15:{index:02d}:00",
+        "opening_price": 100 + index,
+        "high_price": 110 + index,
+        "low_price": 90 + index,
+        "closing_price": 105 + index,
+        "acc_price": 1000 + index,
+        "acc_volume": 10 + index,
+    }
+
+
+class CandleHistoryTests(unittest.TestCase):
+    def test_append_keep_only_latest_capacity_candles(self):
+        history = CandleHistory(3)
+        for i in range(5):
+            history.append(make_candle(i))
+
+        self.assertEqual(len(history), 5)
+        self.assertEqual(history.size, 3)
+        self.assertEqual(history.first_index, 2)
+        self.assertEqual(history.window("closing_price").tolist(), [107, 108, 109])
+        self.assertEqual(history[4], make_candle(4))
+        self.assertEqual(history[-3], make_candle(2))
+        with self.assertRaises(IndexError):
+            history[1]
+        with self.assertRaises(IndexError):
+            history[5]
+
+    def test_window_return_read_only_view_without_copy(self):
+        history = CandleHistory(4)
+        for i in range(7):
+            history.append(make_candle(i))
+
+        window = history.window("low_price", 3)
+        self.assertEqual(window.tolist(), [94, 95, 96])
+        self.assertFalse(window.flags.owndata)
+        self.assertFalse(window.flags.writeable)
+
+        history.set("low_price", 1)
+        self.assertEqual(window.tolist(), [94, 95, 1])
+
+    def test_window_return_epoch_seconds(self):
+        history = CandleHistory(2)
+        history.append(make_candle(0))
+        history.append(make_candle(1))
+
+        self.assertEqual(history.window("epoch").tolist(), [1582642800, 1582642860])
+        self.assertEqual(history.get("epoch"), 1582642860)
+
+    def test_window_return_available_values_when_count_is_larger_than_size(self):
+        history = CandleHistory(5)
+        history.append(make_candle(0))
+        history.append(make_candle(1))
+
+        self.assertEqual(history.window("closing_price", 10).tolist(), [105, 106])
+        self.assertEqual(CandleHistory(3).window("closing_price").tolist(), [])
+
+    def test_getitem_skip_missing_price_fields(self):
+        history = CandleHistory(2)
+        dummy = {
+            "type": "primary_candle",
+            "market": "orange",
+            "date_time": "2020-02-25T15:41:09",
+            "closing_price": 500,
+        }
+        history.append(dummy)
+
+        self.assertEqual(history[-1], dummy)
+
+    def test_set_and_get_extra_fields(self):
+        history = CandleHistory(2, extra_fields=("rsi",))
+        history.append(make_candle(0))
+        self.assertIsNone(history.get("rsi"))
+
+        history.set("rsi", 30.5)
+        self.assertEqual(history.get("rsi"), 30.5)
+        self.assertEqual(history[-1]["rsi"], 30.5)
+
+    def test_pop_remove_last_candle(self):
+        history = CandleHistory(2)
+        for i in range(3):
+            history.append(make_candle(i))
+
+        self.assertEqual(history.pop(), make_candle(2))
+        self.assertEqual(len(history), 2)
+        self.assertEqual(history.size, 1)
+        self.assertEqual(list(history), [make_candle(1)])
+
+    def test_raise_error_when_capacity_is_invalid(self):
+        with self.assertRaises(UserWarning):
+            CandleHistory(0)
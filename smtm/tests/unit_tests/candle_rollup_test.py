@@ -0,0 +1,139 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from smtm.data.candle_rollup import CandleRollup
+from smtm.data.data_repository import DataRepository
+from smtm.data.database import Database
+from unittest.mock import *
+
+
+def make_minute_candles(start, count, market="KRW-BTC", seed=5):
+    rnd = random.Random(seed)
+    candles = []
+    price = 1000.0
+    for i in range(count):
+        close = price + rnd.randint(-5, 5)
+        candles.append(
+            {
+                "market": market,
+                "date_time": (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"),
+                "opening_price": price,
+                "high_price": max(price, close) + rnd.randint(0, 3),
+                "low_price": min(price, close) - rnd.randint(0, 3),
+                "closing_price": close,
+                "acc_price": close * 2,
+                "acc_volume": 2.0,
+                "recovered": 1 if i % 7 == 0 else 0,
+            }
+        )
+        price = close
+    return candles
+
+
+def expected_rollup(candles, size):
+    result = []
+    for idx in range(0, len(candles) - size + 1, size):
+        block = candles[idx : idx + size]
+        result.append(
+            {
+                "date_time": block[0]["date_time"].replace(" ", "T"),
+                "opening_price": block[0]["opening_price"],
+                "high_price": max(c["high_price"] for c in block),
+                "low_price": min(c["low_price"] for c in block),
+                "closing_price": block[-1]["closing_price"],
+                "acc_price": sum(c["acc_price"] for c in block),
+                "acc_volume": sum(c["acc_volume"] for c in block),
+                "recovered": min(c["recovered"] for c in block),
+            }
+        )
+    return result
+
+
+class CandleRollupTests(unittest.TestCase):
+    def setUp(self):
+        self.db = Database(":memory:")
+
+    def get_rollup(self, start, end, period):
+        repo = DataRepository(database=self.db, interval=period, rollup=True)
+        repo.minute_repo._fetch_from_server = MagicMock(side_effect=AssertionError("network"))
+        return repo, repo.get_data(start, end, "KRW-BTC")
+
+    def assert_candles(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for item, exp in zip(actual, expected):
+            for key, value in exp.items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(item[key], value)
+                else:
+                    self.assertEqual(item[key], value)
+
+    def test_get_data_build_rollup_from_stored_minutes_without_network(self):
+        minutes = make_minute_candles(datetime(2020, 3, 10, 9, 0), 240)
+        self.db.update(minutes)
+
+        for period in (180, 300, 900, 3600):
+            with self.subTest(period=period):
+                _, result = self.get_rollup("2020-03-10T09:00:00", "2020-03-10T13:00:00", period)
+                self.assert_candles(result, expected_rollup(minutes, period // 60))
+                self.assertEqual(result[0]["period"], period)
+
+    def test_4h_candles_are_aligned_to_kst_09(self):
+        minutes = make_minute_candles(datetime(2020, 3, 10, 1, 0), 480)
+        self.db.update(minutes)
+
+        _, result = self.get_rollup("2020-03-10T01:00:00", "2020-03-10T09:00:00", 14400)
+
+        self.assertEqual([c["date_time"] for c in result], ["2020-03-10T01:00:00", "2020-03-10T05:00:00"])
+        self.assert_candles(result, expected_rollup(minutes, 240))
+
+    def test_get_data_build_only_new_ranges(self):
+        minutes = make_minute_candles(datetime(2020, 3, 10, 9, 0), 120)
+        self.db.update(minutes[:60])
+        repo, first = self.get_rollup("2020-03-10T09:00:00", "2020-03-10T10:00:00", 300)
+        self.assertEqual(len(first), 12)
+
+        self.db.update(minutes[60:])
+        repo.rollup.build = MagicMock(wraps=repo.rollup.build)
+        second = repo.get_data("2020-03-10T09:00:00", "2020-03-10T11:00:00", "KRW-BTC")
+
+        repo.rollup.build.assert_called_once_with(
+            "KRW-BTC",
+            300,
+            Database.to_epoch("2020-03-10T10:00:00"),
+            Database.to_epoch("2020-03-10T11:00:00"),
+            is_upbit=True,
+        )
+        self.assert_candles(second, expected_rollup(minutes, 5))
+
+    def test_get_data_fetch_only_missing_minutes(self):
+        minutes = make_minute_candles(datetime(2020, 3, 10, 9, 0), 60)
+        self.db.update(minutes[:30])
+        repo = DataRepository(database=self.db, interval=900, rollup=True)
+
+        def fetch(start, end, market):
+            self.assertEqual((start, end), ("2020-03-10T09:30:00", "2020-03-10T10:00:00"))
+            fetched = [dict(c) for c in minutes[30:]]
+            repo.minute_repo._update(fetched)
+            return fetched
+
+        repo.minute_repo._fetch_from_server = MagicMock(side_effect=fetch)
+        result = repo.get_data("2020-03-10T09:00:00", "2020-03-10T10:00:00", "KRW-BTC")
+
+        repo.minute_repo._fetch_from_server.assert_called_once()
+        self.assert_candles(result, expected_rollup(minutes, 15))
+
+    def test_build_skip_incomplete_buckets(self):
+        self.db.update(make_minute_candles(datetime(2020, 3, 10, 9, 0), 7))
+
+        count = CandleRollup(self.db).build(
+            "KRW-BTC", 300, Database.to_epoch("2020-03-10 09:00:00"), Database.to_epoch("2020-03-10 09:10:00")
+        )
+
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            self.db.get_coverage("KRW-BTC", period=300), [("2020-03-10T09:00:00", "2020-03-10T09:05:00")]
+        )
+
+    def test_build_raise_UserWarning_when_period_not_supported(self):
+        with self.assertRaises(UserWarning):
+            CandleRollup(self.db).build("KRW-BTC", 120, 0, 600)
@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from smtm.data.column_store import ColumnStore
+from smtm.data.data_repository import DataRepository
+from smtm.data.database import Database
+from unittest.mock import *
+
+
+def make_rows(count, start_minute=0):
+    rows = []
+    for i in range(count):
+        minute = start_minute + i
+        rows.append(
+            {
+                "market": "KRW-BTC",
+                "date_time": f"2020-03-10 {10 + minute // 60:02d}:{minute % 60:02d}:00",
+                "opening_price": 100.0 + i,
+                "high_price": 110.0 + i,
+                "low_price": 90.0 + i,
+                "closing_price": 105.0 + i,
+                "acc_price": 1000.0 + i,
+                "acc_volume": 10.0 + i,
+            }
+        )
+    return rows
+
+
+class ColumnStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.db = Database(os.path.join(self.root, "test.db"))
+        self.store = ColumnStore(os.path.join(self.root, "store"))
+
+    def tearDown(self):
+        del self.db
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_import_from_database_and_get_data_return_same_candles_as_database(self):
+        rows = make_rows(5)
+        rows[2]["recovered"] = 1
+        self.db.update(rows)
+
+        self.assertEqual(self.store.import_from_database(self.db, "KRW-BTC"), 5)
+        result = self.store.get_data(
+            "upbit", "KRW-BTC", 60, "2020-03-10T10:01:00", "2020-03-10T10:04:00"
+        )
+
+        expected = self.db.query("2020-03-10 10:01:00", "2020-03-10 10:04:00", "KRW-BTC")
+        for item in expected:
+            del item["id"]
+            item["date_time"] = item["date_time"].replace(" ", "T")
+        self.assertEqual(result, expected)
+        self.assertEqual(result[1]["recovered"], 1)
+
+    def test_get_columns_return_read_only_memmap_views(self):
+        self.db.update(make_rows(10))
+        self.store.import_from_database(self.db, "KRW-BTC")
+
+        columns = self.store.get_columns(
+            "upbit", "KRW-BTC", 60, "2020-03-10T10:03:30", "2020-03-10T10:06:00"
+        )
+        self.assertEqual(columns["closing_price"].tolist(), [109.0, 110.0])
+        self.assertEqual(
+            ColumnStore.to_date_time(columns["epoch"]).tolist(),
+            ["2020-03-10T10:04:00", "2020-03-10T10:05:00"],
+        )
+        self.assertIsInstance(columns["epoch"], np.memmap)
+        self.assertFalse(columns["epoch"].flags.writeable)
+
+    def test_get_data_return_None_when_store_not_exist(self):
+        self.assertIsNone(
+            self.store.get_data("upbit", "KRW-ETH", 60, "2020-03-10T10:00:00", "2020-03-10T10:05:00")
+        )
+
+    def test_write_sort_and_remove_duplicated_epoch(self):
+        self.store.write(
+            "binance",
+            "BTCUSDT",
+            60,
+            {
+                "epoch": [120, 0, 60, 0],
+                "opening_price": [3, 1, 2, 1],
+                "high_price": [3, 1, 2, 1],
+                "low_price": [3, 1, 2, 1],
+                "closing_price": [3, 1, 2, 1],
+                "acc_price": [3, 1, 2, 1],
+                "acc_volume": [3, 1, 2, 1],
+            },
+        )
+
+        columns = self.store.open("binance", "BTCUSDT", 60)
+        self.assertEqual(columns["epoch"].tolist(), [0, 60, 120])
+        self.assertEqual(columns["closing_price"].tolist(), [1.0, 2.0, 3.0])
+        self.assertEqual(columns["recovered"].tolist(), [0, 0, 0])
+
+    def test_data_repository_read_column_store_when_backend_is_column(self):
+        self.db.update(make_rows(5))
+        repo = DataRepository(database=self.db, backend="column")
+        repo.column_store = self.store
+        repo.database = MagicMock()
+
+        self.store.import_from_database(self.db, "KRW-BTC")
+        result = repo.get_data("2020-03-10T10:00:00", "2020-03-10T10:05:00", "KRW-BTC")
+
+        self.assertEqual(len(result), 5)
+        self.assertEqual(result[0]["date_time"], "2020-03-10T10:00:00")
+        repo.database.query.assert_not_called()
+
+    def test_data_repository_fallback_to_database_when_column_store_not_enough(self):
+        self.db.update(make_rows(5))
+        self.store.import_from_database(self.db, "KRW-BTC")
+        repo = DataRepository(database=self.db, backend="column")
+        repo.column_store = self.store
+        repo._fetch_from_server = MagicMock(return_value=[])
+
+        repo.get_data("2020-03-10T10:00:00", "2020-03-10T10:10:00", "KRW-BTC")
+
+        repo._fetch_from_server.assert_called_once()
+
+    def test_data_repository_raise_UserWarning_when_backend_not_supported(self):
+        with self.assertRaises(UserWarning):
+            DataRepository(database=self.db, backend="parquet")
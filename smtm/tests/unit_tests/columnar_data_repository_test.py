@@ -0,0 +1,200 @@
+import unittest
+from datetime import datetime, timedelta
+import pandas as pd
+from smtm.analyzer.columnar_data_repository import ColumnarDataRepository
+from smtm.analyzer.data_repository import DataRepository
+from smtm.analyzer.report_generator import ReportGenerator
+from candle_factory import make_candle, to_date_time
+from unittest.mock import *
+
+
+
+
+def fill(repo):
+    for minute in range(5):
+        repo.add_trading_info([make_candle(minute, 100 + minute), {"type": "binance"}])
+    repo.add_requests(
+        [
+            {"id": "1", "type": "buy", "price": "100", "amount": 0.5, "date_time": "2024-01-01T00:01:00"},
+            {"id": "2", "type": "buy", "price": 0, "amount": 0.5, "date_time": "2024-01-01T00:01:00"},
+            {"id": "3", "type": "cancel", "price": 100, "amount": 1, "date_time": "2024-01-01T00:02:00"},
+        ]
+    )
+    repo.add_result(
+        {
+            "request": {"id": "1", "type": "buy", "price": 100, "amount": 0.5},
+            "type": "buy",
+            "price": "100",
+            "amount": "0.5",
+            "msg": "success",
+            "balance": 950,
+            "state": "done",
+            "date_time": "2024-01-01T00:02:00",
+        }
+    )
+    repo.add_result({"type": "buy", "price": 100})
+    repo.add_asset_info(
+        {"balance": 1000, "asset": {}, "quote": {"KRW-BTC": 100}, "date_time": "2024-01-01T00:00:00"}
+    )
+    repo.add_asset_info(
+        {"balance": 950, "asset": {"KRW-BTC": (100, 0.5)}, "quote": {"KRW-BTC": 102}, "date_time": "2024-01-01T00:02:00"}
+    )
+    repo.add_score_record(
+        {
+            "balance": 950,
+            "cumulative_return": 0.05,
+            "price_change_ratio": {"KRW-BTC": 2.0},
+            "asset": [("KRW-BTC", 100, 102, 0.5, 2.0)],
+            "date_time": "2024-01-01T00:02:00",
+        }
+    )
+
+
+class ColumnarDataRepositoryTests(unittest.TestCase):
+    def setUp(self):
+        self.repo = ColumnarDataRepository()
+        self.expected = DataRepository()
+        fill(self.repo)
+        fill(self.expected)
+
+    def test_list_views_return_same_records_as_data_repository(self):
+        for name in ("info_list", "request_list", "result_list", "asset_info_list", "score_list"):
+            self.assertEqual(list(getattr(self.repo, name)), getattr(self.expected, name), name)
+        self.assertEqual(self.repo.start_asset_info, self.expected.start_asset_info)
+        self.assertEqual(self.repo.get_trading_results(), self.expected.get_trading_results())
+
+    def test_list_views_support_index_slice_and_concat(self):
+        self.assertEqual(len(self.repo.info_list), 5)
+        self.assertEqual(self.repo.info_list[-1]["closing_price"], 104)
+        self.assertEqual(self.repo.info_list[1:3], self.expected.info_list[1:3])
+        with self.assertRaises(IndexError):
+            self.repo.info_list[5]
+
+        self.assertEqual(
+            ReportGenerator().create_trading_table(
+                self.repo.request_list, self.repo.info_list, self.repo.score_list, self.repo.result_list
+            ),
+            ReportGenerator().create_trading_table(
+                self.expected.request_list,
+                self.expected.info_list,
+                self.expected.score_list,
+                self.expected.result_list,
+            ),
+        )
+
+    def test_keep_unknown_fields_and_date_time_format(self):
+        self.repo.add_trading_info([dict(make_candle(5, 105), date_time="2024-01-01 00:05:00", extra=1)])
+
+        self.assertEqual(self.repo.info_list[-1]["date_time"], "2024-01-01 00:05:00")
+        self.assertEqual(self.repo.info_list[-1]["extra"], 1)
+
+    def test_grow_columns_over_initial_capacity(self):
+        repo = ColumnarDataRepository()
+        for idx in range(3000):
+            repo.add_trading_info([make_candle(idx, idx)])
+
+        self.assertEqual(len(repo.info_list), 3000)
+        self.assertEqual(repo.info_list[2999]["closing_price"], 2999)
+        self.assertEqual(repo.columns["info"].capacity, 4096)
+
+    def test_get_dataframe_return_typed_columns(self):
+        df = self.repo.get_dataframe("info")
+
+        self.assertEqual(len(df), 5)
+        self.assertEqual(df["date_time"].iloc[1], pd.Timestamp("2024-01-01T00:01:00"))
+        self.assertEqual(df["closing_price"].tolist(), [100.0, 101.0, 102.0, 103.0, 104.0])
+        self.assertEqual(self.repo.get_dataframe("request")["price"].tolist(), [100.0, 0.0])
+        with self.assertRaises(UserWarning):
+            self.repo.get_dataframe("spot")
+
+    def test_reset_data_and_set_start_point_clear_columns(self):
+        view = self.repo.request_list
+
+        self.repo.set_start_point()
+        self.assertEqual(len(view), 0)
+        self.assertEqual(len(self.repo.asset_info_list), 0)
+        self.assertEqual(len(self.repo.info_list), 5)
+
+        self.repo.reset_data()
+        self.assertEqual(len(self.repo.info_list), 0)
+        self.assertIsNone(self.repo.start_asset_info)
+
+    def test_assign_list_rebuild_columns(self):
+        self.repo.info_list = self.expected.info_list[:2]
+
+        self.assertEqual(list(self.repo.info_list), self.expected.info_list[:2])
+
+    def test_should_make_periodic_record_compare_epoch(self):
+        repo = ColumnarDataRepository()
+        repo.is_simulation = True
+        self.assertEqual(repo.should_make_periodic_record(), True)
+
+        repo.add_asset_info({"balance": 1000, "asset": {}, "quote": {}, "date_time": "2024-01-01T00:02:00"})
+        repo.add_trading_info([make_candle(3, 100)])
+        self.assertEqual(repo.should_make_periodic_record(), False)
+
+        repo.add_trading_info([dict(make_candle(3, 100), date_time="2024-01-01T00:03:01")])
+        self.assertEqual(repo.should_make_periodic_record(), True)
+
+
+class IntervalDataTests(unittest.TestCase):
+    def fill_interval(self, repo):
+        for minute in range(30):
+            date_time = to_date_time(minute)
+            repo.add_trading_info([make_candle(minute, 100 + minute)])
+            repo.add_asset_info({"balance": 1000 + minute, "asset": {}, "quote": {}, "date_time": date_time})
+            repo.add_score_record({"balance": 1000, "cumulative_return": minute, "date_time": date_time})
+            repo.add_spot(date_time, minute)
+            if minute % 3 == 0:
+                repo.add_result({"type": "buy", "price": 100, "amount": 1, "state": "done", "date_time": date_time})
+
+    def assert_same_as_linear_filter(self, repo, index_info):
+        interval = repo.get_interval_data(index_info)
+        info_list = interval[2]
+        start_dt = datetime.strptime(info_list[0]["date_time"], DataRepository.ISO_DATEFORMAT)
+        end_dt = datetime.strptime(info_list[-1]["date_time"], DataRepository.ISO_DATEFORMAT)
+        if start_dt == end_dt:
+            end_dt = end_dt + timedelta(minutes=2)
+        sources = (repo.asset_info_list, repo.score_list, None, repo.result_list, repo.spot_list, repo.line_graph_list)
+        for idx, source in enumerate(sources):
+            if source is None:
+                continue
+            expected = []
+            DataRepository._make_filtered_list(start_dt, end_dt, expected, source)
+            self.assertEqual(interval[idx], expected)
+        return interval
+
+    def test_get_interval_data_return_records_of_period(self):
+        for repo in (DataRepository(), ColumnarDataRepository()):
+            self.fill_interval(repo)
+
+            interval = self.assert_same_as_linear_filter(repo, (10, 1))
+            self.assertEqual([r["balance"] for r in interval[0]], list(range(1010, 1020)))
+            self.assertEqual([r["date_time"][-5:] for r in interval[3]], ["12:00", "15:00", "18:00"])
+            self.assert_same_as_linear_filter(repo, (10, -1))
+            self.assert_same_as_linear_filter(repo, (100, 0))
+            self.assert_same_as_linear_filter(repo, (1, 29))
+
+    def test_get_interval_data_index_only_added_records(self):
+        repo = DataRepository()
+        self.fill_interval(repo)
+        repo.get_interval_data((10, 0))
+        index = repo.epoch_index["score_list"]
+
+        repo.add_score_record({"balance": 1000, "cumulative_return": 30, "date_time": "2024-01-01T00:30:00"})
+        repo.get_interval_data((10, 0))
+        self.assertIs(repo.epoch_index["score_list"], index)
+        self.assertEqual(len(index.epochs), 31)
+
+        repo.set_start_point()
+        self.assertEqual(repo.get_interval_data((10, 0))[0], [])
+
+    def test_get_interval_data_filter_unsorted_records(self):
+        for repo in (DataRepository(), ColumnarDataRepository()):
+            self.fill_interval(repo)
+            repo.add_spot("2024-01-01T00:05:30", -1)
+            repo.add_result({"type": "sell", "price": 100, "amount": 1, "date_time": "2024-01-01T00:05:30"})
+
+            interval = self.assert_same_as_linear_filter(repo, (10, 0))
+            self.assertEqual(interval[4][-1]["value"], -1)
+            self.assertEqual(interval[3][-1]["type"], "sell")
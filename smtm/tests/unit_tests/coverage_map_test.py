@@ -0,0 +1,37 @@
+import unittest
+from smtm.data.coverage_map import CoverageMap
+from unittest.mock import *
+
+
+class CoverageMapTests(unittest.TestCase):
+    def test_add_merge_overlapping_and_adjacent_ranges(self):
+        coverage = CoverageMap([(0, 10), (20, 30), (40, 50)])
+
+        removed, merged = coverage.add(10, 20)
+        self.assertEqual(removed, [0, 20])
+        self.assertEqual(merged, (0, 30))
+        self.assertEqual(list(coverage), [(0, 30), (40, 50)])
+
+        removed, merged = coverage.add(35, 38)
+        self.assertEqual(removed, [])
+        self.assertEqual(list(coverage), [(0, 30), (35, 38), (40, 50)])
+
+        coverage.add(-5, 100)
+        self.assertEqual(list(coverage), [(-5, 100)])
+
+    def test_missing_return_uncovered_sub_ranges(self):
+        coverage = CoverageMap([(10, 20), (30, 40)])
+
+        self.assertEqual(coverage.missing(0, 50), [(0, 10), (20, 30), (40, 50)])
+        self.assertEqual(coverage.missing(15, 35), [(20, 30)])
+        self.assertEqual(coverage.missing(12, 18), [])
+        self.assertEqual(coverage.missing(20, 30), [(20, 30)])
+        self.assertEqual(CoverageMap().missing(0, 5), [(0, 5)])
+
+    def test_covers_return_whether_whole_range_is_stored(self):
+        coverage = CoverageMap([(10, 20), (30, 40)])
+
+        self.assertTrue(coverage.covers(10, 20))
+        self.assertTrue(coverage.covers(32, 35))
+        self.assertFalse(coverage.covers(15, 35))
+        self.assertFalse(coverage.covers(0, 5))
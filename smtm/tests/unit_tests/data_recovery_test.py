@@ -0,0 +1,131 @@
+import copy
+import random
+import unittest
+from datetime import datetime, timedelta
+from smtm.data.data_repository import DataRepository
+from unittest.mock import *
+
+
+def legacy_recovery_broken_data(data, start, count, interval):
+    """벡터화 이전의 캔들 단위 복구 구현 (비교 기준)"""
+    new_data = []
+    current_dt = datetime.strptime(start, "%Y-%m-%dT%H:%M:%S")
+    current_datetime = start
+    last_item = None
+    idx = 0
+    while len(new_data) < count:
+        if len(data) <= idx:
+            item_dt = datetime(2099, 1, 1)
+        else:
+            item_dt = datetime.strptime(data[idx]["date_time"], "%Y-%m-%dT%H:%M:%S")
+        delta = current_dt - item_dt
+
+        if delta.total_seconds() > 0:
+            last_item = copy.deepcopy(data[idx])
+            idx += 1
+            continue
+
+        if delta.total_seconds() == 0:
+            new_data.append(copy.deepcopy(data[idx]))
+            last_item = copy.deepcopy(data[idx])
+            idx += 1
+        else:
+            if last_item is None:
+                raise UserWarning("something wrong in recovery data")
+            recovery_item = copy.deepcopy(last_item)
+            recovery_item["date_time"] = current_datetime
+            recovery_item["recovered"] = 1
+            new_data.append(recovery_item)
+
+        current_dt = current_dt + timedelta(seconds=interval)
+        current_datetime = current_dt.strftime("%Y-%m-%dT%H:%M:%S")
+    return new_data
+
+
+def make_gapped_candles(count, interval, seed=3):
+    rnd = random.Random(seed)
+    start = datetime(2020, 2, 22, 3, 0)
+    candles = []
+    for i in range(count):
+        # 랜덤한 길이의 빈 구간을 만든다
+        if rnd.random() < 0.15:
+            continue
+        dt = start + timedelta(seconds=interval * i)
+        price = 10000.0 + rnd.randint(-50, 50)
+        candles.append(
+            {
+                "market": "KRW-BTC",
+                "date_time": dt.strftime("%Y-%m-%dT%H:%M:%S"),
+                "opening_price": price,
+                "high_price": price + 10,
+                "low_price": price - 10,
+                "closing_price": price + 1,
+                "acc_price": price * 2,
+                "acc_volume": 2.0,
+            }
+        )
+    return candles
+
+
+class DataRecoveryTests(unittest.TestCase):
+    def assert_parity(self, result, expected):
+        self.assertEqual(len(result), len(expected))
+        for actual, legacy in zip(result, expected):
+            if legacy.get("recovered") == 1:
+                # 복구 캔들은 가격만 이전 캔들을 따르고 거래량, 거래 금액은 0
+                self.assertEqual(actual["acc_volume"], 0)
+                self.assertEqual(actual["acc_price"], 0)
+                legacy = dict(legacy, acc_volume=0.0, acc_price=0.0)
+            self.assertEqual(actual, legacy)
+
+    def test_recovery_broken_data_match_legacy_behaviour(self):
+        for interval in (60, 180):
+            with self.subTest(interval=interval):
+                repo = DataRepository(database=MagicMock(), interval=interval)
+                repo._report_broken_block = MagicMock()
+                data = make_gapped_candles(1000, interval)
+                start = data[0]["date_time"]
+                count = 1005
+
+                result = repo._recovery_broken_data(data, start, count, "KRW-BTC")
+
+                self.assert_parity(result, legacy_recovery_broken_data(data, start, count, interval))
+                recovered_count = sum(1 for item in result if item.get("recovered") == 1)
+                self.assertEqual(
+                    sum(c[0][2] for c in repo._report_broken_block.call_args_list), recovered_count
+                )
+                self.assertLess(repo._report_broken_block.call_count, recovered_count)
+
+    def test_recovery_broken_data_use_data_before_start(self):
+        repo = DataRepository(database=MagicMock())
+        data = make_gapped_candles(100, 60)
+        start = "2020-02-22T03:30:00"
+
+        result = repo._recovery_broken_data(data, start, 120, "KRW-BTC")
+
+        self.assert_parity(result, legacy_recovery_broken_data(data, start, 120, 60))
+
+    def test_recovery_broken_data_raise_UserWarning_when_no_data_before_start(self):
+        repo = DataRepository(database=MagicMock())
+        data = make_gapped_candles(10, 60)
+        with self.assertRaises(UserWarning):
+            repo._recovery_broken_data(data, "2020-02-22T02:00:00", 10, "KRW-BTC")
+        with self.assertRaises(UserWarning):
+            repo._recovery_broken_data([], "2020-02-22T02:00:00", 10, "KRW-BTC")
+
+    def test_recovery_head_fill_from_start_with_anchor_copy(self):
+        repo = DataRepository(database=MagicMock(), source="binance")
+        repo._report_broken_block = MagicMock()
+        anchor = make_gapped_candles(1, 60)[0]
+
+        head = repo._recovery_head(anchor, "2020-02-22T02:57:00", "BTCUSDT")
+
+        self.assertEqual(
+            [item["date_time"] for item in head],
+            ["2020-02-22T02:57:00", "2020-02-22T02:58:00", "2020-02-22T02:59:00"],
+        )
+        self.assertTrue(all(item["recovered"] == 1 and item["acc_volume"] == 0 for item in head))
+        self.assertEqual(head[0]["closing_price"], anchor["closing_price"])
+        self.assertNotIn("recovered", anchor)
+        repo._report_broken_block.assert_called_once_with("2020-02-22T02:57:00", "BTCUSDT", 3)
+        self.assertEqual(repo._recovery_head(anchor, anchor["date_time"], "BTCUSDT"), [])
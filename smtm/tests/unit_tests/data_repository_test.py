@@ -10,16 +10,25 @@ class DataRepositoryUpbitTests(unittest.TestCase):
         repo = DataRepository()
         self.assertEqual(repo.interval_min, 1)
         self.assertEqual(repo.url, "https://api.upbit.com/v1/candles/minutes/1")
-        repo = DataRepository(interval=180)
+        repo = DataRepository(interval=180, rollup=False)
         self.assertEqual(repo.interval_min, 3)
         self.assertEqual(repo.url, "https://api.upbit.com/v1/candles/minutes/3")
-        repo = DataRepository(interval=300)
+        repo = DataRepository(interval=300, rollup=False)
         self.assertEqual(repo.interval_min, 5)
         self.assertEqual(repo.url, "https://api.upbit.com/v1/candles/minutes/5")
-        repo = DataRepository(interval=600)
+        repo = DataRepository(interval=600, rollup=False)
         self.assertEqual(repo.interval_min, 10)
         self.assertEqual(repo.url, "https://api.upbit.com/v1/candles/minutes/10")
 
+    def test_init_should_use_1m_url_for_rollup_interval(self):
+        repo = DataRepository(interval=3600, rollup=True)
+        self.assertEqual(repo.interval_min, 60)
+        self.assertEqual(repo.url, "https://api.upbit.com/v1/candles/minutes/1")
+        self.assertEqual(repo.minute_repo.interval, 60)
+        self.assertIsNone(repo.minute_repo.rollup)
+        with self.assertRaises(UserWarning):
+            DataRepository(interval=3600, rollup=False)
+
     def test_init_should_raise_UserWarning_when_interval_not_supported(self):
         with self.assertRaises(UserWarning):
             DataRepository(interval=1)
@@ -186,6 +195,9 @@ class DataRepositoryUpbitTests(unittest.TestCase):
         ]
         repo.database = MagicMock()
         repo.database.query.return_value = []
+        repo.database.get_missing_ranges.return_value = [
+            ("2020-02-20T17:00:15", "2020-02-20T22:00:15")
+        ]
         repo._fetch_from_upbit = MagicMock(
             return_value=[
                 {"content": "mango", "date_time": "2020-03-20T00:00:00"},
@@ -267,7 +279,7 @@ class DataRepositoryUpbitTests(unittest.TestCase):
             broken_data_0355_skipped, "2020-02-22T03:53:00", 4, "mango"
         )
         repo._report_broken_block.assert_called_once_with(
-            "2020-02-22T03:55:00", "mango"
+            "2020-02-22T03:55:00", "mango", 1
         )
         self.assertEqual(len(recovered), 4)
         self.assertEqual(recovered[0]["date_time"], "2020-02-22T03:53:00")
@@ -306,12 +318,7 @@ class DataRepositoryUpbitTests(unittest.TestCase):
         recovered = repo._recovery_broken_data(
             broken_data_2_skipped, "2020-02-22T03:54:00", 4, "mango"
         )
-        self.assertEqual(
-            repo._report_broken_block.call_args_list[0][0][0], "2020-02-22T03:55:00"
-        )
-        self.assertEqual(
-            repo._report_broken_block.call_args_list[1][0][0], "2020-02-22T03:56:00"
-        )
+        repo._report_broken_block.assert_called_once_with("2020-02-22T03:55:00", "mango", 2)
         self.assertEqual(len(recovered), 4)
         self.assertEqual(recovered[0]["date_time"], "2020-02-22T03:54:00")
         self.assertEqual(recovered[1]["date_time"], "2020-02-22T03:55:00")
@@ -351,10 +358,8 @@ class DataRepositoryUpbitTests(unittest.TestCase):
             broken_data_2_skipped2, "2020-02-22T03:54:00", 4, "mango"
         )
         self.assertEqual(
-            repo._report_broken_block.call_args_list[0][0][0], "2020-02-22T03:54:00"
-        )
-        self.assertEqual(
-            repo._report_broken_block.call_args_list[1][0][0], "2020-02-22T03:56:00"
+            repo._report_broken_block.call_args_list,
+            [call("2020-02-22T03:54:00", "mango", 1), call("2020-02-22T03:56:00", "mango", 1)],
         )
         self.assertEqual(len(recovered), 4)
         self.assertEqual(recovered[0]["date_time"], "2020-02-22T03:54:00")
@@ -384,7 +389,7 @@ class DataRepositoryUpbitTests(unittest.TestCase):
         recovered = repo._recovery_broken_data(
             broken_data_first_skipped, "2020-02-22T03:53:00", 2, "mango"
         )
-        repo._report_broken_block.assert_called_with("2020-02-22T03:53:00", "mango")
+        repo._report_broken_block.assert_called_with("2020-02-22T03:53:00", "mango", 1)
         self.assertEqual(len(recovered), 2)
         self.assertEqual(recovered[0]["date_time"], "2020-02-22T03:53:00")
         self.assertEqual(recovered[1]["date_time"], "2020-02-22T03:54:00")
@@ -408,12 +413,7 @@ class DataRepositoryUpbitTests(unittest.TestCase):
         recovered = repo._recovery_broken_data(
             broken_data_first_2_skipped, "2020-02-22T03:53:00", 2, "mango"
         )
-        self.assertEqual(
-            repo._report_broken_block.call_args_list[0][0][0], "2020-02-22T03:53:00"
-        )
-        self.assertEqual(
-            repo._report_broken_block.call_args_list[1][0][0], "2020-02-22T03:54:00"
-        )
+        repo._report_broken_block.assert_called_once_with("2020-02-22T03:53:00", "mango", 2)
         self.assertEqual(len(recovered), 2)
         self.assertEqual(recovered[0]["date_time"], "2020-02-22T03:53:00")
         self.assertEqual(recovered[1]["date_time"], "2020-02-22T03:54:00")
@@ -438,7 +438,7 @@ class DataRepositoryUpbitTests(unittest.TestCase):
         recovered = repo._recovery_broken_data(
             broken_data_last_skipped, "2020-02-22T03:54:00", 2, "mango"
         )
-        repo._report_broken_block.assert_called_with("2020-02-22T03:55:00", "mango")
+        repo._report_broken_block.assert_called_with("2020-02-22T03:55:00", "mango", 1)
         self.assertEqual(len(recovered), 2)
         self.assertEqual(recovered[0]["date_time"], "2020-02-22T03:54:00")
         self.assertEqual(recovered[1]["date_time"], "2020-02-22T03:55:00")
@@ -450,12 +450,7 @@ class DataRepositoryUpbitTests(unittest.TestCase):
         recovered = repo._recovery_broken_data(
             broken_data_last_skipped, "2020-02-22T03:54:00", 3, "mango"
         )
-        self.assertEqual(
-            repo._report_broken_block.call_args_list[0][0][0], "2020-02-22T03:55:00"
-        )
-        self.assertEqual(
-            repo._report_broken_block.call_args_list[1][0][0], "2020-02-22T03:56:00"
-        )
+        repo._report_broken_block.assert_called_once_with("2020-02-22T03:55:00", "mango", 2)
         self.assertEqual(len(recovered), 3)
         self.assertEqual(recovered[0]["date_time"], "2020-02-22T03:54:00")
         self.assertEqual(recovered[1]["date_time"], "2020-02-22T03:55:00")
@@ -475,6 +470,7 @@ class DataRepositoryUpbitTests(unittest.TestCase):
         repo = DataRepository(interval=60)
         repo.database = MagicMock()
         repo.database.query.return_value = []
+        repo.database.get_missing_ranges.return_value = [("2020-02-20T17:00:00", "2020-02-20T20:20:00")]
         result = repo.get_data("2020-02-20T17:00:00", "2020-02-20T20:20:00", "KRW-BTC")
         self.assertEqual(len(result), 200)
         repo.database.update.assert_called_with(ANY, period=60, is_upbit=True)
@@ -500,6 +496,7 @@ class DataRepositoryUpbitTests(unittest.TestCase):
         repo = DataRepository(interval=60)
         repo.database = MagicMock()
         repo.database.query.return_value = []
+        repo.database.get_missing_ranges.return_value = [("2020-02-20T17:00:00", "2020-02-20T21:00:00")]
         result = repo.get_data("2020-02-20T17:00:00", "2020-02-20T21:00:00", "KRW-BTC")
         self.assertEqual(len(result), 240)
         self.assertEqual(result[0]["date_time"], "2020-02-20T17:00:00")
@@ -515,9 +512,10 @@ class DataRepositoryUpbitTests(unittest.TestCase):
         with open("tests/unit_tests/data/upbit_3m_20200220_170000-20200220_200000.json", "r") as f:
             get_mock.return_value.json.return_value = json.load(f)
 
-        repo = DataRepository(interval=180)
+        repo = DataRepository(interval=180, rollup=False)
         repo.database = MagicMock()
         repo.database.query.return_value = []
+        repo.database.get_missing_ranges.return_value = [("2020-02-20T17:00:00", "2020-02-20T20:00:00")]
         result = repo.get_data("2020-02-20T17:01:00", "2020-02-20T20:02:00", "KRW-BTC")
         self.assertEqual(len(result), 60)
         self.assertEqual(result[0]["date_time"], "2020-02-20T17:00:00")
@@ -537,9 +535,10 @@ class DataRepositoryUpbitTests(unittest.TestCase):
             dummy_data.append(json.load(f))
         get_mock.return_value.json.side_effect = dummy_data
 
-        repo = DataRepository(interval=180)
+        repo = DataRepository(interval=180, rollup=False)
         repo.database = MagicMock()
         repo.database.query.return_value = []
+        repo.database.get_missing_ranges.return_value = [("2020-02-20T00:00:00", "2020-02-20T12:00:00")]
         result = repo.get_data("2020-02-20T00:00:00", "2020-02-20T12:00:00", "KRW-BTC")
         self.assertEqual(len(result), 240)
         repo.database.update.assert_called_with(ANY, period=180, is_upbit=True)
@@ -645,7 +644,7 @@ class DataRepositoryBinanceTests(unittest.TestCase):
 
     @patch("requests.get")
     def test_get_data_should_return_recovered_data_with_mid_broken_data(self, get_mock):
-        repo = DataRepository(db_file=":memory:", interval=300, source="binance")
+        repo = DataRepository(db_file=":memory:", interval=300, source="binance", rollup=False)
         response_mock = MagicMock()
         get_mock.return_value = response_mock
         response_mock.json.return_value = [
@@ -781,7 +780,7 @@ class DataRepositoryBinanceTests(unittest.TestCase):
 
     @patch("requests.get")
     def test_get_data_should_return_recovered_data_with_end_broken_data(self, get_mock):
-        repo = DataRepository(db_file=":memory:", interval=300, source="binance")
+        repo = DataRepository(db_file=":memory:", interval=300, source="binance", rollup=False)
         response_mock = MagicMock()
         get_mock.return_value = response_mock
         response_mock.json.return_value = [
@@ -821,7 +820,7 @@ class DataRepositoryBinanceTests(unittest.TestCase):
     def test_get_data_should_return_recovered_data_with_head_broken_data(
         self, get_mock
     ):
-        repo = DataRepository(db_file=":memory:", interval=300, source="binance")
+        repo = DataRepository(db_file=":memory:", interval=300, source="binance", rollup=False)
         response_mock = MagicMock()
         get_mock.return_value = response_mock
         response_mock.json.return_value = [
@@ -918,7 +917,7 @@ class DataRepositoryBinanceTests(unittest.TestCase):
 
     @patch("requests.get")
     def test_get_data_should_return_recovered_data_with_all_broken_data(self, get_mock):
-        repo = DataRepository(db_file=":memory:", interval=300, source="binance")
+        repo = DataRepository(db_file=":memory:", interval=300, source="binance", rollup=False)
         response_mock = MagicMock()
         get_mock.return_value = response_mock
         response_mock.json.side_effect = [
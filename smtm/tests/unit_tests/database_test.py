@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from smtm import Database
 from unittest.mock import *
@@ -13,43 +15,92 @@ class DatabaseTests(unittest.TestCase):
     @patch("sqlite3.connect")
     def test_constructor_make_connection_correctly(self, mock_connect):
         dummy_connection = MagicMock()
+        dummy_connection.cursor.return_value.fetchone.return_value = {"user_version": 2}
         mock_connect.return_value = dummy_connection
         Database()
         mock_connect.assert_called_once_with(
             "smtm.db", check_same_thread=False, timeout=30.0
         )
         dummy_connection.cursor.assert_called_once()
+        dummy_connection.cursor.return_value.execute.assert_any_call("PRAGMA journal_mode=WAL")
 
     def test_create_table_should_execute_and_commit_correct_statement(self):
-        db = Database()
+        db = Database(":memory:")
         db.cursor = MagicMock()
         db.conn = MagicMock()
+        db._get_schema_version = MagicMock(return_value=0)
+        db._has_legacy_table = MagicMock(return_value=False)
         db.create_table()
-        self.assertEqual(db.cursor.execute.call_count, 2)
-        self.assertEqual(db.conn.commit.call_count, 2)
+        self.assertEqual(db.cursor.execute.call_count, 7)
+        self.assertEqual(db.conn.commit.call_count, 1)
         self.assertEqual(
             db.cursor.execute.call_args_list[0][0][0],
-            "CREATE TABLE IF NOT EXISTS upbit (id TEXT PRIMARY KEY, period INT, recovered INT, market TEXT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT)",
+            "CREATE TABLE IF NOT EXISTS upbit (market TEXT NOT NULL, period INT NOT NULL, ts_epoch INTEGER NOT NULL, recovered INT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT, PRIMARY KEY (market, period, ts_epoch)) WITHOUT ROWID",
         )
         self.assertEqual(
             db.cursor.execute.call_args_list[1][0][0],
-            "CREATE TABLE IF NOT EXISTS binance (id TEXT PRIMARY KEY, period INT, recovered INT, market TEXT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT)",
+            "CREATE TABLE IF NOT EXISTS binance (market TEXT NOT NULL, period INT NOT NULL, ts_epoch INTEGER NOT NULL, recovered INT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT, PRIMARY KEY (market, period, ts_epoch)) WITHOUT ROWID",
+        )
+        self.assertEqual(
+            db.cursor.execute.call_args_list[2][0][0],
+            "CREATE TABLE IF NOT EXISTS coverage (source TEXT NOT NULL, market TEXT NOT NULL, period INT NOT NULL, start_epoch INTEGER NOT NULL, end_epoch INTEGER NOT NULL, PRIMARY KEY (source, market, period, start_epoch)) WITHOUT ROWID",
+        )
+        self.assertEqual(db.cursor.execute.call_args_list[3][0][0], "DELETE FROM coverage")
+        self.assertEqual(db.cursor.execute.call_args_list[6][0][0], "PRAGMA user_version = 3")
+
+    def test_create_table_should_skip_when_schema_is_current_version(self):
+        db = Database(":memory:")
+        db.cursor = MagicMock()
+        db.conn = MagicMock()
+        db._get_schema_version = MagicMock(return_value=3)
+        db.create_table()
+        db.cursor.execute.assert_not_called()
+
+    def test_create_table_should_migrate_v1_table_to_v2(self):
+        db = Database(":memory:")
+        db.cursor.execute("DROP TABLE upbit")
+        db.cursor.execute("DROP TABLE binance")
+        db.cursor.execute("PRAGMA user_version = 0")
+        db.cursor.execute(
+            "CREATE TABLE upbit (id TEXT PRIMARY KEY, period INT, recovered INT, market TEXT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT)"
+        )
+        db.cursor.executemany(
+            "INSERT INTO upbit (id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                ("60S-2020-03-10 22:53:00", 60, 0, "mango", "2020-03-10 22:53:00", 2, 2, 2, 2, 2, 2),
+                ("60S-2020-03-10 22:52:00", 60, 1, "mango", "2020-03-10 22:52:00", 1, 1, 1, 1, 1, 1),
+            ],
         )
+        db.conn.commit()
+
+        db.create_table()
+
+        self.assertEqual(db._get_schema_version(), 3)
+        self.assertEqual(
+            db.get_coverage("mango"), [("2020-03-10T22:52:00", "2020-03-10T22:54:00")]
+        )
+        data = db.query("2020-03-10 22:52:00", "2020-03-10 22:54:00", "mango")
+        self.assertEqual(
+            [(item["id"], item["recovered"], item["closing_price"]) for item in data],
+            [("60S-2020-03-10 22:52:00", 1, 1), ("60S-2020-03-10 22:53:00", 0, 2)],
+        )
+        db.cursor.execute("SELECT ts_epoch FROM upbit ORDER BY ts_epoch")
+        self.assertEqual([row["ts_epoch"] for row in db.cursor.fetchall()], [1583880720, 1583880780])
 
 
 class DatabaseUpbitTests(unittest.TestCase):
     def test_query_should_execute_and_commit_correct_statement_with_upbit_table(self):
-        db = Database()
+        db = Database(":memory:")
         db.cursor = MagicMock()
-        db.query("start_date", "end_date", "mango_market", period=60, is_upbit=True)
+        db.query("2020-03-10 22:52:00", "2020-03-10T22:54:00", "mango_market", period=60, is_upbit=True)
         db.cursor.execute.assert_called_once_with(
-            "SELECT id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume FROM upbit WHERE market = ? AND period = ? AND date_time >= ? AND date_time < ? ORDER BY datetime(date_time) ASC",
-            ("mango_market", 60, "start_date", "end_date"),
+            "SELECT period || 'S-' || date_time AS id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume FROM upbit WHERE market = ? AND period = ? AND ts_epoch >= ? AND ts_epoch < ? ORDER BY ts_epoch ASC",
+            ("mango_market", 60, 1583880720, 1583880840),
         )
         db.cursor.fetchall.assert_called_once()
 
     def test_update_should_execute_and_commit_correct_statement_with_upbit_table(self):
-        db = Database()
+        db = Database(":memory:")
         dummy_data = [
             {
                 "market": "mango",
@@ -89,10 +140,10 @@ class DatabaseUpbitTests(unittest.TestCase):
         db.update(dummy_data, period=60, is_upbit=True)
         expected_tuple_list = [
             (
-                "60S-2020-03-10T22:52:00",
+                "mango",
                 60,
+                1583880720,
                 1,
-                "mango",
                 "2020-03-10T22:52:00",
                 9777000.0,
                 9778000.0,
@@ -102,10 +153,10 @@ class DatabaseUpbitTests(unittest.TestCase):
                 1.15377852,
             ),
             (
-                "60S-2020-03-10T22:53:00",
+                "mango",
                 60,
+                1583880780,
                 0,
-                "mango",
                 "2020-03-10T22:53:00",
                 8777000.0,
                 8778000.0,
@@ -115,10 +166,10 @@ class DatabaseUpbitTests(unittest.TestCase):
                 1.15377852,
             ),
             (
-                "60S-2020-03-10T22:53:00",
+                "mango",
                 60,
+                1583880780,
                 0,
-                "mango",
                 "2020-03-10T22:53:00",
                 7777000.0,
                 7778000.0,
@@ -130,7 +181,7 @@ class DatabaseUpbitTests(unittest.TestCase):
         ]
 
         db.cursor.executemany.assert_called_once_with(
-            "REPLACE INTO upbit (id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "REPLACE INTO upbit (market, period, ts_epoch, recovered, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
             expected_tuple_list,
         )
         db.conn.commit.assert_called_once()
@@ -138,19 +189,19 @@ class DatabaseUpbitTests(unittest.TestCase):
 
 class DatabaseBinanceTests(unittest.TestCase):
     def test_query_should_execute_and_commit_correct_statement_with_binance_table(self):
-        db = Database()
+        db = Database(":memory:")
         db.cursor = MagicMock()
-        db.query("start_date", "end_date", "mango_market", period=60, is_upbit=False)
+        db.query("2020-03-10 22:52:00", "2020-03-10T22:54:00", "mango_market", period=60, is_upbit=False)
         db.cursor.execute.assert_called_once_with(
-            "SELECT id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume FROM binance WHERE market = ? AND period = ? AND date_time >= ? AND date_time < ? ORDER BY datetime(date_time) ASC",
-            ("mango_market", 60, "start_date", "end_date"),
+            "SELECT period || 'S-' || date_time AS id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume FROM binance WHERE market = ? AND period = ? AND ts_epoch >= ? AND ts_epoch < ? ORDER BY ts_epoch ASC",
+            ("mango_market", 60, 1583880720, 1583880840),
         )
         db.cursor.fetchall.assert_called_once()
 
     def test_update_should_execute_and_commit_correct_statement_with_binance_table(
         self,
     ):
-        db = Database()
+        db = Database(":memory:")
         dummy_data = [
             {
                 "market": "mango",
@@ -190,10 +241,10 @@ class DatabaseBinanceTests(unittest.TestCase):
         db.update(dummy_data, period=60, is_upbit=False)
         expected_tuple_list = [
             (
-                "60S-2020-03-10T22:52:00",
+                "mango",
                 60,
+                1583880720,
                 1,
-                "mango",
                 "2020-03-10T22:52:00",
                 9777000.0,
                 9778000.0,
@@ -203,10 +254,10 @@ class DatabaseBinanceTests(unittest.TestCase):
                 1.15377852,
             ),
             (
-                "60S-2020-03-10T22:53:00",
+                "mango",
                 60,
+                1583880780,
                 0,
-                "mango",
                 "2020-03-10T22:53:00",
                 8777000.0,
                 8778000.0,
@@ -216,10 +267,10 @@ class DatabaseBinanceTests(unittest.TestCase):
                 1.15377852,
             ),
             (
-                "60S-2020-03-10T22:54:00",
+                "mango",
                 60,
+                1583880840,
                 0,
-                "mango",
                 "2020-03-10T22:54:00",
                 7777000.0,
                 7778000.0,
@@ -231,12 +282,91 @@ class DatabaseBinanceTests(unittest.TestCase):
         ]
 
         db.cursor.executemany.assert_called_once_with(
-            "REPLACE INTO binance (id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "REPLACE INTO binance (market, period, ts_epoch, recovered, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
             expected_tuple_list,
         )
         db.conn.commit.assert_called_once()
 
 
+class DatabaseCoverageTests(unittest.TestCase):
+    def make_candles(self, market, times):
+        return [
+            {
+                "market": market,
+                "date_time": f"2020-03-10 22:{minute:02d}:00",
+                "opening_price": 1,
+                "high_price": 1,
+                "low_price": 1,
+                "closing_price": 1,
+                "acc_price": 1,
+                "acc_volume": 1,
+            }
+            for minute in times
+        ]
+
+    def test_update_should_merge_stored_ranges_into_coverage(self):
+        db = Database(":memory:")
+        db.update(self.make_candles("mango", [0, 1, 2, 5, 6]))
+        db.update(self.make_candles("apple", [0]))
+        self.assertEqual(
+            db.get_coverage("mango"),
+            [("2020-03-10T22:00:00", "2020-03-10T22:03:00"), ("2020-03-10T22:05:00", "2020-03-10T22:07:00")],
+        )
+
+        db.update(self.make_candles("mango", [3, 4]))
+        self.assertEqual(db.get_coverage("mango"), [("2020-03-10T22:00:00", "2020-03-10T22:07:00")])
+        self.assertEqual(db.get_coverage("apple"), [("2020-03-10T22:00:00", "2020-03-10T22:01:00")])
+        self.assertEqual(db.get_coverage("mango", is_upbit=False), [])
+
+        db.coverage_maps = {}
+        self.assertEqual(db.get_coverage("mango"), [("2020-03-10T22:00:00", "2020-03-10T22:07:00")])
+
+    def test_update_should_merge_coverage_written_by_other_instance(self):
+        with tempfile.TemporaryDirectory() as folder:
+            db_file = os.path.join(folder, "coverage.db")
+            db_a = Database(db_file)
+            db_b = Database(db_file)
+            db_a.update(self.make_candles("mango", [0]))
+            db_b.get_coverage("mango")
+            db_a.update(self.make_candles("mango", [5]))
+
+            db_b.update(self.make_candles("mango", [5, 6]))
+
+            expected = [("2020-03-10T22:00:00", "2020-03-10T22:01:00"), ("2020-03-10T22:05:00", "2020-03-10T22:07:00")]
+            self.assertEqual(db_b.get_coverage("mango"), expected)
+            self.assertEqual(Database(db_file).get_coverage("mango"), expected)
+            self.assertFalse(db_b.conn.in_transaction)
+            self.assertEqual(len(db_a.query("2020-03-10T22:00:00", "2020-03-10T22:10:00", "mango")), 3)
+
+    def test_get_missing_ranges_should_return_only_not_stored_ranges(self):
+        db = Database(":memory:")
+        db.update(self.make_candles("mango", [2, 3, 6]))
+
+        self.assertEqual(
+            db.get_missing_ranges("2020-03-10T22:00:00", "2020-03-10T22:10:00", "mango"),
+            [
+                ("2020-03-10T22:00:00", "2020-03-10T22:02:00"),
+                ("2020-03-10T22:04:00", "2020-03-10T22:06:00"),
+                ("2020-03-10T22:07:00", "2020-03-10T22:10:00"),
+            ],
+        )
+        self.assertEqual(
+            db.get_missing_ranges("2020-03-10T22:02:00", "2020-03-10T22:04:00", "mango"), []
+        )
+
+    def test_rebuild_coverage_should_find_consecutive_candles(self):
+        db = Database(":memory:")
+        db.update(self.make_candles("mango", [0, 1, 3]))
+        db.cursor.execute("DELETE FROM coverage")
+
+        db.rebuild_coverage()
+
+        self.assertEqual(
+            db.get_coverage("mango"),
+            [("2020-03-10T22:00:00", "2020-03-10T22:02:00"), ("2020-03-10T22:03:00", "2020-03-10T22:04:00")],
+        )
+
+
 class DatabaseInMemoryTests(unittest.TestCase):
     def test_update_and_query_should_execute_and_commit_correct_statement_with_upbit_table(
         self,
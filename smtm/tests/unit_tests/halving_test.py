@@ -0,0 +1,113 @@
+import unittest
+from smtm.runner import halving, sweep
+from unittest.mock import *
+
+
+def make_row(idx, final_return, pruned=False, ok=True, turns=10):
+    return {
+        "idx": idx,
+        "params": {"A": idx},
+        "ok": ok,
+        "final_return": final_return,
+        "max_return": final_return,
+        "min_return": final_return,
+        "trades": 1,
+        "turns": turns,
+        "max_drawdown": 0.0,
+        "pruned": pruned,
+        "elapsed_sec": 0.0,
+        "error": "",
+    }
+
+
+class HalvingScheduleTests(unittest.TestCase):
+    def setUp(self):
+        self.spec = sweep.SweepSpec(
+            strategy="BBI-V3-SPEC-V16-VOL",
+            currency="BTC",
+            start="2025-11-21T00:00:00",
+            end="2025-11-22T00:00:00",
+            budget=100000,
+            term=60,
+        )
+
+    def test_count_candles_return_candle_count_of_period(self):
+        self.assertEqual(halving.count_candles(self.spec), 1440)
+
+    def test_make_rungs_return_prefix_schedule(self):
+        schedule = halving.make_rungs(self.spec, eta=3, rungs=3)
+
+        self.assertEqual([rung["candles"] for rung in schedule], [160, 480, 1440])
+        self.assertEqual(schedule[0]["end"], "2025-11-21T02:40:00")
+        self.assertEqual(schedule[1]["end"], "2025-11-21T08:00:00")
+        self.assertEqual(schedule[2]["end"], "2025-11-22T00:00:00")
+
+    def test_make_rungs_raise_ValueError_when_eta_is_invalid(self):
+        with self.assertRaises(ValueError):
+            halving.make_rungs(self.spec, eta=1)
+
+    def test_promote_return_top_configs_except_pruned_and_failed(self):
+        results = [
+            make_row(0, 1.0),
+            make_row(1, 5.0, pruned=True),
+            make_row(2, 3.0),
+            make_row(3, None, ok=False),
+            make_row(4, 2.0),
+            make_row(5, -1.0),
+        ]
+
+        self.assertEqual(halving.promote(results, eta=3), [2, 4])
+
+    def test_rank_rows_put_higher_rung_first_and_pruned_last(self):
+        rows = [make_row(0, 9.0), make_row(1, 1.0), make_row(2, 5.0, pruned=True), make_row(3, 2.0)]
+        for row, rung in zip(rows, (0, 1, 1, 1)):
+            row["rung"] = rung
+
+        ranked = halving.rank_rows(rows)
+
+        self.assertEqual([row["idx"] for row in ranked], [3, 1, 0, 2])
+        self.assertEqual([row["rank"] for row in ranked], [1, 2, 3, 4])
+
+    def test_rank_rows_sort_by_drawdown_ascending_in_same_rung(self):
+        rows = [make_row(0, 9.0), make_row(1, 1.0), make_row(2, 5.0)]
+        for row, drawdown in zip(rows, (8.0, 1.0, 3.0)):
+            row.update({"rung": 1, "max_drawdown": drawdown})
+
+        ranked = halving.rank_rows(rows, "max_drawdown")
+
+        self.assertEqual([row["idx"] for row in ranked], [1, 2, 0])
+
+
+class HalvingRunTests(unittest.TestCase):
+    @patch("smtm.runner.halving.sweep.evaluate")
+    @patch("smtm.runner.halving.sweep.open_worker_pool")
+    def test_run_halving_extend_promoted_configs_and_count_turns(self, mock_pool, mock_evaluate):
+        spec = sweep.SweepSpec("BBI-V3-SPEC-V16-VOL", "BTC", "2025-11-21T00:00:00", "2025-11-21T01:30:00", 100000, 60)
+        param_list = [{"A": idx} for idx in range(9)]
+
+        def evaluate(pool, tasks, label):
+            # idx가 클수록 수익률이 높고, idx 7은 낙폭으로 중단
+            return [
+                make_row(task["idx"], float(task["idx"]), pruned=task["idx"] == 7, turns=10)
+                for task in tasks
+            ]
+
+        mock_evaluate.side_effect = evaluate
+
+        result = halving.run_halving(spec, param_list, eta=3, rungs=3, process=1)
+
+        calls = mock_evaluate.call_args_list
+        self.assertEqual(len(calls), 3)
+        self.assertEqual([task["idx"] for task in calls[0][0][1]], list(range(9)))
+        self.assertEqual(calls[0][0][1][0]["end"], "2025-11-21T00:10:00")
+        self.assertEqual(sorted(task["idx"] for task in calls[1][0][1]), [5, 6, 8])
+        self.assertEqual(calls[1][0][1][0]["end"], "2025-11-21T00:30:00")
+        self.assertEqual([task["idx"] for task in calls[2][0][1]], [8])
+        self.assertEqual(calls[2][0][1][0]["end"], "2025-11-21T01:30:00")
+
+        self.assertEqual(result["turns"], (9 + 3 + 1) * 10)
+        self.assertEqual(result["exhaustive_turns"], 9 * 90)
+        self.assertEqual([stats["configs"] for stats in result["rungs"]], [9, 3, 1])
+        self.assertEqual(result["ranked"][0]["idx"], 8)
+        self.assertEqual(result["ranked"][0]["rung"], 2)
+        self.assertEqual(result["ranked"][-1]["idx"], 7)
@@ -0,0 +1,144 @@
+import math
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from smtm.indicator import IndicatorCache
+from smtm.indicator.vectorized import bbi_indicator_columns
+from smtm.strategy.strategy_bbi_v3_spec_v16_vol import StrategyBBI_V3_Spec_V16_Vol
+from candle_factory import make_candles
+from unittest.mock import *
+
+
+
+
+class IndicatorCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.candles = make_candles(300, seed=3, price=50000.0, volatility=0.004)
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_get_compute_once_and_return_cached_columns(self):
+        cache = IndicatorCache()
+        params = {"atr_period": 14, "ema_period": 21}
+
+        first = cache.get(self.candles, "bbi", params)
+        second = cache.get(self.candles, "bbi", params)
+
+        self.assertIs(first, second)
+        self.assertEqual(cache.get_stats()["misses"], 1)
+        self.assertEqual(cache.get_stats()["hits"], 1)
+        expected = bbi_indicator_columns(
+            [c["closing_price"] for c in self.candles],
+            [c["high_price"] for c in self.candles],
+            [c["low_price"] for c in self.candles],
+        )
+        for key, values in expected.items():
+            np.testing.assert_array_equal(first[key], values)
+        self.assertEqual(first["epoch"][1] - first["epoch"][0], 60)
+        self.assertFalse(first["rsi"].flags.writeable)
+
+    def test_get_compute_again_when_params_or_candles_are_different(self):
+        cache = IndicatorCache()
+
+        cache.get(self.candles, "bbi", {"atr_period": 14, "ema_period": 21})
+        cache.get(self.candles, "bbi", {"atr_period": 10, "ema_period": 21})
+        cache.get(self.candles[:-1], "bbi", {"atr_period": 14, "ema_period": 21})
+
+        self.assertEqual(cache.get_stats()["misses"], 3)
+        self.assertEqual(cache.get_stats()["entries"], 3)
+
+    def test_get_load_columns_saved_by_other_instance(self):
+        params = {"atr_period": 14, "ema_period": 21}
+        expected = IndicatorCache(cache_dir=self.tmp_dir).get(self.candles, "bbi", params)
+
+        cache = IndicatorCache(cache_dir=self.tmp_dir)
+        result = cache.get(self.candles, "bbi", params)
+
+        self.assertEqual(cache.get_stats()["disk_hits"], 1)
+        self.assertEqual(cache.get_stats()["misses"], 0)
+        self.assertEqual(sorted(result), sorted(expected))
+        for key, values in expected.items():
+            np.testing.assert_array_equal(result[key], values)
+
+    def test_get_evict_oldest_entry_when_max_bytes_is_exceeded(self):
+        cache = IndicatorCache(max_bytes=300 * 8 * 7 * 2)
+
+        cache.get(self.candles, "bbi", {"atr_period": 14, "ema_period": 21})
+        cache.get(self.candles, "bbi", {"atr_period": 10, "ema_period": 21})
+        cache.get(self.candles, "bbi", {"atr_period": 12, "ema_period": 21})
+
+        self.assertEqual(cache.get_stats()["entries"], 2)
+        cache.get(self.candles, "bbi", {"atr_period": 14, "ema_period": 21})
+        self.assertEqual(cache.get_stats()["misses"], 4)
+
+    @patch.object(IndicatorCache, "_instance", None)
+    def test_get_instance_keep_columns_in_memory_only_by_default(self):
+        cache = IndicatorCache.get_instance()
+
+        self.assertIsNone(cache.cache_dir)
+        self.assertIs(IndicatorCache.get_instance(), cache)
+
+    def test_get_raise_UserWarning_when_indicator_is_not_supported(self):
+        with self.assertRaises(UserWarning):
+            IndicatorCache().get(self.candles, "not-exist")
+
+
+class StrategyPrecomputeTests(unittest.TestCase):
+    FIELDS = ("bb_lower", "rsi", "macd", "stoch_k", "atr", "ema")
+
+    def setUp(self):
+        self.candles = make_candles(300, seed=3, price=50000.0, volatility=0.004)
+        self.cache = IndicatorCache()
+        patcher = patch.object(IndicatorCache, "get_instance", return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_strategy(self, candles, precompute_candles=None):
+        strategy = StrategyBBI_V3_Spec_V16_Vol()
+        strategy._apply_tuning_params = MagicMock()
+        strategy.is_simulation = True
+        strategy.initialize(1000000, 5000)
+        strategy._process_window = MagicMock()
+        strategy._check_sell_conditions = MagicMock()
+        if precompute_candles is not None:
+            strategy.precompute(precompute_candles)
+        fields = []
+        for candle in candles:
+            strategy.update_trading_info([candle])
+            fields.append({key: strategy.data[-1][key] for key in self.FIELDS})
+        return strategy, fields
+
+    def assert_fields_equal(self, actual, expected):
+        for a, e in zip(actual, expected):
+            for key in self.FIELDS:
+                if e[key] is None or a[key] is None:
+                    self.assertEqual(a[key], e[key])
+                elif math.isnan(e[key]):
+                    self.assertTrue(math.isnan(a[key]))
+                else:
+                    self.assertTrue(math.isclose(a[key], e[key], rel_tol=1e-9, abs_tol=1e-9))
+
+    def test_precomputed_indicators_match_streaming_indicators(self):
+        _, expected = self.run_strategy(self.candles)
+        strategy, actual = self.run_strategy(self.candles, self.candles)
+
+        self.assertIsNotNone(strategy.precomputed)
+        self.assertEqual(len(strategy.atr_values), min(strategy.ATR_HISTORY_SIZE, 300 - strategy.ATR_PERIOD))
+        self.assert_fields_equal(actual, expected)
+
+    def test_precompute_share_columns_between_strategies(self):
+        first, _ = self.run_strategy(self.candles[:1], self.candles)
+        second, _ = self.run_strategy(self.candles[:1], self.candles)
+
+        self.assertIs(first.precomputed, second.precomputed)
+        self.assertEqual(self.cache.get_stats()["misses"], 1)
+
+    def test_fall_back_to_streaming_when_candle_does_not_match(self):
+        _, expected = self.run_strategy(self.candles)
+        strategy, actual = self.run_strategy(self.candles, self.candles[:100] + self.candles[101:])
+
+        self.assertIsNone(strategy.precomputed)
+        self.assert_fields_equal(actual, expected)
@@ -0,0 +1,175 @@
+import math
+import random
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import *
+
+import numpy as np
+import pandas as pd
+
+from smtm.indicator import (
+    RollingMean,
+    RollingStd,
+    RollingMin,
+    RollingMax,
+    BollingerBand,
+    Ema,
+    Macd,
+    Rsi,
+    Stochastic,
+    Atr,
+)
+from smtm.indicator.vectorized import bbi_indicator_columns, forward_fill_nonzero
+from smtm.strategy.strategy_bbi_v3_spec_v16_vol import StrategyBBI_V3_Spec_V16_Vol
+
+
+def make_candles(count, seed=7):
+    """평탄 구간이 섞인 랜덤 워크 캔들 (NaN/0 손실 경로 확인용)"""
+    rnd = random.Random(seed)
+    price = 50000.0
+    start = datetime(2024, 1, 1)
+    candles = []
+    for i in range(count):
+        if (i // 40) % 5 == 3:
+            close = price
+        else:
+            close = round(price * (1 + rnd.gauss(0, 0.004)), 0)
+        high = max(price, close) + (0 if close == price else round(rnd.random() * 30, 0))
+        low = min(price, close) - (0 if close == price else round(rnd.random() * 30, 0))
+        candles.append(
+            {
+                "type": "primary_candle",
+                "market": "KRW-BTC",
+                "date_time": (start + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%S"),
+                "opening_price": price,
+                "high_price": high,
+                "low_price": low,
+                "closing_price": close,
+                "acc_price": 1000.0,
+                "acc_volume": 0.1,
+            }
+        )
+        price = close
+    return candles
+
+
+class IndicatorParityTests(unittest.TestCase):
+    def setUp(self):
+        self.candles = make_candles(600)
+        self.closes = [c["closing_price"] for c in self.candles]
+        self.highs = [c["high_price"] for c in self.candles]
+        self.lows = [c["low_price"] for c in self.candles]
+
+    def assert_series_equal(self, actual, expected):
+        # pandas 버전에 따라 동일 값 윈도우의 표준편차가 0 대신 미세한 잔차로 남으므로 상대 오차로 비교
+        self.assertEqual(len(actual), len(expected))
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            if math.isnan(e):
+                self.assertTrue(math.isnan(a), f"index {i}: {a} is not NaN")
+            else:
+                self.assertTrue(
+                    math.isclose(a, e, rel_tol=1e-7, abs_tol=1e-6),
+                    f"index {i}: {a} != {e}",
+                )
+
+    def test_streaming_indicators_match_pandas_columns(self):
+        expected = bbi_indicator_columns(
+            self.closes, self.highs, self.lows, atr_period=14, ema_period=21
+        )
+        bb = BollingerBand(20, 2)
+        rsi = Rsi(14)
+        macd = Macd(12, 26)
+        stoch = Stochastic(14, 3)
+        atr = Atr(14)
+        ema = Ema(21)
+        actual = {key: [] for key in expected}
+        for close, high, low in zip(self.closes, self.highs, self.lows):
+            actual["bb_lower"].append(bb.update(close)[2])
+            actual["rsi"].append(rsi.update(close))
+            actual["macd"].append(macd.update(close)[0])
+            actual["stoch_k"].append(stoch.update(high, low, close))
+            actual["atr"].append(atr.update(high, low, close))
+            actual["ema"].append(ema.update(close))
+
+        for key, values in expected.items():
+            with self.subTest(indicator=key):
+                self.assert_series_equal(actual[key], values)
+
+    def test_rolling_primitives_match_pandas(self):
+        series = pd.Series(self.closes, dtype="float")
+        mean, std, low, high = RollingMean(9), RollingStd(9), RollingMin(9), RollingMax(9)
+        result = [(mean.update(x), std.update(x), low.update(x), high.update(x)) for x in self.closes]
+
+        self.assert_series_equal([r[0] for r in result], series.rolling(9).mean().tolist())
+        self.assert_series_equal([r[1] for r in result], series.rolling(9).std().tolist())
+        self.assert_series_equal([r[2] for r in result], series.rolling(9).min().tolist())
+        self.assert_series_equal([r[3] for r in result], series.rolling(9).max().tolist())
+
+    def test_wilder_rsi_match_reference(self):
+        rsi = Rsi(14, method="wilder")
+        actual = [rsi.update(x) for x in self.closes]
+
+        deltas = np.diff(np.array(self.closes, dtype="float64"))
+        gains = np.clip(deltas, 0, None)
+        losses = np.clip(-deltas, 0, None)
+        avg_gain = gains[:14].mean()
+        avg_loss = losses[:14].mean()
+        expected = [float("nan")] * 14
+        expected.append(100 - 100 / (1 + avg_gain / avg_loss) if avg_loss else float("nan"))
+        for gain, loss in zip(gains[14:], losses[14:]):
+            avg_gain = (avg_gain * 13 + gain) / 14
+            avg_loss = (avg_loss * 13 + loss) / 14
+            expected.append(100 - 100 / (1 + avg_gain / avg_loss) if avg_loss else float("nan"))
+
+        self.assert_series_equal(actual, expected)
+
+    def test_rsi_raise_error_when_method_is_not_supported(self):
+        with self.assertRaises(UserWarning):
+            Rsi(14, method="ema")
+
+    def test_bbi_strategy_candle_fields_match_pandas_columns(self):
+        strategy = StrategyBBI_V3_Spec_V16_Vol()
+        strategy._apply_tuning_params = MagicMock()
+        strategy.is_simulation = True
+        strategy.initialize(1000000, 5000)
+        strategy._process_window = MagicMock()
+        strategy._check_sell_conditions = MagicMock()
+
+        candle_fields = []
+        for candle in self.candles:
+            strategy.update_trading_info([candle])
+            candle_fields.append(strategy.data[-1])
+
+        expected = bbi_indicator_columns(
+            self.closes,
+            self.highs,
+            self.lows,
+            atr_period=strategy.ATR_PERIOD,
+            ema_period=strategy.EMA_PERIOD,
+        )
+        gate = {
+            "bb_lower": 20,
+            "rsi": 14,
+            "macd": 26,
+            "stoch_k": 14,
+            "atr": strategy.ATR_PERIOD + 1,
+            "ema": strategy.EMA_PERIOD,
+        }
+        for key, values in expected.items():
+            with self.subTest(indicator=key):
+                for i, candle in enumerate(candle_fields):
+                    if i + 1 < gate[key]:
+                        self.assertIsNone(candle[key])
+                    elif math.isnan(values[i]):
+                        self.assertTrue(math.isnan(candle[key]))
+                    else:
+                        self.assertTrue(math.isclose(candle[key], values[i], rel_tol=1e-7, abs_tol=1e-6))
+
+        self.assertEqual(len(strategy.atr_values), min(strategy.ATR_HISTORY_SIZE, 600 - strategy.ATR_PERIOD))
+
+    def test_forward_fill_nonzero_carry_last_signal(self):
+        filled = forward_fill_nonzero(np.array([0, 0, 1, 0, 0, -1, 0, 1], dtype=np.int8))
+
+        np.testing.assert_array_equal(filled, [0, 0, 1, 1, 1, -1, -1, 1])
+        self.assertEqual(filled.dtype, np.int8)
+        self.assertEqual(len(forward_fill_nonzero([])), 0)
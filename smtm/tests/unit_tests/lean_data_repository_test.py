@@ -0,0 +1,75 @@
+import unittest
+from smtm.analyzer.analyzer import Analyzer
+from smtm.analyzer.lean_data_repository import LeanDataRepository
+from candle_factory import make_candle
+from unittest.mock import *
+
+
+
+
+class LeanDataRepositoryTests(unittest.TestCase):
+    def test_keep_first_and_last_candle_only(self):
+        repo = LeanDataRepository()
+        for minute in range(5):
+            repo.add_trading_info([{"type": "binance"}, make_candle(minute, 100 + minute)])
+
+        self.assertEqual([info["closing_price"] for info in repo.info_list], [100, 104])
+        self.assertEqual(repo.info_list[-1]["kind"], 0)
+
+    def test_ignore_requests_spot_and_line_graph_but_keep_results(self):
+        repo = LeanDataRepository()
+        repo.add_requests([{"id": "1", "type": "buy", "price": 100, "amount": 1}])
+        repo.add_spot("2024-01-01T00:00:00", 1)
+        repo.add_line_graph_value("2024-01-01T00:00:00", 1)
+        repo.add_result({"type": "buy", "price": 100, "amount": 1, "date_time": "2024-01-01T00:00:00"})
+
+        self.assertEqual((repo.request_list, repo.spot_list, repo.line_graph_list), ([], [], []))
+        self.assertEqual(len(repo.get_trading_results()), 1)
+        with self.assertRaises(UserWarning):
+            repo.get_interval_data((10, 0))
+
+
+class LeanAnalyzerTests(unittest.TestCase):
+    def make_analyzer(self, lean):
+        analyzer = Analyzer(lean=lean)
+        analyzer.is_simulation = True
+        analyzer.graph_generator = MagicMock()
+        analyzer.report_generator.create_report_file = MagicMock()
+        analyzer.initialize(
+            lambda: {
+                "balance": 900,
+                "asset": {"KRW-BTC": (100, 1)},
+                "quote": {"KRW-BTC": 100 + len(analyzer.data_repository.score_list)},
+                "date_time": analyzer.data_repository.info_list[-1]["date_time"],
+            }
+        )
+        for minute in range(0, 10, 2):
+            analyzer.put_trading_info([make_candle(minute, 100 + minute)])
+        analyzer.put_requests([{"id": "1", "type": "buy", "price": 100, "amount": 1, "date_time": "2024-01-01T00:08:00"}])
+        analyzer.put_result(
+            {"type": "buy", "price": 100, "amount": 1, "msg": "success", "balance": 900, "state": "done",
+             "request": {"id": "1"}, "date_time": "2024-01-01T00:08:00"}
+        )
+        return analyzer
+
+    def test_create_report_return_same_summary_without_file_and_graph(self):
+        full = self.make_analyzer(lean=False)
+        lean = self.make_analyzer(lean=True)
+
+        full_report = full.create_report(tag="full")
+        lean_report = lean.create_report(tag="lean")
+
+        self.assertEqual(lean_report["summary"], full_report["summary"])
+        self.assertEqual(lean_report["trading_table"], [])
+        full.graph_generator.draw_graph.assert_called_once()
+        full.report_generator.create_report_file.assert_called_once()
+        lean.graph_generator.draw_graph.assert_not_called()
+        lean.report_generator.create_report_file.assert_not_called()
+
+    def test_get_return_report_skip_graph(self):
+        lean = self.make_analyzer(lean=True)
+
+        summary = lean.get_return_report(graph_filename="graph.jpg")
+
+        self.assertIsNone(summary[4])
+        lean.graph_generator.draw_graph.assert_not_called()
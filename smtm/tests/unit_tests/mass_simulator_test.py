@@ -1,3 +1,4 @@
+import queue
 import unittest
 from datetime import datetime
 from datetime import timedelta
@@ -80,6 +81,53 @@ class MassSimulatorAnalyzeTests(unittest.TestCase):
             [1.12, 2.25, 2.01], mean=1.793, filename="output/BnH-2Hour.jpg"
         )
 
+    @patch("builtins.open", new_callable=mock_open)
+    def test_analyze_result_should_skip_unfinished_periods_and_keep_index(self, mock_file):
+        mass = MassSimulator()
+        dummy_config = {
+            "title": "BnH-2Hour",
+            "budget": 50000,
+            "strategy": "BNH",
+            "interval": 1,
+            "currency": "BTC",
+            "description": "mass-simluation-unit-test",
+            "period_list": [
+                {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"},
+                {"start": "2020-04-30T18:00:00", "end": "2020-04-30T20:00:00"},
+            ],
+        }
+        dummy_result = [
+            None,
+            (0, 0, 2.25, 0, 0, 0, 1.99, -1.88),
+            (0, 0, 2.01, 0, 0, 0, 4.99, 2.88),
+        ]
+        mass.draw_graph = MagicMock()
+        mass.analyze_result(dummy_result, dummy_config)
+
+        handle = mock_file()
+        self.assertEqual(handle.write.call_args_list[3][0][0], "2020-04-30T17:00:00 ~ 2020-04-30T20:00:00 (2)\n")
+        self.assertEqual(handle.write.call_args_list[6][0][0], "수익률 최대:     2.25,   1\n")
+        self.assertEqual(handle.write.call_args_list[7][0][0], "수익률 최소:     2.01,   2\n")
+        mass.draw_graph.assert_called_with([2.25, 2.01], mean=2.13, filename="output/BnH-2Hour.jpg")
+
+    @patch("smtm.controller.mass_simulator.ResultJournal")
+    def test_analyze_journal_should_analyze_journaled_results_without_simulating(self, mock_journal):
+        mass = MassSimulator()
+        dummy_config = {
+            "title": "BnH-2Hour",
+            "period_list": [{"start": "s0", "end": "e0"}, {"start": "s1", "end": "e1"}],
+        }
+        mass._load_config = MagicMock(return_value=dummy_config)
+        mass.analyze_result = MagicMock()
+        mass._execute_simulation = MagicMock()
+        mock_journal.return_value.load.return_value = {1: "mango"}
+
+        self.assertEqual(mass.analyze_journal("mass_config_file_name"), 1)
+
+        mock_journal.assert_called_once_with("output/BnH-2Hour.journal.jsonl")
+        mass.analyze_result.assert_called_once_with([None, "mango"], dummy_config)
+        mass._execute_simulation.assert_not_called()
+
     @patch("matplotlib.pyplot.bar")
     @patch("matplotlib.pyplot.plot")
     @patch("matplotlib.pyplot.savefig")
@@ -128,8 +176,9 @@ class MassSimulatorInitializeTests(unittest.TestCase):
 
 
 class MassSimulatorRunTests(unittest.TestCase):
+    @patch("smtm.controller.mass_simulator.ResultJournal")
     @patch("smtm.LogManager.set_stream_level")
-    def test_run_should_call_run_simulation_correctly(self, mock_set_stream_level):
+    def test_run_should_call_run_simulation_correctly(self, mock_set_stream_level, mock_journal):
         mass = MassSimulator()
         dummy_config = {
             "title": "BnH-2Hour",
@@ -147,9 +196,13 @@ class MassSimulatorRunTests(unittest.TestCase):
         mass.analyze_result = MagicMock()
         mass.print_state = MagicMock()
         mass._execute_simulation = MagicMock()
+        dummy_store = MagicMock()
+        mass.load_shared_store = MagicMock(return_value=dummy_store)
+        mass.print_worker_stats = MagicMock()
         mass.run("mass_config_file_name", 2)
 
         mass._load_config.assert_called_once_with("mass_config_file_name")
+        mass.load_shared_store.assert_called_once_with("BTC", dummy_config["period_list"])
         self.assertEqual(
             mass._execute_simulation.call_args[0][0],
             [
@@ -160,15 +213,7 @@ class MassSimulatorRunTests(unittest.TestCase):
                     "interval": 1,
                     "currency": "BTC",
                     "partial_idx": 0,
-                    "partial_period_list": [
-                        {
-                            "idx": 0,
-                            "period": {
-                                "start": "2020-04-30T17:00:00",
-                                "end": "2020-04-30T19:00:00",
-                            },
-                        },
-                    ],
+                    "lean": False,
                 },
                 {
                     "title": "BnH-2Hour",
@@ -177,26 +222,82 @@ class MassSimulatorRunTests(unittest.TestCase):
                     "interval": 1,
                     "currency": "BTC",
                     "partial_idx": 1,
-                    "partial_period_list": [
-                        {
-                            "idx": 1,
-                            "period": {
-                                "start": "2020-04-30T18:00:00",
-                                "end": "2020-04-30T20:00:00",
-                            },
-                        },
-                    ],
+                    "lean": False,
                 },
             ],
         )
         self.assertEqual(mass._execute_simulation.call_args[0][1], 2)
+        self.assertEqual(
+            mass._execute_simulation.call_args[0][2],
+            [
+                {
+                    "idx": 0,
+                    "period": {
+                        "start": "2020-04-30T17:00:00",
+                        "end": "2020-04-30T19:00:00",
+                    },
+                },
+                {
+                    "idx": 1,
+                    "period": {
+                        "start": "2020-04-30T18:00:00",
+                        "end": "2020-04-30T20:00:00",
+                    },
+                },
+            ],
+        )
+        self.assertEqual(mass._execute_simulation.call_args[0][3], dummy_store)
+        dummy_store.close.assert_called_once()
+        mass.print_worker_stats.assert_called_once()
+        mock_journal.assert_called_once_with("output/BnH-2Hour.journal.jsonl")
+        mock_journal.return_value.load.assert_not_called()
+        mock_journal.return_value.open.assert_called_once_with(resume=False)
+        mock_journal.return_value.close.assert_called_once()
+
+    @patch("smtm.controller.mass_simulator.ResultJournal")
+    def test_run_should_skip_journaled_periods_when_resume(self, mock_journal):
+        mass = MassSimulator()
+        dummy_config = {
+            "title": "BnH-2Hour",
+            "budget": 50000,
+            "strategy": 0,
+            "interval": 1,
+            "currency": "BTC",
+            "description": "mass-simluation-unit-test",
+            "period_list": [
+                {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"},
+                {"start": "2020-04-30T18:00:00", "end": "2020-04-30T20:00:00"},
+                {"start": "2020-04-30T19:00:00", "end": "2020-04-30T21:00:00"},
+            ],
+        }
+        mock_journal.return_value.load.return_value = {0: "journaled0", 2: "journaled2"}
+        mass._load_config = MagicMock(return_value=dummy_config)
+        mass.analyze_result = MagicMock()
+        mass.print_state = MagicMock()
+        mass.print_worker_stats = MagicMock()
+        mass._execute_simulation = MagicMock()
+        mass.load_shared_store = MagicMock(return_value=None)
+
+        mass.run("mass_config_file_name", 4, resume=True)
+
+        mock_journal.return_value.load.assert_called_once_with(dummy_config["period_list"])
+        mock_journal.return_value.open.assert_called_once_with(resume=True)
+        self.assertEqual(len(mass._execute_simulation.call_args[0][0]), 1)
+        self.assertEqual(mass._execute_simulation.call_args[0][1], 1)
+        self.assertEqual(
+            mass._execute_simulation.call_args[0][2],
+            [{"idx": 1, "period": dummy_config["period_list"][1]}],
+        )
+        mass.load_shared_store.assert_called_once_with("BTC", [dummy_config["period_list"][1]])
+        self.assertEqual(mass.result, ["journaled0", None, "journaled2"])
         mass.analyze_result.assert_called_once_with(mass.result, dummy_config)
         mass.print_state.assert_called()
 
-    def test_run_single_should_start_and_stop_operator(self):
+    def test_run_single_should_run_to_completion_and_stop_operator(self):
         mock_op = MagicMock()
         MassSimulator.run_single(mock_op)
-        mock_op.start.assert_called_once()
+        mock_op.run_to_completion.assert_called_once()
+        mock_op.start.assert_not_called()
         mock_op.stop.assert_called_once()
         mock_op.get_score.assert_called_once()
 
@@ -298,6 +399,16 @@ class MassSimulatorTests(unittest.TestCase):
         mass._update_result([{"idx": 0, "result": "mango"}])
         self.assertEqual(mass.result[0], "mango")
 
+    def test__update_result_should_append_new_result_to_journal_once(self):
+        mass = MassSimulator()
+        mass.config = {"period_list": [{"start": "s0", "end": "e0"}, {"start": "s1", "end": "e1"}]}
+        mass.result = [None, None]
+        mass.journal = MagicMock()
+        mass._update_result([{"idx": 1, "result": "mango"}])
+        mass._update_result([{"idx": 1, "result": "mango"}])
+        mass.journal.append.assert_called_once_with(1, {"start": "s1", "end": "e1"}, "mango")
+        self.assertEqual(mass.result, [None, "mango"])
+
     def test__execute_single_process_simulation_should_run_simulation(self):
         dummy_config = {
             "title": "BnH-2Hour",
@@ -335,6 +446,9 @@ class MassSimulatorTests(unittest.TestCase):
 
         MassSimulator.memory_usage.assert_called_once()
         MassSimulator.run_single.assert_called_with("dummy_operator")
+        self.assertEqual(result["partial_idx"], 1)
+        self.assertEqual(result["count"], 2)
+        result = result["result_list"]
         self.assertEqual(result[0]["idx"], 7)
         self.assertEqual(result[0]["result"], "mango_result")
         self.assertEqual(result[1]["idx"], 8)
@@ -382,6 +496,87 @@ class MassSimulatorTests(unittest.TestCase):
         MassSimulator.run_single = backup_run_single
         MassSimulator.memory_usage = backup_memory_usage
 
+    @patch("smtm.MassSimulator.memory_usage")
+    @patch("smtm.MassSimulator.run_single")
+    @patch("smtm.MassSimulator.get_initialized_operator")
+    def test__execute_single_process_simulation_should_pull_periods_from_work_queue(
+        self, mock_get_operator, mock_run_single, mock_memory_usage
+    ):
+        work_queue = queue.Queue()
+        work_queue.put({"idx": 3, "period": {"start": "s3", "end": "e3"}})
+        work_queue.put({"idx": 5, "period": {"start": "s5", "end": "e5"}})
+        work_queue.put(None)
+        work_queue.put({"idx": 6, "period": {"start": "s6", "end": "e6"}})
+        mock_run_single.return_value = (0, 0, 1.5)
+        backup_queue = MassSimulator.work_queue
+        MassSimulator.work_queue = work_queue
+
+        result = MassSimulator._execute_single_process_simulation(
+            {"title": "queue", "budget": 500, "strategy": 0, "interval": 1, "currency": "BTC", "partial_idx": 0}
+        )
+
+        MassSimulator.work_queue = backup_queue
+        self.assertEqual([r["idx"] for r in result["result_list"]], [3, 5])
+        self.assertEqual(result["count"], 2)
+        self.assertGreaterEqual(result["busy_sec"], 0)
+        self.assertEqual(work_queue.get_nowait()["idx"], 6)
+
+    @patch("builtins.print")
+    @patch("smtm.MassSimulator.memory_usage")
+    @patch("smtm.MassSimulator.run_single")
+    @patch("smtm.MassSimulator.get_initialized_operator")
+    def test__execute_single_process_simulation_should_keep_running_when_report_is_None(
+        self, mock_get_operator, mock_run_single, mock_memory_usage, mock_print
+    ):
+        mock_run_single.side_effect = [None, (0, 0, 1.5)]
+        config = {
+            "title": "none", "budget": 500, "strategy": 0, "interval": 1, "currency": "BTC", "partial_idx": 0,
+            "partial_period_list": [{"idx": 0, "period": {"start": "s0", "end": "e0"}},
+                                    {"idx": 1, "period": {"start": "s1", "end": "e1"}}],
+        }
+
+        result = MassSimulator._execute_single_process_simulation(config)
+
+        self.assertEqual(result["result_list"], [{"idx": 0, "result": None}, {"idx": 1, "result": (0, 0, 1.5)}])
+        mock_print.assert_any_call("     #0 no report")
+        mass = MassSimulator()
+        mass.config = {"period_list": [{"start": "s0", "end": "e0"}, {"start": "s1", "end": "e1"}]}
+        mass.result = [None, None]
+        mass.journal = MagicMock()
+        mass._update_result(result["result_list"])
+        mass.journal.append.assert_called_once_with(1, {"start": "s1", "end": "e1"}, (0, 0, 1.5))
+
+    @patch("builtins.print")
+    def test_print_worker_stats_print_throughput_and_utilization(self, mock_print):
+        mass = MassSimulator()
+        mass.elapsed_sec = 4
+        mass.worker_stats = [
+            {"worker": "worker-1", "count": 6, "busy_sec": 3.0},
+            {"worker": "worker-2", "count": 2, "busy_sec": 4.0},
+        ]
+        mass.print_worker_stats()
+        self.assertEqual(
+            mock_print.call_args_list[1][0][0],
+            "throughput: 2.00 periods/sec (8 periods, 4.00 sec)",
+        )
+        self.assertEqual(
+            mock_print.call_args_list[2][0][0],
+            "worker-1:     6 periods, busy 3.00 sec,  75.0 %",
+        )
+        self.assertEqual(
+            mock_print.call_args_list[3][0][0],
+            "worker-2:     2 periods, busy 4.00 sec, 100.0 %",
+        )
+
+    def test_get_candle_range_return_range_loaded_by_data_provider(self):
+        interval = Config.candle_interval
+        Config.candle_interval = 60
+        self.assertEqual(
+            MassSimulator.get_candle_range("2020-04-30T17:00:00", "2020-04-30T19:00:00"),
+            ("2020-04-30T17:00:00", "2020-04-30T19:00:00"),
+        )
+        Config.candle_interval = interval
+
     def test_make_chunk_should_make_chunk_list_from_original_list(self):
         a = [1, 2, 3, 4, 5, 6, 7]
         a_result = MassSimulator.make_chunk(a, 3)
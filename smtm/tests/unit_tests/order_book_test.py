@@ -0,0 +1,147 @@
+import unittest
+from smtm.trader.order_book import OrderBook
+from smtm.trader.virtual_market import VirtualMarket
+from candle_factory import make_candle
+from unittest.mock import *
+
+
+
+
+class OrderBookTests(unittest.TestCase):
+    def test_iter_matchable_return_orders_by_price_and_time_priority(self):
+        book = OrderBook()
+        for idx, price in enumerate([100, 105, 98, 105]):
+            book.add({"id": f"b{idx}", "type": "buy", "price": price, "amount": 1}, 0)
+        for idx, price in enumerate([110, 104, 120]):
+            book.add({"id": f"s{idx}", "type": "sell", "price": price, "amount": 1}, 0)
+
+        buys = list(book.iter_matchable("buy", 99, 200))
+        sells = list(book.iter_matchable("sell", 0, 111))
+
+        self.assertEqual([o.request["id"] for o in buys], ["b1", "b3", "b0"])
+        self.assertEqual([o.request["id"] for o in sells], ["s1", "s0"])
+        book.restore(buys + sells)
+        self.assertEqual(len(list(book.iter_matchable("buy", 0, 0))), 4)
+
+    def test_close_remove_order_from_matching_and_id_index(self):
+        book = OrderBook()
+        first = book.add({"id": "same", "type": "buy", "price": 100, "amount": 1}, 0)
+        second = book.add({"id": "same", "type": "buy", "price": 101, "amount": 1}, 0)
+
+        book.close(second)
+
+        self.assertEqual(len(book), 1)
+        self.assertEqual(book.get_orders("same"), [first])
+        self.assertEqual(list(book.iter_matchable("buy", 0, 0)), [first])
+
+    def test_pop_expired_close_orders_added_before_turn(self):
+        book = OrderBook()
+        old = book.add({"id": "1", "type": "sell", "price": 100, "amount": 1}, 0)
+        book.add({"id": "2", "type": "sell", "price": 100, "amount": 1}, 3)
+
+        self.assertEqual(book.pop_expired(2), [old])
+        self.assertEqual([o.request["id"] for o in book.get_orders()], ["2"])
+
+    def test_compact_heaps_when_closed_orders_pile_up(self):
+        book = OrderBook()
+        orders = [book.add({"id": str(i), "type": "buy", "price": 1, "amount": 1}, 0) for i in range(600)]
+        for order in orders[1:]:
+            book.close(order)
+
+        self.assertLess(len(book._heaps["buy"]), 600)
+        self.assertEqual(list(book.iter_matchable("buy", 0, 0)), [orders[0]])
+
+
+class VirtualMarketOrderBookTests(unittest.TestCase):
+    def setUp(self):
+        with patch("smtm.trader.virtual_market.DataRepository"):
+            self.market = VirtualMarket(order_book=True)
+        self.market.data = [
+            make_candle(0, 110, low=100, high=110, opening=100, volume=10.0),
+            make_candle(1, 110, low=100, high=110, opening=100, volume=10.0),
+            make_candle(2, 95, low=90, high=95, opening=90, volume=10.0),
+            make_candle(3, 95, low=90, high=95, opening=90, volume=4.0),
+            make_candle(4, 95, low=90, high=95, opening=90, volume=10.0),
+            make_candle(5, 95, low=90, high=95, opening=90, volume=10.0),
+        ]
+        self.market.balance = 100000
+        self.market.is_initialized = True
+
+    def test_handle_requests_rest_order_until_matched(self):
+        request = {"id": "1", "type": "buy", "price": 95, "amount": 10}
+
+        first = self.market.handle_requests([request])
+        second = self.market.handle_requests([])
+
+        self.assertEqual([(r["state"], r["amount"]) for r in first], [("requested", 10)])
+        # 95 * 10 * 1.0005 = 950.475 -> 99049.525 -> 99050
+        self.assertEqual([(r["state"], r["amount"], r["balance"]) for r in second], [("done", 10, 99050)])
+        self.assertIs(second[0]["request"], request)
+        self.assertEqual(second[0]["date_time"], "2024-01-01T00:01:00")
+        self.assertEqual(self.market.asset, {"KRW-BTC": (95.0, 10)})
+        self.assertEqual(len(self.market.order_book), 0)
+
+    def test_handle_requests_cap_fill_by_participation_rate(self):
+        self.market.participation_rate = 0.5
+        self.market.handle_requests([])
+        self.market.handle_requests([])
+        results = self.market.handle_requests([{"id": "1", "type": "buy", "price": 95, "amount": 6}])
+        results += self.market.handle_requests([])
+
+        # 다음 캔들 거래량 4 * 0.5 = 2, 그 다음 캔들 10 * 0.5 = 5
+        self.assertEqual(
+            [(r["state"], r["amount"]) for r in results], [("requested", 6), ("partially_done", 2), ("done", 4)]
+        )
+
+    def test_handle_requests_fill_sell_before_buy_with_same_turn_cash(self):
+        self.market.balance = 0
+        self.market.asset = {"KRW-BTC": (100, 10)}
+        self.market.handle_requests([])
+
+        results = self.market.handle_requests(
+            [
+                {"id": "1", "type": "buy", "price": 92, "amount": 5},
+                {"id": "2", "type": "sell", "price": 92, "amount": 10},
+            ]
+        )
+
+        self.assertEqual([(r["request"]["id"], r["state"]) for r in results if r["state"] != "requested"],
+                         [("2", "done"), ("1", "done")])
+
+    def test_handle_requests_cancel_and_expire_resting_orders(self):
+        self.market.order_expire_turn = 2
+        results = self.market.handle_requests(
+            [
+                {"id": "1", "type": "sell", "price": 200, "amount": 1},
+                {"id": "2", "type": "buy", "price": 10, "amount": 1},
+            ]
+        )
+        results += self.market.handle_requests([{"id": "1", "type": "cancel", "price": 0, "amount": 0}])
+        results += self.market.handle_requests([])
+
+        self.assertEqual(
+            [(r["request"]["id"], r["state"], r["msg"], r["amount"]) for r in results],
+            [
+                ("1", "requested", "success", 1),
+                ("2", "requested", "success", 1),
+                ("1", "done", "canceled", 0),
+                ("2", "done", "expired", 0),
+            ],
+        )
+        self.assertEqual(len(self.market.order_book), 0)
+
+    def test_cancel_all_requests_close_every_resting_order(self):
+        self.market.handle_requests([{"id": "1", "type": "buy", "price": 10, "amount": 1}])
+        self.market.handle_requests([{"id": "2", "type": "buy", "price": 20, "amount": 1}])
+
+        results = self.market.cancel_all_requests()
+
+        self.assertEqual([(r["request"]["id"], r["msg"]) for r in results], [("1", "canceled"), ("2", "canceled")])
+        self.assertEqual(self.market.cancel_request("1"), [])
+
+    def test_handle_requests_return_game_over_at_end_of_data(self):
+        for _ in range(5):
+            results = self.market.handle_requests([])
+
+        self.assertEqual(results[0]["msg"], "game-over")
+        self.assertEqual(results[0]["date_time"], "2024-01-01T00:04:00")
@@ -0,0 +1,160 @@
+import unittest
+import numpy as np
+from smtm.analyzer.analyzer import Analyzer
+from smtm.analyzer.performance_metrics import (
+    compute_metrics,
+    drawdown_series,
+    max_drawdown,
+    trade_statistics,
+)
+from candle_factory import make_candle, to_date_time
+from unittest.mock import *
+
+
+class PerformanceMetricsTests(unittest.TestCase):
+    def test_drawdown_series_and_max_drawdown(self):
+        equity = np.array([100, 120, 90, 60, 130, 117, 140])
+
+        np.testing.assert_allclose(drawdown_series(equity), [0, 0, -25, -50, 0, -10, 0])
+        self.assertEqual(max_drawdown(equity), (50.0, 2))
+        mdd, duration = max_drawdown(np.array([100, 90, 80, 70]))
+        self.assertAlmostEqual(mdd, 30.0)
+        self.assertEqual(duration, 3)
+        self.assertEqual(max_drawdown(np.array([])), (0.0, 0))
+        mdd, _ = max_drawdown(np.array([100, 100, 110]))
+        self.assertEqual(str(mdd), "0.0")
+
+    def test_trade_statistics_use_average_cost(self):
+        stats = trade_statistics(
+            side=np.array([1, 1, -1, 1, -1]),
+            price=np.array([100, 200, 180, 100, 90]),
+            amount=np.array([1, 1, 1, 2, 3]),
+        )
+
+        # 평균 매입가 150 -> 180 매도 +30, 평균 (150 + 200) / 3 -> 90 매도 3개 -80
+        self.assertEqual(stats["trade_count"], 5)
+        self.assertEqual(stats["sell_count"], 2)
+        self.assertEqual(stats["win_rate"], 50.0)
+        self.assertAlmostEqual(stats["avg_trade_pnl"], -25.0)
+        self.assertAlmostEqual(stats["profit_factor"], 30 / 80)
+
+    def test_compute_metrics_return_risk_and_exposure(self):
+        equity = np.array([100.0, 101.0, 99.0, 102.0, 102.0])
+        returns = equity[1:] / equity[:-1] - 1
+        periods = 365 * 24 * 60
+
+        metrics = compute_metrics(
+            equity,
+            epochs=np.arange(5) * 60,
+            position=np.array([0, 1, 1, 0, 0]),
+            trades={"side": np.array([1, -1]), "price": np.array([100.0, 102.0]), "amount": np.array([1.0, 1.0])},
+        )
+
+        self.assertEqual(metrics["candles"], 5)
+        self.assertEqual(metrics["total_return"], 2.0)
+        self.assertEqual(metrics["max_drawdown"], round((1 - 99 / 101) * 100, 3))
+        self.assertEqual(metrics["max_drawdown_duration"], 1)
+        self.assertEqual(metrics["sharpe"], round(returns.mean() / returns.std() * np.sqrt(periods), 3))
+        downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+        self.assertEqual(metrics["sortino"], round(returns.mean() / downside * np.sqrt(periods), 3))
+        self.assertEqual(metrics["exposure"], 40.0)
+        self.assertEqual(metrics["turnover"], round(202 / equity.mean(), 3))
+        self.assertEqual(metrics["win_rate"], 100.0)
+        self.assertEqual(metrics["profit_factor"], float("inf"))
+        self.assertEqual(compute_metrics(np.array([])), {})
+
+
+class AnalyzerPerformanceMetricsTests(unittest.TestCase):
+    def make_analyzer(self, lean=False):
+        analyzer = Analyzer(lean=lean)
+        analyzer.is_simulation = True
+        repo = analyzer.data_repository
+        for minute, price in enumerate([100, 110, 120, 90, 100, 130]):
+            repo.add_trading_info([make_candle(minute, price)])
+        repo.add_asset_info({"balance": 1000, "asset": {}, "quote": {"KRW-BTC": 100}, "date_time": "2024-01-01T00:00:00"})
+        repo.add_result({"type": "buy", "price": 110, "amount": 2, "balance": 780, "date_time": "2024-01-01T00:01:00"})
+        repo.add_result({"type": "sell", "price": 100, "amount": 1, "balance": 880, "date_time": "2024-01-01T00:04:00"})
+        return analyzer
+
+    def test_get_performance_metrics_rebuild_equity_of_every_candle(self):
+        analyzer = self.make_analyzer()
+
+        epochs, equity, position, _ = analyzer._make_equity_curve()
+
+        np.testing.assert_allclose(equity, [1000, 1000, 1020, 960, 980, 1010])
+        np.testing.assert_allclose(position, [0, 2, 2, 2, 1, 1])
+        metrics = analyzer.get_performance_metrics()
+        self.assertEqual(metrics["candles"], 6)
+        self.assertEqual(metrics["max_drawdown"], round((1 - 960 / 1020) * 100, 3))
+        self.assertEqual(metrics["exposure"], round(5 / 6 * 100, 3))
+        self.assertEqual(metrics["win_rate"], 0.0)
+
+    def test_get_performance_metrics_of_interval(self):
+        analyzer = self.make_analyzer()
+
+        metrics = analyzer.get_performance_metrics(analyzer.data_repository.info_list[3:])
+
+        # 구간 시작 전 보유 수량 2개는 구간 시작 가격 90으로 매입한 것으로 본다
+        self.assertEqual(metrics["candles"], 3)
+        self.assertEqual(metrics["trade_count"], 1)
+        self.assertEqual(metrics["avg_trade_pnl"], 10.0)
+
+    def test_get_performance_metrics_use_asset_samples_in_lean_mode(self):
+        analyzer = self.make_analyzer(lean=True)
+        analyzer.data_repository.add_asset_info(
+            {"balance": 880, "asset": {"KRW-BTC": (110, 1)}, "quote": {"KRW-BTC": 130}, "date_time": "2024-01-01T00:05:00"}
+        )
+
+        metrics = analyzer.get_performance_metrics()
+
+        self.assertEqual(metrics["candles"], 2)
+        self.assertEqual(metrics["total_return"], 1.0)
+        self.assertEqual(metrics["exposure"], 50.0)
+
+    def test_get_performance_metrics_use_asset_samples_in_portfolio_run(self):
+        analyzer = Analyzer()
+        analyzer.is_simulation = True
+        repo = analyzer.data_repository
+        for minute, price in enumerate([100, 120, 150]):
+            analyzer.put_trading_info(
+                [make_candle(minute, 1000), make_candle(minute, price, market="KRW-XRP", candle_type="market_candle")]
+            )
+            repo.add_asset_info(
+                {"balance": 0 if minute > 0 else 1000, "asset": {"KRW-XRP": (100, 10)} if minute > 0 else {},
+                 "quote": {"KRW-BTC": 1000, "KRW-XRP": price}, "date_time": to_date_time(minute)}
+            )
+        repo.add_result(
+            {"market": "KRW-XRP", "type": "buy", "price": 100, "amount": 10, "balance": 0, "date_time": to_date_time(0)}
+        )
+
+        metrics = analyzer.get_performance_metrics()
+
+        self.assertTrue(analyzer.has_market_candle)
+        self.assertEqual(metrics["candles"], 3)
+        self.assertEqual(metrics["total_return"], 50.0)
+        self.assertEqual(metrics["exposure"], round(2 / 3 * 100, 3))
+
+    def test_get_performance_metrics_use_asset_samples_when_result_of_other_market(self):
+        analyzer = self.make_analyzer()
+        analyzer.data_repository.add_result(
+            {"market": "KRW-XRP", "type": "buy", "price": 10, "amount": 1, "balance": 870, "date_time": to_date_time(5)}
+        )
+
+        self.assertEqual(analyzer.get_performance_metrics()["candles"], 1)
+
+    def test_create_report_compute_metrics_only_once(self):
+        analyzer = self.make_analyzer()
+        analyzer.graph_generator = MagicMock()
+        analyzer.report_generator.create_report_file = MagicMock()
+        analyzer.get_performance_metrics = MagicMock(wraps=analyzer.get_performance_metrics)
+        analyzer.get_asset_info_func = MagicMock(
+            return_value={"balance": 880, "asset": {"KRW-BTC": (110, 1)}, "quote": {"KRW-BTC": 130},
+                          "date_time": to_date_time(5)}
+        )
+
+        analyzer.get_return_report()
+        analyzer.get_performance_metrics.assert_not_called()
+        report = analyzer.create_report(tag="metrics")
+
+        analyzer.get_performance_metrics.assert_called_once_with()
+        self.assertEqual(report["metrics"]["candles"], 6)
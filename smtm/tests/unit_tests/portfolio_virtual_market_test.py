@@ -0,0 +1,205 @@
+import unittest
+from smtm.data.candle_alignment import align_candles
+from smtm.data.simulation_portfolio_data_provider import SimulationPortfolioDataProvider
+from smtm.strategy.strategy_portfolio import StrategyPortfolio
+from smtm.trader.portfolio_virtual_market import PortfolioVirtualMarket
+from candle_factory import make_candle
+from unittest.mock import *
+
+
+
+
+def make_market(data, budget=10000):
+    with patch("smtm.trader.portfolio_virtual_market.DataRepository"):
+        market = PortfolioVirtualMarket(list(data.keys()))
+    market.set_data(data)
+    market.balance = budget
+    market.is_initialized = True
+    return market
+
+
+class CandleAlignmentTests(unittest.TestCase):
+    def test_align_candles_fill_gaps_with_flat_candles(self):
+        data = {
+            "KRW-A": [make_candle(0, 100, market="KRW-A"), make_candle(1, 110, market="KRW-A"), make_candle(3, 130, market="KRW-A")],
+            "KRW-B": [make_candle(1, 50, market="KRW-B"), make_candle(2, 60, market="KRW-B")],
+        }
+
+        timeline, aligned, traded = align_candles(data)
+
+        self.assertEqual(timeline, [f"2024-01-01T00:0{i}:00" for i in range(4)])
+        self.assertEqual([c["closing_price"] for c in aligned["KRW-A"]], [100, 110, 110, 130])
+        self.assertEqual([c["closing_price"] for c in aligned["KRW-B"]], [50, 50, 60, 60])
+        self.assertEqual([c["acc_volume"] for c in aligned["KRW-B"]], [0.0, 1.0, 1.0, 0.0])
+        self.assertIs(aligned["KRW-A"][0], data["KRW-A"][0])
+        self.assertEqual(traded["KRW-A"].tolist(), [True, True, False, True])
+        self.assertEqual(traded["KRW-B"].tolist(), [False, True, True, False])
+
+    def test_align_candles_raise_error_when_market_has_no_candle(self):
+        with self.assertRaises(UserWarning):
+            align_candles({"KRW-A": [make_candle(0, 100, market="KRW-A")], "KRW-B": []})
+
+
+class PortfolioVirtualMarketTests(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "KRW-A": [make_candle(i, 100 + i * 10, market="KRW-A") for i in range(6)],
+            "KRW-B": [make_candle(i, 50, market="KRW-B") for i in range(6) if i != 2],
+        }
+
+    def test_initialize_load_every_market_through_candle_cache(self):
+        cache = MagicMock()
+        cache.get_data.side_effect = lambda repo, start, end, market: self.data[market]
+        with patch("smtm.trader.portfolio_virtual_market.DataRepository"), patch(
+            "smtm.trader.portfolio_virtual_market.CandleCache.get_instance", return_value=cache
+        ):
+            market = PortfolioVirtualMarket(["KRW-A", "KRW-B"])
+            market.initialize(end="2024-01-01T00:06:00", count=6, budget=5000)
+
+        self.assertEqual(cache.get_data.call_count, 2)
+        cache.get_data.assert_called_with(market.repo, "2024-01-01T00:00:00", "2024-01-01T00:06:00", market="KRW-B")
+        self.assertEqual(market.close.shape, (2, 6))
+        self.assertEqual(market.balance, 5000)
+        self.assertEqual(market.get_balance()["quote"], {"KRW-A": 100.0, "KRW-B": 50.0})
+
+    def test_handle_requests_share_cash_across_markets(self):
+        market = make_market(self.data)
+
+        results = market.handle_requests(
+            [
+                {"id": "1", "market": "KRW-A", "type": "buy", "price": 100, "amount": 50},
+                {"id": "2", "market": "KRW-B", "type": "buy", "price": 50, "amount": 100},
+            ]
+        )
+
+        # 100 * 50 * 1.0005 = 5002.5 -> 4998, 50 * 100 * 1.0005 = 5002.5 잔고 부족
+        self.assertEqual([(r["market"], r["balance"]) for r in results], [("KRW-A", 4998)])
+        self.assertEqual(market.asset, {"KRW-A": (100, 50)})
+
+    def test_handle_requests_process_sell_before_buy(self):
+        market = make_market(self.data, budget=0)
+        market.asset = {"KRW-A": (100, 10)}
+
+        results = market.handle_requests(
+            [
+                {"id": "1", "market": "KRW-B", "type": "buy", "price": 50, "amount": 10},
+                {"id": "2", "market": "KRW-A", "type": "sell", "price": 100, "amount": 20},
+            ]
+        )
+
+        # 100 * 10 * 0.9995 = 999.5 -> 1000, 50 * 10 * 1.0005 = 500.25 -> 500
+        self.assertEqual([(r["type"], r["market"]) for r in results], [("sell", "KRW-A"), ("buy", "KRW-B")])
+        self.assertEqual(market.balance, 500)
+        self.assertEqual(market.asset, {"KRW-B": (50, 10)})
+
+    def test_handle_requests_not_match_on_filled_candle(self):
+        market = make_market(self.data)
+        market.handle_requests([])
+
+        # 다음 캔들(2)은 KRW-B 거래가 없는 채워진 캔들
+        results = market.handle_requests(
+            [
+                {"id": "1", "market": "KRW-B", "type": "buy", "price": 50, "amount": 1},
+                {"id": "2", "type": "buy", "price": 130, "amount": 1},
+            ]
+        )
+
+        self.assertEqual([(r["market"], r["request"]["id"]) for r in results], [("KRW-A", "2")])
+
+    def test_handle_requests_ignore_zero_and_cancel_requests(self):
+        market = make_market(self.data)
+
+        results = market.handle_requests(
+            [
+                {"id": "1", "market": "KRW-A", "type": "buy", "price": 0, "amount": 0},
+                {"id": "2", "market": "KRW-A", "type": "cancel", "price": 100, "amount": 1},
+                {"id": "3", "market": "KRW-C", "type": "buy", "price": 100, "amount": 1},
+            ]
+        )
+
+        self.assertEqual(results, [])
+        self.assertEqual(market.turn_count, 1)
+
+    def test_handle_requests_return_game_over_at_end_of_data(self):
+        market = make_market(self.data)
+        request = {"id": "1", "type": "buy", "price": 0, "amount": 0}
+        for _ in range(5):
+            results = market.handle_requests([request])
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["msg"], "game-over")
+        self.assertEqual(results[0]["date_time"], "2024-01-01T00:04:00")
+
+
+class SimulationPortfolioDataProviderTests(unittest.TestCase):
+    def test_get_info_return_aligned_candles_of_every_market(self):
+        providers = [MagicMock(market="KRW-A"), MagicMock(market="KRW-B")]
+        providers[0].get_candles.return_value = [
+            make_candle(0, 100, market="KRW-A", candle_type=None),
+            make_candle(1, 110, market="KRW-A", candle_type=None),
+        ]
+        providers[1].get_candles.return_value = [make_candle(1, 50, market="KRW-B", candle_type=None)]
+        with patch(
+            "smtm.data.simulation_portfolio_data_provider.SimulationDataProvider", side_effect=providers
+        ):
+            dp = SimulationPortfolioDataProvider(currencies=["A", "B"])
+        dp.initialize_simulation(end="2024-01-01T00:02:00", count=2)
+
+        info = dp.get_info()
+        self.assertEqual([(c["type"], c["market"], c["closing_price"]) for c in info],
+                         [("primary_candle", "KRW-A", 100), ("market_candle", "KRW-B", 50)])
+        self.assertEqual(info[1]["acc_volume"], 0.0)
+        self.assertEqual(len(dp.get_info()), 2)
+        self.assertIsNone(dp.get_info())
+        self.assertNotIn("type", providers[0].get_candles.return_value[0])
+
+
+class StrategyPortfolioTests(unittest.TestCase):
+    def setUp(self):
+        self.sub = {"KRW-A": MagicMock(), "KRW-B": MagicMock()}
+        self.strategy = StrategyPortfolio(self.sub, weights={"KRW-A": 0.75, "KRW-B": 0.25})
+        self.strategy.is_simulation = True
+        self.strategy.initialize(10000)
+
+    def test_initialize_split_budget_by_weight(self):
+        self.assertEqual(self.sub["KRW-A"].initialize.call_args[0][0], 7500)
+        self.assertEqual(self.sub["KRW-B"].initialize.call_args[0][0], 2500)
+        self.assertTrue(self.sub["KRW-B"].is_simulation)
+
+    def test_update_trading_info_route_candles_as_primary_candle(self):
+        candle_a = make_candle(0, 100, market="KRW-A")
+        candle_b = make_candle(0, 50, market="KRW-B", candle_type="market_candle")
+
+        self.strategy.update_trading_info([candle_a, candle_b])
+
+        info_b = self.sub["KRW-B"].update_trading_info.call_args[0][0]
+        self.assertEqual((info_b[0]["market"], info_b[0]["type"]), ("KRW-B", "primary_candle"))
+        self.assertEqual(candle_b["type"], "market_candle")
+        self.assertEqual(self.sub["KRW-A"].update_trading_info.call_args[0][0][0]["market"], "KRW-A")
+
+    def test_get_request_stamp_market_and_skip_noop_requests(self):
+        self.sub["KRW-A"].get_request.return_value = [{"id": "1", "type": "buy", "price": 0, "amount": 0}]
+        self.sub["KRW-B"].get_request.return_value = [{"id": "2", "type": "sell", "price": 50, "amount": 1}]
+
+        self.assertEqual(
+            self.strategy.get_request(), [{"id": "2", "type": "sell", "price": 50, "amount": 1, "market": "KRW-B"}]
+        )
+
+        self.sub["KRW-B"].get_request.return_value = None
+        self.assertEqual(self.strategy.get_request(), [{"id": "1", "type": "buy", "price": 0, "amount": 0}])
+
+    def test_update_result_route_by_request_market(self):
+        result = {"request": {"id": "2", "market": "KRW-B"}, "type": "sell", "price": 50, "amount": 1}
+
+        self.strategy.update_result(result)
+
+        self.sub["KRW-B"].update_result.assert_called_once_with(result)
+        self.sub["KRW-A"].update_result.assert_not_called()
+
+    def test_create_make_strategy_for_every_market(self):
+        strategy = StrategyPortfolio.create("BNH", ["KRW-A", "KRW-B"])
+
+        self.assertEqual(list(strategy.strategies.keys()), ["KRW-A", "KRW-B"])
+        self.assertEqual(strategy.weights, {"KRW-A": 0.5, "KRW-B": 0.5})
+        with self.assertRaises(UserWarning):
+            StrategyPortfolio.create("NOT-EXIST", ["KRW-A"])
@@ -0,0 +1,111 @@
+import os
+import random
+import tempfile
+import unittest
+from datetime import datetime
+from smtm.analyzer.analyzer import Analyzer
+from smtm.analyzer.report_generator import ReportGenerator, TradingTable
+from candle_factory import make_candle, to_date_time
+from unittest.mock import *
+
+
+def sorted_trading_table(request_list, info_list, score_list, result_list):
+    return sorted(
+        request_list + info_list + score_list + result_list,
+        key=lambda x: (datetime.strptime(x["date_time"], "%Y-%m-%dT%H:%M:%S"), x["kind"]),
+    )
+
+
+def make_lists(count, seed=0):
+    rand = random.Random(seed)
+    info_list, request_list, result_list, score_list = [], [], [], []
+    for idx in range(count):
+        date_time = to_date_time(idx)
+        info_list.append({"kind": 0, "date_time": date_time, "idx": idx})
+        score_list.append({"kind": 3, "date_time": date_time, "idx": idx})
+        for sub in range(rand.randint(0, 2)):
+            request_list.append({"kind": 1, "date_time": date_time, "idx": idx, "sub": sub})
+            result_list.append({"kind": 2, "date_time": date_time, "idx": idx, "sub": sub})
+    return request_list, info_list, score_list, result_list
+
+
+class ReportGeneratorTests(unittest.TestCase):
+    def setUp(self):
+        self.generator = ReportGenerator()
+
+    def test_create_trading_table_same_as_sorted_table(self):
+        lists = make_lists(300)
+
+        table = self.generator.create_trading_table(*lists)
+
+        self.assertEqual(table, sorted_trading_table(*lists))
+        self.assertEqual((table[0]["kind"], table[-1]["kind"]), (0, 3))
+
+    def test_create_trading_table_sort_unordered_list(self):
+        request_list, info_list, score_list, result_list = make_lists(50, seed=1)
+        random.Random(2).shuffle(result_list)
+        request_list.append({"kind": 1, "date_time": "2024-01-01T00:00:00", "idx": -1})
+
+        table = self.generator.create_trading_table(request_list, info_list, score_list, result_list)
+
+        self.assertEqual(table, sorted_trading_table(request_list, info_list, score_list, result_list))
+
+    def test_create_trading_table_raise_error_with_invalid_date_time(self):
+        with self.assertRaises(ValueError):
+            self.generator.create_trading_table([], [{"kind": 0, "date_time": "2024-01-01 00:00:00"}], [], [])
+
+    def test_create_report_file_write_iterator_same_as_list(self):
+        lists = make_lists(5)
+        records = [
+            dict(item, opening_price=1, high_price=1, low_price=1, closing_price=1, acc_price=1, acc_volume=1,
+                 id="1", type="buy", price=1, amount=1, request={"id": "1"}, msg="success", balance=1,
+                 cumulative_return=0, price_change_ratio={}, asset={})
+            for item in self.generator.create_trading_table(*lists)
+        ]
+        summary = (100, 100, 0, {}, None, 0, 0, 0, 0)
+        outputs = []
+        with tempfile.TemporaryDirectory() as folder:
+            with patch.object(ReportGenerator, "OUTPUT_FOLDER", folder + "/"):
+                for name, table in (("list", records), ("iter", iter(records)), ("empty", iter([]))):
+                    self.generator.create_report_file(name, summary, table)
+                    with open(os.path.join(folder, name + ".txt"), encoding="utf-8") as report_file:
+                        outputs.append(report_file.read())
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertTrue(outputs[0].startswith("### TRADING TABLE"))
+        self.assertTrue(outputs[2].startswith("### SUMMARY"))
+
+
+class TradingTableTests(unittest.TestCase):
+    def test_build_rows_only_when_read(self):
+        lists = make_lists(20)
+        generator = ReportGenerator()
+        generator.create_trading_table = MagicMock(wraps=generator.create_trading_table)
+
+        table = TradingTable(generator, *lists)
+        self.assertEqual(len(table), sum(len(records) for records in lists))
+        generator.create_trading_table.assert_not_called()
+        lists[1].append({"kind": 0, "date_time": to_date_time(100), "idx": 100})
+
+        self.assertEqual(table, sorted_trading_table(*(records[:-1] if idx == 1 else records
+                                                       for idx, records in enumerate(lists))))
+        self.assertEqual(table[0]["kind"], 0)
+        generator.create_trading_table.assert_called_once()
+
+    def test_analyzer_create_report_stream_rows_to_report_file(self):
+        analyzer = Analyzer()
+        analyzer.is_simulation = True
+        analyzer.graph_generator = MagicMock()
+        analyzer.report_generator.create_report_file = MagicMock()
+        analyzer.initialize(
+            lambda: {"balance": 1000, "asset": {}, "quote": {"KRW-BTC": 100}, "date_time": to_date_time(2)}
+        )
+        for minute in range(3):
+            analyzer.put_trading_info([make_candle(minute, 100)])
+
+        report = analyzer.create_report(tag="stream")
+
+        rows = analyzer.report_generator.create_report_file.call_args[0][2]
+        self.assertNotIsInstance(rows, list)
+        self.assertIsInstance(report["trading_table"], TradingTable)
+        self.assertEqual(list(rows), list(report["trading_table"]))
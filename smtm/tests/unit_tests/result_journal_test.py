@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+from smtm.controller.result_journal import ResultJournal
+
+
+class ResultJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "output", "mango.journal.jsonl")
+        self.period_list = [
+            {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"},
+            {"start": "2020-04-30T19:00:00", "end": "2020-04-30T21:00:00"},
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_append_and_load_return_results_as_tuple(self):
+        journal = ResultJournal(self.path)
+        journal.open()
+        journal.append(1, self.period_list[1], (100, 101, 1.0, {"KRW-BTC": 0.5}, None, "p", 0.1, 1.2, ("a", "b")))
+        journal.close()
+
+        result = ResultJournal(self.path).load(self.period_list)
+        self.assertEqual(result, {1: (100, 101, 1.0, {"KRW-BTC": 0.5}, None, "p", 0.1, 1.2, ("a", "b"))})
+
+    def test_load_skip_truncated_line_and_other_period(self):
+        journal = ResultJournal(self.path)
+        journal.open()
+        journal.append(0, {"start": "x", "end": "y"}, (1, 2, 3))
+        journal.append(1, self.period_list[1], (4, 5, 6))
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"idx": 0, "start": "2020-04')
+
+        self.assertEqual(ResultJournal(self.path).load(self.period_list), {1: (4, 5, 6)})
+        self.assertEqual(len(ResultJournal(self.path).load()), 2)
+
+    def test_load_skip_null_and_invalid_result(self):
+        journal = ResultJournal(self.path)
+        journal.open()
+        journal.append(0, self.period_list[0], None)
+        journal.append(1, self.period_list[1], (4, 5, 6))
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"idx": 0, "start": "2020-04-30T17:00:00"}\n[1, 2]\n')
+
+        self.assertEqual(ResultJournal(self.path).load(self.period_list), {1: (4, 5, 6)})
+
+    def test_open_with_resume_keep_results_and_start_new_line(self):
+        journal = ResultJournal(self.path)
+        journal.open()
+        journal.append(0, self.period_list[0], (1, 2, 3))
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"idx": 1, "st')
+
+        journal.open(resume=True)
+        journal.append(1, self.period_list[1], (4, 5, 6))
+        journal.close()
+        self.assertEqual(
+            ResultJournal(self.path).load(self.period_list), {0: (1, 2, 3), 1: (4, 5, 6)}
+        )
+
+        journal.open()
+        journal.close()
+        self.assertEqual(ResultJournal(self.path).load(self.period_list), {})
+
+    def test_load_return_empty_when_journal_not_exist(self):
+        self.assertEqual(ResultJournal(self.path).load(), {})
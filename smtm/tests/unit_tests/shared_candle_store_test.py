@@ -0,0 +1,84 @@
+import multiprocessing
+import unittest
+import numpy as np
+from smtm.data.shared_candle_store import SharedCandleStore
+
+
+def make_candles(start_hour, count):
+    candles = []
+    for i in range(count):
+        minute = start_hour * 60 + i
+        candles.append(
+            {
+                "market": "KRW-BTC",
+                "date_time": f"2020-03-10T{minute // 60:02d}:{minute % 60:02d}:00",
+                "opening_price": 100.0 + i,
+                "high_price": 110.0 + i,
+                "low_price": 90.0 + i,
+                "closing_price": 105.0 + i,
+                "acc_price": 1000.0 + i,
+                "acc_volume": 10.0 + i,
+                "period": 60,
+                "recovered": i % 2,
+            }
+        )
+    return candles
+
+
+def read_in_child(descriptor, start, end, result_queue):
+    store = SharedCandleStore.attach(descriptor)
+    result_queue.put(store.get_data(start, end))
+    store.close()
+
+
+class SharedCandleStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.candles = make_candles(10, 60) + make_candles(13, 30)
+        self.store = SharedCandleStore.create(
+            "upbit",
+            "KRW-BTC",
+            60,
+            self.candles,
+            [("2020-03-10T10:00:00", "2020-03-10T11:00:00"), ("2020-03-10T13:00:00", "2020-03-10T13:30:00")],
+        )
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_get_data_return_same_candles_as_loaded(self):
+        self.assertEqual(len(self.store), 90)
+        self.assertEqual(
+            self.store.get_data("2020-03-10T10:00:00", "2020-03-10T13:30:00"), self.candles
+        )
+        self.assertEqual(
+            self.store.get_data("2020-03-10T10:10:00", "2020-03-10T10:13:00"), self.candles[10:13]
+        )
+
+    def test_get_columns_return_views_of_shared_memory(self):
+        columns = self.store.get_columns("2020-03-10T13:00:00", "2020-03-10T13:30:00")
+        self.assertEqual(len(columns["epoch"]), 30)
+        self.assertTrue(np.shares_memory(columns["closing_price"], self.store.columns["closing_price"]))
+
+    def test_covers_check_market_interval_and_ranges(self):
+        self.assertTrue(self.store.covers("upbit", "KRW-BTC", 60, "2020-03-10T10:30:00", "2020-03-10T11:00:00"))
+        self.assertFalse(self.store.covers("upbit", "KRW-BTC", 60, "2020-03-10T10:30:00", "2020-03-10T13:10:00"))
+        self.assertFalse(self.store.covers("upbit", "KRW-ETH", 60, "2020-03-10T10:30:00", "2020-03-10T11:00:00"))
+        self.assertFalse(self.store.covers("binance", "KRW-BTC", 60, "2020-03-10T10:30:00", "2020-03-10T11:00:00"))
+
+    def test_attach_read_candles_from_other_process(self):
+        result_queue = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=read_in_child,
+            args=(self.store.get_descriptor(), "2020-03-10T13:00:00", "2020-03-10T13:05:00", result_queue),
+        )
+        process.start()
+        result = result_queue.get(timeout=10)
+        process.join(10)
+
+        self.assertEqual(result, self.candles[60:65])
+
+    def test_create_empty_store(self):
+        store = SharedCandleStore.create("upbit", "KRW-BTC", 60, [], [])
+        self.assertEqual(store.get_data("2020-03-10T10:00:00", "2020-03-10T11:00:00"), [])
+        self.assertFalse(store.covers("upbit", "KRW-BTC", 60, "2020-03-10T10:00:00", "2020-03-10T11:00:00"))
+        store.close()
@@ -30,7 +30,10 @@ class SimulationDataProviderTests(unittest.TestCase):
         dp = SimulationDataProvider()
         dp.index = 0
         dp.data = dummy_data
-        self.assertEqual(dp.get_info()[0], dummy_data[0])
-        self.assertEqual(dp.get_info()[0], dummy_data[1])
-        self.assertEqual(dp.get_info()[0], dummy_data[2])
+        for expected in dummy_data:
+            info = dp.get_info()[0]
+            self.assertEqual(info["type"], "primary_candle")
+            self.assertEqual(info["market"], expected["market"])
+            self.assertEqual(info["date_time"], expected["date_time"])
+            self.assertNotIn("type", expected)
         self.assertEqual(dp.get_info(), None)
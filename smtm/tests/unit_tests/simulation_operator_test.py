@@ -125,6 +125,142 @@ class SimulationOperatorTests(unittest.TestCase):
         with self.assertRaises(UserWarning):
             operator._execute_trading(None)
 
+    def test_run_to_completion_should_run_turns_until_data_is_exhausted(self):
+        operator = SimulationOperator()
+        analyzer_mock = Mock()
+        analyzer_mock.create_report = MagicMock(return_value={"summary": "banana"})
+        dp_mock = Mock()
+        dp_mock.get_info = MagicMock(side_effect=["mango", "orange", "apple", None])
+        strategy_mock = Mock()
+        strategy_mock.CODE = "MAG"
+        strategy_mock.get_request = MagicMock(return_value=None)
+        trader_mock = Mock()
+        trader_mock.NAME = "orange_tr"
+        operator.initialize(dp_mock, strategy_mock, trader_mock, analyzer_mock)
+        operator.worker = MagicMock()
+        operator._start_timer = MagicMock()
+
+        report = operator.run_to_completion()
+
+        self.assertEqual(report, {"summary": "banana"})
+        self.assertEqual(operator.last_report, report)
+        self.assertEqual(operator.state, "simulation_terminated")
+        self.assertEqual(operator.turn, 3)
+        self.assertEqual(strategy_mock.update_trading_info.call_count, 3)
+        analyzer_mock.make_start_point.assert_called_once()
+        analyzer_mock.create_report.assert_called_once_with(tag=operator.tag)
+        operator.worker.start.assert_not_called()
+        operator.worker.post_task.assert_not_called()
+        operator._start_timer.assert_not_called()
+
+    def test_run_to_completion_should_stop_when_result_msg_game_over(self):
+        operator = SimulationOperator()
+        analyzer_mock = Mock()
+        analyzer_mock.create_report = MagicMock(return_value={"summary": "banana"})
+        dp_mock = Mock()
+        dp_mock.get_info = MagicMock(return_value="mango")
+        dummy_request = {"id": "mango", "type": "buy", "price": 500, "amount": 10}
+        strategy_mock = Mock()
+        strategy_mock.CODE = "MAG"
+        strategy_mock.get_request = MagicMock(return_value=dummy_request)
+        trader_mock = Mock()
+        trader_mock.NAME = "orange_tr"
+
+        def send_request(request_list, callback):
+            if trader_mock.send_request.call_count == 2:
+                callback({"msg": "game-over"})
+
+        trader_mock.send_request = MagicMock(side_effect=send_request)
+        operator.initialize(dp_mock, strategy_mock, trader_mock, analyzer_mock)
+
+        report = operator.run_to_completion()
+
+        self.assertEqual(report, {"summary": "banana"})
+        self.assertEqual(operator.state, "simulation_terminated")
+        self.assertEqual(trader_mock.send_request.call_count, 2)
+
+    def test_run_to_completion_should_stop_when_stop_condition_return_True(self):
+        operator = SimulationOperator()
+        analyzer_mock = Mock()
+        analyzer_mock.create_report = MagicMock(return_value={"summary": "banana"})
+        dp_mock = Mock()
+        dp_mock.get_info = MagicMock(return_value="mango")
+        strategy_mock = Mock()
+        strategy_mock.CODE = "MAG"
+        strategy_mock.get_request = MagicMock(return_value=None)
+        trader_mock = Mock()
+        trader_mock.NAME = "orange_tr"
+        operator.initialize(dp_mock, strategy_mock, trader_mock, analyzer_mock)
+        stop_condition = MagicMock(side_effect=[False, False, True])
+
+        report = operator.run_to_completion(stop_condition=stop_condition)
+
+        self.assertEqual(report, {"summary": "banana"})
+        self.assertEqual(operator.state, "simulation_terminated")
+        self.assertEqual(operator.turn, 3)
+        self.assertEqual(stop_condition.call_count, 3)
+        stop_condition.assert_called_with(operator)
+        analyzer_mock.create_report.assert_called_once_with(tag=operator.tag)
+
+    def test_run_to_completion_should_stop_with_error_when_turn_keep_failing(self):
+        operator = SimulationOperator()
+        analyzer_mock = Mock()
+        dp_mock = Mock()
+        dp_mock.get_info = MagicMock(side_effect=["mango", "orange", "apple", "kiwi", "banana"])
+        strategy_mock = Mock()
+        strategy_mock.CODE = "MAG"
+        strategy_mock.get_request = MagicMock(
+            side_effect=[None, UserWarning("fail"), UserWarning("fail"), UserWarning("fail"), None]
+        )
+        trader_mock = Mock()
+        trader_mock.NAME = "orange_tr"
+        operator.initialize(dp_mock, strategy_mock, trader_mock, analyzer_mock)
+
+        report = operator.run_to_completion()
+
+        self.assertIsNone(report)
+        self.assertEqual(operator.state, "error")
+        self.assertEqual(operator.turn, 4)
+        analyzer_mock.create_report.assert_not_called()
+
+    def test_run_to_completion_should_continue_after_single_failure(self):
+        operator = SimulationOperator()
+        analyzer_mock = Mock()
+        analyzer_mock.create_report = MagicMock(return_value={"summary": "banana"})
+        dp_mock = Mock()
+        dp_mock.get_info = MagicMock(side_effect=["mango", "orange", "apple", None])
+        strategy_mock = Mock()
+        strategy_mock.CODE = "MAG"
+        strategy_mock.get_request = MagicMock(side_effect=[UserWarning("fail"), None, UserWarning("fail")])
+        trader_mock = Mock()
+        trader_mock.NAME = "orange_tr"
+        operator.initialize(dp_mock, strategy_mock, trader_mock, analyzer_mock)
+
+        report = operator.run_to_completion()
+
+        self.assertEqual(report, {"summary": "banana"})
+        self.assertEqual(operator.state, "simulation_terminated")
+
+    def test_run_to_completion_return_None_when_state_is_NOT_ready(self):
+        operator = SimulationOperator()
+        self.assertIsNone(operator.run_to_completion())
+
+    def test_get_score_should_call_callback_directly_in_batch_mode(self):
+        operator = SimulationOperator()
+        analyzer = MagicMock()
+        analyzer.get_return_report.return_value = "grape"
+        operator.initialize("banana", MagicMock(), MagicMock(), analyzer)
+        operator.worker = MagicMock()
+        operator.state = "running"
+        operator.is_batch = True
+        callback = MagicMock()
+        operator.get_score(callback, index_info=7)
+        operator.worker.post_task.assert_not_called()
+        analyzer.get_return_report.assert_called_once_with(
+            graph_filename=ANY, index_info=7
+        )
+        callback.assert_called_once_with("grape")
+
     def test_get_score_should_call_work_post_task_with_correct_task(self):
         operator = SimulationOperator()
         strategy = MagicMock()
@@ -176,3 +312,29 @@ class SimulationOperatorTests(unittest.TestCase):
         operator.get_score.assert_called_with(
             ANY, index_info=operator.PERIODIC_RECORD_INFO, graph_tag=ANY
         )
+
+    def test_initialize_should_call_strategy_precompute_with_all_candles(self):
+        operator = SimulationOperator()
+        dp_mock = Mock()
+        dp_mock.get_candles.return_value = ["candle1", "candle2"]
+        strategy_mock = Mock()
+        strategy_mock.CODE = "MAG"
+        trader_mock = Mock()
+        trader_mock.NAME = "orange_tr"
+
+        operator.initialize(dp_mock, strategy_mock, trader_mock, Mock())
+
+        strategy_mock.initialize.assert_called_once()
+        strategy_mock.precompute.assert_called_once_with(["candle1", "candle2"])
+
+    def test_initialize_should_not_call_strategy_precompute_when_data_provider_has_no_candles(self):
+        operator = SimulationOperator()
+        dp_mock = Mock(spec=["get_info"])
+        strategy_mock = Mock()
+        strategy_mock.CODE = "MAG"
+        trader_mock = Mock()
+        trader_mock.NAME = "orange_tr"
+
+        operator.initialize(dp_mock, strategy_mock, trader_mock, Mock())
+
+        strategy_mock.precompute.assert_not_called()
@@ -33,6 +33,18 @@ class SimulatorTests(unittest.TestCase):
         simulator.initialize.assert_called()
         simulator.terminate.assert_called()
 
+    def test_run_single_call_run_to_completion_in_batch_mode(self):
+        simulator = Simulator(batch=True)
+        simulator.start = MagicMock()
+        simulator.initialize = MagicMock()
+        simulator.terminate = MagicMock()
+        simulator.operator = MagicMock()
+        simulator.run_single()
+        simulator.initialize.assert_called()
+        simulator.operator.run_to_completion.assert_called_once()
+        simulator.start.assert_not_called()
+        simulator.terminate.assert_called()
+
     @patch("builtins.print")
     def test_print_help_print_guide_correctly(self, mock_print):
         simulator = Simulator()
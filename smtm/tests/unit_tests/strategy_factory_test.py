@@ -6,6 +6,7 @@ from smtm import (
     StrategyRsi,
     StrategySmaMl,
 )
+from smtm.strategy.tuning_presets import PRESETS
 from unittest.mock import *
 
 
@@ -50,3 +51,30 @@ class StrategyFactoryTests(unittest.TestCase):
         self.assertTrue(all[3]["name"], StrategySmaMl.NAME)
         self.assertTrue(all[3]["code"], StrategySmaMl.CODE)
         self.assertTrue(all[3]["class"], StrategySmaMl)
+
+    def test_create_apply_params_to_instance_only(self):
+        strategy = StrategyFactory.create("SMA", params={"SHORT": 7})
+        self.assertEqual(strategy.SHORT, 7)
+        self.assertNotEqual(StrategySma0.SHORT, 7)
+        self.assertNotEqual(StrategyFactory.create("SMA").SHORT, 7)
+
+    def test_create_raise_UserWarning_when_params_has_unknown_key(self):
+        with self.assertRaises(UserWarning):
+            StrategyFactory.create("SMA", params={"NOT_EXIST": 7})
+
+    def test_create_set_tuning_params_when_strategy_support_it(self):
+        strategy = StrategyFactory.create(
+            "BBI-V3-SPEC-V16-VOL", params={"VOL_SPIKE_FACTOR": 3.5, "BUY_WEIGHTS": [1, 1, 1, 1, 1]}
+        )
+        self.assertEqual(strategy.tuning_params, {"VOL_SPIKE_FACTOR": 3.5, "BUY_WEIGHTS": [1, 1, 1, 1, 1]})
+
+        strategy.is_simulation = True
+        strategy.initialize(1000000)
+        self.assertEqual(strategy.VOL_SPIKE_FACTOR, 3.5)
+        self.assertEqual(strategy.BUY_WEIGHTS, [1, 1, 1, 1, 1])
+        self.assertEqual(type(strategy).VOL_SPIKE_FACTOR, 2.5)
+
+    def test_create_accept_all_tuning_presets(self):
+        for name, params in PRESETS.items():
+            strategy = StrategyFactory.create("BBI-V3-SPEC-V16-VOL", params=params)
+            self.assertEqual(strategy.tuning_params, params, name)
@@ -49,7 +49,7 @@ class StrategySma0Tests(unittest.TestCase):
             }
         ]
         sma.update_trading_info(dummy_info)
-        self.assertEqual(sma.closing_price_list.pop(), 500)
+        self.assertEqual(sma.data.window("closing_price")[-1], 500)
 
     @patch("numpy.isnan")
     @patch("pandas.Series")
@@ -59,7 +59,7 @@ class StrategySma0Tests(unittest.TestCase):
         sma = StrategySma0()
 
         for i in range(sma.LONG):
-            sma.closing_price_list.append(500)
+            sma.data.append({"closing_price": 500})
 
         class DummyMean:
             pass
@@ -121,7 +121,7 @@ class StrategySma0Tests(unittest.TestCase):
         sma = StrategySma0()
 
         for i in range(sma.LONG):
-            sma.closing_price_list.append(500)
+            sma.data.append({"closing_price": 500})
 
         class DummyMean:
             pass
@@ -184,7 +184,7 @@ class StrategySma0Tests(unittest.TestCase):
         sma = StrategySma0()
 
         for i in range(sma.LONG + sma.STD_K):
-            sma.closing_price_list.append(500)
+            sma.data.append({"closing_price": 500})
 
         class DummyMean:
             pass
@@ -374,7 +374,7 @@ class StrategySma0Tests(unittest.TestCase):
         sma = StrategySma0()
         sma.initialize(100, 10)
         dummy_info = {"closing_price": 2000}
-        sma.closing_price_list.append(dummy_info)
+        sma.data.append(dummy_info)
         sma.cross_info[0] = {"price": 0, "index": 1}
         requests = sma.get_request()
         self.assertEqual(requests, None)
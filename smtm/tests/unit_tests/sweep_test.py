@@ -0,0 +1,180 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from smtm.runner import sweep
+from unittest.mock import *
+
+
+class SweepSpaceTests(unittest.TestCase):
+    def test_make_grid_return_all_combinations(self):
+        result = sweep.make_grid({"VOL_SPIKE_FACTOR": [2.0, 3.0], "BUY_WEIGHTS": [[1, 1], [2, 2], [3, 3]]})
+        self.assertEqual(len(result), 6)
+        self.assertEqual(result[0], {"VOL_SPIKE_FACTOR": 2.0, "BUY_WEIGHTS": [1, 1]})
+        self.assertEqual(result[-1], {"VOL_SPIKE_FACTOR": 3.0, "BUY_WEIGHTS": [3, 3]})
+
+    def test_make_grid_raise_ValueError_when_values_is_not_list(self):
+        with self.assertRaises(ValueError):
+            sweep.make_grid({"VOL_SPIKE_FACTOR": 2.0})
+
+    def test_make_random_return_same_params_with_same_seed(self):
+        space = {
+            "VOL_SPIKE_FACTOR": {"min": 1.5, "max": 3.5},
+            "MAX_BUY_COUNT": {"min": 3, "max": 5},
+            "BUY_WEIGHTS": [[1, 1], [2, 2]],
+        }
+        first = sweep.make_random(space, 20, seed=7)
+        self.assertEqual(first, sweep.make_random(space, 20, seed=7))
+        self.assertEqual(len(first), 20)
+        for params in first:
+            self.assertTrue(1.5 <= params["VOL_SPIKE_FACTOR"] <= 3.5)
+            self.assertIn(params["MAX_BUY_COUNT"], (3, 4, 5))
+            self.assertIn(params["BUY_WEIGHTS"], space["BUY_WEIGHTS"])
+
+
+class DrawdownPrunerTests(unittest.TestCase):
+    def make_operator(self, score_list, probe_return):
+        operator = MagicMock()
+        operator.analyzer.data_repository.score_list = score_list
+        operator.analyzer.data_analyzer.create_score_record.return_value = {
+            "cumulative_return": probe_return
+        }
+        return operator
+
+    def test_call_return_False_and_count_turns_when_limit_is_None(self):
+        pruner = sweep.DrawdownPruner()
+        operator = self.make_operator([], -50)
+
+        for _ in range(60):
+            self.assertFalse(pruner(operator))
+
+        self.assertEqual(pruner.turns, 60)
+        self.assertFalse(pruner.pruned)
+        operator.analyzer.data_analyzer.create_score_record.assert_not_called()
+
+    def test_call_check_drawdown_only_every_check_interval(self):
+        pruner = sweep.DrawdownPruner(limit=5, check_interval=3)
+        operator = self.make_operator([{"cumulative_return": 10}], -10)
+
+        self.assertFalse(pruner(operator))
+        self.assertFalse(pruner(operator))
+        self.assertTrue(pruner(operator))
+        self.assertTrue(pruner.pruned)
+        self.assertEqual(operator.analyzer.data_analyzer.create_score_record.call_count, 1)
+        # 고점 1.1에서 0.9로 하락
+        self.assertAlmostEqual(pruner.max_drawdown, 0.2 / 1.1 * 100)
+
+    def test_call_return_False_when_drawdown_is_under_limit(self):
+        pruner = sweep.DrawdownPruner(limit=5, check_interval=1)
+        score_list = [{"cumulative_return": 2}, {"cumulative_return": 1}]
+        operator = self.make_operator(score_list, 3)
+
+        self.assertFalse(pruner(operator))
+        score_list.append({"cumulative_return": 0})
+        self.assertFalse(pruner(operator))
+
+        self.assertEqual(pruner.seen, 3)
+        self.assertAlmostEqual(pruner.max_drawdown, 0.03 / 1.03 * 100)
+
+
+class SweepRunConfigTests(unittest.TestCase):
+    @patch("smtm.runner.sweep.MassSimulator")
+    def test_run_config_inject_params_and_return_result_row(self, mock_mass):
+        operator = MagicMock()
+        operator.analyzer.get_trading_results.return_value = [{}, {}, {}]
+        operator.analyzer.metrics = {"max_drawdown": 4.2, "sharpe": 1.5, "sortino": 2.1,
+                                     "max_drawdown_duration": 30, "exposure": 40.0, "win_rate": 60.0}
+        mock_mass.get_initialized_operator.return_value = operator
+        mock_mass.run_single.return_value = (100, 110, 10.0, {}, None, "p", -1.5, 12.0)
+        task = {
+            "idx": 3,
+            "params": {"VOL_SPIKE_FACTOR": 3.0},
+            "strategy": "BBI-V3-SPEC-V16-VOL",
+            "currency": "BTC",
+            "start": "2025-11-21T00:00:00",
+            "end": "2025-11-22T00:00:00",
+            "budget": 100,
+        }
+
+        row = sweep.run_config(task)
+
+        mock_mass.get_initialized_operator.assert_called_once_with(
+            100,
+            "BBI-V3-SPEC-V16-VOL",
+            0,
+            "BTC",
+            "2025-11-21T00:00:00",
+            "2025-11-22T00:00:00",
+            "SWEEP-3",
+            strategy_params={"VOL_SPIKE_FACTOR": 3.0},
+            lean=False,
+        )
+        self.assertTrue(row["ok"])
+        self.assertEqual(row["final_return"], 10.0)
+        self.assertEqual(row["min_return"], -1.5)
+        self.assertEqual(row["max_return"], 12.0)
+        self.assertEqual(row["trades"], 3)
+        self.assertEqual(row["max_drawdown"], 4.2)
+        self.assertEqual(
+            [row[key] for key in sweep.METRIC_FIELDS],
+            [1.5, 2.1, 30, 40.0, 60.0],
+        )
+        self.assertFalse(row["pruned"])
+
+    @patch("smtm.runner.sweep.MassSimulator")
+    def test_run_config_return_failed_row_when_exception_raised(self, mock_mass):
+        mock_mass.get_initialized_operator.side_effect = UserWarning("unknown parameter: X")
+        row = sweep.run_config({"idx": 0, "params": {"X": 1}, "strategy": "SMA", "currency": "BTC",
+                                "start": "s", "end": "e", "budget": 100})
+        self.assertFalse(row["ok"])
+        self.assertEqual(row["error"], "unknown parameter: X")
+
+
+class SweepTableTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.results = [
+            {"idx": 0, "ok": True, "final_return": 1.0, "max_return": 3.0, "min_return": -1.0,
+             "trades": 2, "elapsed_sec": 0.1, "error": "", "params": {"A": 1, "B": [1, 2]}},
+            {"idx": 1, "ok": False, "final_return": None, "max_return": None, "min_return": None,
+             "trades": 0, "elapsed_sec": 0.1, "error": "boom", "params": {"A": 2, "B": [1, 2]}},
+            {"idx": 2, "ok": True, "final_return": 2.0, "max_return": 2.5, "min_return": -3.0,
+             "trades": 4, "elapsed_sec": 0.1, "error": "", "params": {"A": 3, "B": [3, 4]}},
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_rank_results_sort_by_key_and_put_failed_last(self):
+        ranked = sweep.rank_results(self.results)
+        self.assertEqual([r["idx"] for r in ranked], [2, 0, 1])
+        self.assertEqual([r["rank"] for r in ranked], [1, 2, 3])
+
+        ranked = sweep.rank_results(self.results, "min_return")
+        self.assertEqual([r["idx"] for r in ranked], [0, 2, 1])
+
+        with self.assertRaises(ValueError):
+            sweep.rank_results(self.results, "mango")
+
+    def test_rank_results_sort_drawdown_ascending_and_missing_metric_last(self):
+        self.results[0].update({"sharpe": None, "max_drawdown": 5.0})
+        self.results[2].update({"sharpe": 0.8, "max_drawdown": 7.0})
+        self.results.append(dict(self.results[2], idx=3, sharpe=1.2, max_drawdown=2.0))
+
+        ranked = sweep.rank_results(self.results, "sharpe")
+        self.assertEqual([r["idx"] for r in ranked], [3, 2, 0, 1])
+
+        ranked = sweep.rank_results(self.results, "max_drawdown")
+        self.assertEqual([r["idx"] for r in ranked], [3, 0, 2, 1])
+
+    def test_write_table_write_ranked_csv_with_param_columns(self):
+        path = os.path.join(self.tmp_dir, "output", "sweep.csv")
+        sweep.write_table(path, sweep.rank_results(self.results))
+
+        with open(path, encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], list(sweep.RESULT_FIELDS) + ["A", "B"])
+        self.assertEqual(rows[1][:3], ["1", "2", "2.0"])
+        self.assertEqual(rows[1][-2:], ["3", "[3, 4]"])
+        self.assertEqual(rows[3][sweep.RESULT_FIELDS.index("error")], "boom")
@@ -0,0 +1,150 @@
+import unittest
+import numpy as np
+from smtm.strategy.strategy_bnh import StrategyBuyAndHold
+from smtm.strategy.strategy_rsi import StrategyRsi
+from smtm.strategy.strategy_sma_0 import StrategySma0
+from smtm.trader.vectorized_market import VectorizedMarket
+from smtm.trader.virtual_market import VirtualMarket
+from candle_factory import make_candles
+from unittest.mock import *
+
+
+
+
+def run_event_driven(strategy, candles, budget):
+    """SimulationOperator의 턴 진행과 같은 순서로 전략과 VirtualMarket을 실행"""
+    with patch("smtm.trader.virtual_market.DataRepository"):
+        market = VirtualMarket()
+    market.data = candles
+    market.balance = budget
+    market.is_initialized = True
+    strategy.is_simulation = True
+    strategy.initialize(budget)
+
+    trades = []
+    for candle in candles:
+        strategy.update_trading_info([dict(candle)])
+        result = market.handle_request(strategy.get_request()[0])
+        if isinstance(result, dict) and result["msg"] == "game-over":
+            break
+        if isinstance(result, dict):
+            strategy.update_result(result)
+            trades.append(
+                (result["type"], float(result["price"]), float(result["amount"]), result["balance"], result["date_time"])
+            )
+    return trades, market.balance
+
+
+class VectorizedMarketTests(unittest.TestCase):
+    def setUp(self):
+        self.columns = {
+            "closing_price": np.array([100.0, 110.0, 120.0, 130.0, 140.0, 150.0]),
+            "high_price": np.array([105.0, 115.0, 125.0, 135.0, 145.0, 155.0]),
+            "low_price": np.array([95.0, 95.0, 100.0, 125.0, 135.0, 145.0]),
+            "date_time": np.array([f"2024-01-01T00:0{i}:00" for i in range(6)], dtype=object),
+        }
+
+    def test_run_fill_buy_and_sell_with_next_candle_rule(self):
+        signals = {
+            "buy": np.array([True, False, False, False, False, False]),
+            "sell": np.array([False, False, True, False, False, False]),
+        }
+        amounts = {"buy": 10, "sell": 10}
+
+        result = VectorizedMarket().run(self.columns, signals, 10000, lambda side, price, account: amounts[side])
+
+        # 100 * 10 * 1.0005 = 1000.5 -> 8999.5 -> 9000, 120 * 10 * 0.9995 = 1199.4 -> 10199
+        self.assertEqual(
+            [(t["type"], t["price"], t["amount"], t["balance"], t["index"]) for t in result["trades"]],
+            [("buy", 100.0, 10, 9000, 0), ("sell", 120.0, 10, 10199, 2)],
+        )
+        self.assertEqual(result["trades"][0]["date_time"], "2024-01-01T00:00:00")
+        np.testing.assert_array_equal(result["balance"], [10000, 9000, 9000, 10199, 10199, 10199])
+        np.testing.assert_array_equal(result["asset_amount"], [0, 10, 10, 0, 0, 0])
+        np.testing.assert_array_equal(result["equity"], [10000, 10100, 10200, 10199, 10199, 10199])
+        self.assertEqual(result["final_balance"], 10199)
+        self.assertEqual(result["final_return"], 1.99)
+
+    def test_run_skip_unmatched_orders_and_orders_of_last_two_candles(self):
+        signals = {
+            "buy": np.array([False, True, False, True, True, False]),
+            "sell": np.array([False, False, False, False, False, False]),
+        }
+        get_amount = MagicMock(return_value=1)
+
+        result = VectorizedMarket().run(self.columns, signals, 10000, get_amount)
+
+        # 110은 다음 캔들 저가 100 이상이라 체결, 130은 다음 저가 135보다 낮아 미체결, 140은 game-over 턴
+        self.assertEqual([t["index"] for t in result["trades"]], [1])
+        self.assertEqual(get_amount.call_count, 2)
+
+    def test_run_pass_orders_without_money_or_asset(self):
+        signals = {
+            "buy": np.array([True, False, False, False, False, False]),
+            "sell": np.array([False, True, False, False, False, False]),
+        }
+
+        result = VectorizedMarket().run(self.columns, signals, 1000, lambda side, price, account: 10)
+
+        self.assertEqual(result["trades"], [])
+        np.testing.assert_array_equal(result["equity"], [1000] * 6)
+
+    def test_run_cap_sell_amount_to_holdings_and_pass_run_start_account(self):
+        signals = {
+            "buy": np.array([True, False, False, False, False, False]),
+            "sell": np.array([False, True, True, False, False, False]),
+        }
+        accounts = []
+
+        def get_amount(side, price, account):
+            accounts.append(dict(account))
+            return 5 if side == "buy" else 7
+
+        result = VectorizedMarket().run(self.columns, signals, 10000, get_amount)
+
+        self.assertEqual([(t["type"], t["amount"]) for t in result["trades"]], [("buy", 5), ("sell", 5)])
+        self.assertEqual(accounts[1]["run_asset_amount"], 5)
+        self.assertEqual(accounts[1]["asset_amount"], 5)
+        self.assertEqual(accounts[1]["run_balance"], 9500)
+
+    def test_run_raise_error_when_signals_are_invalid(self):
+        get_amount = MagicMock(return_value=1)
+        with self.assertRaises(UserWarning):
+            VectorizedMarket().run(self.columns, {"buy": np.ones(6, bool), "sell": np.ones(6, bool)}, 100, get_amount)
+        with self.assertRaises(UserWarning):
+            VectorizedMarket().run(self.columns, {"buy": np.ones(5, bool), "sell": np.zeros(5, bool)}, 100, get_amount)
+
+    def test_run_strategy_raise_error_when_strategy_is_not_vectorized(self):
+        strategy = MagicMock()
+        strategy.get_vectorized_signals.return_value = None
+
+        with self.assertRaises(UserWarning):
+            VectorizedMarket().run_strategy(strategy, make_candles(10), 10000)
+
+
+class VectorizedStrategyCrossCheckTests(unittest.TestCase):
+    """벡터화 구현의 체결 내역이 이벤트 방식 시뮬레이션과 같은지 확인"""
+
+    BUDGET = 10000000
+
+    def check_same_trades(self, strategy_cls, volatility, min_trades, seeds=(0, 1, 2)):
+        for seed in seeds:
+            with self.subTest(seed=seed):
+                candles = make_candles(1500, seed=seed, volatility=volatility)
+                expected, expected_balance = run_event_driven(strategy_cls(), candles, self.BUDGET)
+
+                result = VectorizedMarket().run_strategy(strategy_cls(), candles, self.BUDGET)
+
+                trades = [(t["type"], t["price"], t["amount"], t["balance"], t["date_time"]) for t in result["trades"]]
+                self.assertGreaterEqual(len(expected), min_trades)
+                self.assertEqual(trades, expected)
+                self.assertEqual(result["final_balance"], expected_balance)
+
+    def test_sma0_match_event_driven_simulation(self):
+        self.check_same_trades(StrategySma0, 0.0003, 2, seeds=(0, 2))
+
+    def test_rsi_match_event_driven_simulation(self):
+        self.check_same_trades(StrategyRsi, 0.003, 4)
+
+    def test_bnh_match_event_driven_simulation(self):
+        self.check_same_trades(StrategyBuyAndHold, 0.003, 5)
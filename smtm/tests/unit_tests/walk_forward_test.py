@@ -0,0 +1,162 @@
+import unittest
+from datetime import timedelta
+from smtm.analyzer.performance_metrics import compute_metrics
+from smtm.runner import sweep, walk_forward
+from unittest.mock import *
+
+
+def make_row(idx, final_return, ok=True, pruned=False, curve=None):
+    row = {
+        "idx": idx,
+        "params": {"A": idx},
+        "ok": ok,
+        "final_return": final_return,
+        "max_return": final_return,
+        "min_return": final_return,
+        "trades": 1,
+        "turns": 10,
+        "max_drawdown": 0.0,
+        "pruned": pruned,
+        "elapsed_sec": 0.0,
+        "error": "" if ok else "boom",
+    }
+    if curve is not None:
+        row["curve"] = curve
+    return row
+
+
+class WalkForwardWindowTests(unittest.TestCase):
+    def test_parse_duration_return_timedelta(self):
+        self.assertEqual(walk_forward.parse_duration("2d"), timedelta(days=2))
+        self.assertEqual(walk_forward.parse_duration("12h"), timedelta(hours=12))
+        self.assertEqual(walk_forward.parse_duration("90m"), timedelta(minutes=90))
+
+    def test_parse_duration_raise_ValueError_when_format_is_invalid(self):
+        for text in ("", "d", "2w", "1.5d"):
+            with self.assertRaises(ValueError):
+                walk_forward.parse_duration(text)
+
+    def test_make_windows_slide_train_and_test_windows_in_period(self):
+        windows = walk_forward.make_windows(
+            "2025-11-21T00:00:00", "2025-11-26T12:00:00", timedelta(days=2), timedelta(days=1)
+        )
+
+        self.assertEqual(len(windows), 3)
+        self.assertEqual(
+            windows[0],
+            {
+                "train_start": "2025-11-21T00:00:00",
+                "train_end": "2025-11-23T00:00:00",
+                "test_start": "2025-11-23T00:00:00",
+                "test_end": "2025-11-24T00:00:00",
+            },
+        )
+        self.assertEqual(windows[1]["test_start"], windows[0]["test_end"])
+        self.assertEqual(windows[2]["test_end"], "2025-11-26T00:00:00")
+
+    def test_make_windows_use_step(self):
+        windows = walk_forward.make_windows(
+            "2025-11-21T00:00:00", "2025-11-24T00:00:00", timedelta(days=1), timedelta(hours=12), timedelta(days=1)
+        )
+
+        self.assertEqual([window["test_start"] for window in windows], ["2025-11-22T00:00:00", "2025-11-23T00:00:00"])
+
+    def test_make_candidates_return_presets_and_space_params(self):
+        candidates = walk_forward.make_candidates(["SAFE"], [{"VOL_SPIKE_FACTOR": 2.0}])
+
+        self.assertEqual([candidate["name"] for candidate in candidates], ["SAFE", "space-0"])
+        self.assertEqual(candidates[0]["params"], walk_forward.PRESETS["SAFE"])
+        self.assertIsNot(candidates[0]["params"], walk_forward.PRESETS["SAFE"])
+
+    def test_make_candidates_raise_ValueError_when_preset_is_unknown(self):
+        with self.assertRaises(ValueError):
+            walk_forward.make_candidates(["NOT_EXIST"], [])
+
+
+class WalkForwardRunTests(unittest.TestCase):
+    def test_select_best_skip_pruned_and_failed_result(self):
+        rows = [make_row(0, 1.0), make_row(1, 5.0, pruned=True), make_row(2, None, ok=False), make_row(3, 2.0)]
+
+        self.assertEqual(walk_forward.select_best(rows)["idx"], 3)
+        self.assertIsNone(walk_forward.select_best([make_row(0, None, ok=False)]))
+
+    def test_stitch_equity_compound_test_curves(self):
+        rows = [
+            make_row(0, 10.0, curve=[["t0", 0.0], ["t1", 10.0]]),
+            None,
+            make_row(1, -50.0, curve=[["t2", 0.0], ["t3", -50.0]]),
+        ]
+
+        curve = walk_forward.stitch_equity(rows)
+
+        self.assertEqual([point["date_time"] for point in curve], ["t0", "t1", "t2", "t3"])
+        self.assertEqual([point["window"] for point in curve], [0, 0, 2, 2])
+        self.assertAlmostEqual(curve[1]["equity"], 1.1)
+        self.assertAlmostEqual(curve[2]["equity"], 1.1)
+        self.assertAlmostEqual(curve[3]["equity"], 0.55)
+
+    @patch("smtm.runner.walk_forward.sweep.evaluate")
+    @patch("smtm.runner.walk_forward.sweep.open_worker_pool")
+    def test_run_walk_forward_test_best_train_candidate_on_next_window(self, mock_pool, mock_evaluate):
+        spec = sweep.SweepSpec("BBI-V3-SPEC-V16-VOL", "BTC", "2025-11-21T00:00:00", "2025-11-25T00:00:00", 100000, 60)
+        windows = walk_forward.make_windows(spec.start, spec.end, timedelta(days=2), timedelta(days=1))
+        candidates = walk_forward.make_candidates(["SAFE", "BALANCED", "AGGRESSIVE"], [])
+        train_returns = {0: [1.0, 3.0, 2.0], 1: [5.0, 1.0, 2.0]}
+
+        def evaluate(pool, tasks, label):
+            if label.endswith("train"):
+                return [make_row(task["idx"], train_returns[task["idx"] // 3][task["idx"] % 3]) for task in tasks]
+            return [make_row(task["idx"], 10.0, curve=[[task["end"], 10.0]]) for task in tasks]
+
+        mock_evaluate.side_effect = evaluate
+
+        result = walk_forward.run_walk_forward(spec, windows, candidates, process=1)
+
+        train_tasks = mock_evaluate.call_args_list[0][0][1]
+        self.assertEqual(len(train_tasks), 6)
+        self.assertEqual(train_tasks[3]["start"], "2025-11-22T00:00:00")
+        self.assertEqual(train_tasks[3]["end"], "2025-11-24T00:00:00")
+        test_tasks = mock_evaluate.call_args_list[1][0][1]
+        self.assertEqual([task["idx"] for task in test_tasks], [1, 3])
+        self.assertEqual(test_tasks[0]["start"], "2025-11-23T00:00:00")
+        self.assertEqual(test_tasks[1]["end"], "2025-11-25T00:00:00")
+        self.assertTrue(all(task["curve"] for task in test_tasks))
+
+        self.assertEqual([item["candidate"] for item in result["windows"]], ["BALANCED", "SAFE"])
+        self.assertEqual([item["train_return"] for item in result["windows"]], [3.0, 5.0])
+        self.assertEqual(result["oos_return"], 21.0)
+        self.assertAlmostEqual(result["equity"][-1]["equity"], 1.21)
+
+    @patch("smtm.runner.walk_forward.sweep.MassSimulator")
+    @patch("smtm.runner.walk_forward.sweep.evaluate")
+    @patch("smtm.runner.walk_forward.sweep.open_worker_pool")
+    def test_run_walk_forward_report_test_max_drawdown_of_losing_window(self, mock_pool, mock_evaluate, mock_mass):
+        spec = sweep.SweepSpec("BBI-V3-SPEC-V16-VOL", "BTC", "2025-11-21T00:00:00", "2025-11-24T00:00:00", 100000, 60)
+        windows = walk_forward.make_windows(spec.start, spec.end, timedelta(days=2), timedelta(days=1))
+        candidates = walk_forward.make_candidates(["SAFE"], [])
+        operator = MagicMock()
+        operator.analyzer.get_trading_results.return_value = [{}]
+        operator.analyzer.data_repository.score_list = []
+        mock_mass.get_initialized_operator.return_value = operator
+
+        def run_single(operator, stop_condition):
+            # 최고점 대비 20% 하락 후 일부 회복한 손실 구간
+            operator.analyzer.metrics = compute_metrics([100.0, 110.0, 88.0, 99.0])
+            return (100000, 99000, -1.0, {}, None, "p", -12.0, 10.0)
+
+        mock_mass.run_single.side_effect = run_single
+
+        def evaluate(pool, tasks, label):
+            if label.endswith("train"):
+                return [make_row(task["idx"], 1.0) for task in tasks]
+            return [sweep.run_config(task) for task in tasks]
+
+        mock_evaluate.side_effect = evaluate
+
+        result = walk_forward.run_walk_forward(spec, windows, candidates, process=1)
+
+        self.assertEqual(result["windows"][0]["test_return"], -1.0)
+        self.assertEqual(result["windows"][0]["test_max_drawdown"], 20.0)
+        self.assertEqual(result["windows"][0]["test_exposure"], 0.0)
+        self.assertEqual(result["windows"][0]["test_max_drawdown_duration"], 2)
+        self.assertEqual(result["windows"][0]["test_trades"], 1)